@@ -11,7 +11,15 @@ import json
 import time
 import os
 import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
+
+from intent_cache import IntentCache
+from intent_classifier import IntentModel, TieredIntentClassifier
+from routing_metrics import RoutingMetrics
+from speculation import Speculator
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend
@@ -91,12 +99,15 @@ SAMPLE_USER = {
 bedrock_agent_runtime = boto3.client('bedrock-agent-runtime', region_name=REGION)
 bedrock_runtime = boto3.client('bedrock-runtime', region_name=REGION)
 
+# Live routing metrics for /api/metrics (1m/5m/1h windows, Prometheus export)
+routing_metrics = RoutingMetrics()
+
 
 # ==============================================================================
 # Monitoring and Logging Functions
 # ==============================================================================
 
-def log_classification_decision(message: str, intent: str, classification_time: float):
+def log_classification_decision(message: str, intent: str, classification_time: float, source: str = 'haiku'):
     """
     Log classification decisions for monitoring and analytics
 
@@ -104,6 +115,7 @@ def log_classification_decision(message: str, intent: str, classification_time:
         message: User message
         intent: Classified intent
         classification_time: Time taken to classify
+        source: Classifier that answered (rules, model or haiku)
     """
     try:
         log_entry = {
@@ -113,15 +125,14 @@ def log_classification_decision(message: str, intent: str, classification_time:
             'message_length': len(message),
             'classified_intent': intent,
             'classification_time_ms': round(classification_time * 1000, 2),
-            'model': 'haiku',
+            'model': source,
             'status': 'success'
         }
 
         # Log to standard logger
         logger.info(f"Classification: {json.dumps(log_entry)}")
 
-        # TODO: In production, also send to CloudWatch Metrics or analytics service
-        # Example: cloudwatch.put_metric_data(...)
+        routing_metrics.record_classification(intent, source, classification_time)
 
     except Exception as e:
         logger.error(f"Error logging classification decision: {e}")
@@ -148,11 +159,14 @@ def log_classification_error(message: str, error: str, classification_time: floa
 
         logger.error(f"Classification Error: {json.dumps(log_entry)}")
 
+        routing_metrics.record_classification_error(classification_time)
+
     except Exception as e:
         logger.error(f"Error logging classification error: {e}")
 
 
-def log_agent_invocation(intent: str, agent_id: str, customer_id: str, message: str, invocation_time: float, success: bool):
+def log_agent_invocation(intent: str, agent_id: str, customer_id: str, message: str, invocation_time: float, success: bool,
+                         chunk_count: int = 0, first_chunk_time: Optional[float] = None):
     """
     Log agent invocations for monitoring
 
@@ -163,6 +177,8 @@ def log_agent_invocation(intent: str, agent_id: str, customer_id: str, message:
         message: User message
         invocation_time: Time taken for invocation
         success: Whether invocation succeeded
+        chunk_count: Response chunks streamed
+        first_chunk_time: Time until the first chunk (None if none arrived)
     """
     try:
         log_entry = {
@@ -173,13 +189,14 @@ def log_agent_invocation(intent: str, agent_id: str, customer_id: str, message:
             'customer_id': customer_id,
             'message_length': len(message),
             'invocation_time_ms': round(invocation_time * 1000, 2),
+            'first_chunk_ms': round(first_chunk_time * 1000, 2) if first_chunk_time is not None else None,
+            'chunks': chunk_count,
             'status': 'success' if success else 'error'
         }
 
         logger.info(f"Agent Invocation: {json.dumps(log_entry)}")
 
-        # TODO: Send to CloudWatch or analytics
-        # track_metric('agent_invocations', 1, {'intent': intent, 'agent': agent_id})
+        routing_metrics.record_invocation(intent, invocation_time, success, chunk_count, first_chunk_time)
 
     except Exception as e:
         logger.error(f"Error logging agent invocation: {e}")
@@ -188,32 +205,20 @@ def log_agent_invocation(intent: str, agent_id: str, customer_id: str, message:
 def get_routing_metrics():
     """
     Get routing metrics for monitoring dashboard
-    Returns aggregated stats for the last hour
+    Returns last-hour headline stats plus 1m/5m/1h windows (see routing_metrics.py)
     """
-    # TODO: Implement metrics aggregation from logs or CloudWatch
-    # This is a placeholder for future implementation
-    return {
-        'total_requests': 0,
-        'intents': {
-            'chitchat': 0,
-            'scheduling': 0,
-            'information': 0,
-            'notes': 0
-        },
-        'avg_classification_time_ms': 0,
-        'avg_invocation_time_ms': 0,
-        'error_rate': 0
-    }
+    return routing_metrics.snapshot()
 
 
 # ==============================================================================
 # Intent Classification
 # ==============================================================================
 
-def classify_intent(message):
+def classify_intent_with_haiku(message):
     """
     Classify user intent using Claude Haiku for fast, cheap classification.
-    Returns: 'scheduling', 'information', 'notes', or 'chitchat'
+    Returns: 'scheduling', 'information', 'notes', or 'chitchat';
+    None when the call fails or returns something else (not cached, routed to chitchat)
 
     Version: 2.0 - Improved edge case handling
     """
@@ -275,13 +280,11 @@ Respond with ONLY the category name (scheduling/information/notes/chitchat), not
         valid_intents = ['scheduling', 'information', 'notes', 'chitchat']
         if intent not in valid_intents:
             logger.warning(f"Invalid intent '{intent}' returned, defaulting to chitchat")
-            intent = 'chitchat'
+            log_classification_error(message, f"Invalid intent '{intent}'", time.time() - classification_start_time)
+            return None
 
         classification_time = time.time() - classification_start_time
-        logger.info(f"Intent classified: {intent} for message: '{message[:50]}...' (took {classification_time:.2f}s)")
-
-        # Log to monitoring (for production analytics)
-        log_classification_decision(message, intent, classification_time)
+        logger.info(f"Haiku classified: {intent} for message: '{message[:50]}...' (took {classification_time:.2f}s)")
 
         return intent
 
@@ -292,8 +295,128 @@ Respond with ONLY the category name (scheduling/information/notes/chitchat), not
         # Log error for monitoring
         log_classification_error(message, str(e), classification_time)
 
-        # Default to chitchat on error
-        return 'chitchat'
+        # Caller defaults to chitchat on error
+        return None
+
+
+def load_intent_classifier():
+    """
+    Tiered classifier: rules, then the local model (intent_model.json), then
+    cached Haiku answers, then Haiku.
+    Settings come from routing.local_classifier and routing.intent_cache in agent_config.json.
+    """
+    settings = ROUTING_CONFIG.get('local_classifier', {})
+    model = None
+    try:
+        model = IntentModel.load()
+    except (OSError, ValueError, KeyError) as e:
+        # Rules still answer greetings and explicit requests without the model
+        logger.warning(f"Local intent model unavailable ({e}); using rules + Haiku")
+
+    return TieredIntentClassifier(
+        fallback=classify_intent_with_haiku,
+        model=model,
+        threshold=float(settings.get('confidence_threshold', 0.8)),
+        enabled=settings.get('enabled', True),
+        cache=IntentCache.from_config(ROUTING_CONFIG.get('intent_cache', {}))
+    )
+
+
+intent_classifier = load_intent_classifier()
+
+
+def record_classification(message, intent, tier, confidence, classification_time):
+    """Log a classification from any tier (a failed Haiku call was logged as an error instead)"""
+    if tier == 'failed':
+        logger.info(f"Routing to default intent {intent} after the Haiku classification failed")
+        return
+
+    source = 'haiku' if tier == 'llm' else tier
+    if tier == 'cache':
+        logger.info(f"Intent from cache: {intent} for message: '{message[:50]}...'")
+    elif tier != 'llm':
+        logger.info(f"Intent classified locally: {intent} via {tier}"
+                    f"{f' ({confidence:.2f})' if confidence is not None else ''} for message: '{message[:50]}...'")
+
+    # Log to monitoring (for production analytics)
+    log_classification_decision(message, intent, classification_time, source)
+
+
+def classify_intent(message):
+    """
+    Classify user intent locally when confident, otherwise with Claude Haiku.
+    Returns: 'scheduling', 'information', 'notes', or 'chitchat'
+
+    Version: 3.0 - Local rules/model tiers in front of Haiku
+    """
+    classification_start_time = time.time()
+    intent, tier, confidence = intent_classifier.classify(message)
+    record_classification(message, intent, tier, confidence, time.time() - classification_start_time)
+    return intent
+
+
+def load_speculator():
+    """Speculative invocation settings from routing.speculation in agent_config.json (off by default)"""
+    settings = ROUTING_CONFIG.get('speculation', {})
+    executor = ThreadPoolExecutor(
+        max_workers=int(settings.get('max_workers', 8)),
+        thread_name_prefix='speculative-agent'
+    )
+    return Speculator.from_config(settings, executor)
+
+
+speculator = load_speculator()
+
+
+def classify_intent_speculatively(message, customer_id, open_agent_stream):
+    """
+    Classify like classify_intent, but when Haiku is needed start the likely
+    agent while it runs
+
+    Args:
+        message: User message
+        customer_id: Customer ID (previous intent is used as a guess)
+        open_agent_stream: Starts the agent for an intent and returns its chunks
+
+    Returns:
+        (intent, speculative chunk stream to use, or None to invoke the agent normally)
+    """
+    classification_start_time = time.time()
+    intent, tier, confidence = intent_classifier.classify_local(message)
+    speculative = None
+    if not tier:
+        speculative = speculator.start(customer_id, intent, confidence, open_agent_stream)
+        intent, tier, confidence = intent_classifier.classify_fallback(message, confidence)
+    record_classification(message, intent, tier, confidence, time.time() - classification_start_time)
+    return intent, speculator.resolve(speculative, intent)
+
+
+def stream_agent_response(agent_id, alias_id, session_id, augmented_prompt, customer_id, customer_type):
+    """Invoke an agent and yield its response chunks as text"""
+    response = bedrock_agent_runtime.invoke_agent(
+        agentId=agent_id,
+        agentAliasId=alias_id,
+        sessionId=session_id,
+        inputText=augmented_prompt,
+        sessionState={
+            'sessionAttributes': {
+                'customer_id': customer_id,
+                'customer_type': customer_type
+            }
+        }
+    )
+
+    completion = response['completion']
+    try:
+        for event in completion:
+            if 'chunk' in event:
+                chunk = event['chunk']
+                if 'bytes' in chunk:
+                    yield chunk['bytes'].decode('utf-8')
+    finally:
+        # Release the connection when the reader stops early (client gone, speculation discarded)
+        if hasattr(completion, 'close'):
+            completion.close()
 
 
 def invoke_agent_with_context(message, customer_id, customer_type='B2C'):
@@ -303,8 +426,9 @@ def invoke_agent_with_context(message, customer_id, customer_type='B2C'):
     Routing logic:
     1. If use_supervisor=True: use supervisor agent (for when AWS fixes the bug)
     2. If use_supervisor=False: classify intent and route to appropriate agent
+       (with routing.speculation enabled, the likely agent starts while Haiku classifies)
 
-    Version: 2.0 - With monitoring and logging
+    Version: 2.1 - With speculative invocation
     """
 
     # CRITICAL: Inject customer context into prompt
@@ -320,6 +444,9 @@ Please help the customer with their request using their customer ID for any acti
     invocation_start_time = time.time()
     intent = 'unknown'
     agent_id = None
+    speculative = None
+    chunk_count = 0
+    first_chunk_time = None
 
     try:
         # Determine which agent to use
@@ -331,59 +458,110 @@ Please help the customer with their request using their customer ID for any acti
             logger.info(f"Routing via SUPERVISOR agent: {agent_id}")
         else:
             # Custom routing: classify intent and route to appropriate agent
-            intent = classify_intent(message)
+            if speculator.enabled:
+                # A throwaway session: a discarded guess must not leave a turn in the user's session
+                speculative_session_id = f"{session_id}-speculative-{uuid.uuid4().hex[:8]}"
+
+                def open_agent_stream(guess):
+                    guess_config = AGENTS.get(guess, AGENTS['chitchat'])
+                    return stream_agent_response(guess_config['agent_id'], guess_config['alias_id'],
+                                                 speculative_session_id, augmented_prompt, customer_id, customer_type)
+
+                intent, speculative = classify_intent_speculatively(message, customer_id, open_agent_stream)
+            else:
+                intent = classify_intent(message)
+            speculator.recent.set(customer_id, intent)
+
             agent_config = AGENTS.get(intent, AGENTS['chitchat'])
             agent_id = agent_config['agent_id']
             alias_id = agent_config['alias_id']
-            logger.info(f"Routing to {intent.upper()} agent: {agent_id}")
-
-        # Invoke the selected agent
-        response = bedrock_agent_runtime.invoke_agent(
-            agentId=agent_id,
-            agentAliasId=alias_id,
-            sessionId=session_id,
-            inputText=augmented_prompt,
-            sessionState={
-                'sessionAttributes': {
-                    'customer_id': customer_id,
-                    'customer_type': customer_type
-                }
-            }
-        )
-
-        # Stream response
-        chunk_count = 0
-        for event in response['completion']:
-            if 'chunk' in event:
-                chunk = event['chunk']
-                if 'bytes' in chunk:
-                    chunk_count += 1
-                    yield chunk['bytes'].decode('utf-8')
+            logger.info(f"Routing to {intent.upper()} agent: {agent_id}{' (speculative stream)' if speculative else ''}")
+
+        # Stream the selected agent's response (already running on a speculation hit)
+        chunks = speculative or stream_agent_response(agent_id, alias_id, session_id, augmented_prompt,
+                                                      customer_id, customer_type)
+        try:
+            for chunk in chunks:
+                if first_chunk_time is None:
+                    first_chunk_time = time.time() - invocation_start_time
+                chunk_count += 1
+                yield chunk
+        finally:
+            # Client gone (GeneratorExit) or the stream failed: stop reading the agent's response
+            if speculative is not None:
+                speculative.cancel()
+            else:
+                chunks.close()
 
         # Log successful invocation
         invocation_time = time.time() - invocation_start_time
-        log_agent_invocation(intent, agent_id, customer_id, message, invocation_time, True)
+        log_agent_invocation(intent, agent_id, customer_id, message, invocation_time, True,
+                             chunk_count, first_chunk_time)
         logger.info(f"Agent invocation completed: {chunk_count} chunks in {invocation_time:.2f}s")
 
     except Exception as e:
         # Log failed invocation
         invocation_time = time.time() - invocation_start_time
-        log_agent_invocation(intent, agent_id or 'unknown', customer_id, message, invocation_time, False)
+        log_agent_invocation(intent, agent_id or 'unknown', customer_id, message, invocation_time, False,
+                             chunk_count, first_chunk_time)
 
         logger.error(f"Agent invocation error: {e} (after {invocation_time:.2f}s)")
         yield f"Error: {str(e)}"
 
 
-@app.route('/api/health', methods=['GET'])
-def health():
-    """Health check endpoint"""
-    return jsonify({
+# ==============================================================================
+# Response payloads (shared with the ASGI server in asgi_app.py)
+# ==============================================================================
+
+def health_payload():
+    return {
         'status': 'healthy',
         'routing': ROUTING_CONFIG,
         'supervisor_id': SUPERVISOR_ID,
         'agents': {intent: agent['agent_id'] for intent, agent in AGENTS.items()},
         'region': REGION
-    })
+    }
+
+
+def config_payload():
+    return {
+        'routing': ROUTING_CONFIG,
+        'supervisor_id': SUPERVISOR_ID,
+        'supervisor_alias': SUPERVISOR_ALIAS,
+        'agents': AGENTS,
+        'region': REGION
+    }
+
+
+def metrics_payload():
+    """Routing metrics, classifier tiers, intent cache and speculation statistics"""
+    return {
+        'status': 'active',
+        'routing_method': 'frontend' if not ROUTING_CONFIG.get('use_supervisor') else 'supervisor',
+        'metrics': get_routing_metrics(),
+        'classification': intent_classifier.stats(),
+        'intent_cache': intent_classifier.cache.stats(),
+        'speculation': speculator.stats(),
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def prometheus_payload():
+    """Routing metrics in Prometheus text format"""
+    return routing_metrics.prometheus()
+
+
+# ==============================================================================
+# Flask Routes
+# ==============================================================================
+
+@app.route('/api/health', methods=['GET'])
+def health():
+    """Health check endpoint"""
+    return jsonify(health_payload())
 
 
 @app.route('/api/user', methods=['GET'])
@@ -447,13 +625,7 @@ def chat_simple():
 @app.route('/api/config', methods=['GET'])
 def get_config():
     """Get Bedrock configuration"""
-    return jsonify({
-        'routing': ROUTING_CONFIG,
-        'supervisor_id': SUPERVISOR_ID,
-        'supervisor_alias': SUPERVISOR_ALIAS,
-        'agents': AGENTS,
-        'region': REGION
-    })
+    return jsonify(config_payload())
 
 
 @app.route('/api/metrics', methods=['GET'])
@@ -462,13 +634,13 @@ def get_metrics():
     Get routing metrics for monitoring dashboard
     Returns aggregated statistics for the current session
     """
-    metrics = get_routing_metrics()
-    return jsonify({
-        'status': 'active',
-        'routing_method': 'frontend' if not ROUTING_CONFIG.get('use_supervisor') else 'supervisor',
-        'metrics': metrics,
-        'timestamp': datetime.now().isoformat()
-    })
+    return jsonify(metrics_payload())
+
+
+@app.route('/api/metrics/prometheus', methods=['GET'])
+def get_prometheus_metrics():
+    """Routing metrics for a Prometheus scrape"""
+    return Response(prometheus_payload(), content_type=PROMETHEUS_CONTENT_TYPE)
 
 
 if __name__ == '__main__':
@@ -480,6 +652,9 @@ if __name__ == '__main__':
 ╚══════════════════════════════════════════════════════════════╝
 
 Routing Mode: {routing_mode}
+Intent Classifier: {'rules + local model' if intent_classifier.model else 'rules'} (>= {intent_classifier.threshold}) then Haiku{'' if intent_classifier.enabled else ' [local tiers disabled]'}
+Intent Cache: {intent_classifier.cache.max_entries} entries{' + Redis' if intent_classifier.cache.redis is not None else ''}{'' if intent_classifier.cache.enabled else ' [disabled]'}
+Speculative Invocation: {', '.join(sorted(speculator.intents)) if speculator.enabled else 'off'}
 Region: {REGION}
 
 Available Agents:
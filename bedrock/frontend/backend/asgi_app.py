@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+ASGI Backend for Bedrock Agent Chat UI
+Same endpoints and intent-based routing as app.py, served from an event loop
+
+Routing, classification and agent invocation come from app.py. boto3's
+event-stream reads are blocking, so each chat runs on a bounded pool of
+stream workers (StreamBridge) that hands chunks to the event loop through a
+small buffer:
+
+  - backpressure: a worker waits when a client is slow to read, and gives the
+    stream up after ASGI_SEND_TIMEOUT seconds without progress; a client that
+    resumes reads what was buffered, then the stream ends with an error
+  - disconnects: the worker stops and closes the agent's event stream
+  - admission: beyond the workers plus ASGI_MAX_WAITING queued chats,
+    /api/chat answers 503 with Retry-After instead of queueing without bound
+  - health, config and metrics never wait behind chats
+
+Environment variables:
+    ASGI_STREAM_WORKERS  - concurrent agent streams (default: 64)
+    ASGI_MAX_WAITING     - chats queued for a worker before 503 (default: 64)
+    ASGI_STREAM_BUFFER   - chunks buffered per chat (default: 16)
+    ASGI_SEND_TIMEOUT    - seconds a full buffer may wait for the client (default: 30)
+
+Run:
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5001
+    python3 asgi_app.py
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+import app as routing
+
+logger = logging.getLogger(__name__)
+
+STREAM_WORKERS = int(os.getenv('ASGI_STREAM_WORKERS', '64'))
+MAX_WAITING = int(os.getenv('ASGI_MAX_WAITING', '64'))
+STREAM_BUFFER = int(os.getenv('ASGI_STREAM_BUFFER', '16'))
+SEND_TIMEOUT = float(os.getenv('ASGI_SEND_TIMEOUT', '30'))
+
+_CHUNK, _ERROR, _DONE, _STALLED = 'chunk', 'error', 'done', 'stalled'
+
+
+# ==============================================================================
+# Blocking stream bridge
+# ==============================================================================
+
+class StreamBridge:
+    """Runs blocking chunk iterators on a bounded thread pool and relays them to the event loop"""
+
+    def __init__(self, workers: int = 64, max_waiting: int = 64, buffer_size: int = 16, send_timeout: float = 30.0):
+        """
+        Args:
+            workers: Iterators read concurrently
+            max_waiting: Streams queued for a worker before accepting() refuses
+            buffer_size: Chunks held per stream before the worker waits for the client
+            send_timeout: Seconds a worker waits on a full buffer before giving the stream up
+        """
+        self.workers = workers
+        self.max_waiting = max_waiting
+        self.buffer_size = buffer_size
+        self.send_timeout = send_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='agent-stream')
+        self.open_streams = 0  # event loop thread only
+        self._counts = {'started': 0, 'completed': 0, 'failed': 0, 'disconnected': 0, 'stalled': 0, 'rejected': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def accepting(self) -> bool:
+        """Whether another stream may start (soft limit: workers plus max_waiting open streams)"""
+        if self.open_streams >= self.workers + self.max_waiting:
+            self._count('rejected')
+            return False
+        return True
+
+    async def iterate(self, open_iterator: Callable[[], Iterable[Any]]) -> AsyncIterator[Any]:
+        """
+        Iterate a blocking iterator on a worker thread
+
+        Args:
+            open_iterator: Creates the iterator (called on the worker)
+
+        Yields:
+            Items in order; an exception raised by the iterator is re-raised here
+
+        Raises:
+            TimeoutError: The consumer stalled past send_timeout and the stream was given up
+        """
+        loop = asyncio.get_running_loop()
+        buffer: asyncio.Queue = asyncio.Queue(maxsize=self.buffer_size)
+        stop = threading.Event()
+
+        def send(item) -> None:
+            # Blocks this worker while the buffer is full: backpressure from the client socket
+            put = asyncio.wait_for(buffer.put(item), self.send_timeout)
+            asyncio.run_coroutine_threadsafe(put, loop).result()
+
+        def produce() -> None:
+            iterator = None
+            try:
+                iterator = iter(open_iterator())
+                for item in iterator:
+                    if stop.is_set():
+                        break
+                    send((_CHUNK, item))
+                if not stop.is_set():
+                    send((_DONE, None))
+            except (asyncio.TimeoutError, TimeoutError):
+                logger.warning(f"Client stalled for {self.send_timeout}s; dropping stream")
+                self._count('stalled')
+                stop.set()
+                # Queued behind the buffered chunks, without waiting for room: a client
+                # that resumes reading gets an end to the stream instead of hanging
+                try:
+                    asyncio.run_coroutine_threadsafe(buffer.put((_STALLED, None)), loop)
+                except RuntimeError:
+                    pass  # event loop already closed
+            except Exception as e:
+                if not stop.is_set():
+                    try:
+                        send((_ERROR, e))
+                    except Exception:
+                        pass
+            finally:
+                # Nobody will read the rest: release the agent's event stream
+                if stop.is_set() and hasattr(iterator, 'close'):
+                    iterator.close()
+
+        self.open_streams += 1
+        self._count('started')
+        loop.run_in_executor(self.executor, produce)
+        outcome = 'disconnected'
+        try:
+            while True:
+                kind, value = await buffer.get()
+                if kind == _DONE:
+                    outcome = 'completed'
+                    return
+                if kind == _ERROR:
+                    outcome = 'failed'
+                    raise value
+                if kind == _STALLED:
+                    outcome = None  # counted by the worker
+                    raise TimeoutError(f"Stream dropped after the client stalled for {self.send_timeout}s")
+                yield value
+        finally:
+            self.open_streams -= 1
+            if outcome:
+                self._count(outcome)
+            stop.set()
+            # Free a worker blocked on a full buffer so it sees stop
+            while not buffer.empty():
+                buffer.get_nowait()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            'workers': self.workers,
+            'max_waiting': self.max_waiting,
+            'open_streams': self.open_streams,
+            **counts
+        }
+
+
+bridge = StreamBridge(STREAM_WORKERS, MAX_WAITING, STREAM_BUFFER, SEND_TIMEOUT)
+
+
+# ==============================================================================
+# Routes
+# ==============================================================================
+
+async def read_message(request: Request):
+    """Chat message from the JSON body, or None"""
+    try:
+        data = await request.json()
+    except ValueError:
+        return None
+    return data.get('message') if isinstance(data, dict) else None
+
+
+def agent_chunks(message: str) -> Callable[[], Iterable[str]]:
+    """Blocking chunk iterator for the sample user's chat (same routing as app.py)"""
+    customer_id = routing.SAMPLE_USER['customer_id']
+    customer_type = routing.SAMPLE_USER['customer_type']
+    return lambda: routing.invoke_agent_with_context(message, customer_id, customer_type)
+
+
+def busy_response() -> JSONResponse:
+    return JSONResponse({'error': 'Too many concurrent chats, retry shortly'}, status_code=503,
+                        headers={'Retry-After': '1'})
+
+
+async def health(request: Request) -> JSONResponse:
+    """Health check endpoint"""
+    return JSONResponse(routing.health_payload())
+
+
+async def get_user(request: Request) -> JSONResponse:
+    """Get current user info (simulated login)"""
+    return JSONResponse(routing.SAMPLE_USER)
+
+
+async def chat(request: Request):
+    """Chat endpoint - invokes Bedrock agent with streaming response"""
+    message = await read_message(request)
+    if not message:
+        return JSONResponse({'error': 'Message is required'}, status_code=400)
+    if not bridge.accepting():
+        return busy_response()
+
+    async def generate():
+        async for chunk in bridge.iterate(agent_chunks(message)):
+            yield f"data: {json.dumps({'chunk': chunk})}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
+async def chat_simple(request: Request) -> JSONResponse:
+    """Simple non-streaming chat endpoint"""
+    message = await read_message(request)
+    if not message:
+        return JSONResponse({'error': 'Message is required'}, status_code=400)
+    if not bridge.accepting():
+        return busy_response()
+
+    chunks = [chunk async for chunk in bridge.iterate(agent_chunks(message))]
+    return JSONResponse({
+        'response': ''.join(chunks),
+        'customer_id': routing.SAMPLE_USER['customer_id'],
+        'timestamp': time.time()
+    })
+
+
+async def get_config(request: Request) -> JSONResponse:
+    """Get Bedrock configuration"""
+    return JSONResponse(routing.config_payload())
+
+
+async def get_metrics(request: Request) -> JSONResponse:
+    """Routing metrics plus stream bridge counters"""
+    return JSONResponse({**routing.metrics_payload(), 'streams': bridge.stats()})
+
+
+async def get_prometheus_metrics(request: Request) -> Response:
+    """Routing metrics for a Prometheus scrape"""
+    return Response(routing.prometheus_payload(), headers={'Content-Type': routing.PROMETHEUS_CONTENT_TYPE})
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    yield
+    bridge.executor.shutdown(wait=False)
+
+
+app = Starlette(
+    routes=[
+        Route('/api/health', health, methods=['GET']),
+        Route('/api/user', get_user, methods=['GET']),
+        Route('/api/chat', chat, methods=['POST']),
+        Route('/api/chat/simple', chat_simple, methods=['POST']),
+        Route('/api/config', get_config, methods=['GET']),
+        Route('/api/metrics', get_metrics, methods=['GET']),
+        Route('/api/metrics/prometheus', get_prometheus_metrics, methods=['GET']),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print(f"ASGI chat backend on http://localhost:5001 ({STREAM_WORKERS} stream workers, {MAX_WAITING} waiting)")
+    uvicorn.run(app, host='0.0.0.0', port=5001)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Intent classification cache for the chat backend
+
+Keeps Haiku classifications keyed on a normalized form of the message
+(case-folded, punctuation stripped, whitespace collapsed), so "Show my
+projects!" and "show my projects" share one entry. Unlike the archived
+IntentCache (session + MD5 of the raw message) the key does not include the
+session: the intent of a message does not depend on who sends it.
+
+Tiers:
+  1. in-process LRU with TTL
+  2. Redis (optional), shared by every backend process; needs the redis
+     package and a redis_url. Errors are counted and treated as misses.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+
+def normalize_message(message: str) -> str:
+    """Case-fold, strip punctuation and collapse whitespace"""
+    return ' '.join(_PUNCTUATION.sub('', (message or '').casefold()).split())
+
+
+class IntentCache:
+    """LRU of normalized message -> intent, with an optional Redis tier"""
+
+    REDIS_PREFIX = 'intent:v1:'
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 3600,
+        redis_client: Any = None,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            max_entries: In-process entries kept (least recently used evicted)
+            ttl_seconds: Lifetime of an entry in both tiers
+            redis_client: redis.Redis-compatible client, or None for in-process only
+            enabled: False makes every lookup a miss and skips stores
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis_client
+        self.enabled = enabled
+        self._entries: 'OrderedDict[str, Tuple[str, float]]' = OrderedDict()
+        self._counts = {'hits': 0, 'redis_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'redis_errors': 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, settings: Dict[str, Any]) -> 'IntentCache':
+        """Cache from routing.intent_cache settings (redis_url or REDIS_URL enables the Redis tier)"""
+        redis_client = None
+        redis_url = settings.get('redis_url') or os.getenv('REDIS_URL')
+        if redis_url:
+            try:
+                import redis
+                # Short timeouts: a slow Redis must never cost more than the Haiku call it saves
+                redis_client = redis.Redis.from_url(redis_url, socket_timeout=0.05, socket_connect_timeout=0.05)
+            except ImportError:
+                logger.warning("redis package not installed; intent cache is in-process only")
+
+        return cls(
+            max_entries=int(settings.get('max_entries', 2048)),
+            ttl_seconds=float(settings.get('ttl_seconds', 3600)),
+            redis_client=redis_client,
+            enabled=settings.get('enabled', True)
+        )
+
+    def _redis_key(self, key: str) -> str:
+        return self.REDIS_PREFIX + hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def get(self, message: str) -> Optional[str]:
+        """Cached intent for a message, or None"""
+        key = normalize_message(message)
+        if not self.enabled or not key:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(key)
+                self._counts['hits'] += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+
+        if self.redis is not None:
+            try:
+                value = self.redis.get(self._redis_key(key))
+            except Exception as e:
+                logger.warning(f"Intent cache Redis get failed: {e}")
+                self._count('redis_errors')
+                value = None
+            if value is not None:
+                intent = value.decode('utf-8') if isinstance(value, bytes) else str(value)
+                self._store_local(key, intent)
+                self._count('redis_hits')
+                return intent
+
+        self._count('misses')
+        return None
+
+    def put(self, message: str, intent: str) -> None:
+        """Cache a classification in both tiers"""
+        key = normalize_message(message)
+        if not self.enabled or not key:
+            return
+
+        self._store_local(key, intent)
+        self._count('stores')
+        if self.redis is not None:
+            try:
+                self.redis.setex(self._redis_key(key), int(self.ttl_seconds), intent)
+            except Exception as e:
+                logger.warning(f"Intent cache Redis set failed: {e}")
+                self._count('redis_errors')
+
+    def _store_local(self, key: str, intent: str) -> None:
+        with self._lock:
+            self._entries[key] = (intent, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counts['evictions'] += 1
+
+    def clear(self) -> None:
+        """Drop in-process entries (Redis entries expire on their own)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit rate for /api/metrics"""
+        with self._lock:
+            counts = dict(self._counts)
+            size = len(self._entries)
+        lookups = counts['hits'] + counts['redis_hits'] + counts['misses']
+        return {
+            'enabled': self.enabled,
+            'redis': self.redis is not None,
+            'size': size,
+            'max_entries': self.max_entries,
+            **counts,
+            'hit_rate': round((counts['hits'] + counts['redis_hits']) / lookups, 3) if lookups else 0.0
+        }
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Tiered local intent classifier for the chat backend
+
+Answers clear-cut messages locally so only ambiguous ones pay for a Haiku call:
+  1. rules  - anchored patterns for greetings/thanks and explicit requests
+              ("add a note", "reschedule my appointment", "working hours")
+  2. model  - TF-IDF + softmax regression exported to intent_model.json
+              (trained by train_intent_model.py), used when its top
+              probability reaches the confidence threshold
+  3. cache  - earlier fallback answers for the same normalized message
+              (intent_cache.py), when a cache is given
+  4. llm    - the fallback classifier (Haiku) for everything else
+
+When the fallback fails the message gets the default intent under its own
+"failed" tier, so it is never counted as an llm answer.
+
+Pure Python, no extra dependencies; a classification takes microseconds.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+INTENTS = ('scheduling', 'information', 'notes', 'chitchat')
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'intent_model.json')
+
+
+# ==============================================================================
+# Tier 1: rules
+# ==============================================================================
+
+_CHITCHAT = (
+    r'(hi|hello|hey|howdy|yo)( there| again)?'
+    r'|good (morning|afternoon|evening)'
+    r'|(thanks|thank you|thx|ty)( so much| a lot| very much)?( for (your|the) help)?'
+    r'|(that\'?s|thats) (great|perfect|awesome|helpful)( thanks| thank you)?'
+    r'|(bye|goodbye|see you|see ya)( later)?'
+    r'|(ok|okay|cool|great|perfect|awesome|got it)'
+    r'|how are you( doing)?( today)?'
+    r'|hey how\'?s it going'
+)
+
+RULES: List[Tuple[str, re.Pattern]] = [
+    # Whole-message small talk only: "thanks, now book friday" must not match
+    ('chitchat', re.compile(rf'^({_CHITCHAT})$')),
+    ('notes', re.compile(r'\b(add|write|save|leave|create|take|make)( me)? (a |an |another )?note\b')),
+    ('notes', re.compile(r'^(please )?(note that|remember (to|that))\b')),
+    ('notes', re.compile(r'\b(shopping|grocery|to ?do) list\b')),
+    ('notes', re.compile(r'\b(show|list|view|find|read|delete|remove)( me)?( all)?( of)?( my| the)? notes\b')),
+    ('scheduling', re.compile(r'\b(schedule|book|reschedule|cancel|confirm)\b.*\b(appointment|installation|visit|slot)\b')),
+    ('scheduling', re.compile(r'\b(show|list|view)( me)?( all)?( of)?( my)? (projects|appointments)\b')),
+    ('scheduling', re.compile(r'\bwhat projects\b|\bavailable (dates|times|slots)\b|\bopen slots\b')),
+    ('information', re.compile(r'\b(working|business|opening|office) hours\b|\bwhat time do you (open|close)\b')),
+    ('information', re.compile(r'\bwhen are you open\b|\bweather\b')),
+    ('information', re.compile(r'\bstatus of (my |the )?(project|appointment|order)\b')),
+]
+
+
+def rule_intent(text: str) -> Optional[str]:
+    """
+    Intent from the rules, or None when no rule or rules for several intents match
+
+    Args:
+        text: Lower-cased message with punctuation other than apostrophes removed
+    """
+    matched = {intent for intent, pattern in RULES if pattern.search(text)}
+    return matched.pop() if len(matched) == 1 else None
+
+
+# ==============================================================================
+# Tier 2: TF-IDF + softmax regression
+# ==============================================================================
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def prepare(message: str) -> str:
+    """Lower-case, drop punctuation (keeping apostrophes) and collapse whitespace"""
+    return ' '.join(_TOKEN.findall((message or '').lower().replace('-', ' ')))
+
+
+def features(text: str) -> List[str]:
+    """Unigrams and bigrams of a prepared message"""
+    tokens = text.split()
+    return tokens + [f'{a} {b}' for a, b in zip(tokens, tokens[1:])]
+
+
+def vectorize(text: str, idf: Dict[str, float]) -> Dict[str, float]:
+    """L2-normalized TF-IDF vector over the model vocabulary (unknown terms dropped)"""
+    counts = Counter(term for term in features(text) if term in idf)
+    vector = {term: count * idf[term] for term, count in counts.items()}
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {term: value / norm for term, value in vector.items()} if norm else {}
+
+
+def softmax(scores: List[float]) -> List[float]:
+    top = max(scores)
+    exps = [math.exp(score - top) for score in scores]
+    total = sum(exps)
+    return [value / total for value in exps]
+
+
+class IntentModel:
+    """Exported TF-IDF softmax regression: idf per term, weights per term and intent, bias per intent"""
+
+    def __init__(self, model: Dict[str, Any]):
+        self.intents: List[str] = model['intents']
+        self.idf: Dict[str, float] = model['idf']
+        self.weights: Dict[str, List[float]] = model['weights']
+        self.bias: List[float] = model['bias']
+        self.trained_on = model.get('trained_on')
+
+    @classmethod
+    def load(cls, path: str = MODEL_PATH) -> 'IntentModel':
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """Probability per intent for a prepared message"""
+        scores = list(self.bias)
+        for term, value in vectorize(text, self.idf).items():
+            for index, weight in enumerate(self.weights[term]):
+                scores[index] += weight * value
+        return dict(zip(self.intents, softmax(scores)))
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """(most likely intent, its probability)"""
+        probabilities = self.predict_proba(text)
+        intent = max(probabilities, key=probabilities.get)
+        return intent, probabilities[intent]
+
+
+def train(
+    examples: List[Tuple[str, str]],
+    epochs: int = 400,
+    learning_rate: float = 2.0,
+    l2: float = 1e-4
+) -> Dict[str, Any]:
+    """
+    Fit a TF-IDF softmax regression with full-batch gradient descent
+
+    Args:
+        examples: (message, intent) pairs
+        epochs: Gradient descent passes
+        learning_rate: Step size
+        l2: Weight decay
+
+    Returns:
+        Model dictionary for IntentModel / intent_model.json
+    """
+    intents = list(INTENTS)
+    texts = [prepare(message) for message, _ in examples]
+    labels = [intents.index(intent) for _, intent in examples]
+
+    document_frequency = Counter(term for text in texts for term in set(features(text)))
+    total = len(texts)
+    idf = {term: round(math.log((1 + total) / (1 + df)) + 1, 4) for term, df in document_frequency.items()}
+    vectors = [vectorize(text, idf) for text in texts]
+
+    weights = {term: [0.0] * len(intents) for term in idf}
+    bias = [0.0] * len(intents)
+    for _ in range(epochs):
+        weight_gradient = {term: [0.0] * len(intents) for term in idf}
+        bias_gradient = [0.0] * len(intents)
+        for vector, label in zip(vectors, labels):
+            scores = list(bias)
+            for term, value in vector.items():
+                for index, weight in enumerate(weights[term]):
+                    scores[index] += weight * value
+            for index, probability in enumerate(softmax(scores)):
+                error = probability - (1.0 if index == label else 0.0)
+                bias_gradient[index] += error
+                for term, value in vector.items():
+                    weight_gradient[term][index] += error * value
+        for term, gradient in weight_gradient.items():
+            row = weights[term]
+            for index in range(len(intents)):
+                row[index] -= learning_rate * (gradient[index] / total + l2 * row[index])
+        for index in range(len(intents)):
+            bias[index] -= learning_rate * bias_gradient[index] / total
+
+    return {
+        'intents': intents,
+        'idf': idf,
+        'weights': {term: [round(weight, 4) for weight in row] for term, row in weights.items()},
+        'bias': [round(value, 4) for value in bias],
+        'trained_on': total
+    }
+
+
+# ==============================================================================
+# Tiered classifier
+# ==============================================================================
+
+class TieredIntentClassifier:
+    """Rules, then the local model above a confidence threshold, then cached or fresh fallback answers"""
+
+    def __init__(
+        self,
+        fallback: Callable[[str], Optional[str]],
+        model: Optional[IntentModel] = None,
+        threshold: float = 0.8,
+        enabled: bool = True,
+        cache: Any = None,
+        default_intent: str = 'chitchat'
+    ):
+        """
+        Args:
+            fallback: Classifier for messages the local tiers are not sure about (Haiku);
+                returns None when it fails
+            model: Local model; None skips tier 2
+            threshold: Minimum model probability to answer locally
+            enabled: False skips the rules and model tiers
+            cache: IntentCache for fallback answers; None skips tier 3
+            default_intent: Answer when the fallback fails (tier "failed", never cached)
+        """
+        self.fallback = fallback
+        self.model = model
+        self.threshold = threshold
+        self.enabled = enabled
+        self.cache = cache
+        self.default_intent = default_intent
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def classify(self, message: str) -> Tuple[str, str, Optional[float]]:
+        """
+        Returns:
+            (intent, tier that answered: rules/model/cache/llm, or failed; model confidence or None)
+        """
+        intent, tier, confidence = self.classify_local(message)
+        if tier:
+            return intent, tier, confidence
+        return self.classify_fallback(message, confidence)
+
+    def classify_local(self, message: str) -> Tuple[Optional[str], Optional[str], Optional[float]]:
+        """
+        Rules, model and cache tiers only (no LLM call)
+
+        Returns:
+            (intent, tier, confidence) when a tier answered; otherwise
+            (model's best guess or None, None, its probability or None)
+        """
+        guess = confidence = None
+        if self.enabled:
+            text = prepare(message)
+            intent = rule_intent(text)
+            if intent:
+                return self._answer(intent, 'rules', None)
+            if self.model and text:
+                guess, confidence = self.model.predict(text)
+                if confidence >= self.threshold:
+                    return self._answer(guess, 'model', confidence)
+
+        if self.cache is not None:
+            intent = self.cache.get(message)
+            if intent:
+                return self._answer(intent, 'cache', confidence)
+        return guess, None, confidence
+
+    def classify_fallback(self, message: str, confidence: Optional[float] = None) -> Tuple[str, str, Optional[float]]:
+        """Ask the fallback classifier (after classify_local did not answer) and cache its answer"""
+        intent = self.fallback(message)
+        if intent is None:
+            return self._answer(self.default_intent, 'failed', confidence)
+        if self.cache is not None:
+            self.cache.put(message, intent)
+        return self._answer(intent, 'llm', confidence)
+
+    def _answer(self, intent: str, tier: str, confidence: Optional[float]) -> Tuple[str, str, Optional[float]]:
+        with self._lock:
+            self._counts[tier] += 1
+        return intent, tier, confidence
+
+    def stats(self) -> Dict[str, Any]:
+        """Messages answered per tier (plus failed fallbacks) and the share that skipped the LLM"""
+        with self._lock:
+            counts = {tier: self._counts[tier] for tier in ('rules', 'model', 'cache', 'llm', 'failed')}
+        total = sum(counts.values())
+        return {
+            'enabled': self.enabled,
+            'threshold': self.threshold,
+            'by_tier': counts,
+            'local_rate': round((total - counts['llm'] - counts['failed']) / total, 3) if total else 0.0
+        }
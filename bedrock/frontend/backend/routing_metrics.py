@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+In-process routing metrics for the chat backend
+
+Records classifications and agent invocations as they happen and serves
+them from /api/metrics (JSON) and /api/metrics/prometheus (text format):
+
+  - counts per intent, per classification source and per outcome
+  - latency histograms for classification, invocation and time to first chunk
+  - error rates and chunk counts
+  - rolling 1m, 5m and 1h windows, plus totals since start
+
+Histograms use HDR-style log-linear buckets: exact below 32us, then 16
+buckets per power of two, so any percentile is within ~6% of the true
+value in a fixed, small amount of memory. Events land in 10-second slots;
+a window merges the slots it covers, so recording stays a handful of
+counter increments under one short lock and the merging cost is paid by
+readers.
+"""
+
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+WINDOWS = {'1m': 60, '5m': 300, '1h': 3600}
+PERCENTILES = (50, 95, 99)
+
+_SUB_BUCKETS = 16  # per power of two above the linear range
+_LINEAR_LIMIT = 2 * _SUB_BUCKETS
+
+
+def bucket_index(micros: int) -> int:
+    """Histogram bucket for a value in microseconds"""
+    if micros < _LINEAR_LIMIT:
+        return max(micros, 0)
+    shift = micros.bit_length() - 5
+    return shift * _SUB_BUCKETS + (micros >> shift)
+
+
+def bucket_bounds(index: int):
+    """(lowest value, width) of a bucket, in microseconds"""
+    if index < _LINEAR_LIMIT:
+        return index, 1
+    shift = index // _SUB_BUCKETS - 1
+    return (index - shift * _SUB_BUCKETS) << shift, 1 << shift
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram (HDR-style), values recorded in seconds"""
+
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.buckets[bucket_index(int(seconds * 1_000_000))] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """Value at a percentile in seconds (bucket midpoint, capped at the max seen)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * pct // 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                low, width = bucket_bounds(index)
+                return min((low + (width - 1) / 2) / 1_000_000, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, percentiles and max in milliseconds"""
+        result = {'count': self.count, 'mean_ms': round(self.total / self.count * 1000, 2) if self.count else 0.0}
+        for pct in PERCENTILES:
+            result[f'p{pct}_ms'] = round(self.percentile(pct) * 1000, 2)
+        result['max_ms'] = round(self.max * 1000, 2)
+        return result
+
+
+class _Slot:
+    """Everything recorded in one time slot (or merged over a window)"""
+
+    __slots__ = ('classifications', 'classification_errors', 'classification_latency',
+                 'invocations', 'invocation_latency', 'first_chunk_latency', 'chunks')
+
+    def __init__(self):
+        self.classifications: Counter = Counter()  # (intent, source)
+        self.classification_errors = 0
+        self.classification_latency = LatencyHistogram()
+        self.invocations: Counter = Counter()  # (intent, 'success' | 'error')
+        self.invocation_latency = LatencyHistogram()
+        self.first_chunk_latency = LatencyHistogram()
+        self.chunks: Counter = Counter()  # intent
+
+    def merge(self, other: '_Slot') -> None:
+        self.classifications.update(other.classifications)
+        self.classification_errors += other.classification_errors
+        self.classification_latency.merge(other.classification_latency)
+        self.invocations.update(other.invocations)
+        self.invocation_latency.merge(other.invocation_latency)
+        self.first_chunk_latency.merge(other.first_chunk_latency)
+        self.chunks.update(other.chunks)
+
+
+def _by_first(counter: Counter) -> Dict[str, int]:
+    totals: Counter = Counter()
+    for (first, _), count in counter.items():
+        totals[first] += count
+    return dict(totals)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RoutingMetrics:
+    """Registry of routing events with rolling windows"""
+
+    def __init__(
+        self,
+        slot_seconds: float = 10,
+        windows: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            slot_seconds: Granularity of the rolling windows
+            windows: Window name -> length in seconds (default 1m, 5m, 1h)
+            clock: Monotonic time source (seconds)
+        """
+        self.slot_seconds = slot_seconds
+        self.windows = dict(windows or WINDOWS)
+        self.clock = clock
+        self.started = clock()
+        self._horizon = int(max(self.windows.values()) // slot_seconds) + 1
+        self._slots: 'OrderedDict[int, _Slot]' = OrderedDict()
+        self._totals = _Slot()
+        self._lock = threading.Lock()
+
+    def _current(self) -> _Slot:
+        """Slot for now (caller holds the lock); drops slots older than the longest window"""
+        key = int(self.clock() // self.slot_seconds)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = _Slot()
+            while next(iter(self._slots)) <= key - self._horizon:
+                self._slots.popitem(last=False)
+        return slot
+
+    def _record(self, update: Callable[[_Slot], None]) -> None:
+        with self._lock:
+            update(self._current())
+            update(self._totals)
+
+    def record_classification(self, intent: str, source: str, seconds: float) -> None:
+        """A classification from any tier (rules, model, cache, haiku)"""
+        def update(slot: _Slot) -> None:
+            slot.classifications[(intent, source)] += 1
+            slot.classification_latency.record(seconds)
+        self._record(update)
+
+    def record_classification_error(self, seconds: float) -> None:
+        """A failed Haiku classification (routed to the default intent, not counted as a classification)"""
+        def update(slot: _Slot) -> None:
+            slot.classification_errors += 1
+        self._record(update)
+
+    def record_invocation(
+        self,
+        intent: str,
+        seconds: float,
+        success: bool,
+        chunks: int = 0,
+        first_chunk_seconds: Optional[float] = None
+    ) -> None:
+        """
+        A finished agent invocation
+
+        Args:
+            intent: Intent routed to
+            seconds: Request start to last chunk (includes classification)
+            success: False when the agent raised
+            chunks: Response chunks streamed
+            first_chunk_seconds: Request start to first chunk, None if no chunk arrived
+        """
+        def update(slot: _Slot) -> None:
+            slot.invocations[(intent, 'success' if success else 'error')] += 1
+            slot.invocation_latency.record(seconds)
+            slot.chunks[intent] += chunks
+            if first_chunk_seconds is not None:
+                slot.first_chunk_latency.record(first_chunk_seconds)
+        self._record(update)
+
+    def window(self, seconds: Optional[float] = None) -> _Slot:
+        """Events of the last `seconds` (whole slots), or since start when None"""
+        merged = _Slot()
+        with self._lock:
+            if seconds is None:
+                merged.merge(self._totals)
+                return merged
+            oldest = int(self.clock() // self.slot_seconds) - int(seconds // self.slot_seconds) + 1
+            for key, slot in self._slots.items():
+                if key >= oldest:
+                    merged.merge(slot)
+        return merged
+
+    @staticmethod
+    def describe(slot: _Slot) -> Dict[str, Any]:
+        """JSON summary of a window"""
+        classified = sum(slot.classifications.values())
+        attempted = classified + slot.classification_errors
+        invoked = sum(slot.invocations.values())
+        failed = sum(count for (_, status), count in slot.invocations.items() if status == 'error')
+        by_source: Counter = Counter()
+        for (_, source), count in slot.classifications.items():
+            by_source[source] += count
+        return {
+            'classifications': {
+                'count': classified,
+                'by_intent': _by_first(slot.classifications),
+                'by_source': dict(by_source),
+                'errors': slot.classification_errors,
+                'error_rate': round(slot.classification_errors / attempted, 4) if attempted else 0.0,
+                'latency': slot.classification_latency.summary()
+            },
+            'invocations': {
+                'count': invoked,
+                'by_intent': _by_first(slot.invocations),
+                'errors': failed,
+                'error_rate': round(failed / invoked, 4) if invoked else 0.0,
+                'latency': slot.invocation_latency.summary(),
+                'time_to_first_chunk': slot.first_chunk_latency.summary(),
+                'chunks': sum(slot.chunks.values()),
+                'avg_chunks': round(sum(slot.chunks.values()) / invoked, 2) if invoked else 0.0
+            }
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        /api/metrics view: last-hour headline numbers (the fields the
+        dashboard already reads), then every window and totals since start
+        """
+        windows = {name: self.describe(self.window(seconds)) for name, seconds in self.windows.items()}
+        last_hour = windows.get('1h') or self.describe(self.window(max(self.windows.values())))
+        return {
+            'total_requests': last_hour['invocations']['count'],
+            'intents': last_hour['classifications']['by_intent'],
+            'avg_classification_time_ms': last_hour['classifications']['latency']['mean_ms'],
+            'avg_invocation_time_ms': last_hour['invocations']['latency']['mean_ms'],
+            'error_rate': last_hour['invocations']['error_rate'],
+            'windows': windows,
+            'since_start': self.describe(self.window()),
+            'uptime_seconds': round(self.clock() - self.started, 1)
+        }
+
+    def prometheus(self, prefix: str = 'bedrock_routing', quantile_window: str = '5m') -> str:
+        """
+        Prometheus text exposition (format 0.0.4)
+
+        Counters are totals since start; latencies are summaries whose
+        quantiles cover the quantile_window and whose _sum/_count are totals.
+        """
+        totals = self.window()
+        recent = self.window(self.windows.get(quantile_window, 300))
+        lines: List[str] = []
+
+        def counter(name: str, help_text: str, samples: Iterable) -> None:
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for labels, value in samples:
+                rendered = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f'{prefix}_{name}{{{rendered}}} {value}' if rendered else f'{prefix}_{name} {value}')
+
+        def summary(name: str, help_text: str, total: LatencyHistogram, window: LatencyHistogram) -> None:
+            lines.append(f'# HELP {prefix}_{name} {help_text} ({quantile_window} quantiles)')
+            lines.append(f'# TYPE {prefix}_{name} summary')
+            for pct in PERCENTILES:
+                lines.append(f'{prefix}_{name}{{quantile="{pct / 100}"}} {window.percentile(pct):.6f}')
+            lines.append(f'{prefix}_{name}_sum {total.total:.6f}')
+            lines.append(f'{prefix}_{name}_count {total.count}')
+
+        counter('classifications_total', 'Messages classified, by intent and source',
+                (({'intent': intent, 'source': source}, count)
+                 for (intent, source), count in sorted(totals.classifications.items())))
+        counter('classification_errors_total', 'Failed Haiku classifications',
+                [({}, totals.classification_errors)])
+        counter('invocations_total', 'Agent invocations, by intent and status',
+                (({'intent': intent, 'status': status}, count)
+                 for (intent, status), count in sorted(totals.invocations.items())))
+        counter('chunks_total', 'Response chunks streamed, by intent',
+                (({'intent': intent}, count) for intent, count in sorted(totals.chunks.items())))
+        summary('classification_seconds', 'Intent classification time',
+                totals.classification_latency, recent.classification_latency)
+        summary('invocation_seconds', 'Request start to last chunk',
+                totals.invocation_latency, recent.invocation_latency)
+        summary('first_chunk_seconds', 'Request start to first chunk',
+                totals.first_chunk_latency, recent.first_chunk_latency)
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Speculative agent invocation for the chat backend
+
+When a message needs a Haiku classification, the agent the message most
+likely goes to is invoked at the same time, so its response is already
+streaming when the classification returns:
+
+  - guess: the local model's best intent when its probability reaches
+    min_confidence, otherwise the customer's previous intent
+  - hit:   classification agrees; the buffered stream is handed to the caller
+  - miss:  the speculative stream is cancelled and discarded, and the
+           classified agent is invoked as usual
+
+A discarded invocation still ran its agent, so speculation is limited to
+agents whose actions have no side effects (information and chitchat by
+default). Scheduling and notes agents can book, cancel and write notes.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_CHUNK, _ERROR, _DONE = 'chunk', 'error', 'done'
+
+
+class SpeculativeStream:
+    """Agent response read on a worker thread and buffered until claimed or cancelled"""
+
+    def __init__(self, intent: str, open_stream: Callable[[], Iterable[str]], executor: Executor):
+        """
+        Args:
+            intent: Intent whose agent is being invoked
+            open_stream: Starts the agent and returns its chunk iterator
+            executor: Runs the reader
+        """
+        self.intent = intent
+        self.started = time.monotonic()
+        self.chunks = 0
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._cancelled = threading.Event()
+        self._future = executor.submit(self._read, open_stream)
+
+    def _read(self, open_stream: Callable[[], Iterable[str]]) -> None:
+        stream = None
+        try:
+            stream = open_stream()
+            for chunk in stream:
+                if self._cancelled.is_set():
+                    break
+                self.chunks += 1
+                self._queue.put((_CHUNK, chunk))
+        except Exception as e:
+            self._queue.put((_ERROR, e))
+        finally:
+            # Stop reading the agent's event stream once nobody will consume it
+            if self._cancelled.is_set() and hasattr(stream, 'close'):
+                stream.close()
+            self._queue.put((_DONE, None))
+
+    def cancel(self) -> None:
+        """Discard the response; the reader stops at its next chunk"""
+        self._cancelled.set()
+
+    def __iter__(self) -> Iterator[str]:
+        while True:
+            kind, value = self._queue.get()
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                raise value
+            yield value
+
+
+class RecentIntents:
+    """Last classified intent per customer (bounded, least recently used dropped)"""
+
+    def __init__(self, max_customers: int = 10000):
+        self.max_customers = max_customers
+        self._intents: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, customer_id: str) -> Optional[str]:
+        with self._lock:
+            return self._intents.get(customer_id)
+
+    def set(self, customer_id: str, intent: str) -> None:
+        with self._lock:
+            self._intents[customer_id] = intent
+            self._intents.move_to_end(customer_id)
+            while len(self._intents) > self.max_customers:
+                self._intents.popitem(last=False)
+
+
+class Speculator:
+    """Decides when to speculate and keeps hit/waste statistics"""
+
+    def __init__(
+        self,
+        executor: Executor,
+        enabled: bool = False,
+        intents: Iterable[str] = ('information', 'chitchat'),
+        min_confidence: float = 0.5
+    ):
+        """
+        Args:
+            executor: Runs speculative agent readers
+            enabled: False never speculates
+            intents: Intents whose agents may be invoked speculatively
+            min_confidence: Model probability needed to prefer its guess over the previous intent
+        """
+        self.executor = executor
+        self.enabled = enabled
+        self.intents = set(intents)
+        self.min_confidence = min_confidence
+        self.recent = RecentIntents()
+        self._counts = {'started': 0, 'hits': 0, 'misses': 0, 'not_allowed': 0, 'no_guess': 0,
+                        'wasted_chunks': 0, 'saved_ms': 0.0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, settings: Dict[str, Any], executor: Executor) -> 'Speculator':
+        return cls(
+            executor,
+            enabled=settings.get('enabled', False),
+            intents=settings.get('intents', ('information', 'chitchat')),
+            min_confidence=float(settings.get('min_confidence', 0.5))
+        )
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def guess(self, customer_id: str, model_guess: Optional[str], confidence: Optional[float]) -> Optional[str]:
+        """Most likely intent before classification: a confident-enough model guess, else the previous intent"""
+        if model_guess and confidence is not None and confidence >= self.min_confidence:
+            return model_guess
+        return self.recent.get(customer_id) or model_guess
+
+    def start(
+        self,
+        customer_id: str,
+        model_guess: Optional[str],
+        confidence: Optional[float],
+        open_stream: Callable[[str], Iterable[str]]
+    ) -> Optional[SpeculativeStream]:
+        """Invoke the guessed agent in the background, or None when not speculating"""
+        if not self.enabled:
+            return None
+        intent = self.guess(customer_id, model_guess, confidence)
+        if not intent:
+            self._count('no_guess')
+            return None
+        if intent not in self.intents:
+            self._count('not_allowed')
+            return None
+
+        self._count('started')
+        logger.info(f"Speculatively invoking {intent.upper()} agent")
+        return SpeculativeStream(intent, lambda: open_stream(intent), self.executor)
+
+    def resolve(self, speculative: Optional[SpeculativeStream], intent: str) -> Optional[SpeculativeStream]:
+        """
+        Settle a speculation against the classified intent
+
+        Returns:
+            The stream to use on a hit, None on a miss (stream cancelled) or without speculation
+        """
+        if speculative is None:
+            return None
+        if speculative.intent == intent:
+            self._count('hits')
+            self._count('saved_ms', (time.monotonic() - speculative.started) * 1000)
+            return speculative
+
+        speculative.cancel()
+        self._count('misses')
+        self._count('wasted_chunks', speculative.chunks)
+        logger.info(f"Speculation missed: guessed {speculative.intent}, classified {intent}; discarding stream")
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate, wasted invocations and head start gained on hits"""
+        with self._lock:
+            counts = dict(self._counts)
+        settled = counts['hits'] + counts['misses']
+        return {
+            'enabled': self.enabled,
+            'intents': sorted(self.intents),
+            'started': counts['started'],
+            'hits': counts['hits'],
+            'wasted_invocations': counts['misses'],
+            'wasted_chunks': counts['wasted_chunks'],
+            'skipped_no_guess': counts['no_guess'],
+            'skipped_not_allowed': counts['not_allowed'],
+            'hit_rate': round(counts['hits'] / settled, 3) if settled else 0.0,
+            'avg_head_start_ms': round(counts['saved_ms'] / counts['hits'], 1) if counts['hits'] else 0.0
+        }
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Train the local intent model (intent_model.json) used by intent_classifier.py
+
+Labeled messages come from:
+  - intent_examples.jsonl                       (one {"text", "intent"} per line)
+  - tests/LoadTest/config.py                    (*_MESSAGES lists, MULTI_TURN_CONVERSATION)
+  - tests/v2/test_improved_classification.py    (TEST_CASES, read without running the script)
+
+Reports cross-validated accuracy and how many held-out messages the local tiers
+would answer at the threshold, then writes the model.
+
+Usage:
+    python3 train_intent_model.py
+    python3 train_intent_model.py --threshold 0.8 --output /tmp/intent_model.json
+"""
+
+import argparse
+import ast
+import importlib.util
+import json
+import os
+import sys
+from typing import List, Tuple
+
+from intent_classifier import INTENTS, MODEL_PATH, IntentModel, prepare, rule_intent, train
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+TESTS_DIR = os.path.join(BACKEND_DIR, '..', '..', 'tests')
+EXAMPLES_PATH = os.path.join(BACKEND_DIR, 'intent_examples.jsonl')
+
+
+def load_examples_file(path: str) -> List[Tuple[str, str]]:
+    with open(path, 'r') as f:
+        return [(row['text'], row['intent']) for row in map(json.loads, f) if row]
+
+
+def load_loadtest_messages(path: str) -> List[Tuple[str, str]]:
+    spec = importlib.util.spec_from_file_location('loadtest_config', path)
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    examples = [
+        (message, intent)
+        for intent in INTENTS
+        for message in getattr(config, f'{intent.upper()}_MESSAGES', [])
+    ]
+    return examples + list(config.MULTI_TURN_CONVERSATION)
+
+
+def load_v2_test_cases(path: str) -> List[Tuple[str, str]]:
+    """TEST_CASES literal from the v2 classification test (which calls Bedrock when run)"""
+    with open(path, 'r') as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'TEST_CASES' for t in node.targets):
+            groups = ast.literal_eval(node.value)
+            return [(query['text'], query['expected']) for group in groups for query in group['queries']]
+    return []
+
+
+def collect_examples() -> List[Tuple[str, str]]:
+    examples = load_examples_file(EXAMPLES_PATH)
+    examples += load_loadtest_messages(os.path.join(TESTS_DIR, 'LoadTest', 'config.py'))
+    examples += load_v2_test_cases(os.path.join(TESTS_DIR, 'v2', 'test_improved_classification.py'))
+
+    # Same message from several sources counts once; conflicting labels are a data bug
+    labels = {}
+    for message, intent in examples:
+        key = prepare(message)
+        if labels.setdefault(key, (message, intent))[1] != intent:
+            raise ValueError(f"Conflicting labels for '{message}': {labels[key][1]} vs {intent}")
+    return list(labels.values())
+
+
+def cross_validate(examples: List[Tuple[str, str]], threshold: float, folds: int = 5) -> Tuple[float, float, float]:
+    """
+    Returns:
+        (model accuracy, share answered locally, accuracy of the local answers) on held-out messages
+    """
+    correct = local = local_correct = 0
+    for fold in range(folds):
+        held_out = examples[fold::folds]
+        model = IntentModel(train([example for index, example in enumerate(examples) if index % folds != fold]))
+        for message, intent in held_out:
+            text = prepare(message)
+            predicted, confidence = model.predict(text)
+            correct += predicted == intent
+
+            answer = rule_intent(text) or (predicted if confidence >= threshold else None)
+            if answer:
+                local += 1
+                local_correct += answer == intent
+    total = len(examples)
+    return correct / total, local / total, (local_correct / local if local else 0.0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default=MODEL_PATH)
+    parser.add_argument('--threshold', type=float, default=0.8, help='Model confidence needed to answer locally')
+    parser.add_argument('--skip-eval', action='store_true', help='Skip cross-validation')
+    args = parser.parse_args()
+
+    examples = collect_examples()
+    counts = {intent: sum(1 for _, label in examples if label == intent) for intent in INTENTS}
+    print(f"Training on {len(examples)} messages: {counts}")
+
+    if not args.skip_eval:
+        accuracy, local_rate, local_accuracy = cross_validate(examples, args.threshold)
+        print(f"5-fold cross-validation: model accuracy {accuracy:.1%}; "
+              f"answered locally at {args.threshold}: {local_rate:.1%} with {local_accuracy:.1%} accuracy")
+
+    model = train(examples)
+    with open(args.output, 'w') as f:
+        json.dump(model, f, separators=(',', ':'), sort_keys=True)
+    print(f"Wrote {args.output} ({len(model['idf'])} terms, {os.path.getsize(args.output) / 1024:.1f} KiB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
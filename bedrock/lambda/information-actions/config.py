@@ -2,6 +2,7 @@
 Configuration for Information Actions Lambda
 Handles environment variables and API configuration
 """
+import json
 import os
 from typing import Dict
 
@@ -20,6 +21,23 @@ CUSTOMER_SCHEDULER_BASE_API_URL = os.getenv(
 # Weather API (external)
 WEATHER_API_URL = os.getenv("WEATHER_API_URL", "https://wttr.in")
 
+# Notes table (notes Lambda's DYNAMODB_TABLE), read by get_project_overview when
+# the List Notes API is unavailable
+NOTES_TABLE = os.getenv("NOTES_TABLE", "scheduling-agent-notes-dev")
+
+# Number of most recent notes included in get_project_overview
+OVERVIEW_NOTES = int(os.getenv("OVERVIEW_NOTES", "3"))
+
+# Response projection (see lib/projection.py): default "fields" per agent name
+# and action as JSON, e.g. {"scheduling-agent-information": {"get-project-details": "status,dates"}}
+DEFAULT_PROJECTIONS = json.loads(os.getenv("DEFAULT_PROJECTIONS", "{}"))
+
+# Drop null values from projectable results unless the request sets compact
+COMPACT_RESPONSES = os.getenv("COMPACT_RESPONSES", "false").lower() == "true"
+
+# Run async action variants (overlapping upstream calls) where a handler has one
+USE_ASYNC_ACTIONS = os.getenv("USE_ASYNC_ACTIONS", "false").lower() == "true"
+
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
@@ -43,7 +61,9 @@ def get_api_config(client_id: str, env: str = None) -> Dict[str, str]:
     return {
         "dashboard_url": f"{CUSTOMER_SCHEDULER_BASE_API_URL}/dashboard/get/{client_id}",
         "business_hours_url": f"{CUSTOMER_SCHEDULER_BASE_API_URL}/scheduler/client/{client_id}/business-hours",
+        "list_notes_url": f"{CUSTOMER_SCHEDULER_BASE_API_URL}/project-notes/list/{client_id}",
         "weather_url": WEATHER_API_URL,
+        "notes_table": NOTES_TABLE,
         "environment": env,
         "use_mock": USE_MOCK_API
     }
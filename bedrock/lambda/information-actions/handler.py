@@ -1,154 +1,131 @@
 """
 Information Actions Lambda Handler
-Handles 4 information-related actions for Bedrock Agent
+Handles 6 information-related actions for Bedrock Agent
 
 Actions:
 1. get_project_details - Show detailed project information
 2. get_appointment_status - Check appointment status
 3. get_working_hours - Get business hours
 4. get_weather - Get weather forecast
+5. is_open - Check whether the business is open and when it next opens
+6. get_project_overview - Details, status, recent notes and weather in one call
 
-Supports both MOCK and REAL API modes via USE_MOCK_API environment variable
+Supports both MOCK and REAL API modes via USE_MOCK_API environment variable.
+With USE_ASYNC_ACTIONS=true, get_project_overview runs its async variant: the
+notes fetch overlaps the dashboard fetch, and the weather lookup starts as soon
+as the dashboard has the project's address.
 """
 
 import json
 import logging
-import requests
-from typing import Dict, Any, Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Tuple, Callable
+
+# Import shared layer
+from lib.action_router import ActionRouter
+from lib.validators import load_action_schemas
+from lib.http_client import http_get
+from lib.dashboard_cache import dashboard_cache, DashboardEntry
+from lib.weather_cache import weather_cache, WEATHER_TIMEOUT
+from lib.business_hours import business_hours_cache, BusinessHours
+from lib.circuit_breaker import get_circuit_breaker
+from lib.notes_repository import get_notes_repository
+from lib.async_runtime import call, gather
 
 # Import configuration and mock data
 from config import (
     USE_MOCK_API,
+    OVERVIEW_NOTES,
+    DEFAULT_PROJECTIONS,
+    COMPACT_RESPONSES,
+    USE_ASYNC_ACTIONS,
     get_api_config,
     get_auth_headers
 )
-from mock_data import (
-    get_mock_project_details,
-    get_mock_appointment_status,
-    get_mock_business_hours,
-    get_mock_weather
-)
+
+# Mock responses are only loaded in mock mode
+if USE_MOCK_API:
+    from mock_data import (
+        get_mock_project_details,
+        get_mock_appointment_status,
+        get_mock_business_hours,
+        get_mock_weather,
+        get_mock_project_notes
+    )
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Action registry; parameter schemas are compiled once per container
+router = ActionRouter(
+    'information',
+    get_api_config,
+    get_auth_headers,
+    USE_MOCK_API,
+    projections=DEFAULT_PROJECTIONS,
+    compact=COMPACT_RESPONSES,
+    use_async=USE_ASYNC_ACTIONS,
+    schemas=load_action_schemas('information-actions-schema.json', os.path.dirname(os.path.abspath(__file__)))
+)
+
+# Used when no client_id is provided (real API mode)
+DEFAULT_BUSINESS_HOURS = {
+    "workHours": [
+        {"day": "Monday", "open": "08:00", "close": "18:00"},
+        {"day": "Tuesday", "open": "08:00", "close": "18:00"},
+        {"day": "Wednesday", "open": "08:00", "close": "18:00"},
+        {"day": "Thursday", "open": "08:00", "close": "18:00"},
+        {"day": "Friday", "open": "08:00", "close": "18:00"},
+        {"day": "Saturday", "open": "09:00", "close": "16:00"},
+        {"day": "Sunday", "open": "Closed", "close": "Closed"}
+    ],
+    "timezone": "America/New_York"
+}
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
-def extract_parameters(event: Dict) -> Dict[str, Any]:
+def fetch_dashboard(params: Dict, config: Dict, auth_headers: Dict) -> DashboardEntry:
     """
-    Extract parameters from Bedrock Agent event
-    Handles both actionGroup and requestBody formats
+    Fetch the Dashboard API payload for a customer through the shared cache
     """
-    try:
-        # Bedrock Agent passes parameters in different ways
-        if 'parameters' in event and event['parameters']:
-            params = {p['name']: p['value'] for p in event['parameters']}
-        elif 'requestBody' in event:
-            content = event['requestBody'].get('content', {})
-            app_json = content.get('application/json', {})
-
-            # Check if properties array format (from action groups)
-            if isinstance(app_json, dict) and 'properties' in app_json:
-                params = {p['name']: p['value'] for p in app_json['properties']}
-            # Check if JSON string format
-            elif isinstance(app_json, str):
-                params = json.loads(app_json)
-            # Already a dict
-            else:
-                params = app_json
-        else:
-            # Fallback: try to parse body
-            body = event.get('body', '{}')
-            if isinstance(body, str):
-                params = json.loads(body)
-            else:
-                params = body
-
-        logger.info(f"Extracted parameters: {params}")
-        return params
-
-    except Exception as e:
-        logger.error(f"Error extracting parameters: {str(e)}")
-        return {}
-
-def format_success_response(event: Dict, action: str, result: Dict[str, Any]) -> Dict[str, Any]:
-    """Format successful response for Bedrock Agent"""
-    return {
-        'messageVersion': '1.0',
-        'response': {
-            'actionGroup': event.get('actionGroup', 'information'),
-            'apiPath': event.get('apiPath', f'/{action}'),
-            'httpMethod': event.get('httpMethod', 'POST'),
-            'httpStatusCode': 200,
-            'responseBody': {
-                'application/json': {
-                    'body': json.dumps(result)
-                }
-            }
-        }
-    }
+    customer_id = params['customer_id']
 
-def format_error_response(event: Dict, action: str, error_message: str, status_code: int = 500) -> Dict[str, Any]:
-    """Format error response for Bedrock Agent"""
-    return {
-        'messageVersion': '1.0',
-        'response': {
-            'actionGroup': event.get('actionGroup', 'information'),
-            'apiPath': event.get('apiPath', f'/{action}'),
-            'httpMethod': event.get('httpMethod', 'POST'),
-            'httpStatusCode': status_code,
-            'responseBody': {
-                'application/json': {
-                    'body': json.dumps({
-                        'error': error_message,
-                        'action': action
-                    })
-                }
-            }
-        }
-    }
+    def load() -> Dict[str, Any]:
+        url = f"{config['dashboard_url']}/{customer_id}"
+        res = http_get(url, headers=auth_headers)
+        res.raise_for_status()
+        return res.json()
 
-# ============================================================================
-# Action Handlers
-# ============================================================================
+    return dashboard_cache.get_or_load(params.get('client_id', 'default'), customer_id, load)
 
-def handle_get_project_details(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
+def load_project(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
     """
-    Action: get_project_details
-    Returns detailed information about a specific project
+    Fetch the dashboard (mock or cached) and return the record for params['project_id']
     """
-    project_id = params.get('project_id')
-    customer_id = params.get('customer_id')
-
-    if not all([project_id, customer_id]):
-        raise ValueError("Missing required parameters: project_id, customer_id")
+    project_id = params['project_id']
 
     if USE_MOCK_API:
-        logger.info(f"[MOCK] Fetching details for project {project_id}")
-        response = get_mock_project_details(project_id, customer_id)
+        logger.info(f"[MOCK] Fetching dashboard for project {project_id}")
+        dashboard = DashboardEntry(get_mock_project_details(project_id, params.get('customer_id')))
     else:
-        logger.info(f"[REAL] Fetching details for project {project_id}")
-        url = f"{config['dashboard_url']}/{customer_id}"
-        res = requests.get(url, headers=auth_headers, timeout=30)
-        res.raise_for_status()
-        response = res.json()
+        logger.info(f"[REAL] Fetching dashboard for project {project_id}")
+        dashboard = fetch_dashboard(params, config, auth_headers)
 
-    # Extract project data
-    data = response.get("data", [])
-    project = None
-    for item in data:
-        if item.get("project_project_id") == project_id:
-            project = item
-            break
+    project = dashboard.get_project(project_id)
 
     if not project:
         raise ValueError(f"Project {project_id} not found")
 
-    # Format project details
-    project_details = {
+    return project
+
+def format_project_details(project: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a dashboard project record as project details"""
+    return {
         "project_id": project.get("project_project_id"),
         "order_number": project.get("project_project_number"),
         "project_type": project.get("project_type_project_type"),
@@ -188,13 +165,237 @@ def handle_get_project_details(params: Dict, config: Dict, auth_headers: Dict) -
         }
     }
 
+def derive_appointment_status(project_id: str, project: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive appointment status from a dashboard project record (no dedicated API)"""
+    return {
+        "project_id": project_id,
+        "status": project.get("status_info_status"),
+        "scheduled_date": project.get("project_date_scheduled_date"),
+        "scheduled_time": project.get("convertedProjectStartScheduledDate"),
+        "scheduled_end_time": project.get("convertedProjectEndScheduledDate"),
+        "duration": f"{project.get('service_time_duration_value')} {project.get('service_time_duration_type')}",
+        "technician": f"{project.get('user_idata_first_name')} {project.get('user_idata_last_name')}" if project.get('user_idata_first_name') else None,
+        "can_reschedule": project.get("status_info_status") == "Scheduled",
+        "can_cancel": project.get("status_info_status") == "Scheduled"
+    }
+
+def business_hours_loader(params: Dict, config: Dict, auth_headers: Dict) -> Callable[[], Dict[str, Any]]:
+    """Loader for a client's Business Hours API data (mock, default or PF360)"""
+    client_id = params.get('client_id', 'default')
+
+    def load() -> Dict[str, Any]:
+        if USE_MOCK_API:
+            logger.info(f"[MOCK] Fetching business hours for client {client_id}")
+            response = get_mock_business_hours(client_id)
+        elif not params.get('client_id'):
+            # Default business hours if no client_id provided
+            response = {"status": "success", "data": DEFAULT_BUSINESS_HOURS}
+        else:
+            logger.info(f"[REAL] Fetching business hours for client {client_id}")
+            res = http_get(config['business_hours_url'], headers=auth_headers)
+            res.raise_for_status()
+            response = res.json()
+        return response.get("data", {})
+
+    return load
+
+def fetch_business_hours(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
+    """Business Hours API data for a client, cached per client (not compiled)"""
+    return business_hours_cache.get_data(params.get('client_id', 'default'),
+                                         business_hours_loader(params, config, auth_headers))
+
+def fetch_compiled_business_hours(params: Dict, config: Dict, auth_headers: Dict) -> BusinessHours:
+    """
+    A client's compiled business hours, cached per client
+
+    Raises:
+        ValueError: The hours cannot be compiled
+    """
+    _, hours = business_hours_cache.get_or_load(params.get('client_id', 'default'),
+                                                business_hours_loader(params, config, auth_headers))
+    return hours
+
+def format_window(window: Optional[Tuple[datetime, datetime]]) -> Optional[Dict[str, str]]:
+    """Open window as ISO 8601 start/end, or None"""
+    if window is None:
+        return None
+    return {"start": window[0].isoformat(timespec="minutes"), "end": window[1].isoformat(timespec="minutes")}
+
+def format_weather(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract location, current conditions and a 3-day forecast from a wttr.in response"""
+    current = response.get("current_condition", [{}])[0]
+    forecast = response.get("weather", [])
+    area = response.get("nearest_area", [{}])[0]
+
+    return {
+        "location": {
+            "area": area.get("areaName", [{}])[0].get("value"),
+            "region": area.get("region", [{}])[0].get("value"),
+            "country": area.get("country", [{}])[0].get("value")
+        },
+        "current": {
+            "temp_f": current.get("temp_F"),
+            "temp_c": current.get("temp_C"),
+            "condition": current.get("weatherDesc", [{}])[0].get("value"),
+            "humidity": current.get("humidity"),
+            "wind_mph": current.get("windspeedMiles"),
+            "wind_dir": current.get("winddir16Point"),
+            "feels_like_f": current.get("FeelsLikeF"),
+            "uv_index": current.get("uvIndex")
+        },
+        "forecast": [
+            {
+                "date": day.get("date"),
+                "max_temp_f": day.get("maxtempF"),
+                "min_temp_f": day.get("mintempF"),
+                "avg_temp_f": day.get("avgtempF"),
+                "uv_index": day.get("uvIndex"),
+                "sun_hours": day.get("sunHour")
+            }
+            for day in forecast[:3]  # Next 3 days
+        ]
+    }
+
+def fetch_weather(location: str, config: Dict) -> Dict[str, Any]:
+    """
+    Fetch and format weather for a location from wttr.in (or mock data)
+    """
+    if USE_MOCK_API:
+        logger.info(f"[MOCK] Fetching weather for {location}")
+        response = get_mock_weather(location)
+    else:
+        logger.info(f"[REAL] Fetching weather for {location}")
+        # Weather API doesn't need authentication. Short timeout, no retries:
+        # the cache serves stale data if wttr.in is slow
+        url = f"{config['weather_url']}/{location}?format=j1"
+        res = http_get(url, read_timeout=WEATHER_TIMEOUT, retries=0)
+        res.raise_for_status()
+        response = res.json()
+
+    return format_weather(response)
+
+def fetch_recent_notes(project_id: str, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
+    """
+    Fetch a project's notes and keep the latest few
+
+    Reads the List Notes API (or mock data) and, like list_notes in the notes
+    Lambda, falls back to the notes table when the API fails or its circuit is open
+    """
+    if USE_MOCK_API:
+        logger.info(f"[MOCK] Listing notes for project {project_id}")
+        response = get_mock_project_notes(project_id)
+    else:
+        logger.info(f"[REAL] Listing notes for project {project_id}")
+
+        def fetch_notes() -> Dict[str, Any]:
+            res = http_get(f"{config['list_notes_url']}?project_id={project_id}", headers=auth_headers)
+            res.raise_for_status()
+            return res.json()
+
+        def read_locally(error: Exception) -> Dict[str, Any]:
+            # Newest first, so one short page is enough; a DynamoDB failure marks notes unavailable
+            logger.warning(f"List notes API not available, using DynamoDB: {str(error)}")
+            notes, _ = get_notes_repository(config['notes_table']).list(project_id, limit=OVERVIEW_NOTES)
+            return {"data": {"notes": notes, "total_count": None}}
+
+        response = get_circuit_breaker('pf360-list-notes').call(fetch_notes, read_locally)
+
+    data = response.get("data", {})
+    notes = sorted(data.get("notes", []), key=lambda note: note.get("created_at") or "", reverse=True)
+    return {
+        "total_count": data.get("total_count", len(notes)),
+        "recent": [
+            {"created_at": note.get("created_at"), "author": note.get("author"), "note_text": note.get("note_text")}
+            for note in notes[:OVERVIEW_NOTES]
+        ]
+    }
+
+def fetch_project_weather(project: Dict[str, Any], config: Dict) -> Optional[Dict[str, Any]]:
+    """
+    Current conditions (and the scheduled day's forecast) at a project's installation address
+    """
+    city, state = project.get("installation_address_city"), project.get("installation_address_state")
+    location = f"{city}, {state}" if city and state else project.get("installation_address_zipcode")
+    if not location:
+        return None
+
+    entry, cache_status = weather_cache.get_or_load(location, lambda query: fetch_weather(query, config))
+    scheduled = project.get("project_date_scheduled_date")
+
+    return {
+        "location": location,
+        "current": {key: entry.payload["current"].get(key) for key in ("temp_f", "condition")},
+        "scheduled_day": next((day for day in entry.payload.get("forecast", []) if day.get("date") == scheduled), None),
+        "stale": cache_status.startswith("stale")
+    }
+
+def build_overview(project_id: str, project: Dict[str, Any], notes: Any, weather: Any) -> Dict[str, Any]:
+    """
+    Combine project details, status, notes and weather into the overview payload
+
+    notes/weather may be exceptions from the concurrent fetches; those parts are
+    returned as null and listed in "unavailable" instead of failing the action
+    """
+    unavailable = []
+    for name, value in (("notes", notes), ("weather", weather)):
+        if isinstance(value, Exception):
+            logger.warning(f"Overview {name} unavailable for project {project_id}: {str(value)}")
+            unavailable.append(name)
+
+    status = derive_appointment_status(project_id, project)
+    technician = status["technician"]
+
+    return {
+        "action": "get_project_overview",
+        "project_id": project_id,
+        "project": {
+            "order_number": project.get("project_project_number"),
+            "project_type": project.get("project_type_project_type"),
+            "category": project.get("project_category_category"),
+            "store": project.get("project_store_store_number"),
+            "address": project.get("installation_address_full_address")
+        },
+        "appointment": {
+            "status": status["status"],
+            "scheduled_date": status["scheduled_date"],
+            "scheduled_time": status["scheduled_time"],
+            "scheduled_end_time": status["scheduled_end_time"],
+            "technician": technician,
+            "can_reschedule": status["can_reschedule"],
+            "can_cancel": status["can_cancel"]
+        },
+        "notes": None if "notes" in unavailable else notes,
+        "weather": None if "weather" in unavailable else weather,
+        "unavailable": unavailable,
+        "mock_mode": USE_MOCK_API
+    }
+
+# ============================================================================
+# Action Handlers
+# ============================================================================
+
+@router.action('get-project-details', projection='project_details')
+def handle_get_project_details(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
+    """
+    Action: get_project_details
+    Returns detailed information about a specific project
+    """
+    project_id = params.get('project_id')
+    customer_id = params.get('customer_id')
+
+    if not all([project_id, customer_id]):
+        raise ValueError("Missing required parameters: project_id, customer_id")
+
+    project = load_project(params, config, auth_headers)
+
     return {
         "action": "get_project_details",
         "project_id": project_id,
-        "project_details": project_details,
+        "project_details": format_project_details(project),
         "mock_mode": USE_MOCK_API
     }
 
+@router.action('get-appointment-status', projection='appointment_status')
 def handle_get_appointment_status(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
     """
     Action: get_appointment_status
@@ -216,37 +417,12 @@ def handle_get_appointment_status(params: Dict, config: Dict, auth_headers: Dict
         if not customer_id:
             raise ValueError("Missing required parameter: customer_id (needed for real API)")
 
-        url = f"{config['dashboard_url']}/{customer_id}"
-        res = requests.get(url, headers=auth_headers, timeout=30)
-        res.raise_for_status()
-        dashboard_response = res.json()
-
-        # Find the project and extract status
-        project = None
-        for item in dashboard_response.get("data", []):
-            if item.get("project_project_id") == project_id:
-                project = item
-                break
-
-        if not project:
-            raise ValueError(f"Project {project_id} not found")
-
-        # Derive status from project data
-        status_info = {
-            "project_id": project_id,
-            "status": project.get("status_info_status"),
-            "scheduled_date": project.get("project_date_scheduled_date"),
-            "scheduled_time": project.get("convertedProjectStartScheduledDate"),
-            "scheduled_end_time": project.get("convertedProjectEndScheduledDate"),
-            "duration": f"{project.get('service_time_duration_value')} {project.get('service_time_duration_type')}",
-            "technician": f"{project.get('user_idata_first_name')} {project.get('user_idata_last_name')}" if project.get('user_idata_first_name') else None,
-            "can_reschedule": project.get("status_info_status") == "Scheduled",
-            "can_cancel": project.get("status_info_status") == "Scheduled"
-        }
+        # Find the project and derive status from project data
+        project = load_project(params, config, auth_headers)
 
         response = {
             "status": "success",
-            "data": status_info
+            "data": derive_appointment_status(project_id, project)
         }
 
     data = response.get("data", {})
@@ -257,6 +433,7 @@ def handle_get_appointment_status(params: Dict, config: Dict, auth_headers: Dict
         "mock_mode": USE_MOCK_API
     }
 
+@router.action('get-working-hours', projection='business_hours')
 def handle_get_working_hours(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
     """
     Action: get_working_hours
@@ -264,36 +441,8 @@ def handle_get_working_hours(params: Dict, config: Dict, auth_headers: Dict) ->
     Note: client_id is optional, will use default business hours if not provided
     """
     client_id = params.get('client_id', 'default')
+    data = fetch_business_hours(params, config, auth_headers)
 
-    if USE_MOCK_API:
-        logger.info(f"[MOCK] Fetching business hours for client {client_id}")
-        response = get_mock_business_hours(client_id)
-    else:
-        logger.info(f"[REAL] Fetching business hours for client {client_id}")
-        if not params.get('client_id'):
-            # Return default business hours if no client_id provided
-            response = {
-                "status": "success",
-                "data": {
-                    "workHours": [
-                        {"day": "Monday", "open": "08:00", "close": "18:00"},
-                        {"day": "Tuesday", "open": "08:00", "close": "18:00"},
-                        {"day": "Wednesday", "open": "08:00", "close": "18:00"},
-                        {"day": "Thursday", "open": "08:00", "close": "18:00"},
-                        {"day": "Friday", "open": "08:00", "close": "18:00"},
-                        {"day": "Saturday", "open": "09:00", "close": "16:00"},
-                        {"day": "Sunday", "open": "Closed", "close": "Closed"}
-                    ],
-                    "timezone": "America/New_York"
-                }
-            }
-        else:
-            url = config['business_hours_url']
-            res = requests.get(url, headers=auth_headers, timeout=30)
-            res.raise_for_status()
-            response = res.json()
-
-    data = response.get("data", {})
     return {
         "action": "get_working_hours",
         "client_id": client_id,
@@ -302,69 +451,114 @@ def handle_get_working_hours(params: Dict, config: Dict, auth_headers: Dict) ->
         "mock_mode": USE_MOCK_API
     }
 
+@router.action('is-open')
+def handle_is_open(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
+    """
+    Action: is_open
+    Returns whether the business is open at a moment and the next open window
+    Note: Answered from the compiled business hours (see lib/business_hours.py);
+    datetime is optional ISO 8601, naive values are client-local, default now
+    """
+    client_id = params.get('client_id', 'default')
+    at = params.get('datetime')
+
+    try:
+        moment = datetime.fromisoformat(at) if at else None
+    except ValueError:
+        raise ValueError(f"Invalid datetime format: {at}. Expected ISO 8601 (YYYY-MM-DDTHH:MM)")
+
+    hours = fetch_compiled_business_hours(params, config, auth_headers)
+    local = hours.localize(moment)
+    is_open = hours.is_open(local)
+    window = hours.next_open_window(local)
+    # While open, next_open_window returns the current window; look past its end
+    upcoming = hours.next_open_window(window[1]) if is_open else window
+
+    return {
+        "action": "is_open",
+        "client_id": client_id,
+        "checked_at": local.isoformat(timespec="minutes"),
+        "timezone": hours.timezone_name,
+        "is_open": is_open,
+        "current_window": format_window(window) if is_open else None,
+        "next_open_window": format_window(upcoming),
+        "mock_mode": USE_MOCK_API
+    }
+
+@router.action('get-weather', projection='weather')
 def handle_get_weather(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
     """
     Action: get_weather
     Returns weather forecast for project location
-    Note: Uses external wttr.in API (no authentication needed)
+    Note: Uses external wttr.in API (no authentication needed), cached per
+    normalized location (see lib/weather_cache.py)
     """
     location = params.get('location')
 
     if not location:
         raise ValueError("Missing required parameter: location")
 
-    if USE_MOCK_API:
-        logger.info(f"[MOCK] Fetching weather for {location}")
-        response = get_mock_weather(location)
-    else:
-        logger.info(f"[REAL] Fetching weather for {location}")
-        # Weather API doesn't need authentication
-        url = f"{config['weather_url']}/{location}?format=j1"
-        res = requests.get(url, timeout=30)
-        res.raise_for_status()
-        response = res.json()
-
-    # Extract and format weather data
-    current = response.get("current_condition", [{}])[0]
-    forecast = response.get("weather", [])
-    area = response.get("nearest_area", [{}])[0]
-
-    weather_info = {
-        "location": {
-            "area": area.get("areaName", [{}])[0].get("value"),
-            "region": area.get("region", [{}])[0].get("value"),
-            "country": area.get("country", [{}])[0].get("value")
-        },
-        "current": {
-            "temp_f": current.get("temp_F"),
-            "temp_c": current.get("temp_C"),
-            "condition": current.get("weatherDesc", [{}])[0].get("value"),
-            "humidity": current.get("humidity"),
-            "wind_mph": current.get("windspeedMiles"),
-            "wind_dir": current.get("winddir16Point"),
-            "feels_like_f": current.get("FeelsLikeF"),
-            "uv_index": current.get("uvIndex")
-        },
-        "forecast": [
-            {
-                "date": day.get("date"),
-                "max_temp_f": day.get("maxtempF"),
-                "min_temp_f": day.get("mintempF"),
-                "avg_temp_f": day.get("avgtempF"),
-                "uv_index": day.get("uvIndex"),
-                "sun_hours": day.get("sunHour")
-            }
-            for day in forecast[:3]  # Next 3 days
-        ]
-    }
+    entry, cache_status = weather_cache.get_or_load(location, lambda query: fetch_weather(query, config))
 
     return {
         "action": "get_weather",
         "location": location,
-        "weather": weather_info,
+        "weather": entry.payload,
+        "as_of": datetime.fromtimestamp(entry.fetched_at, tz=timezone.utc).isoformat(timespec="seconds"),
+        "stale": cache_status.startswith("stale"),
         "mock_mode": USE_MOCK_API
     }
 
+@router.action('get-project-overview', projection='')
+def handle_get_project_overview(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
+    """
+    Action: get_project_overview
+    Returns project details, appointment status, recent notes and weather in one call
+    Note: The dashboard is fetched once; notes and weather are fetched concurrently
+    """
+    project_id = params.get('project_id')
+    customer_id = params.get('customer_id')
+
+    if not all([project_id, customer_id]):
+        raise ValueError("Missing required parameters: project_id, customer_id")
+
+    project = load_project(params, config, auth_headers)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(fetch_recent_notes, project_id, config, auth_headers),
+            executor.submit(fetch_project_weather, project, config)
+        ]
+    notes, weather = [future.exception() or future.result() for future in futures]
+
+    return build_overview(project_id, project, notes, weather)
+
+@router.async_action('get-project-overview')
+async def handle_get_project_overview_async(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
+    """
+    Action: get_project_overview (async variant)
+    Notes only need the project_id, so they are fetched alongside the dashboard;
+    weather follows the dashboard, which has the installation address
+    """
+    project_id = params.get('project_id')
+    customer_id = params.get('customer_id')
+
+    if not all([project_id, customer_id]):
+        raise ValueError("Missing required parameters: project_id, customer_id")
+
+    async def project_and_weather():
+        project = await call(load_project, params, config, auth_headers)
+        (weather,) = await gather(call(fetch_project_weather, project, config), return_exceptions=True)
+        return project, weather
+
+    # A failed notes fetch is reported in the overview; a failed dashboard fetch fails the action
+    (project, weather), (notes,) = await gather(
+        project_and_weather(),
+        gather(call(fetch_recent_notes, project_id, config, auth_headers), return_exceptions=True)
+    )
+
+    return build_overview(project_id, project, notes, weather)
+
 # ============================================================================
 # Lambda Handler
 # ============================================================================
@@ -374,88 +568,7 @@ def lambda_handler(event, context):
     Main Lambda handler for information actions
     Routes to appropriate action handler based on apiPath
     """
-    logger.info(f"Received event: {json.dumps(event)}")
-
-    try:
-        # Extract action from event
-        action = event.get('apiPath', '').lstrip('/')
-        if not action:
-            # Fallback: check for action in parameters
-            params = extract_parameters(event)
-            action = params.get('action', '').replace('_', '-')
-
-        if not action:
-            return format_error_response(
-                event,
-                'unknown',
-                'No action specified in event',
-                400
-            )
-
-        logger.info(f"Processing action: {action}")
-
-        # Extract parameters
-        params = extract_parameters(event)
-
-        # Get configuration
-        client_id = params.get('client_id', 'default')
-        config = get_api_config(client_id)
-
-        # Get auth headers (if not using mock)
-        auth_headers = {}
-        if not USE_MOCK_API:
-            authorization = params.get('authorization', event.get('authorization', ''))
-            auth_headers = get_auth_headers(authorization, client_id)
-
-        # Route to appropriate handler
-        handlers = {
-            'get-project-details': handle_get_project_details,
-            'get-appointment-status': handle_get_appointment_status,
-            'get-working-hours': handle_get_working_hours,
-            'get-weather': handle_get_weather
-        }
-
-        handler = handlers.get(action)
-        if not handler:
-            return format_error_response(
-                event,
-                action,
-                f'Unknown action: {action}',
-                400
-            )
-
-        # Execute handler
-        result = handler(params, config, auth_headers)
-
-        # Return formatted response
-        return format_success_response(event, action, result)
-
-    except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
-        return format_error_response(
-            event,
-            action if 'action' in locals() else 'unknown',
-            f'Validation error: {str(e)}',
-            400
-        )
-
-    except requests.RequestException as e:
-        logger.error(f"API request failed: {str(e)}")
-        return format_error_response(
-            event,
-            action if 'action' in locals() else 'unknown',
-            f'API request failed: {str(e)}',
-            502
-        )
-
-    except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
-        return format_error_response(
-            event,
-            action if 'action' in locals() else 'unknown',
-            f'Internal error: {str(e)}',
-            500
-        )
+    return router.dispatch(event, context)
 
 # For local testing
 if __name__ == "__main__":
@@ -5,11 +5,17 @@ Based on real API responses from core/tools.py analysis
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 
+# MOCK_DATA_MODE=synthetic: seeded records at configurable volumes (see lib/synthetic_data.py)
+from lib.synthetic_data import SYNTHETIC_ENABLED, synthetic_data
+
 def get_mock_project_details(project_id: str, customer_id: str) -> Dict[str, Any]:
     """
     Mock response for Dashboard API (project details)
     GET /dashboard/get/{client_id}/{customer_id}
     """
+    if SYNTHETIC_ENABLED:
+        return synthetic_data.project_details_response(project_id, customer_id)
+
     # Mock projects database
     projects = {
         "12345": {
@@ -118,6 +124,9 @@ def get_mock_appointment_status(project_id: str) -> Dict[str, Any]:
     Mock response for appointment status
     Derived from project data (no dedicated API found)
     """
+    if SYNTHETIC_ENABLED:
+        return synthetic_data.appointment_status_response(project_id)
+
     # Mock appointment statuses
     statuses = {
         "12345": {
@@ -313,6 +322,39 @@ def get_mock_weather(location: str) -> Dict[str, Any]:
         ]
     }
 
+def get_mock_project_notes(project_id: str) -> Dict[str, Any]:
+    """
+    Mock response for List Notes API (used by get_project_overview)
+    GET /project-notes/list/{client_id}?project_id={project_id}
+    """
+    if SYNTHETIC_ENABLED:
+        return synthetic_data.notes_response(project_id)
+
+    now = datetime.now()
+    notes = [
+        {
+            "note_id": f"note-00{index + 1}",
+            "project_id": project_id,
+            "note_text": text,
+            "author": author,
+            "created_at": (now - timedelta(days=days_ago)).strftime("%Y-%m-%d %H:%M:%S")
+        }
+        for index, (text, author, days_ago) in enumerate([
+            ("Customer requested morning appointment", "Sales Team", 5),
+            ("Need to confirm access to installation area", "Scheduling Team", 3),
+            ("Customer confirmed appointment for next week", "Agent", 1)
+        ])
+    ]
+
+    return {
+        "status": "success",
+        "data": {
+            "project_id": project_id,
+            "notes": notes,
+            "total_count": len(notes)
+        }
+    }
+
 # Example usage for testing
 if __name__ == "__main__":
     import json
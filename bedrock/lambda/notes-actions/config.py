@@ -20,6 +20,11 @@ CUSTOMER_SCHEDULER_BASE_API_URL = os.getenv(
 # DynamoDB Configuration (for storing notes if no API available)
 DYNAMODB_TABLE = os.getenv("DYNAMODB_TABLE", "scheduling-agent-notes-dev")
 
+# Write-behind (opt-in): add_note stores in DynamoDB and returns; the notes-sync
+# Lambda (triggered by the table's stream) posts the note to PF360. Only enable
+# once notes-sync, the table stream and its event source mapping are deployed.
+NOTES_WRITE_BEHIND = os.getenv("NOTES_WRITE_BEHIND", "false").lower() == "true"
+
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
@@ -1,163 +1,114 @@
 """
 Notes Actions Lambda Handler
-Handles 2 notes-related actions for Bedrock Agent
+Handles 3 notes-related actions for Bedrock Agent
 
 Actions:
 1. add_note - Add a note to a project
 2. list_notes - List all notes for a project
+3. search_notes - Ranked full-text search over a project's notes
 
 Supports both MOCK and REAL API modes via USE_MOCK_API environment variable
 Note: list_notes API may not exist in PF360, using DynamoDB as fallback
+With NOTES_WRITE_BEHIND (opt-in), add_note writes to DynamoDB only; lambda/notes-sync
+replicates new notes to PF360 from the table's stream
 """
 
 import json
 import logging
-import requests
+import os
 from datetime import datetime
-from typing import Dict, Any, Optional, List
-import boto3
-from botocore.exceptions import ClientError
+from typing import Dict, Any, Optional, List, Tuple
+
+# Import shared layer
+from lib.action_router import ActionRouter
+from lib.validators import load_action_schemas
+from lib.http_client import http_get, http_post
+from lib.circuit_breaker import get_circuit_breaker
+from lib.notes_repository import (
+    get_notes_repository, paginate, failed_post_status,
+    SYNC_PENDING, SYNC_DONE, SYNC_FAILED, SYNC_UNCONFIRMED
+)
+from lib.notes_index import notes_index_cache
 
 # Import configuration and mock data
 from config import (
     USE_MOCK_API,
+    NOTES_WRITE_BEHIND,
     get_api_config,
     get_auth_headers
 )
-from mock_data import (
-    get_mock_add_note,
-    get_mock_list_notes
-)
+
+# Mock responses are only loaded in mock mode
+if USE_MOCK_API:
+    from mock_data import (
+        get_mock_add_note,
+        get_mock_list_notes
+    )
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# DynamoDB client
-dynamodb = boto3.resource('dynamodb')
-
-# ============================================================================
-# Helper Functions
-# ============================================================================
-
-def extract_parameters(event: Dict) -> Dict[str, Any]:
-    """
-    Extract parameters from Bedrock Agent event
-    Handles both actionGroup and requestBody formats
-    """
-    try:
-        # Bedrock Agent passes parameters in different ways
-        if 'parameters' in event and event['parameters']:
-            params = {p['name']: p['value'] for p in event['parameters']}
-        elif 'requestBody' in event:
-            content = event['requestBody'].get('content', {})
-            app_json = content.get('application/json', {})
-
-            # Check if properties array format (from action groups)
-            if isinstance(app_json, dict) and 'properties' in app_json:
-                properties = app_json['properties']
-                if isinstance(properties, list):
-                    params = {p['name']: p['value'] for p in properties}
-                else:
-                    params = properties
-            # Check if JSON string format
-            elif isinstance(app_json, str):
-                params = json.loads(app_json)
-            # Already a dict
-            else:
-                params = app_json
-        else:
-            # Fallback: try to parse body
-            body = event.get('body', '{}')
-            if isinstance(body, str):
-                params = json.loads(body)
-            else:
-                params = body
-
-        logger.info(f"Extracted parameters: {params}")
-        return params
-
-    except Exception as e:
-        logger.error(f"Error extracting parameters: {str(e)}", exc_info=True)
-        return {}
-
-def format_success_response(event: Dict, action: str, result: Dict[str, Any]) -> Dict[str, Any]:
-    """Format successful response for Bedrock Agent"""
-    return {
-        'messageVersion': '1.0',
-        'response': {
-            'actionGroup': event.get('actionGroup', 'notes'),
-            'apiPath': event.get('apiPath', f'/{action}'),
-            'httpMethod': event.get('httpMethod', 'POST'),
-            'httpStatusCode': 200,
-            'responseBody': {
-                'application/json': {
-                    'body': json.dumps(result)
-                }
-            }
-        }
-    }
+# add_note results when PF360 failed, by the stored note's sync_status
+STORED_LOCALLY_MESSAGES = {
+    SYNC_PENDING: "Note added (stored in DynamoDB)",
+    SYNC_UNCONFIRMED: "Note added (stored in DynamoDB; PF360 did not confirm it)",
+    SYNC_FAILED: "Note stored in DynamoDB only (rejected by PF360)"
+}
 
-def format_error_response(event: Dict, action: str, error_message: str, status_code: int = 500) -> Dict[str, Any]:
-    """Format error response for Bedrock Agent"""
-    return {
-        'messageVersion': '1.0',
-        'response': {
-            'actionGroup': event.get('actionGroup', 'notes'),
-            'apiPath': event.get('apiPath', f'/{action}'),
-            'httpMethod': event.get('httpMethod', 'POST'),
-            'httpStatusCode': status_code,
-            'responseBody': {
-                'application/json': {
-                    'body': json.dumps({
-                        'error': error_message,
-                        'action': action
-                    })
-                }
-            }
-        }
-    }
+# Action registry; parameter schemas are compiled once per container
+router = ActionRouter(
+    'notes',
+    get_api_config,
+    get_auth_headers,
+    USE_MOCK_API,
+    schemas=load_action_schemas('notes-actions-schema.json', os.path.dirname(os.path.abspath(__file__)))
+)
 
 # ============================================================================
 # DynamoDB Helper Functions
 # ============================================================================
 
-def store_note_in_dynamodb(table_name: str, project_id: str, note_text: str, author: str) -> Dict[str, Any]:
-    """Store note in DynamoDB"""
-    table = dynamodb.Table(table_name)
-
-    note = {
-        'project_id': project_id,
-        'timestamp': datetime.now().isoformat(),
-        'note_text': note_text,
-        'author': author,
-        'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-
-    table.put_item(Item=note)
-    return note
-
-def get_notes_from_dynamodb(table_name: str, project_id: str) -> List[Dict[str, Any]]:
-    """Retrieve notes from DynamoDB"""
-    table = dynamodb.Table(table_name)
+def get_notes_from_dynamodb(table_name: str, project_id: str, limit: Any = None, next_token: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Retrieve one page of notes from DynamoDB (newest first)"""
+    from botocore.exceptions import ClientError
 
     try:
-        response = table.query(
-            KeyConditionExpression='project_id = :pid',
-            ExpressionAttributeValues={
-                ':pid': project_id
-            },
-            ScanIndexForward=False  # Sort by timestamp descending
-        )
-        return response.get('Items', [])
+        return get_notes_repository(table_name).list(project_id, limit, next_token)
     except ClientError as e:
         logger.error(f"DynamoDB query failed: {str(e)}")
-        return []
+        return [], None
+
+# ============================================================================
+# PF360 Helper Functions
+# ============================================================================
+
+def fetch_api_notes(project_id: str, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
+    """GET a project's notes from the PF360 list notes API"""
+    url = f"{config['list_notes_url']}?project_id={project_id}"
+    res = http_get(url, headers=auth_headers)
+    res.raise_for_status()
+    return res.json()
+
+def merge_notes(*sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Concatenate note lists, keeping the first copy of each note_id"""
+    seen = set()
+    merged = []
+    for notes in sources:
+        for note in notes:
+            note_id = note.get("note_id")
+            if note_id is not None:
+                if note_id in seen:
+                    continue
+                seen.add(note_id)
+            merged.append(note)
+    return merged
 
 # ============================================================================
 # Action Handlers
 # ============================================================================
 
+@router.action('add-note')
 def handle_add_note(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
     """
     Action: add_note
@@ -173,6 +124,19 @@ def handle_add_note(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str,
     if USE_MOCK_API:
         logger.info(f"[MOCK] Adding note to project {project_id}")
         response = get_mock_add_note(project_id, note_text, author)
+    elif NOTES_WRITE_BEHIND:
+        # Acknowledge once DynamoDB has it; notes-sync posts it to PF360
+        logger.info(f"[REAL] Adding note to project {project_id} (write-behind)")
+        note = get_notes_repository(config['dynamodb_table']).put(
+            project_id, note_text, author,
+            sync_status=SYNC_PENDING,
+            client_id=params.get('client_id', 'default')
+        )
+        response = {
+            "status": "success",
+            "message": "Note added (syncing to PF360)",
+            "data": note
+        }
     else:
         logger.info(f"[REAL] Adding note to project {project_id}")
         url = config['add_note_url']
@@ -184,37 +148,57 @@ def handle_add_note(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str,
             "created_at": datetime.now().strftime("%m-%d-%Y %H:%M:%S")
         }
 
-        try:
-            res = requests.post(url, headers=auth_headers, json=payload, timeout=30)
+        def post_note() -> Dict[str, Any]:
+            res = http_post(url, headers=auth_headers, json=payload)
             res.raise_for_status()
-            response = res.json()
-        except requests.RequestException as e:
-            # If API fails, fallback to DynamoDB
-            logger.warning(f"Add note API failed, using DynamoDB fallback: {str(e)}")
-            note = store_note_in_dynamodb(config['dynamodb_table'], project_id, note_text, author)
-            response = {
+            return res.json()
+
+        def store_locally(error: Exception) -> Dict[str, Any]:
+            # API failing (or circuit open): store in DynamoDB. notes-sync only posts
+            # pending notes, i.e. those PF360 certainly did not get; a read timeout
+            # may have stored it there, so that note is kept as unconfirmed instead
+            sync_status = failed_post_status(error)
+            logger.warning(f"Add note API unavailable, using DynamoDB ({sync_status}): {str(error)}")
+            attributes = {} if sync_status == SYNC_PENDING else {"sync_error": str(error)}
+            note = get_notes_repository(config['dynamodb_table']).put(
+                project_id, note_text, author,
+                sync_status=sync_status,
+                client_id=params.get('client_id', 'default'),
+                **attributes
+            )
+            return {
                 "status": "success",
-                "message": "Note added (stored in DynamoDB)",
+                "message": STORED_LOCALLY_MESSAGES[sync_status],
                 "data": note
             }
 
+        response = get_circuit_breaker('pf360-add-note').call(post_note, store_locally)
+
+    note_data = response.get("data", {})
+    if note_data.get("note_text"):
+        # Searchable right away in this container's cached index
+        notes_index_cache.add(project_id, note_data)
+
     return {
         "action": "add_note",
         "project_id": project_id,
         "note_text": note_text,
         "author": author,
         "message": response.get("message", "Note added successfully"),
-        "note_data": response.get("data", {}),
+        "note_data": note_data,
         "mock_mode": USE_MOCK_API
     }
 
+@router.action('list-notes')
 def handle_list_notes(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
     """
     Action: list_notes
-    List all notes for a project
+    List a project's notes, newest first, one page at a time (limit, next_token)
     Note: PF360 API for listing notes may not exist, using DynamoDB fallback
     """
     project_id = params.get('project_id')
+    limit = params.get('limit')
+    next_token = params.get('next_token')
 
     if not project_id:
         raise ValueError("Missing required parameter: project_id")
@@ -225,36 +209,99 @@ def handle_list_notes(params: Dict, config: Dict, auth_headers: Dict) -> Dict[st
     else:
         logger.info(f"[REAL] Listing notes for project {project_id}")
 
-        # Try PF360 API first
-        try:
-            url = f"{config['list_notes_url']}?project_id={project_id}"
-            res = requests.get(url, headers=auth_headers, timeout=30)
-            res.raise_for_status()
-            response = res.json()
-        except requests.RequestException as e:
-            # If API doesn't exist or fails, use DynamoDB
-            logger.warning(f"List notes API not available, using DynamoDB: {str(e)}")
-            notes = get_notes_from_dynamodb(config['dynamodb_table'], project_id)
-            response = {
+        def fetch_notes() -> Dict[str, Any]:
+            return fetch_api_notes(project_id, config, auth_headers)
+
+        def read_locally(error: Exception) -> Dict[str, Any]:
+            # API missing or failing (or circuit open): one DynamoDB page
+            logger.warning(f"List notes API not available, using DynamoDB: {str(error)}")
+            notes, page_token = get_notes_from_dynamodb(config['dynamodb_table'], project_id, limit, next_token)
+            return {
                 "status": "success",
-                "data": {
-                    "project_id": project_id,
-                    "notes": notes,
-                    "total_count": len(notes),
-                    "source": "dynamodb"
-                }
+                "data": {"notes": notes, "next_token": page_token, "source": "dynamodb"}
             }
 
+        # PF360 first unless its circuit is open
+        response = get_circuit_breaker('pf360-list-notes').call(fetch_notes, read_locally)
+
     data = response.get("data", {})
+    if data.get("source") == "dynamodb":
+        # Already paginated by the query itself; counting the history would mean reading all of it
+        notes, next_token = data["notes"], data["next_token"]
+        total_count = None
+    else:
+        notes, next_token = paginate(data.get("notes", []), limit, next_token)
+        total_count = data.get("total_count", 0)
+
     return {
         "action": "list_notes",
         "project_id": project_id,
-        "notes": data.get("notes", []),
-        "total_count": data.get("total_count", 0),
+        "notes": notes,
+        "count": len(notes),
+        "total_count": total_count,
+        "next_token": next_token,
         "source": data.get("source", "api"),
         "mock_mode": USE_MOCK_API
     }
 
+@router.action('search-notes')
+def handle_search_notes(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
+    """
+    Action: search_notes
+    Rank a project's notes against a free-text query (inverted index, see lib/notes_index.py)
+    """
+    project_id = params.get('project_id')
+    query = params.get('query')
+    limit = params.get('limit')
+
+    if not all([project_id, query]):
+        raise ValueError("Missing required parameters: project_id, query")
+
+    def load_notes() -> List[Dict[str, Any]]:
+        if USE_MOCK_API:
+            return get_mock_list_notes(project_id)["data"]["notes"]
+
+        # Same sources as list_notes: PF360 (unless its circuit is open), plus the notes
+        # stored by add_note (write-behind or fallback) and bulk imports
+        def fetch_notes() -> List[Dict[str, Any]]:
+            return fetch_api_notes(project_id, config, auth_headers).get("data", {}).get("notes", [])
+
+        def api_unavailable(error: Exception) -> Optional[List[Dict[str, Any]]]:
+            logger.warning(f"List notes API not available, indexing DynamoDB notes only: {str(error)}")
+            return None
+
+        api_notes = get_circuit_breaker('pf360-list-notes').call(fetch_notes, api_unavailable)
+        local_notes = get_notes_repository(config['dynamodb_table']).list_all(project_id)
+        if api_notes is None:
+            return local_notes
+        # PF360 lists synced notes under its own note_id, so their local copies would show twice
+        return merge_notes(api_notes, [note for note in local_notes if note.get('sync_status') != SYNC_DONE])
+
+    index, built = notes_index_cache.get_or_build(project_id, load_notes)
+    logger.info(f"Searching {len(index)} notes for project {project_id} (index {'built' if built else 'cached'})")
+
+    results = [
+        {
+            "note_id": note.get("note_id"),
+            "note_text": note.get("note_text"),
+            "author": note.get("author"),
+            "created_at": note.get("created_at"),
+            "score": score,
+            "matched": matched
+        }
+        for note, score, matched in index.search(query, limit)
+    ]
+
+    return {
+        "action": "search_notes",
+        "project_id": project_id,
+        "query": query,
+        "results": results,
+        "count": len(results),
+        "searched_notes": len(index),
+        "mock_mode": USE_MOCK_API
+    }
+
 # ============================================================================
 # Lambda Handler
 # ============================================================================
@@ -264,86 +311,7 @@ def lambda_handler(event, context):
     Main Lambda handler for notes actions
     Routes to appropriate action handler based on apiPath
     """
-    logger.info(f"Received event: {json.dumps(event)}")
-
-    try:
-        # Extract action from event
-        action = event.get('apiPath', '').lstrip('/')
-        if not action:
-            # Fallback: check for action in parameters
-            params = extract_parameters(event)
-            action = params.get('action', '').replace('_', '-')
-
-        if not action:
-            return format_error_response(
-                event,
-                'unknown',
-                'No action specified in event',
-                400
-            )
-
-        logger.info(f"Processing action: {action}")
-
-        # Extract parameters
-        params = extract_parameters(event)
-
-        # Get configuration
-        client_id = params.get('client_id', 'default')
-        config = get_api_config(client_id)
-
-        # Get auth headers (if not using mock)
-        auth_headers = {}
-        if not USE_MOCK_API:
-            authorization = params.get('authorization', event.get('authorization', ''))
-            auth_headers = get_auth_headers(authorization, client_id)
-
-        # Route to appropriate handler
-        handlers = {
-            'add-note': handle_add_note,
-            'list-notes': handle_list_notes
-        }
-
-        handler = handlers.get(action)
-        if not handler:
-            return format_error_response(
-                event,
-                action,
-                f'Unknown action: {action}',
-                400
-            )
-
-        # Execute handler
-        result = handler(params, config, auth_headers)
-
-        # Return formatted response
-        return format_success_response(event, action, result)
-
-    except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
-        return format_error_response(
-            event,
-            action if 'action' in locals() else 'unknown',
-            f'Validation error: {str(e)}',
-            400
-        )
-
-    except requests.RequestException as e:
-        logger.error(f"API request failed: {str(e)}")
-        return format_error_response(
-            event,
-            action if 'action' in locals() else 'unknown',
-            f'API request failed: {str(e)}',
-            502
-        )
-
-    except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
-        return format_error_response(
-            event,
-            action if 'action' in locals() else 'unknown',
-            f'Internal error: {str(e)}',
-            500
-        )
+    return router.dispatch(event, context)
 
 # For local testing
 if __name__ == "__main__":
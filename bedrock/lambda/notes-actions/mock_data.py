@@ -2,12 +2,17 @@
 Mock API responses for Notes Actions
 Based on real API responses from core/tools.py analysis
 """
+import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 import uuid
 
-# In-memory mock notes database
+# MOCK_DATA_MODE=synthetic: seeded records at configurable volumes (see lib/synthetic_data.py)
+from lib.synthetic_data import SYNTHETIC_ENABLED, synthetic_data
+
+# In-memory mock notes database (newest MOCK_NOTES_MAX_PER_PROJECT notes kept per project)
 MOCK_NOTES_DB: Dict[str, List[Dict]] = {}
+MOCK_NOTES_MAX_PER_PROJECT = int(os.getenv("MOCK_NOTES_MAX_PER_PROJECT", "500"))
 
 def get_mock_add_note(project_id: str, note_text: str, author: str = "Agent") -> Dict[str, Any]:
     """
@@ -28,6 +33,7 @@ def get_mock_add_note(project_id: str, note_text: str, author: str = "Agent") ->
     if project_id not in MOCK_NOTES_DB:
         MOCK_NOTES_DB[project_id] = []
     MOCK_NOTES_DB[project_id].append(note)
+    del MOCK_NOTES_DB[project_id][:-MOCK_NOTES_MAX_PER_PROJECT]
 
     return {
         "status": "success",
@@ -43,6 +49,9 @@ def get_mock_list_notes(project_id: str) -> Dict[str, Any]:
     Note: This API endpoint may not exist in PF360.
     Using mock data for development.
     """
+    if SYNTHETIC_ENABLED:
+        return synthetic_data.notes_response(project_id, MOCK_NOTES_DB.get(project_id))
+
     # Get notes from mock database or return sample notes
     notes = MOCK_NOTES_DB.get(project_id, [])
 
@@ -0,0 +1,58 @@
+"""
+Configuration for Notes Sync Lambda
+Handles environment variables and PF360 API configuration
+"""
+import os
+from typing import Dict
+
+# ============================================================================
+# Environment Variables
+# ============================================================================
+
+# Core Configuration
+ENVIRONMENT = os.getenv("ENVIRONMENT", "dev")
+CUSTOMER_SCHEDULER_BASE_API_URL = os.getenv(
+    "CUSTOMER_SCHEDULER_API_URL",
+    "https://api.projectsforce.com"
+)
+
+# Notes table whose stream triggers this Lambda
+DYNAMODB_TABLE = os.getenv("DYNAMODB_TABLE", "scheduling-agent-notes-dev")
+
+# Service credential for PF360 (agent session tokens are not stored with notes)
+PF360_SYNC_TOKEN = os.getenv("PF360_SYNC_TOKEN", "")
+
+# Notes posted concurrently per stream batch, and attempts per note
+SYNC_MAX_WORKERS = int(os.getenv("SYNC_MAX_WORKERS", "4"))
+SYNC_ATTEMPTS = int(os.getenv("SYNC_ATTEMPTS", "2"))
+
+# Logging
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+# ============================================================================
+# API Configuration Builder
+# ============================================================================
+
+def get_add_note_url(client_id: str) -> str:
+    """PF360 add-note endpoint for a client"""
+    return f"{CUSTOMER_SCHEDULER_BASE_API_URL}/project-notes/add/{client_id}"
+
+def get_auth_headers(client_id: str) -> Dict[str, str]:
+    """
+    Generate authentication headers for PF360 API calls
+
+    Args:
+        client_id: Client identifier stored with the note
+
+    Returns:
+        Dict with authorization and client_id headers
+    """
+    authorization = PF360_SYNC_TOKEN
+    if authorization and not authorization.startswith("Bearer "):
+        authorization = f"Bearer {authorization}"
+
+    return {
+        "authorization": authorization,
+        "client_id": client_id,
+        "Content-Type": "application/json"
+    }
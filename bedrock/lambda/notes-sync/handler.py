@@ -0,0 +1,245 @@
+"""
+Notes Sync Lambda Handler
+Replicates notes written to DynamoDB by add_note to PF360 (write-behind)
+
+Triggered by the notes table's DynamoDB Stream (NEW_IMAGE) with
+ReportBatchItemFailures enabled:
+  - only INSERTs whose new image has sync_status "pending" are considered
+  - notes are deduplicated by note_id within a batch, and each note is re-read
+    before posting, so redelivered records for already-synced notes are skipped
+  - pending notes are posted concurrently through the pf360-add-note circuit
+    breaker, then marked synced with a conditional update; a note whose
+    update fails after the post is counted as posted, not marked, and never
+    retried (PF360 does not dedupe by note_id)
+  - a post is only repeated when PF360 certainly did not store the note
+    (connection error, 429/5xx other than 504). A 4xx marks the note
+    "failed"; a read timeout or 504 marks it "unconfirmed", to be checked
+    against PF360 rather than posted again
+  - notes PF360 did not get are returned as batchItemFailures; Lambda retries
+    from the first failure (MaximumRetryAttempts, BisectBatchOnFunctionError)
+    and then sends the record to the mapping's on-failure destination
+"""
+
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Tuple
+
+# Import shared layer
+from lib.http_client import http_post, backoff_delay, write_not_applied
+from lib.circuit_breaker import get_circuit_breaker, CircuitOpenError
+from lib.notes_repository import get_notes_repository, failed_post_status, SYNC_PENDING
+from lib.invocation_log import start_invocation, end_invocation, count
+
+# Import configuration
+from config import (
+    DYNAMODB_TABLE,
+    SYNC_MAX_WORKERS,
+    SYNC_ATTEMPTS,
+    get_add_note_url,
+    get_auth_headers
+)
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# ============================================================================
+# Stream Records
+# ============================================================================
+
+def deserialize_image(image: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a stream image ({"S": ...} attribute values) to a plain item"""
+    from boto3.dynamodb.types import TypeDeserializer
+
+    deserializer = TypeDeserializer()
+    return {name: deserializer.deserialize(value) for name, value in image.items()}
+
+def pending_notes(records: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Pending notes in a stream batch, first record per note_id
+
+    Returns:
+        List of (sequence_number, note) in stream order
+    """
+    notes: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    for record in records:
+        if record.get('eventName') != 'INSERT':
+            continue
+        stream = record.get('dynamodb', {})
+        note = deserialize_image(stream.get('NewImage', {}))
+        if note.get('sync_status') != SYNC_PENDING:
+            continue
+        note_id = note.get('note_id') or f"{note.get('project_id')}#{note.get('timestamp')}"
+        if note_id in notes:
+            count('notes_sync_duplicate')
+            continue
+        notes[note_id] = (stream.get('SequenceNumber'), note)
+    return list(notes.values())
+
+# ============================================================================
+# Sync
+# ============================================================================
+
+def build_payload(note: Dict[str, Any]) -> Dict[str, Any]:
+    """PF360 add-note payload, keeping the note's original creation time"""
+    try:
+        created_at = datetime.strptime(note['created_at'], "%Y-%m-%d %H:%M:%S")
+    except (KeyError, TypeError, ValueError):
+        created_at = datetime.now()
+
+    return {
+        "project_id": note['project_id'],
+        "note": note['note_text'],
+        "author": note.get('author', 'Agent'),
+        "created_at": created_at.strftime("%m-%d-%Y %H:%M:%S")
+    }
+
+def post_to_pf360(note: Dict[str, Any]) -> None:
+    """
+    Post one note, up to SYNC_ATTEMPTS times while PF360 certainly did not store it
+
+    Raises:
+        CircuitOpenError: PF360 circuit is open (no call made)
+        Exception: Last request error (see failed_post_status)
+    """
+    client_id = note.get('client_id', 'default')
+    url = get_add_note_url(client_id)
+    headers = get_auth_headers(client_id)
+    payload = build_payload(note)
+
+    def post_note():
+        res = http_post(url, headers=headers, json=payload)
+        if res.status_code >= 500 or res.status_code == 429:
+            res.raise_for_status()
+        # A 4xx rejects this note, not the endpoint: it must not trip the breaker
+        return res
+
+    def fail(error: Exception) -> None:
+        raise error
+
+    breaker = get_circuit_breaker('pf360-add-note')
+    for attempt in range(SYNC_ATTEMPTS):
+        try:
+            breaker.call(post_note, fail).raise_for_status()
+            return
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            # Read timeouts and 504s may have stored the note, and 4xx never will
+            if attempt == SYNC_ATTEMPTS - 1 or not write_not_applied(e):
+                raise
+            time.sleep(backoff_delay(attempt))
+
+def sync_note(note: Dict[str, Any]) -> bool:
+    """
+    Replicate one note to PF360 unless it is already synced
+
+    Returns:
+        False only if PF360 certainly did not get the note (retry the record);
+        True once it is synced, rejected (marked failed), possibly posted
+        (marked unconfirmed) or marked by an earlier delivery
+    """
+    repository = get_notes_repository(DYNAMODB_TABLE)
+    project_id, timestamp = note['project_id'], note['timestamp']
+
+    try:
+        current = repository.get(project_id, timestamp)
+        if current is None or current.get('sync_status') != SYNC_PENDING:
+            count('notes_sync_skipped')
+            return True
+        post_to_pf360(current)
+    except Exception as e:
+        status = failed_post_status(e)
+        if status == SYNC_PENDING:
+            # Nothing reached PF360 yet, so retrying the record is safe
+            logger.warning(f"Sync of note {note.get('note_id')} for project {project_id} failed: {str(e)}")
+            count('notes_sync_failed')
+            return False
+
+        logger.error(f"Note {note.get('note_id')} for project {project_id} not synced ({status}): {str(e)}")
+        count(f'notes_sync_{status}')
+        try:
+            repository.mark_unsynced(project_id, timestamp, status, str(e))
+        except Exception as mark_error:
+            # Stays pending in DynamoDB; its stream record is not redelivered
+            logger.error(f"Note {note.get('note_id')} for project {project_id} not marked {status}: {str(mark_error)}")
+        return True
+
+    try:
+        repository.mark_synced(project_id, timestamp, datetime.now().isoformat())
+    except Exception as e:
+        # PF360 has the note and does not dedupe by note_id: never retry it.
+        # The item stays pending in DynamoDB; its stream record is not redelivered.
+        logger.error(f"Note {note.get('note_id')} for project {project_id} posted to PF360 "
+                     f"but not marked synced: {str(e)}")
+        count('notes_sync_unmarked')
+        return True
+
+    count('notes_synced')
+    return True
+
+def sync_batch(records: List[Dict[str, Any]]) -> List[str]:
+    """
+    Sync the pending notes of a stream batch
+
+    Returns:
+        Sequence numbers of records to retry
+    """
+    notes = pending_notes(records)
+    if not notes:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(SYNC_MAX_WORKERS, len(notes)))) as executor:
+        results = list(executor.map(lambda entry: sync_note(entry[1]), notes))
+
+    return [sequence for (sequence, _), synced in zip(notes, results) if not synced]
+
+# ============================================================================
+# Lambda Handler
+# ============================================================================
+
+def lambda_handler(event, context):
+    """
+    DynamoDB Streams handler for the notes table
+    Returns partial batch failures so only unsynced notes are retried
+    """
+    records = event.get('Records', [])
+    invocation = start_invocation('notes-sync', event, context)
+    invocation.set(records=len(records))
+
+    try:
+        failures = sync_batch(records)
+    except Exception:
+        # Unexpected error: let Lambda retry (or bisect) the whole batch
+        end_invocation(500)
+        raise
+
+    end_invocation(200)
+    if failures:
+        logger.info(f"{len(failures)} of {len(records)} records will be retried")
+    return {"batchItemFailures": [{"itemIdentifier": sequence} for sequence in failures]}
+
+# For local testing
+if __name__ == "__main__":
+    test_event = {
+        "Records": [{
+            "eventName": "INSERT",
+            "dynamodb": {
+                "SequenceNumber": "100",
+                "NewImage": {
+                    "project_id": {"S": "12345"},
+                    "timestamp": {"S": "2025-10-01T09:00:00"},
+                    "note_id": {"S": "test-note"},
+                    "note_text": {"S": "Test note from notes-sync handler"},
+                    "author": {"S": "Test Agent"},
+                    "client_id": {"S": "09PF05VD"},
+                    "sync_status": {"S": "pending"}
+                }
+            }
+        }]
+    }
+
+    print(json.dumps(lambda_handler(test_event, None), indent=2))
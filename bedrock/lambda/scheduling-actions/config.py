@@ -20,6 +20,9 @@ DYNAMODB_TABLE = os.getenv("DYNAMODB_TABLE", "scheduling-agent-sessions-dev")
 ENABLE_REAL_CONFIRM = os.getenv("ENABLE_REAL_CONFIRM", "false").lower() == "true"
 ENABLE_REAL_CANCEL = os.getenv("ENABLE_REAL_CANCEL", "false").lower() == "true"
 
+# Run async action variants (overlapping upstream calls) where a handler has one
+USE_ASYNC_ACTIONS = os.getenv("USE_ASYNC_ACTIONS", "false").lower() == "true"
+
 def get_api_config(client_id: str, env: str = None) -> Dict[str, str]:
     """
     Generate API configuration based on environment and client
@@ -53,11 +56,3 @@ def get_auth_headers(authorization: str, client_id: str) -> Dict[str, str]:
         "Content-Type": "application/json",
         "charset": "utf-8"
     }
-
-# Mock mode notification
-if USE_MOCK_API:
-    print(f"⚠️ MOCK API MODE ENABLED (USE_MOCK_API=true)")
-    print(f"   To enable real API calls, set USE_MOCK_API=false")
-else:
-    print(f"✅ REAL API MODE ENABLED (USE_MOCK_API=false)")
-    print(f"   API Base URL: {CUSTOMER_SCHEDULER_BASE_API_URL}")
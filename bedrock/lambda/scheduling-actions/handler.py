@@ -9,15 +9,30 @@ Actions:
 4. confirm_appointment - Confirm/schedule an appointment
 5. reschedule_appointment - Reschedule an existing appointment
 6. cancel_appointment - Cancel an appointment
+7. batch - Run several of the above in one invocation
 
-Supports both MOCK and REAL API modes via USE_MOCK_API environment variable
+Supports both MOCK and REAL API modes via USE_MOCK_API environment variable.
+With USE_ASYNC_ACTIONS=true, get_available_dates runs its async variant (slot
+prefetch calls overlap). reschedule_appointment always cancels, then confirms:
+the two writes depend on each other, so they are never overlapped.
 """
 
 import json
 import logging
-import requests
+import os
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
+
+# Import shared layer
+from lib.action_router import ActionRouter
+from lib.validators import load_action_schemas
+from lib.http_client import http_get, http_post
+from lib.dashboard_cache import dashboard_cache, DashboardEntry
+from lib.batch_executor import parse_steps, run_batch
+from lib.slot_prefetch import prefetch_slots, slot_store, DEFAULT_MAX_DATES
+from lib.async_runtime import call, gather, http_get_async
+from lib.idempotency import idempotency_store
+from lib.invocation_log import current_invocation
 
 # Import configuration and mock data
 from config import (
@@ -25,103 +40,105 @@ from config import (
     get_api_config,
     get_auth_headers,
     ENABLE_REAL_CONFIRM,
-    ENABLE_REAL_CANCEL
-)
-from mock_data import (
-    get_mock_projects,
-    get_mock_available_dates,
-    get_mock_time_slots,
-    get_mock_confirm_appointment,
-    get_mock_cancel_appointment,
-    get_mock_business_hours
+    ENABLE_REAL_CANCEL,
+    USE_ASYNC_ACTIONS
 )
 
+# Mock responses are only loaded when some action can run in mock mode
+# (confirm/cancel stay mocked until their ENABLE_REAL_* flag is set)
+if USE_MOCK_API or not (ENABLE_REAL_CONFIRM and ENABLE_REAL_CANCEL):
+    from mock_data import (
+        get_mock_projects,
+        get_mock_available_dates,
+        get_mock_time_slots,
+        get_mock_confirm_appointment,
+        get_mock_cancel_appointment
+    )
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Action registry; parameter schemas are compiled once per container
+router = ActionRouter(
+    'scheduling',
+    get_api_config,
+    get_auth_headers,
+    USE_MOCK_API,
+    schemas=load_action_schemas('scheduling-actions-schema.json', os.path.dirname(os.path.abspath(__file__))),
+    use_async=USE_ASYNC_ACTIONS,
+    idempotency=idempotency_store
+)
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
-def extract_parameters(event: Dict) -> Dict[str, Any]:
+def fetch_dashboard(params: Dict, config: Dict, auth_headers: Dict) -> DashboardEntry:
     """
-    Extract parameters from Bedrock Agent event
-    Handles both actionGroup and requestBody formats
+    Fetch the Dashboard API payload for a customer through the shared cache
     """
-    try:
-        # Bedrock Agent passes parameters in different ways
-        if 'parameters' in event and event['parameters']:
-            params = {p['name']: p['value'] for p in event['parameters']}
-        elif 'requestBody' in event:
-            content = event['requestBody'].get('content', {})
-            app_json = content.get('application/json', {})
-
-            # Check if properties array format (from action groups)
-            if isinstance(app_json, dict) and 'properties' in app_json:
-                params = {p['name']: p['value'] for p in app_json['properties']}
-            # Check if JSON string format
-            elif isinstance(app_json, str):
-                params = json.loads(app_json)
-            # Already a dict
-            else:
-                params = app_json
-        else:
-            # Fallback: try to parse body
-            body = event.get('body', '{}')
-            if isinstance(body, str):
-                params = json.loads(body)
-            else:
-                params = body
+    customer_id = params['customer_id']
 
-        logger.info(f"Extracted parameters: {params}")
-        return params
+    def load() -> Dict[str, Any]:
+        url = f"{config['dashboard_url']}/{customer_id}"
+        res = http_get(url, headers=auth_headers)
+        res.raise_for_status()
+        return res.json()
 
-    except Exception as e:
-        logger.error(f"Error extracting parameters: {str(e)}")
-        return {}
+    return dashboard_cache.get_or_load(params.get('client_id', 'default'), customer_id, load)
 
-def format_success_response(event: Dict, action: str, result: Dict[str, Any]) -> Dict[str, Any]:
-    """Format successful response for Bedrock Agent"""
-    return {
-        'messageVersion': '1.0',
-        'response': {
-            'actionGroup': event.get('actionGroup', 'scheduling'),
-            'apiPath': event.get('apiPath', f'/{action}'),
-            'httpMethod': event.get('httpMethod', 'POST'),
-            'httpStatusCode': 200,
-            'responseBody': {
-                'application/json': {
-                    'body': json.dumps(result)
-                }
-            }
-        }
-    }
+def invalidate_dashboard(params: Dict, project_id: str) -> None:
+    """Drop cached dashboards affected by a write to project_id"""
+    dashboard_cache.invalidate(
+        params.get('client_id', 'default'),
+        customer_id=params.get('customer_id'),
+        project_id=project_id
+    )
 
-def format_error_response(event: Dict, action: str, error_message: str, status_code: int = 500) -> Dict[str, Any]:
-    """Format error response for Bedrock Agent"""
-    return {
-        'messageVersion': '1.0',
-        'response': {
-            'actionGroup': event.get('actionGroup', 'scheduling'),
-            'apiPath': event.get('apiPath', f'/{action}'),
-            'httpMethod': event.get('httpMethod', 'POST'),
-            'httpStatusCode': status_code,
-            'responseBody': {
-                'application/json': {
-                    'body': json.dumps({
-                        'error': error_message,
-                        'action': action
-                    })
-                }
-            }
-        }
-    }
+def time_slots_url(project_id: str, date: str, request_id: str, config: Dict) -> str:
+    """PF360 rescheduler-slots URL for one date of a scheduling session"""
+    return f"{config['scheduler_base_url']}/project/{project_id}/date/{date}/selected/{date}/get-rescheduler-slots?request_id={request_id}"
+
+def fetch_time_slots(project_id: str, date: str, request_id: str, config: Dict, auth_headers: Dict) -> List[Any]:
+    """
+    Fetch available time slots for one date from PF360 (or mock data)
+    """
+    if USE_MOCK_API:
+        logger.info(f"[MOCK] Fetching time slots for project {project_id} on {date}")
+        response = get_mock_time_slots(project_id, date, request_id)
+    else:
+        logger.info(f"[REAL] Fetching time slots for project {project_id} on {date}")
+        res = http_get(time_slots_url(project_id, date, request_id, config), headers=auth_headers)
+        res.raise_for_status()
+        response = res.json()
+
+    return response.get("data", {}).get("slots", [])
+
+async def fetch_time_slots_async(project_id: str, date: str, request_id: str, config: Dict, auth_headers: Dict) -> List[Any]:
+    """
+    Async variant of fetch_time_slots for the async execution path
+    """
+    if USE_MOCK_API:
+        response = get_mock_time_slots(project_id, date, request_id)
+    else:
+        res = await http_get_async(time_slots_url(project_id, date, request_id, config), headers=auth_headers)
+        res.raise_for_status()
+        response = res.json()
+
+    return response.get("data", {}).get("slots", [])
+
+def prefetch_dates(params: Dict, result: Dict[str, Any]) -> List[str]:
+    """Dates whose slots get_available_dates should prefetch (empty unless prefetch_slots=true)"""
+    if str(params.get('prefetch_slots', '')).lower() != 'true' or not result["request_id"]:
+        return []
+    return result["available_dates"][:int(params.get('prefetch_count') or DEFAULT_MAX_DATES)]
 
 # ============================================================================
 # Action Handlers
 # ============================================================================
 
+@router.action('list-projects')
 def handle_list_projects(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
     """
     Action: list_projects
@@ -137,10 +154,7 @@ def handle_list_projects(params: Dict, config: Dict, auth_headers: Dict) -> Dict
         response = get_mock_projects(customer_id)
     else:
         logger.info(f"[REAL] Fetching projects for customer {customer_id}")
-        url = f"{config['dashboard_url']}/{customer_id}"
-        res = requests.get(url, headers=auth_headers, timeout=30)
-        res.raise_for_status()
-        response = res.json()
+        response = fetch_dashboard(params, config, auth_headers).payload
 
     # Extract and simplify project data
     projects = []
@@ -165,6 +179,7 @@ def handle_list_projects(params: Dict, config: Dict, auth_headers: Dict) -> Dict
         "mock_mode": USE_MOCK_API
     }
 
+@router.action('get-available-dates')
 def handle_get_available_dates(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
     """
     Action: get_available_dates
@@ -182,19 +197,66 @@ def handle_get_available_dates(params: Dict, config: Dict, auth_headers: Dict) -
         logger.info(f"[REAL] Fetching available dates for project {project_id}")
         today = datetime.now().strftime("%Y-%m-%d")
         url = f"{config['scheduler_base_url']}/project/{project_id}/date/{today}/selected/{today}/get-rescheduler-slots"
-        res = requests.get(url, headers=auth_headers, timeout=30)
+        res = http_get(url, headers=auth_headers)
         res.raise_for_status()
         response = res.json()
 
     data = response.get("data", {})
-    return {
+    dates = data.get("dates", [])
+    request_id = data.get("request_id")
+
+    result = {
         "action": "get_available_dates",
         "project_id": project_id,
-        "available_dates": data.get("dates", []),
-        "request_id": data.get("request_id"),
+        "available_dates": dates,
+        "request_id": request_id,
         "mock_mode": USE_MOCK_API
     }
 
+    # Optionally fetch slots for the first few dates concurrently and keep them
+    # for follow-up get_time_slots calls in this scheduling session
+    dates_to_prefetch = prefetch_dates(params, result)
+    if dates_to_prefetch:
+        slots_by_date = prefetch_slots(
+            dates_to_prefetch,
+            lambda date: fetch_time_slots(project_id, date, request_id, config, auth_headers)
+        )
+        slot_store.put(project_id, request_id, slots_by_date)
+        logger.info(f"Prefetched slots for {len(slots_by_date)} dates (request_id={request_id})")
+        result["slots_by_date"] = slots_by_date
+
+    return result
+
+@router.async_action('get-available-dates')
+async def handle_get_available_dates_async(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
+    """
+    Action: get_available_dates (async variant)
+    Slot prefetch calls overlap on the event loop instead of a thread pool
+    """
+    result = await call(handle_get_available_dates, {**params, 'prefetch_slots': 'false'}, config, auth_headers)
+    dates_to_prefetch = prefetch_dates(params, result)
+    if not dates_to_prefetch:
+        return result
+
+    project_id, request_id = result["project_id"], result["request_id"]
+    fetched = await gather(
+        *(fetch_time_slots_async(project_id, date, request_id, config, auth_headers) for date in dates_to_prefetch),
+        return_exceptions=True
+    )
+
+    slots_by_date = {}
+    for date, slots in zip(dates_to_prefetch, fetched):
+        if isinstance(slots, Exception):
+            logger.warning(f"Slot prefetch failed for {date}: {str(slots)}")
+        else:
+            slots_by_date[date] = slots
+
+    slot_store.put(project_id, request_id, slots_by_date)
+    logger.info(f"Prefetched slots for {len(slots_by_date)} dates (request_id={request_id})")
+    result["slots_by_date"] = slots_by_date
+    return result
+
+@router.action('get-time-slots')
 def handle_get_time_slots(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
     """
     Action: get_time_slots
@@ -207,25 +269,24 @@ def handle_get_time_slots(params: Dict, config: Dict, auth_headers: Dict) -> Dic
     if not all([project_id, date, request_id]):
         raise ValueError("Missing required parameters: project_id, date, request_id")
 
-    if USE_MOCK_API:
-        logger.info(f"[MOCK] Fetching time slots for project {project_id} on {date}")
-        response = get_mock_time_slots(project_id, date, request_id)
+    # Serve from slots prefetched by get_available_dates when available
+    slots = slot_store.get(project_id, request_id, date)
+    prefetched = slots is not None
+    if prefetched:
+        logger.info(f"Serving prefetched time slots for project {project_id} on {date}")
     else:
-        logger.info(f"[REAL] Fetching time slots for project {project_id} on {date}")
-        url = f"{config['scheduler_base_url']}/project/{project_id}/date/{date}/selected/{date}/get-rescheduler-slots?request_id={request_id}"
-        res = requests.get(url, headers=auth_headers, timeout=30)
-        res.raise_for_status()
-        response = res.json()
+        slots = fetch_time_slots(project_id, date, request_id, config, auth_headers)
 
-    data = response.get("data", {})
     return {
         "action": "get_time_slots",
         "project_id": project_id,
         "date": date,
-        "available_slots": data.get("slots", []),
+        "available_slots": slots,
+        "prefetched": prefetched,
         "mock_mode": USE_MOCK_API
     }
 
+@router.action('confirm-appointment', idempotent=True)
 def handle_confirm_appointment(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
     """
     Action: confirm_appointment
@@ -257,9 +318,10 @@ def handle_confirm_appointment(params: Dict, config: Dict, auth_headers: Dict) -
             "is_chatbot": "true"
         }
 
-        res = requests.post(url, headers=auth_headers, json=payload, timeout=30)
+        res = http_post(url, headers=auth_headers, json=payload)
         res.raise_for_status()
         response = res.json()
+        invalidate_dashboard(params, project_id)
 
     return {
         "action": "confirm_appointment",
@@ -271,6 +333,7 @@ def handle_confirm_appointment(params: Dict, config: Dict, auth_headers: Dict) -
         "mock_mode": use_mock
     }
 
+@router.action('reschedule-appointment', idempotent=True)
 def handle_reschedule_appointment(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
     """
     Action: reschedule_appointment
@@ -289,7 +352,11 @@ def handle_reschedule_appointment(params: Dict, config: Dict, auth_headers: Dict
     # Step 1: Cancel existing appointment
     try:
         cancel_result = handle_cancel_appointment(
-            {'project_id': project_id},
+            {
+                'project_id': project_id,
+                'client_id': params.get('client_id', 'default'),
+                'customer_id': params.get('customer_id')
+            },
             config,
             auth_headers
         )
@@ -303,7 +370,9 @@ def handle_reschedule_appointment(params: Dict, config: Dict, auth_headers: Dict
             'project_id': project_id,
             'date': new_date,
             'time': new_time,
-            'request_id': request_id
+            'request_id': request_id,
+            'client_id': params.get('client_id', 'default'),
+            'customer_id': params.get('customer_id')
         },
         config,
         auth_headers
@@ -320,6 +389,7 @@ def handle_reschedule_appointment(params: Dict, config: Dict, auth_headers: Dict
         "mock_mode": USE_MOCK_API
     }
 
+@router.action('cancel-appointment', idempotent=True)
 def handle_cancel_appointment(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
     """
     Action: cancel_appointment
@@ -339,9 +409,10 @@ def handle_cancel_appointment(params: Dict, config: Dict, auth_headers: Dict) ->
     else:
         logger.info(f"[REAL] Cancelling appointment for project {project_id}")
         url = f"{config['scheduler_base_url']}/project/{project_id}/cancel-reschedule"
-        res = requests.get(url, headers=auth_headers, timeout=30)
+        res = http_get(url, headers=auth_headers, retries=0)  # cancel is a write; never retry
         res.raise_for_status()
         response = res.json()
+        invalidate_dashboard(params, project_id)
 
     return {
         "action": "cancel_appointment",
@@ -351,6 +422,43 @@ def handle_cancel_appointment(params: Dict, config: Dict, auth_headers: Dict) ->
         "mock_mode": use_mock
     }
 
+# Batch steps that may overlap; confirm, cancel and reschedule run strictly in order
+BATCH_READ_ONLY_ACTIONS = ('list-projects', 'get-available-dates', 'get-time-slots')
+
+@router.action('batch')
+def handle_batch(params: Dict, config: Dict, auth_headers: Dict) -> Dict[str, Any]:
+    """
+    Action: batch
+    Executes several actions in one invocation. Later steps can reference
+    earlier results (e.g. "$dates.request_id"); independent reads run
+    concurrently, writes run one at a time in the order given.
+    """
+    if not params.get('steps'):
+        raise ValueError("Missing required parameter: steps")
+
+    steps = parse_steps(params['steps'])
+    if any(step['action'] == 'batch' for step in steps):
+        raise ValueError("Nested batch steps are not supported")
+
+    logger.info(f"Running batch of {len(steps)} steps: {[step['action'] for step in steps]}")
+
+    # Shared parameters (client_id, customer_id, ...) apply to every step
+    base_params = {k: v for k, v in params.items() if k not in ('steps', 'action')}
+    # Write steps replay on a retried batch, as single writes do through the router
+    invocation = current_invocation()
+    results = run_batch(steps, router.handlers, base_params, config, auth_headers,
+                        read_only=BATCH_READ_ONLY_ACTIONS, schemas=router.schemas,
+                        idempotency=router.idempotency, idempotent_actions=router.idempotent_actions,
+                        session_id=invocation.fields.get("session_id") if invocation else None)
+
+    return {
+        "action": "batch",
+        "step_count": len(results),
+        "failed_count": sum(1 for r in results if r['status'] != 'success'),
+        "results": results,
+        "mock_mode": USE_MOCK_API
+    }
+
 # ============================================================================
 # Lambda Handler
 # ============================================================================
@@ -360,93 +468,7 @@ def lambda_handler(event, context):
     Main Lambda handler for scheduling actions
     Routes to appropriate action handler based on apiPath
     """
-    logger.info(f"Received event: {json.dumps(event)}")
-
-    try:
-        # Extract action from event
-        action = event.get('apiPath', '').lstrip('/')
-        if not action:
-            # Fallback: check for action in parameters
-            params = extract_parameters(event)
-            action = params.get('action', '')
-
-        # Normalize action name: convert underscores to hyphens for handler matching
-        action = action.replace('_', '-')
-
-        if not action:
-            return format_error_response(
-                event,
-                'unknown',
-                'No action specified in event',
-                400
-            )
-
-        logger.info(f"Processing action: {action}")
-
-        # Extract parameters
-        params = extract_parameters(event)
-
-        # Get configuration
-        client_id = params.get('client_id', 'default')
-        config = get_api_config(client_id)
-
-        # Get auth headers (if not using mock)
-        auth_headers = {}
-        if not USE_MOCK_API:
-            authorization = params.get('authorization', event.get('authorization', ''))
-            auth_headers = get_auth_headers(authorization, client_id)
-
-        # Route to appropriate handler
-        handlers = {
-            'list-projects': handle_list_projects,
-            'get-available-dates': handle_get_available_dates,
-            'get-time-slots': handle_get_time_slots,
-            'confirm-appointment': handle_confirm_appointment,
-            'reschedule-appointment': handle_reschedule_appointment,
-            'cancel-appointment': handle_cancel_appointment
-        }
-
-        handler = handlers.get(action)
-        if not handler:
-            return format_error_response(
-                event,
-                action,
-                f'Unknown action: {action}',
-                400
-            )
-
-        # Execute handler
-        result = handler(params, config, auth_headers)
-
-        # Return formatted response
-        return format_success_response(event, action, result)
-
-    except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
-        return format_error_response(
-            event,
-            action if 'action' in locals() else 'unknown',
-            f'Validation error: {str(e)}',
-            400
-        )
-
-    except requests.RequestException as e:
-        logger.error(f"API request failed: {str(e)}")
-        return format_error_response(
-            event,
-            action if 'action' in locals() else 'unknown',
-            f'API request failed: {str(e)}',
-            502
-        )
-
-    except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
-        return format_error_response(
-            event,
-            action if 'action' in locals() else 'unknown',
-            f'Internal error: {str(e)}',
-            500
-        )
+    return router.dispatch(event, context)
 
 # For local testing
 if __name__ == "__main__":
@@ -5,11 +5,17 @@ Based on real API responses from core/tools.py analysis
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 
+# MOCK_DATA_MODE=synthetic: seeded records at configurable volumes (see lib/synthetic_data.py)
+from lib.synthetic_data import SYNTHETIC_ENABLED, synthetic_data
+
 def get_mock_projects(customer_id: str) -> Dict[str, Any]:
     """
     Mock response for Dashboard API
     GET /dashboard/get/{client_id}/{customer_id}
     """
+    if SYNTHETIC_ENABLED:
+        return synthetic_data.projects_response(customer_id)
+
     return {
         "status": "success",
         "data": [
@@ -93,6 +99,9 @@ def get_mock_available_dates(project_id: str) -> Dict[str, Any]:
     Mock response for Available Dates API
     GET /scheduler/.../get-rescheduler-slots
     """
+    if SYNTHETIC_ENABLED:
+        return synthetic_data.available_dates_response(project_id)
+
     today = datetime.now()
     dates = [(today + timedelta(days=i)).strftime("%Y-%m-%d")
              for i in range(1, 15)
@@ -111,6 +120,9 @@ def get_mock_time_slots(project_id: str, date: str, request_id: str) -> Dict[str
     Mock response for Time Slots API
     GET /scheduler/.../get-rescheduler-slots?request_id=...
     """
+    if SYNTHETIC_ENABLED:
+        return synthetic_data.time_slots_response(project_id, date, request_id)
+
     # Generate time slots from 8 AM to 5 PM
     slots = [
         "08:00 AM", "09:00 AM", "10:00 AM", "11:00 AM",
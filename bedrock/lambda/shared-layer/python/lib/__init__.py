@@ -0,0 +1,4 @@
+"""
+Shared utilities for Bedrock Agent action Lambdas
+Packaged as the bedrock-agent-shared Lambda layer (see ../../README.md)
+"""
@@ -0,0 +1,242 @@
+"""
+Action routing for Bedrock Agent action group Lambdas
+
+Each action Lambda registers its handlers on an ActionRouter and delegates
+lambda_handler to router.dispatch:
+
+    router = ActionRouter('scheduling', get_api_config, get_auth_headers, USE_MOCK_API,
+                          schemas=load_action_schemas('scheduling-actions-schema.json', HERE))
+
+    @router.action('list-projects')
+    def handle_list_projects(params, config, auth_headers): ...
+
+    def lambda_handler(event, context):
+        return router.dispatch(event, context)
+
+Handlers may also register an async variant with @router.async_action(name);
+routers created with use_async=True run it through async_runtime.run so
+independent upstream calls overlap (see async_runtime). Write actions
+registered with idempotent=True run through the router's IdempotencyStore, so
+a retried confirm/cancel returns the first result instead of writing twice.
+Read actions registered with projection='<result key>' accept the fields and
+compact parameters, with per-agent defaults (see projection).
+
+dispatch extracts parameters once, resolves the action from apiPath (or an
+"action" parameter), applies the pre-compiled parameter schema, builds the API
+config and auth headers, calls the handler and wraps the result in the Bedrock
+response envelope. ValueError maps to 400, requests.RequestException to 502 and
+anything else to 500. Every invocation ends with one structured summary line
+(see invocation_log) carrying total_ms, handler_ms, upstream_ms and
+payload_bytes as EMF metrics; events and parameters are only logged when
+sampled.
+"""
+
+import logging
+from typing import Dict, Any, Callable, Optional, Awaitable
+
+try:
+    from .validators import extract_bedrock_parameters, ParameterSchema
+    from .error_handler import format_bedrock_response
+    from .http_client import request_errors
+    from .invocation_log import start_invocation, end_invocation, timer
+    from .async_runtime import run
+    from .idempotency import IdempotencyStore, IdempotencyConflictError
+    from .projection import Projections, apply_projection, parse_fields, default_fields, is_compact
+except ImportError:  # imported flat (python/lib on sys.path)
+    from validators import extract_bedrock_parameters, ParameterSchema
+    from error_handler import format_bedrock_response
+    from http_client import request_errors
+    from invocation_log import start_invocation, end_invocation, timer
+    from async_runtime import run
+    from idempotency import IdempotencyStore, IdempotencyConflictError
+    from projection import Projections, apply_projection, parse_fields, default_fields, is_compact
+
+logger = logging.getLogger(__name__)
+
+ActionHandler = Callable[[Dict, Dict, Dict], Dict[str, Any]]
+AsyncActionHandler = Callable[[Dict, Dict, Dict], Awaitable[Dict[str, Any]]]
+
+
+def normalize_action(action: str) -> str:
+    """'/get_time_slots' -> 'get-time-slots'"""
+    return (action or "").lstrip("/").replace("_", "-")
+
+
+class ActionRouter:
+    """Decorator-based action registry and Lambda dispatcher"""
+
+    def __init__(
+        self,
+        action_group: str,
+        get_api_config: Callable[[str], Dict[str, Any]],
+        get_auth_headers: Callable[[str, str], Dict[str, str]],
+        use_mock: bool,
+        schemas: Optional[Dict[str, ParameterSchema]] = None,
+        use_async: bool = False,
+        idempotency: Optional[IdempotencyStore] = None,
+        projections: Optional[Projections] = None,
+        compact: bool = False
+    ):
+        """
+        Args:
+            action_group: Default actionGroup for responses
+            get_api_config: Lambda config factory, called with client_id
+            get_auth_headers: PF360 auth header factory (authorization, client_id)
+            use_mock: Skip auth headers in mock mode
+            schemas: Compiled parameter schemas by action (see load_action_schemas)
+            use_async: Prefer handlers registered with async_action
+            idempotency: Store for actions registered with idempotent=True
+            projections: Default fields by agent name and action (see projection)
+            compact: Drop null values from projectable results by default
+        """
+        self.action_group = action_group
+        self.get_api_config = get_api_config
+        self.get_auth_headers = get_auth_headers
+        self.use_mock = use_mock
+        self.schemas = schemas or {}
+        self.use_async = use_async
+        self.handlers: Dict[str, ActionHandler] = {}
+        self.async_handlers: Dict[str, AsyncActionHandler] = {}
+        self.idempotency = idempotency
+        self.idempotent_actions = set()
+        self.projections = projections or {}
+        self.compact = compact
+        self.projectable: Dict[str, str] = {}
+
+    def action(
+        self,
+        name: str,
+        idempotent: bool = False,
+        projection: Optional[str] = None
+    ) -> Callable[[ActionHandler], ActionHandler]:
+        """
+        Register a handler for an action (hyphenated or underscored name)
+
+        idempotent=True marks a write whose identical retries (same session,
+        project and parameters) replay the stored result. projection names the
+        result key that the fields parameter selects from ("" for the top
+        level) and enables the compact parameter.
+        """
+        def register(handler: ActionHandler) -> ActionHandler:
+            self.handlers[normalize_action(name)] = handler
+            if idempotent:
+                self.idempotent_actions.add(normalize_action(name))
+            if projection is not None:
+                self.projectable[normalize_action(name)] = projection
+            return handler
+        return register
+
+    def async_action(self, name: str) -> Callable[[AsyncActionHandler], AsyncActionHandler]:
+        """Register the async variant of an action (used when use_async is set)"""
+        def register(handler: AsyncActionHandler) -> AsyncActionHandler:
+            self.async_handlers[normalize_action(name)] = handler
+            return handler
+        return register
+
+    # ------------------------------------------------------------------------
+    # Responses
+    # ------------------------------------------------------------------------
+
+    def success_response(self, event: Dict, action: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a successful handler result for Bedrock Agent"""
+        return format_bedrock_response(
+            action_group=event.get("actionGroup", self.action_group),
+            api_path=event.get("apiPath", f"/{action}"),
+            http_method=event.get("httpMethod", "POST"),
+            response_body=result,
+            http_status_code=200
+        )
+
+    def error_response(self, event: Dict, action: str, error_message: str, status_code: int = 500) -> Dict[str, Any]:
+        """Format an error for Bedrock Agent"""
+        return format_bedrock_response(
+            action_group=event.get("actionGroup", self.action_group),
+            api_path=event.get("apiPath", f"/{action}"),
+            http_method=event.get("httpMethod", "POST"),
+            response_body={"error": error_message, "action": action},
+            http_status_code=status_code
+        )
+
+    def shape_result(self, event: Dict, action: str, params: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the fields/compact parameters (or the agent's defaults) to a projectable result"""
+        fields = parse_fields(params.get("fields"))
+        if fields is None:
+            fields = default_fields(self.projections, (event.get("agent") or {}).get("name"), action)
+        compact = is_compact(params["compact"]) if params.get("compact") not in (None, "") else self.compact
+        return apply_projection(result, self.projectable[action], fields, compact)
+
+    # ------------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------------
+
+    def dispatch(self, event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+        """Route a Bedrock Agent event to its registered handler"""
+        invocation = start_invocation(self.action_group, event, context)
+        invocation.set(mode="mock" if self.use_mock else "real", execution="async" if self.use_async else "sync")
+        invocation.log_payload("Event", event)
+
+        response = self._dispatch(event, invocation)
+        body = response["response"]["responseBody"]["application/json"]["body"]
+        invocation.add_metric("payload_bytes", len(body.encode("utf-8")), "Bytes")
+        end_invocation(response["response"]["httpStatusCode"])
+        return response
+
+    def _dispatch(self, event: Dict[str, Any], invocation) -> Dict[str, Any]:
+        action = "unknown"
+
+        try:
+            params = extract_bedrock_parameters(event)
+            action = normalize_action(event.get("apiPath") or params.get("action", "")) or "unknown"
+            invocation.set(action=action)
+
+            if action == "unknown":
+                return self.error_response(event, action, "No action specified in event", 400)
+
+            handler = self.handlers.get(action)
+            async_handler = self.async_handlers.get(action) if self.use_async else None
+            if handler is None and async_handler is None:
+                return self.error_response(event, action, f"Unknown action: {action}", 400)
+
+            invocation.log_payload("Parameters", params)
+
+            schema = self.schemas.get(action)
+            if schema is not None:
+                params = schema.apply(params)
+
+            client_id = params.get("client_id", "default")
+            config = self.get_api_config(client_id)
+
+            auth_headers = {}
+            if not self.use_mock:
+                authorization = params.get("authorization", event.get("authorization", ""))
+                auth_headers = self.get_auth_headers(authorization, client_id)
+
+            def execute() -> Dict[str, Any]:
+                with timer("handler"):
+                    if async_handler is not None:
+                        return run(async_handler(params, config, auth_headers))
+                    return handler(params, config, auth_headers)
+
+            if self.idempotency is not None and action in self.idempotent_actions:
+                result = self.idempotency.run(event.get("sessionId"), action, params, execute)
+            else:
+                result = execute()
+            if action in self.projectable:
+                result = self.shape_result(event, action, params, result)
+            return self.success_response(event, action, result)
+
+        except ValueError as e:
+            logger.error("Validation error in %s: %s", action, e)
+            return self.error_response(event, action, f"Validation error: {str(e)}", 400)
+
+        except IdempotencyConflictError as e:
+            logger.warning("Duplicate %s in progress: %s", action, e)
+            return self.error_response(event, action, str(e), 409)
+
+        except request_errors() as e:
+            logger.error("API request failed in %s: %s", action, e)
+            return self.error_response(event, action, f"API request failed: {str(e)}", 502)
+
+        except Exception as e:
+            logger.error("Unexpected error in %s: %s", action, e, exc_info=True)
+            return self.error_response(event, action, f"Internal error: {str(e)}", 500)
@@ -0,0 +1,233 @@
+"""
+PF360 Customer Scheduler API client
+
+Wraps the PF360 endpoints used by the scheduling agent for one session
+(customer, client, auth token, PF360 request_id). Calls go through the pooled
+http_client (keep-alive, timeouts, GET retry with backoff). In mock mode the
+calling Lambda's mock_data module is used instead.
+
+Environment variables:
+    USE_MOCK_API                - Use mock responses (default: true)
+    CUSTOMER_SCHEDULER_API_URL  - PF360 base URL (default: https://api.projectsforce.com)
+    WEATHER_API_URL             - Weather API base URL (default: https://wttr.in)
+    ENABLE_REAL_CONFIRM         - Allow real confirm calls (default: false)
+    ENABLE_REAL_CANCEL          - Allow real cancel calls (default: false)
+    API_TIMEOUT                 - Read timeout in seconds (default: HTTP_READ_TIMEOUT)
+"""
+
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+try:
+    from .http_client import http_get, http_post
+except ImportError:  # imported flat (python/lib on sys.path)
+    from http_client import http_get, http_post
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+BASE_URL = os.getenv("CUSTOMER_SCHEDULER_API_URL", "https://api.projectsforce.com")
+WEATHER_API_URL = os.getenv("WEATHER_API_URL", "https://wttr.in")
+
+
+def _flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() == "true"
+
+# ============================================================================
+# API Client
+# ============================================================================
+
+class PF360APIClient:
+    """PF360 API client bound to one conversation session"""
+
+    def __init__(self, session_data: Dict[str, Any]):
+        """
+        Args:
+            session_data: Session dict with customer_id, client_id, client_name,
+                auth_token and (optionally) request_id
+        """
+        self.session_data = session_data
+        self.customer_id = session_data.get("customer_id")
+        self.client_id = session_data.get("client_id")
+        self.client_name = session_data.get("client_name")
+        self.auth_token = session_data.get("auth_token", "")
+        self.request_id = session_data.get("request_id")
+
+        # Read per instance so tests and warm containers pick up flag changes
+        self.use_mock = _flag("USE_MOCK_API", "true")
+        self.enable_real_confirm = _flag("ENABLE_REAL_CONFIRM")
+        self.enable_real_cancel = _flag("ENABLE_REAL_CANCEL")
+        self.timeout = float(os.getenv("API_TIMEOUT")) if os.getenv("API_TIMEOUT") else None
+
+        self.scheduler_base_url = f"{BASE_URL}/scheduler/client/{self.client_id}"
+
+    # ------------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------------
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        token = self.auth_token or ""
+        if token and not token.startswith("Bearer "):
+            token = f"Bearer {token}"
+        return {
+            "authorization": token,
+            "client_id": self.client_id or "",
+            "Content-Type": "application/json"
+        }
+
+    def _get(self, url: str, retries: Optional[int] = None, headers: Optional[Dict] = None) -> Dict[str, Any]:
+        res = http_get(url, headers=self.headers if headers is None else headers,
+                       read_timeout=self.timeout, retries=retries)
+        res.raise_for_status()
+        return res.json()
+
+    def _post(self, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        res = http_post(url, headers=self.headers, json=payload, read_timeout=self.timeout)
+        res.raise_for_status()
+        return res.json()
+
+    @staticmethod
+    def _mock(name: str):
+        # Lambda-specific mock_data module, only imported in mock mode
+        import mock_data
+        return getattr(mock_data, name, None)
+
+    def _require_request_id(self, request_id: Optional[str]) -> str:
+        request_id = request_id or self.request_id
+        if not request_id:
+            raise ValueError("request_id is required. Please call get_available_dates first.")
+        return request_id
+
+    # ------------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------------
+
+    def get_projects(self) -> Dict[str, Any]:
+        """Return the Dashboard API payload ({"data": [project records]})"""
+        if self.use_mock:
+            return self._mock("get_mock_projects")(self.customer_id)
+        return self._get(f"{BASE_URL}/dashboard/get/{self.client_id}/{self.customer_id}")
+
+    def get_available_dates(self, project_id: str) -> Dict[str, Any]:
+        """Return available dates; stores the PF360 request_id on the client"""
+        if self.use_mock:
+            response = self._mock("get_mock_available_dates")(project_id)
+        else:
+            today = datetime.now().strftime("%Y-%m-%d")
+            response = self._get(
+                f"{self.scheduler_base_url}/project/{project_id}/date/{today}/selected/{today}/get-rescheduler-slots"
+            )
+
+        request_id = response.get("data", {}).get("request_id")
+        if request_id:
+            self.request_id = request_id
+        return response
+
+    def get_time_slots(self, project_id: str, date: str, request_id: Optional[str] = None) -> Dict[str, Any]:
+        """Return time slots for a date (requires request_id from get_available_dates)"""
+        request_id = self._require_request_id(request_id)
+        if self.use_mock:
+            return self._mock("get_mock_time_slots")(project_id, date, request_id)
+        return self._get(
+            f"{self.scheduler_base_url}/project/{project_id}/date/{date}/selected/{date}"
+            f"/get-rescheduler-slots?request_id={request_id}"
+        )
+
+    def confirm_appointment(
+        self,
+        project_id: str,
+        date: str,
+        time: str,
+        request_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Schedule an appointment (mocked unless ENABLE_REAL_CONFIRM is set)"""
+        request_id = self._require_request_id(request_id)
+        if self.use_mock or not self.enable_real_confirm:
+            return self._mock("get_mock_confirm_appointment")(project_id, date, time, request_id)
+        return self._post(f"{self.scheduler_base_url}/project/{project_id}/schedule", {
+            "created_at": datetime.now().strftime("%m-%d-%Y %H:%M:%S"),
+            "date": date,
+            "time": time,
+            "request_id": request_id,
+            "is_chatbot": "true"
+        })
+
+    def cancel_appointment(self, project_id: str, request_id: Optional[str] = None) -> Dict[str, Any]:
+        """Cancel an appointment (mocked unless ENABLE_REAL_CANCEL is set)"""
+        if self.use_mock or not self.enable_real_cancel:
+            return self._mock("get_mock_cancel_appointment")(project_id)
+        # cancel is a write; never retry
+        return self._get(f"{self.scheduler_base_url}/project/{project_id}/cancel-reschedule", retries=0)
+
+    # ------------------------------------------------------------------------
+    # Information
+    # ------------------------------------------------------------------------
+
+    def get_business_hours(self) -> Dict[str, Any]:
+        """Return business hours as {"data": {"business_hours": [...], ...}}"""
+        if self.use_mock:
+            response = self._mock("get_mock_business_hours")(self.client_id)
+        else:
+            response = self._get(f"{self.scheduler_base_url}/business-hours")
+
+        data = dict(response.get("data", {}))
+        if "business_hours" not in data:
+            data["business_hours"] = data.pop("workHours", [])
+        return {**response, "data": data}
+
+    def get_weather(self, location: str) -> Dict[str, Any]:
+        """Return current weather for a location (location, temperature, condition)"""
+        if self.use_mock:
+            mock_weather = self._mock("get_mock_weather")
+            if mock_weather is None:
+                return {"location": location, "temperature": "72°F", "condition": "Partly cloudy", "mock": True}
+            response = mock_weather(location)
+        else:
+            # Weather API doesn't need authentication
+            response = self._get(f"{WEATHER_API_URL}/{location}?format=j1", headers={})
+
+        current = response.get("current_condition", [{}])[0]
+        return {
+            "location": location,
+            "temperature": f"{current.get('temp_F')}°F",
+            "condition": current.get("weatherDesc", [{}])[0].get("value"),
+            "humidity": current.get("humidity"),
+            "forecast": response.get("weather", [])[:3]
+        }
+
+    # ------------------------------------------------------------------------
+    # Notes
+    # ------------------------------------------------------------------------
+
+    def add_note(self, project_id: str, note_text: str, author: str = "Agent") -> Dict[str, Any]:
+        """Add a note to a project"""
+        if self.use_mock:
+            mock_add_note = self._mock("get_mock_add_note")
+            if mock_add_note is not None:
+                return mock_add_note(project_id, note_text, author)
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            return {
+                "status": "success",
+                "message": f"[MOCK] Note added successfully to project {project_id}",
+                "data": {
+                    "note_id": str(uuid.uuid4()),
+                    "project_id": project_id,
+                    "note_text": note_text,
+                    "author": author,
+                    "created_at": now
+                }
+            }
+
+        return self._post(f"{BASE_URL}/project-notes/add/{self.client_id}", {
+            "project_id": project_id,
+            "note": note_text,
+            "author": author,
+            "created_at": datetime.now().strftime("%m-%d-%Y %H:%M:%S")
+        })
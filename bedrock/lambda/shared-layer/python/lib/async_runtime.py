@@ -0,0 +1,219 @@
+"""
+asyncio execution path for action Lambdas
+
+Handlers can register an async variant next to their sync handler:
+
+    @router.async_action('get-available-dates')
+    async def handle_get_available_dates_async(params, config, auth_headers):
+        slots = await gather(*(fetch_time_slots_async(date, ...) for date in dates))
+
+Only overlap independent calls: writes that depend on each other (the cancel
+and confirm of a reschedule) must stay sequential.
+
+When a Lambda's router is created with use_async=True, dispatch runs the async
+variant through run(), a sync shim driving one event loop that is kept for the
+life of the container, so lambda_handler itself stays synchronous. Actions
+without an async variant (and batch steps) use the sync handlers as before.
+
+Upstream calls from async handlers:
+  - http_get_async / http_post_async use httpx.AsyncClient when httpx is
+    installed, with http_client's timeouts, GET retry policy and upstream timing
+  - without httpx (or with HTTP_ASYNC_CLIENT=threads) they run http_client's
+    pooled requests session on the runtime's thread pool
+  - call() runs any other blocking function (mock data, DynamoDB, existing
+    sync handlers) on the same pool
+
+asyncio and httpx are imported on first use, so Lambdas that never take the
+async path do not pay for them at cold start.
+
+Environment variables:
+    HTTP_ASYNC_CLIENT  - auto | httpx | threads (default: auto)
+    ASYNC_MAX_WORKERS  - Thread pool size for blocking calls (default: 8)
+"""
+
+import functools
+import importlib.util
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable, Awaitable, TypeVar
+
+try:
+    from .http_client import (
+        http_get, http_post, get_timeout, backoff_delay,
+        MAX_RETRIES, POOL_CONNECTIONS, POOL_MAXSIZE, RETRY_STATUS_CODES
+    )
+    from .invocation_log import record_upstream
+except ImportError:  # imported flat (python/lib on sys.path)
+    from http_client import (
+        http_get, http_post, get_timeout, backoff_delay,
+        MAX_RETRIES, POOL_CONNECTIONS, POOL_MAXSIZE, RETRY_STATUS_CODES
+    )
+    from invocation_log import record_upstream
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+ASYNC_CLIENT = os.getenv("HTTP_ASYNC_CLIENT", "auto").lower()
+MAX_WORKERS = int(os.getenv("ASYNC_MAX_WORKERS", "8"))
+
+# Module-level loop and httpx client, reused across warm invocations
+_loop = None
+_async_client = None
+
+# ============================================================================
+# Event Loop
+# ============================================================================
+
+def get_event_loop():
+    """Return the container's event loop, creating it on first use"""
+    global _loop
+    import asyncio
+
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        _loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="async-call")
+        )
+    return _loop
+
+
+def run(coroutine: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code (the lambda_handler shim)
+
+    Must not be called from inside a running loop.
+    """
+    return get_event_loop().run_until_complete(coroutine)
+
+
+def reset_async_runtime() -> None:
+    """Close the httpx client and event loop (useful for testing)"""
+    global _loop, _async_client
+
+    if _loop is not None and not _loop.is_closed():
+        if _async_client is not None:
+            _loop.run_until_complete(_async_client.aclose())
+        _loop.close()
+    _loop = None
+    _async_client = None
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+async def call(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking function on the runtime's thread pool"""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+async def gather(*awaitables: Awaitable, return_exceptions: bool = False) -> list:
+    """asyncio.gather without importing asyncio in handler modules"""
+    import asyncio
+
+    return await asyncio.gather(*awaitables, return_exceptions=return_exceptions)
+
+
+def use_httpx() -> bool:
+    """Whether async HTTP calls go through httpx.AsyncClient"""
+    if ASYNC_CLIENT == "threads":
+        return False
+    if ASYNC_CLIENT == "httpx":
+        return True
+    return importlib.util.find_spec("httpx") is not None
+
+
+def get_async_client():
+    """Return the shared httpx.AsyncClient, creating it on first use"""
+    global _async_client
+
+    if _async_client is None:
+        import httpx
+
+        _async_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=POOL_CONNECTIONS * POOL_MAXSIZE,
+                max_keepalive_connections=POOL_MAXSIZE
+            )
+        )
+        logger.info("Created async HTTP client (httpx)")
+    return _async_client
+
+
+def _httpx_timeout(read_timeout: Optional[float]):
+    import httpx
+
+    connect, read = get_timeout(read_timeout)
+    return httpx.Timeout(read, connect=connect)
+
+# ============================================================================
+# Async Request Helpers
+# ============================================================================
+
+async def http_get_async(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    read_timeout: Optional[float] = None,
+    retries: Optional[int] = None
+):
+    """
+    Async counterpart of http_client.http_get (same retry policy)
+
+    Returns:
+        httpx.Response or requests.Response (status_code, json(), raise_for_status())
+    """
+    if not use_httpx():
+        return await call(http_get, url, headers=headers, params=params, read_timeout=read_timeout, retries=retries)
+
+    import asyncio
+    import httpx
+
+    client = get_async_client()
+    max_retries = MAX_RETRIES if retries is None else retries
+    timeout = _httpx_timeout(read_timeout)
+    attempt = 0
+
+    while True:
+        started = time.perf_counter()
+        try:
+            res = await client.get(url, headers=headers, params=params, timeout=timeout)
+            record_upstream((time.perf_counter() - started) * 1000)
+            if res.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+                return res
+            logger.warning("GET %s returned %s, retrying (%s/%s)", url, res.status_code, attempt + 1, max_retries)
+        except (httpx.NetworkError, httpx.TimeoutException) as e:
+            record_upstream((time.perf_counter() - started) * 1000)
+            if attempt >= max_retries:
+                raise
+            logger.warning("GET %s failed: %s, retrying (%s/%s)", url, e, attempt + 1, max_retries)
+
+        await asyncio.sleep(backoff_delay(attempt))
+        attempt += 1
+
+
+async def http_post_async(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    json: Optional[Dict[str, Any]] = None,
+    read_timeout: Optional[float] = None
+):
+    """Async counterpart of http_client.http_post (never retried)"""
+    if not use_httpx():
+        return await call(http_post, url, headers=headers, json=json, read_timeout=read_timeout)
+
+    client = get_async_client()
+    started = time.perf_counter()
+    try:
+        return await client.post(url, headers=headers, json=json, timeout=_httpx_timeout(read_timeout))
+    finally:
+        record_upstream((time.perf_counter() - started) * 1000)
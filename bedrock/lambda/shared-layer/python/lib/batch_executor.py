@@ -0,0 +1,293 @@
+"""
+Batch execution of several actions in one Lambda invocation
+
+A batch is an ordered list of steps:
+
+    [
+        {"id": "dates", "action": "get_available_dates", "parameters": {"project_id": "12345"}},
+        {"id": "slots", "action": "get_time_slots",
+         "parameters": {"project_id": "12345", "date": "$dates.available_dates.0",
+                        "request_id": "$dates.request_id"}}
+    ]
+
+A parameter value of the form "$<step_id>.<path>" is replaced with the value at
+<path> in that earlier step's result (dict keys or list indexes separated by
+dots). A step whose dependency failed is skipped.
+
+Only read-only actions (the read_only argument of run_batch) run concurrently,
+and only with each other. Every other step may have side effects, so it runs
+alone, in the order given: after all earlier steps and before all later ones.
+A cancel and a confirm on the same project can then never overlap.
+
+Step parameters go through the action's compiled parameter schema (required
+parameters, type coercion) after references are resolved, as in dispatch.
+
+Idempotent write steps run through the router's IdempotencyStore, as single
+writes do, so a retried batch replays its confirm/cancel results instead of
+writing to PF360 again. Each step is keyed by the Bedrock session plus the
+step id: a cancel and a confirm on the same project in one batch are both
+replayed, while the store alone would only keep the latest write per project.
+
+Environment variables:
+    BATCH_MAX_STEPS    - Maximum steps per batch (default: 10)
+    BATCH_MAX_WORKERS  - Thread pool size for independent steps (default: 4)
+"""
+
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Iterable, Optional, Set
+
+try:
+    from .http_client import request_errors
+    from .idempotency import IdempotencyStore, IdempotencyConflictError
+    from .validators import ParameterSchema, get_parameter_schema
+except ImportError:  # imported flat (python/lib on sys.path)
+    from http_client import request_errors
+    from idempotency import IdempotencyStore, IdempotencyConflictError
+    from validators import ParameterSchema, get_parameter_schema
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+MAX_STEPS = int(os.getenv("BATCH_MAX_STEPS", "10"))
+MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+
+# "$<step_id>" optionally followed by ".<key>" segments
+REFERENCE_PATTERN = re.compile(r"^\$([A-Za-z0-9_-]+)((?:\.[A-Za-z0-9_-]+)*)$")
+
+ActionHandler = Callable[[Dict, Dict, Dict], Dict[str, Any]]
+
+# ============================================================================
+# Parsing
+# ============================================================================
+
+def parse_steps(raw_steps: Any) -> List[Dict[str, Any]]:
+    """
+    Validate and normalize batch steps
+
+    Args:
+        raw_steps: List of step dicts, or a JSON string of one (Bedrock passes strings)
+
+    Returns:
+        List of steps with id, action (hyphenated), parameters and depends_on
+
+    Raises:
+        ValueError: If the batch is malformed or references unknown/later steps
+    """
+    if isinstance(raw_steps, str):
+        try:
+            raw_steps = json.loads(raw_steps)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"steps must be a JSON array: {str(e)}")
+
+    if not isinstance(raw_steps, list) or not raw_steps:
+        raise ValueError("steps must be a non-empty list")
+
+    if len(raw_steps) > MAX_STEPS:
+        raise ValueError(f"Batch has {len(raw_steps)} steps (max {MAX_STEPS})")
+
+    steps = []
+    seen_ids: Set[str] = set()
+
+    for index, raw in enumerate(raw_steps):
+        if not isinstance(raw, dict) or not raw.get("action"):
+            raise ValueError(f"Step {index} must be an object with an 'action'")
+
+        step_id = str(raw.get("id", index))
+        if step_id in seen_ids:
+            raise ValueError(f"Duplicate step id: {step_id}")
+
+        parameters = raw.get("parameters") or {}
+        if not isinstance(parameters, dict):
+            raise ValueError(f"Step {step_id} parameters must be an object")
+
+        depends_on = find_references(parameters)
+        unknown = depends_on - seen_ids
+        if unknown:
+            raise ValueError(
+                f"Step {step_id} references steps that do not precede it: {', '.join(sorted(unknown))}"
+            )
+
+        steps.append({
+            "id": step_id,
+            "action": str(raw["action"]).lstrip("/").replace("_", "-"),
+            "parameters": parameters,
+            "depends_on": depends_on
+        })
+        seen_ids.add(step_id)
+
+    return steps
+
+
+def find_references(value: Any) -> Set[str]:
+    """Collect step ids referenced anywhere inside a parameter value"""
+    if isinstance(value, str):
+        match = REFERENCE_PATTERN.match(value)
+        return {match.group(1)} if match else set()
+    if isinstance(value, dict):
+        return set().union(*(find_references(v) for v in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(find_references(v) for v in value)) if value else set()
+    return set()
+
+
+def resolve_references(value: Any, results: Dict[str, Any]) -> Any:
+    """
+    Replace "$<step_id>.<path>" strings with values from earlier results
+
+    Raises:
+        ValueError: If a referenced path does not exist
+    """
+    if isinstance(value, str):
+        match = REFERENCE_PATTERN.match(value)
+        if not match:
+            return value
+
+        current = results[match.group(1)]
+        path = match.group(2)
+        for key in path.split(".")[1:] if path else []:
+            if isinstance(current, list) and key.isdigit() and int(key) < len(current):
+                current = current[int(key)]
+            elif isinstance(current, dict) and key in current:
+                current = current[key]
+            else:
+                raise ValueError(f"Reference {value} not found in step {match.group(1)} result")
+        return current
+
+    if isinstance(value, dict):
+        return {k: resolve_references(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(v, results) for v in value]
+    return value
+
+# ============================================================================
+# Execution
+# ============================================================================
+
+def classify_step_error(error: Exception) -> Dict[str, Any]:
+    """Map a step exception to the same status codes lambda_handler uses"""
+    if isinstance(error, ValueError):
+        return {"error": f"Validation error: {str(error)}", "status_code": 400}
+    if isinstance(error, IdempotencyConflictError):
+        return {"error": str(error), "status_code": 409}
+    if isinstance(error, request_errors()):
+        return {"error": f"API request failed: {str(error)}", "status_code": 502}
+    return {"error": f"Internal error: {str(error)}", "status_code": 500}
+
+
+def run_batch(
+    steps: List[Dict[str, Any]],
+    handlers: Dict[str, ActionHandler],
+    base_params: Dict[str, Any],
+    config: Dict,
+    auth_headers: Dict,
+    max_workers: int = MAX_WORKERS,
+    read_only: Iterable[str] = (),
+    schemas: Optional[Dict[str, ParameterSchema]] = None,
+    idempotency: Optional[IdempotencyStore] = None,
+    idempotent_actions: Iterable[str] = (),
+    session_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Execute parsed steps, running each wave of ready read-only steps concurrently
+
+    Args:
+        steps: Output of parse_steps
+        handlers: Action name (hyphenated) -> handler(params, config, auth_headers)
+        base_params: Parameters shared by every step (client_id, customer_id, ...)
+        config: API configuration
+        auth_headers: PF360 auth headers
+        read_only: Actions without side effects; all others run one at a time in order
+        schemas: Compiled parameter schemas by action (see load_action_schemas)
+        idempotency: Store that replays retried writes (see idempotency)
+        idempotent_actions: Actions that run through the store
+        session_id: Bedrock session ID (writes without one are not deduplicated)
+
+    Returns:
+        Per-step results in the original order
+    """
+    results: Dict[str, Any] = {}
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    failed: Set[str] = set()
+    pending = list(steps)
+    read_only = set(read_only)
+    schemas = schemas or {}
+    idempotent_actions = set(idempotent_actions)
+
+    # Ordering constraints (not data dependencies: a failure here skips nothing)
+    after: Dict[str, Set[str]] = {}
+    earlier: List[str] = []
+    last_write: Optional[str] = None
+    for step in steps:
+        if step["action"] in read_only:
+            after[step["id"]] = {last_write} if last_write else set()
+        else:
+            after[step["id"]] = set(earlier)
+            last_write = step["id"]
+        earlier.append(step["id"])
+
+    def is_ready(step: Dict[str, Any]) -> bool:
+        return (step["depends_on"] | after[step["id"]]) <= outcomes.keys()
+
+    def execute(step: Dict[str, Any]) -> Dict[str, Any]:
+        outcome = {"id": step["id"], "action": step["action"], "status": "success"}
+        handler = handlers.get(step["action"])
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown action: {step['action']}")
+            params = {**base_params, **resolve_references(step["parameters"], results)}
+            schema = get_parameter_schema(schemas, step["action"])
+            if schema is not None:
+                params = schema.apply(params)
+            if idempotency is not None and step["action"] in idempotent_actions:
+                step_session = f"{session_id}#batch-{step['id']}" if session_id else None
+                outcome["result"] = idempotency.run(
+                    step_session, step["action"], params, lambda: handler(params, config, auth_headers)
+                )
+            else:
+                outcome["result"] = handler(params, config, auth_headers)
+        except Exception as e:
+            logger.warning(f"Batch step {step['id']} ({step['action']}) failed: {str(e)}")
+            outcome["status"] = "error"
+            outcome.update(classify_step_error(e))
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while pending:
+            # Steps only wait on earlier steps, so the first pending step is always ready
+            ready = [s for s in pending if is_ready(s)]
+            pending = [s for s in pending if not is_ready(s)]
+
+            runnable = []
+            for step in ready:
+                blocked = step["depends_on"] & failed
+                if blocked:
+                    outcomes[step["id"]] = {
+                        "id": step["id"],
+                        "action": step["action"],
+                        "status": "skipped",
+                        "error": f"Dependency failed: {', '.join(sorted(blocked))}"
+                    }
+                    failed.add(step["id"])
+                else:
+                    runnable.append(step)
+
+            if len(runnable) == 1:
+                wave = [execute(runnable[0])]
+            else:
+                wave = list(executor.map(execute, runnable))
+
+            for outcome in wave:
+                outcomes[outcome["id"]] = outcome
+                if outcome["status"] == "success":
+                    results[outcome["id"]] = outcome["result"]
+                else:
+                    failed.add(outcome["id"])
+
+    return [outcomes[step["id"]] for step in steps]
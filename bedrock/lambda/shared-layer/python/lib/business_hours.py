@@ -0,0 +1,304 @@
+"""
+Compiled per-client business hours
+
+The Business Hours API returns a list of day entries in one of two shapes:
+
+    {"day": "Monday", "is_working": true, "start": "08:00", "end": "17:00"}
+    {"day": "Sunday", "open": "Closed", "close": "Closed"}
+
+compile_business_hours turns that payload into a BusinessHours object:
+
+  - a weekday bitmap (bit 0 = Monday) of days with any open interval
+  - per-weekday open intervals in minutes of the day
+  - the client's timezone (times are interpreted as local wall-clock time)
+  - holiday overrides by date (closed, or special hours), from the payload's
+    "holidays" list and BUSINESS_HOURS_HOLIDAYS
+
+is_open() and next_open_window() then answer without another API call and in
+bounded time (at most BUSINESS_HOURS_HORIZON_DAYS days are scanned).
+business_hours_cache keeps the raw payload per client for BUSINESS_HOURS_TTL
+seconds across warm invocations and compiles it on first use, so listing the
+hours never fails on a time format the compiler cannot read.
+
+Environment variables:
+    BUSINESS_HOURS_TTL           - Compiled hours lifetime in seconds (default: 3600)
+    BUSINESS_HOURS_HOLIDAYS      - Comma-separated YYYY-MM-DD dates closed for every client (default: none)
+    BUSINESS_HOURS_HORIZON_DAYS  - Days next_open_window looks ahead (default: 14)
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime, date, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_TTL = int(os.getenv("BUSINESS_HOURS_TTL", "3600"))
+GLOBAL_HOLIDAYS = tuple(d.strip() for d in os.getenv("BUSINESS_HOURS_HOLIDAYS", "").split(",") if d.strip())
+HORIZON_DAYS = int(os.getenv("BUSINESS_HOURS_HORIZON_DAYS", "14"))
+
+DEFAULT_TIMEZONE = "America/New_York"
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+MINUTES_PER_DAY = 24 * 60
+
+# (start_minute, end_minute) pairs, sorted, end exclusive
+Intervals = Tuple[Tuple[int, int], ...]
+
+_TIME_RE = re.compile(r"^(\d{1,2})(?::?(\d{2})(?::\d{2})?)?\s*([ap]\.?m\.?)?$")
+
+# ============================================================================
+# Parsing
+# ============================================================================
+
+def parse_time(value: Any) -> Optional[int]:
+    """
+    Minutes since midnight for "08:00", "08:00:00", "8:00 AM", "5pm" or "1730"
+    (seconds are ignored)
+
+    Returns:
+        None for empty/"Closed" values
+
+    Raises:
+        ValueError: Unrecognized or out-of-range time
+    """
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    if not text or text == "closed":
+        return None
+
+    match = _TIME_RE.match(text.replace(" ", "") if text[-1] == "m" else text)
+    if not match:
+        raise ValueError(f"Invalid time: {value}")
+
+    hours, minutes, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3)
+    if meridiem:
+        if not 1 <= hours <= 12:
+            raise ValueError(f"Invalid time: {value}")
+        hours = hours % 12 + (12 if meridiem.startswith("p") else 0)
+    if hours == 24 and minutes == 0:
+        return MINUTES_PER_DAY
+    if hours > 23 or minutes > 59:
+        raise ValueError(f"Invalid time: {value}")
+    return hours * 60 + minutes
+
+
+def format_minutes(minutes: int) -> str:
+    """720 -> "12:00" (24:00 for end of day)"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _entry_interval(entry: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """Open interval of one day entry in either API shape, or None when closed"""
+    if entry.get("is_working") is False:
+        return None
+    start = parse_time(entry.get("start", entry.get("open")))
+    end = parse_time(entry.get("end", entry.get("close")))
+    if start is None or end is None or end <= start:
+        return None
+    return (start, end)
+
+
+def _load_zone(name: str):
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception as e:
+        logger.warning("Unknown timezone %s, using UTC: %s", name, e)
+        return timezone.utc
+
+# ============================================================================
+# Compiled Hours
+# ============================================================================
+
+class BusinessHours:
+    """Weekday bitmap + minute intervals + holiday overrides in one timezone"""
+
+    __slots__ = ("timezone_name", "tz", "open_days", "intervals", "holidays")
+
+    def __init__(self, timezone_name: str, intervals: List[Intervals], holidays: Optional[Dict[str, Intervals]] = None):
+        """
+        Args:
+            timezone_name: IANA timezone of the client (e.g. America/New_York)
+            intervals: Seven interval tuples, Monday first
+            holidays: YYYY-MM-DD -> intervals for that date (empty tuple: closed)
+        """
+        self.timezone_name = timezone_name
+        self.tz = _load_zone(timezone_name)
+        self.intervals = tuple(intervals)
+        self.open_days = sum(1 << day for day, day_intervals in enumerate(self.intervals) if day_intervals)
+        self.holidays = holidays or {}
+
+    def intervals_on(self, day: date) -> Intervals:
+        """Open intervals for a calendar date, holidays applied"""
+        override = self.holidays.get(day.isoformat())
+        if override is not None:
+            return override
+        if not self.open_days >> day.weekday() & 1:
+            return ()
+        return self.intervals[day.weekday()]
+
+    def localize(self, at: Optional[datetime] = None) -> datetime:
+        """Convert to the client's timezone (naive datetimes are taken as local time)"""
+        if at is None:
+            return datetime.now(self.tz)
+        if at.tzinfo is None:
+            return at.replace(tzinfo=self.tz)
+        return at.astimezone(self.tz)
+
+    def is_open(self, at: Optional[datetime] = None) -> bool:
+        """Whether the business is open at a moment (default: now)"""
+        local = self.localize(at)
+        minute = local.hour * 60 + local.minute
+        return any(start <= minute < end for start, end in self.intervals_on(local.date()))
+
+    def contains(self, day: str, start_time: str, end_time: Optional[str] = None) -> bool:
+        """
+        Whether a slot on a YYYY-MM-DD date falls inside one open interval
+
+        Useful for filtering time slots locally (e.g. "08:00 AM" - "10:00 AM").
+        """
+        start = parse_time(start_time)
+        end = parse_time(end_time) if end_time else start + 1
+        return any(
+            open_start <= start and end <= open_end
+            for open_start, open_end in self.intervals_on(date.fromisoformat(day))
+        )
+
+    def next_open_window(self, after: Optional[datetime] = None, horizon_days: int = HORIZON_DAYS) -> Optional[Tuple[datetime, datetime]]:
+        """
+        The open window containing `after`, or the next one starting after it
+
+        Returns:
+            (start, end) as timezone-aware local datetimes, or None if closed
+            for the whole horizon
+        """
+        local = self.localize(after)
+        minute = local.hour * 60 + local.minute
+
+        for offset in range(horizon_days + 1):
+            day = local.date() + timedelta(days=offset)
+            for start, end in self.intervals_on(day):
+                if offset == 0 and end <= minute:
+                    continue
+                midnight = datetime(day.year, day.month, day.day, tzinfo=self.tz)
+                window_start = midnight + timedelta(minutes=start)
+                if offset == 0 and start <= minute:
+                    window_start = local.replace(second=0, microsecond=0)
+                return window_start, midnight + timedelta(minutes=end)
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Readable form for action responses"""
+        return {
+            "timezone": self.timezone_name,
+            "days": {
+                name: [[format_minutes(s), format_minutes(e)] for s, e in self.intervals[day]]
+                for day, name in enumerate(WEEKDAYS)
+            },
+            "holidays": {
+                day: [[format_minutes(s), format_minutes(e)] for s, e in intervals]
+                for day, intervals in sorted(self.holidays.items())
+            }
+        }
+
+
+def compile_business_hours(data: Dict[str, Any]) -> BusinessHours:
+    """
+    Compile a Business Hours API "data" object
+
+    Args:
+        data: {"workHours": [...], "timezone": "...", "holidays": [...]}; holiday
+              entries are "YYYY-MM-DD" (closed) or {"date", "start"/"open", "end"/"close"}
+
+    Raises:
+        ValueError: Unparseable times
+    """
+    by_day: Dict[int, List[Tuple[int, int]]] = {day: [] for day in range(7)}
+    for entry in data.get("workHours") or []:
+        name = str(entry.get("day", "")).strip().lower()
+        if name not in WEEKDAYS:
+            continue
+        interval = _entry_interval(entry)
+        if interval:
+            by_day[WEEKDAYS.index(name)].append(interval)
+
+    holidays: Dict[str, Intervals] = {day: () for day in GLOBAL_HOLIDAYS}
+    for holiday in data.get("holidays") or []:
+        if isinstance(holiday, str):
+            holidays[holiday] = ()
+        elif holiday.get("date"):
+            interval = _entry_interval(holiday)
+            holidays[str(holiday["date"])] = (interval,) if interval else ()
+
+    return BusinessHours(
+        data.get("timezone") or DEFAULT_TIMEZONE,
+        [tuple(sorted(by_day[day])) for day in range(7)],
+        holidays
+    )
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class BusinessHoursCache:
+    """Raw business hours per client, with TTL, compiled on first use"""
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL):
+        self.ttl_seconds = ttl_seconds
+        # client_id -> [expires_at, raw data, compiled hours or None until first use]
+        self._entries: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, client_id: str, loader: Callable[[], Dict[str, Any]]) -> List[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(client_id)
+        if entry is not None and entry[0] > now:
+            return entry
+
+        entry = [now + self.ttl_seconds, loader(), None]
+        with self._lock:
+            self._entries[client_id] = entry
+        return entry
+
+    def get_data(self, client_id: str, loader: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the raw Business Hours API "data" object for a client (not compiled)
+
+        Args:
+            client_id: Client identifier
+            loader: Zero-argument callable returning the Business Hours API "data" object
+        """
+        return self._entry(client_id, loader)[1]
+
+    def get_or_load(self, client_id: str, loader: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], BusinessHours]:
+        """
+        Return (raw data, compiled hours) for a client, calling loader() on a miss
+
+        Raises:
+            ValueError: The payload cannot be compiled (the raw data stays cached)
+        """
+        entry = self._entry(client_id, loader)
+        if entry[2] is None:
+            entry[2] = compile_business_hours(entry[1])
+        return entry[1], entry[2]
+
+    def invalidate(self, client_id: Optional[str] = None) -> None:
+        """Drop one client's hours, or all of them"""
+        with self._lock:
+            if client_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(client_id, None)
+
+
+# Module-level cache, reused across warm invocations
+business_hours_cache = BusinessHoursCache()
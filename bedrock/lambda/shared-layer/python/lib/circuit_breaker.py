@@ -0,0 +1,228 @@
+"""
+Per-endpoint circuit breakers for upstream APIs with a local fallback
+
+    breaker = get_circuit_breaker("pf360-list-notes")
+    response = breaker.call(call_api, fallback)
+
+States:
+  - closed: calls go to the endpoint; CIRCUIT_FAILURE_THRESHOLD consecutive
+    failures (request errors, including 404 from a missing endpoint) open it
+  - open: calls go straight to the fallback for CIRCUIT_RESET_SECONDS
+  - half_open: after that, one call per container probes the endpoint while
+    others keep using the fallback; success closes the circuit, failure
+    reopens it for another CIRCUIT_RESET_SECONDS
+
+Breakers live at module level, so their state persists across warm
+invocations. With CIRCUIT_BREAKER_TABLE set, transitions are also written to
+DynamoDB (items "circuit#<name>" in the sessions table, see lib/dynamo_tier.py)
+and re-read at most every CIRCUIT_SYNC_SECONDS, so one container tripping the
+breaker spares the others their own failing calls.
+The DynamoDB tier is best effort and never blocks a call.
+
+Environment variables:
+    CIRCUIT_FAILURE_THRESHOLD  - Consecutive failures that open a circuit (default: 3)
+    CIRCUIT_RESET_SECONDS      - Time a circuit stays open before a probe (default: 60)
+    CIRCUIT_SYNC_SECONDS       - Interval between DynamoDB state reads (default: 10)
+    CIRCUIT_BREAKER_TABLE      - DynamoDB table for shared state (default: disabled)
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, Tuple, Type, TypeVar
+
+try:
+    from .dynamo_tier import DynamoTier
+    from .http_client import request_errors
+    from .invocation_log import count
+except ImportError:  # imported flat (python/lib on sys.path)
+    from dynamo_tier import DynamoTier
+    from http_client import request_errors
+    from invocation_log import count
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "60"))
+SYNC_SECONDS = float(os.getenv("CIRCUIT_SYNC_SECONDS", "10"))
+DEFAULT_TABLE = os.getenv("CIRCUIT_BREAKER_TABLE", "")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# ============================================================================
+# Circuit Breaker
+# ============================================================================
+
+class CircuitOpenError(Exception):
+    """Passed to the fallback when a call was skipped because the circuit is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one endpoint"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_seconds: float = RESET_SECONDS,
+        table_name: Optional[str] = None,
+        sync_seconds: float = SYNC_SECONDS
+    ):
+        """
+        Args:
+            name: Endpoint name (metrics and DynamoDB key)
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: Time the circuit stays open before a probe
+            table_name: DynamoDB table for shared state (default: CIRCUIT_BREAKER_TABLE)
+            sync_seconds: Interval between DynamoDB state reads
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.remote = DynamoTier("circuit", DEFAULT_TABLE if table_name is None else table_name, "Circuit breaker")
+        self.sync_seconds = sync_seconds
+        self.failures = 0
+        self.opened_until = 0.0
+        self._probing = False
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_until == 0.0:
+            return CLOSED
+        return OPEN if time.time() < self.opened_until else HALF_OPEN
+
+    def allow_request(self) -> bool:
+        """
+        Whether the next call should go to the endpoint
+
+        In half_open, only the first caller (the probe) is allowed until it
+        reports success or failure.
+        """
+        self._sync()
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            was_open = self.opened_until != 0.0
+            self.failures = 0
+            self.opened_until = 0.0
+            self._probing = False
+        if was_open:
+            logger.info("Circuit %s closed", self.name)
+            self._put_remote()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            tripped = self._probing or (self.opened_until == 0.0 and self.failures >= self.failure_threshold)
+            if tripped:
+                self.opened_until = time.time() + self.reset_seconds
+            self._probing = False
+        if tripped:
+            logger.warning("Circuit %s open for %ss after %s failures", self.name, self.reset_seconds, self.failures)
+            count(f"circuit_open_{self.name}")
+            self._put_remote()
+
+    def call(
+        self,
+        func: Callable[[], T],
+        fallback: Callable[[Exception], T],
+        errors: Optional[Tuple[Type[BaseException], ...]] = None
+    ) -> T:
+        """
+        Call the endpoint through the breaker
+
+        Args:
+            func: Zero-argument endpoint call
+            fallback: Called with the error (or a CircuitOpenError) instead
+            errors: Exceptions counted as endpoint failures (default: request errors)
+
+        Returns:
+            func() on success, otherwise fallback(error)
+        """
+        if not self.allow_request():
+            count("circuit_short_circuit")
+            return fallback(CircuitOpenError(f"Circuit {self.name} is open"))
+
+        try:
+            result = func()
+        except BaseException as e:
+            # Resolved after the call: in a cold container func() is what imports requests
+            if isinstance(e, errors or request_errors()):
+                self.record_failure()
+                return fallback(e)
+            with self._lock:
+                self._probing = False
+            raise
+        self.record_success()
+        return result
+
+    def reset(self) -> None:
+        """Close the circuit locally (tests, manual recovery)"""
+        with self._lock:
+            self.failures = 0
+            self.opened_until = 0.0
+            self._probing = False
+            self._synced_at = 0.0
+
+    # ------------------------------------------------------------------------
+    # DynamoDB tier
+    # ------------------------------------------------------------------------
+
+    def _sync(self) -> None:
+        """Adopt a newer open state from DynamoDB (at most every sync_seconds)"""
+        now = time.time()
+        if not self.remote.enabled or now - self._synced_at < self.sync_seconds:
+            return
+        self._synced_at = now
+        item = self.remote.get((self.name,))
+        if not item:
+            return
+
+        opened_until = float(item.get("opened_until", 0))
+        with self._lock:
+            if opened_until > self.opened_until:
+                self.opened_until = opened_until
+            elif opened_until == 0.0 and self.opened_until and not self._probing:
+                # Another container's probe succeeded
+                self.failures = 0
+                self.opened_until = 0.0
+
+    def _put_remote(self) -> None:
+        self.remote.put(
+            (self.name,),
+            {"opened_until": str(self.opened_until)},
+            time.time() + max(self.reset_seconds, self.sync_seconds) * 10
+        )
+
+
+# Breakers by endpoint name, reused across warm invocations
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str, **kwargs: Any) -> CircuitBreaker:
+    """Return the container-wide breaker for an endpoint, creating it on first use"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, **kwargs)
+        return breaker
@@ -0,0 +1,297 @@
+"""
+Per-customer Dashboard API response cache
+Shared by list_projects, get_project_details and get_appointment_status
+
+Two tiers:
+  1. In-process LRU with TTL (survives across warm invocations)
+  2. Optional DynamoDB tier (shared across containers and Lambdas)
+
+Each cached payload carries a project_id -> record index built once, so
+project lookups are O(1) instead of a scan over the dashboard data list.
+
+The DynamoDB tier (lib/dynamo_tier.py) is disabled unless DASHBOARD_CACHE_TABLE
+is set. It is meant to reuse the sessions table, with items keyed
+"dashboard#<client>#<customer>".
+
+With the tier enabled, invalidate() also writes a per-customer marker
+("dashboard#<client>#<customer>#invalidated") holding the invalidation time.
+Before an entry from either tier is used, get() reads the marker, and it drops
+entries loaded before it. A confirm in the scheduling Lambda then reaches the
+information Lambda's warm containers right away rather than after
+DASHBOARD_CACHE_TTL. Without the table, each container only sees its own
+invalidations.
+
+Environment variables:
+    DASHBOARD_CACHE_TTL          - Entry lifetime in seconds (default: 60)
+    DASHBOARD_CACHE_MAX_ENTRIES  - In-process LRU capacity (default: 256)
+    DASHBOARD_CACHE_TABLE        - DynamoDB table for the shared tier (default: disabled)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, List
+
+try:
+    from .dynamo_tier import DynamoTier
+    from .invocation_log import count
+except ImportError:  # imported flat (python/lib on sys.path)
+    from dynamo_tier import DynamoTier
+    from invocation_log import count
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", "60"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "256"))
+DEFAULT_TABLE = os.getenv("DASHBOARD_CACHE_TABLE", "")
+
+# DynamoDB item size limit is 400 KB; leave room for key and metadata
+MAX_DYNAMODB_PAYLOAD_BYTES = 350 * 1024
+
+# ============================================================================
+# Cache Entry
+# ============================================================================
+
+class DashboardEntry:
+    """Dashboard payload with a project_id -> record index"""
+
+    __slots__ = ("payload", "projects", "expires_at", "loaded_at")
+
+    def __init__(self, payload: Dict[str, Any], expires_at: float = 0.0, loaded_at: Optional[float] = None):
+        self.payload = payload
+        self.expires_at = expires_at
+        self.loaded_at = time.time() if loaded_at is None else loaded_at
+        self.projects: Dict[str, Dict[str, Any]] = {
+            str(item.get("project_project_id")): item
+            for item in self.records
+        }
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """Raw project records from the dashboard payload"""
+        return self.payload.get("data") or []
+
+    def get_project(self, project_id: Any) -> Optional[Dict[str, Any]]:
+        """Look up a project record by ID"""
+        return self.projects.get(str(project_id))
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) >= self.expires_at
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class DashboardCache:
+    """Two-tier TTL cache for Dashboard API payloads"""
+
+    def __init__(
+        self,
+        ttl_seconds: int = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        table_name: Optional[str] = None
+    ):
+        """
+        Args:
+            ttl_seconds: Entry lifetime in seconds
+            max_entries: In-process LRU capacity
+            table_name: DynamoDB table for the shared tier (None: DASHBOARD_CACHE_TABLE)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.remote = DynamoTier("dashboard", DEFAULT_TABLE if table_name is None else table_name, "Dashboard cache")
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, DashboardEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------------
+
+    def get(self, client_id: str, customer_id: str) -> Optional[DashboardEntry]:
+        """
+        Return a fresh cached entry, checking the in-process tier then DynamoDB
+
+        An entry loaded before the customer's latest invalidation (possibly by
+        another Lambda) is dropped.
+
+        Returns:
+            DashboardEntry or None on miss
+        """
+        key = (str(client_id), str(customer_id))
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.is_expired(now):
+                del self._entries[key]
+                entry = None
+
+        local = entry is not None
+        if not local:
+            entry = self.remote.get(key, self._decode_remote, now)
+
+        if entry is not None and self._invalidated_since(key, entry):
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            count("dashboard_cache_invalidated")
+            entry = None
+
+        if entry is not None:
+            if local:
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+            else:
+                self._store_local(key, entry)
+            self.hits += 1
+            count("dashboard_cache_hit")
+            return entry
+
+        self.misses += 1
+        count("dashboard_cache_miss")
+        return None
+
+    def put(
+        self,
+        client_id: str,
+        customer_id: str,
+        payload: Dict[str, Any],
+        loaded_at: Optional[float] = None
+    ) -> DashboardEntry:
+        """
+        Cache a dashboard payload in both tiers and return its entry
+
+        Args:
+            loaded_at: When the payload was requested (default: now); compared
+                       with invalidation markers
+        """
+        key = (str(client_id), str(customer_id))
+        entry = DashboardEntry(payload, time.time() + self.ttl_seconds, loaded_at)
+        self._store_local(key, entry)
+        self._put_remote(key, entry)
+        return entry
+
+    def get_or_load(
+        self,
+        client_id: str,
+        customer_id: str,
+        loader: Callable[[], Dict[str, Any]]
+    ) -> DashboardEntry:
+        """
+        Return the cached entry, calling loader() to fetch the payload on a miss
+
+        Args:
+            client_id: Client identifier
+            customer_id: Customer identifier
+            loader: Zero-argument callable returning the Dashboard API JSON
+
+        Returns:
+            DashboardEntry
+        """
+        entry = self.get(client_id, customer_id)
+        if entry is not None:
+            logger.info(f"Dashboard cache hit for {client_id}/{customer_id}")
+            return entry
+
+        # A load that overlaps a write and an invalidation must not outlive them
+        started = time.time()
+        return self.put(client_id, customer_id, loader(), loaded_at=started)
+
+    def invalidate(
+        self,
+        client_id: str,
+        customer_id: Optional[str] = None,
+        project_id: Optional[str] = None
+    ) -> int:
+        """
+        Drop cached dashboards after a write (confirm/cancel)
+
+        With customer_id, that customer's entry is dropped from both tiers.
+        With only project_id, every in-process entry for the client containing
+        the project is dropped (and its DynamoDB copy, since the customer is
+        then known). With the DynamoDB tier enabled, an invalidation marker
+        per customer makes other containers drop their copies too.
+
+        Returns:
+            Number of in-process entries removed
+        """
+        client_id = str(client_id)
+        keys = set()
+
+        if customer_id:
+            keys.add((client_id, str(customer_id)))
+
+        with self._lock:
+            if project_id is not None:
+                keys.update(
+                    key for key, entry in self._entries.items()
+                    if key[0] == client_id and entry.get_project(project_id) is not None
+                )
+            removed = sum(1 for key in keys if self._entries.pop(key, None) is not None)
+
+        now = time.time()
+        for key in keys:
+            self.remote.delete(key)
+            if self.remote.enabled:
+                # Entries loaded before now expire within ttl_seconds, so the marker can too
+                self.remote.put(key + ("invalidated",), {"invalidated_at": str(now)}, now + self.ttl_seconds + 1)
+
+        if keys:
+            logger.info(f"Invalidated {len(keys)} dashboard cache entries for client {client_id}")
+        return removed
+
+    def clear(self) -> None:
+        """Clear the in-process tier and reset counters (useful for testing)"""
+        with self._lock:
+            self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------------
+    # In-process tier
+    # ------------------------------------------------------------------------
+
+    def _store_local(self, key: tuple, entry: DashboardEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # ------------------------------------------------------------------------
+    # DynamoDB tier
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _decode_remote(item: Dict[str, Any]) -> DashboardEntry:
+        return DashboardEntry(json.loads(item["payload"]), float(item["ttl"]), float(item.get("loaded_at", 0)))
+
+    def _put_remote(self, key: tuple, entry: DashboardEntry) -> None:
+        if not self.remote.enabled:
+            return
+        payload = json.dumps(entry.payload, separators=(",", ":"))
+        if len(payload) > MAX_DYNAMODB_PAYLOAD_BYTES:
+            logger.info(f"Dashboard payload too large for DynamoDB tier ({len(payload)} bytes)")
+            return
+        self.remote.put(key, {"payload": payload, "loaded_at": str(entry.loaded_at)}, entry.expires_at)
+
+    def _invalidated_since(self, key: tuple, entry: DashboardEntry) -> bool:
+        """Whether the customer was invalidated (by any container) after entry was loaded"""
+        if not self.remote.enabled:
+            return False
+        invalidated_at = self.remote.get(key + ("invalidated",), lambda item: float(item["invalidated_at"]), time.time())
+        return invalidated_at is not None and entry.loaded_at <= invalidated_at
+
+
+# Module-level cache, reused across warm invocations
+dashboard_cache = DashboardCache()
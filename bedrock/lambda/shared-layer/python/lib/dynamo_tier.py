@@ -0,0 +1,143 @@
+"""
+Optional DynamoDB tier for in-process caches and stores
+
+The dashboard cache, slot store, idempotency store, weather cache and circuit
+breakers keep their state per warm container and can share it across
+containers (and Lambdas) through DynamoDB. They all reuse the sessions table:
+items are keyed "<prefix>#<part>#..." in its session_id attribute and expire
+through its ttl attribute.
+
+    tier = DynamoTier("dashboard", os.getenv("DASHBOARD_CACHE_TABLE", ""), "Dashboard cache")
+    tier.put((client_id, customer_id), {"payload": payload}, expires_at)
+    item = tier.get((client_id, customer_id), now=time.time())
+
+An empty table name disables the tier. Reads, writes and deletes are best
+effort: failures are logged and reported as a miss, never raised. Callers
+that need conditional writes use tier.table and tier.key() directly.
+
+The boto3 resource is created once per container and shared by every tier,
+the notes repository and the session manager.
+"""
+
+import logging
+import threading
+from typing import Dict, Any, Optional, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_resource = None
+_resource_lock = threading.Lock()
+
+
+def dynamodb_resource():
+    """Container-wide boto3 DynamoDB resource, created on first use"""
+    global _resource
+    if _resource is None:
+        with _resource_lock:
+            if _resource is None:
+                import boto3
+                _resource = boto3.resource("dynamodb")
+    return _resource
+
+
+def error_code(error: Exception) -> Optional[str]:
+    """botocore ClientError code, without importing botocore"""
+    return getattr(error, "response", {}).get("Error", {}).get("Code")
+
+
+class DynamoTier:
+    """Prefixed items in a shared table, with best-effort access"""
+
+    def __init__(self, prefix: str, table_name: str, label: str):
+        """
+        Args:
+            prefix: Key prefix, e.g. "dashboard"
+            table_name: Table name ("" disables the tier)
+            label: Name used in log messages, e.g. "Dashboard cache"
+        """
+        self.prefix = prefix
+        self.table_name = table_name
+        self.label = label
+        self._table = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.table_name)
+
+    @property
+    def table(self):
+        """Table handle (None when the tier is disabled)"""
+        if not self.table_name:
+            return None
+        if self._table is None:
+            self._table = dynamodb_resource().Table(self.table_name)
+        return self._table
+
+    def key(self, *parts: Any) -> Dict[str, str]:
+        return {"session_id": "#".join([self.prefix, *(str(part) for part in parts)])}
+
+    def get(
+        self,
+        parts: tuple,
+        decode: Callable[[Dict[str, Any]], T] = dict,
+        now: Optional[float] = None,
+        consistent: bool = False
+    ) -> Optional[T]:
+        """
+        Read and decode an item
+
+        Args:
+            parts: Key parts after the prefix
+            decode: Builds the caller's value from the item (errors count as a miss)
+            now: Treat items whose ttl is not after now as missing (None: no check)
+            consistent: Strongly consistent read
+
+        Returns:
+            decode(item), or None when missing, expired, disabled or failed
+        """
+        table = self.table
+        if table is None:
+            return None
+        try:
+            request = {"Key": self.key(*parts)}
+            if consistent:
+                request["ConsistentRead"] = True
+            item = table.get_item(**request).get("Item")
+            if not item or (now is not None and int(item.get("ttl", 0)) <= now):
+                return None
+            return decode(item)
+        except Exception as e:
+            logger.warning("%s DynamoDB read failed: %s", self.label, e)
+            return None
+
+    def put(self, parts: tuple, attributes: Dict[str, Any], expires_at: float) -> bool:
+        """Write an item expiring at expires_at (epoch seconds); False if disabled or failed"""
+        table = self.table
+        if table is None:
+            return False
+        try:
+            table.put_item(Item={**self.key(*parts), **attributes, "ttl": int(expires_at)})
+            return True
+        except Exception as e:
+            logger.warning("%s DynamoDB write failed: %s", self.label, e)
+            return False
+
+    def delete(self, parts: tuple, **conditions: Any) -> bool:
+        """
+        Delete an item, optionally conditionally (ConditionExpression etc.)
+
+        Returns:
+            False if disabled, the condition did not hold or the delete failed
+        """
+        table = self.table
+        if table is None:
+            return False
+        try:
+            table.delete_item(Key=self.key(*parts), **conditions)
+            return True
+        except Exception as e:
+            if error_code(e) != "ConditionalCheckFailedException":
+                logger.warning("%s DynamoDB delete failed: %s", self.label, e)
+            return False
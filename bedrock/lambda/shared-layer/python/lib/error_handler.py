@@ -0,0 +1,182 @@
+"""
+Error handling and response formatting for Bedrock Agent action Lambdas
+
+Includes:
+  - Error classification (exception -> error type + HTTP status)
+  - Bedrock Agent response envelope with a compact JSON body serializer
+  - @handle_errors decorator and request/response logging helpers
+"""
+
+import json
+import logging
+import functools
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Any, Optional, Tuple, Callable
+
+try:
+    from .invocation_log import log_payload
+except ImportError:  # imported flat (python/lib on sys.path)
+    from invocation_log import log_payload
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Response Serialization
+# ============================================================================
+
+def _json_default(value: Any) -> Any:
+    """Serialize types json does not handle (DynamoDB numbers, datetimes, sets)"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# One encoder for every response: compact separators and raw UTF-8 keep the
+# body Bedrock passes back to the model small
+_encoder = json.JSONEncoder(
+    separators=(",", ":"),
+    ensure_ascii=False,
+    default=_json_default
+)
+
+
+def serialize_body(body: Any) -> str:
+    """Encode a response body as compact JSON"""
+    return _encoder.encode(body)
+
+# ============================================================================
+# Error Classification
+# ============================================================================
+
+# (keyword in lowercased message, error type, status code), checked in order
+ERROR_KEYWORDS = (
+    ("timed out", "TimeoutError", 504),
+    ("timeout", "TimeoutError", 504),
+    ("rate limit", "RateLimitError", 429),
+    ("401", "AuthenticationError", 401),
+    ("unauthorized", "AuthenticationError", 401),
+    ("not found", "NotFoundError", 404),
+    ("invalid", "ValidationError", 400),
+    ("missing required", "ValidationError", 400)
+)
+
+
+def classify_error(error: Exception) -> Tuple[str, int]:
+    """
+    Classify an exception into an error type and HTTP status code
+
+    Returns:
+        (error_type, status_code)
+    """
+    message = str(error).lower()
+    for keyword, error_type, status_code in ERROR_KEYWORDS:
+        if keyword in message:
+            return error_type, status_code
+
+    if isinstance(error, ValueError):
+        return "ValidationError", 400
+    return "InternalError", 500
+
+# ============================================================================
+# Response Formatting
+# ============================================================================
+
+def format_error_response(
+    error_message: str,
+    error_type: str = "InternalError",
+    status_code: int = 500,
+    details: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Format a plain (non-Bedrock) error response"""
+    error = {"type": error_type, "message": error_message}
+    if details:
+        error["details"] = details
+    return {"statusCode": status_code, "body": {"error": error}}
+
+
+def format_success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
+    """Format a plain (non-Bedrock) success response"""
+    return {"statusCode": 200, "body": {"message": message, "data": data}}
+
+
+def format_bedrock_response(
+    action_group: str,
+    api_path: str,
+    http_method: str,
+    response_body: Any,
+    http_status_code: int = 200
+) -> Dict[str, Any]:
+    """
+    Format a response for Bedrock Agent action groups
+
+    Args:
+        action_group: Action group name
+        api_path: API path of the action (e.g. "/list-projects")
+        http_method: HTTP method from the event
+        response_body: Result dict; serialized with serialize_body
+        http_status_code: HTTP status code
+    """
+    return {
+        "messageVersion": "1.0",
+        "response": {
+            "actionGroup": action_group,
+            "apiPath": api_path,
+            "httpMethod": http_method,
+            "httpStatusCode": http_status_code,
+            "responseBody": {
+                "application/json": {
+                    "body": serialize_body(response_body)
+                }
+            }
+        }
+    }
+
+# ============================================================================
+# Decorator and Logging
+# ============================================================================
+
+def handle_errors(func: Callable) -> Callable:
+    """
+    Decorator for handlers of the form handler(event, ...) returning a Bedrock
+    response. Exceptions are classified and returned as Bedrock error responses.
+    """
+    @functools.wraps(func)
+    def wrapper(event: Dict[str, Any], *args, **kwargs):
+        try:
+            return func(event, *args, **kwargs)
+        except Exception as e:
+            error_type, status_code = classify_error(e)
+            if status_code >= 500:
+                logger.error(f"{func.__name__} failed: {str(e)}", exc_info=True)
+            else:
+                logger.warning(f"{func.__name__} failed ({error_type}): {str(e)}")
+
+            return format_bedrock_response(
+                action_group=event.get("actionGroup", "unknown"),
+                api_path=event.get("apiPath", "/error"),
+                http_method=event.get("httpMethod", "POST"),
+                response_body={"error": str(e), "type": error_type},
+                http_status_code=status_code
+            )
+    return wrapper
+
+
+def log_request(event: Dict[str, Any], context: Any = None) -> None:
+    """Log an incoming Bedrock event (full event only when sampled, redacted)"""
+    logger.info(
+        "Request: actionGroup=%s apiPath=%s sessionId=%s requestId=%s",
+        event.get("actionGroup"), event.get("apiPath"), event.get("sessionId"),
+        getattr(context, "aws_request_id", None)
+    )
+    log_payload("Event", event)
+
+
+def log_response(response: Dict[str, Any]) -> None:
+    """Log the status of an outgoing Bedrock response"""
+    inner = response.get("response", {})
+    logger.info("Response: apiPath=%s status=%s", inner.get("apiPath"), inner.get("httpStatusCode"))
@@ -0,0 +1,231 @@
+"""
+Pooled HTTP client for PF360 API calls
+Shared by the scheduling, information and notes action Lambdas
+
+A single requests.Session is created on first use and kept at module level,
+so warm Lambda containers reuse open TCP/TLS connections instead of paying a
+new handshake on every action invocation. requests itself is imported on first
+use too, so mock-mode cold starts never load it.
+
+Environment variables:
+    HTTP_POOL_CONNECTIONS  - Number of per-host connection pools (default: 4)
+    HTTP_POOL_MAXSIZE      - Max keep-alive connections per host (default: 10)
+    HTTP_CONNECT_TIMEOUT   - Connect timeout in seconds (default: 3.05)
+    HTTP_READ_TIMEOUT      - Read timeout in seconds (default: 30)
+    HTTP_MAX_RETRIES       - Retries for idempotent GETs (default: 2)
+    HTTP_BACKOFF_BASE      - Base backoff in seconds (default: 0.2)
+    HTTP_BACKOFF_MAX       - Max backoff in seconds (default: 2.0)
+"""
+
+import logging
+import os
+import random
+import sys
+import time
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
+
+try:
+    from .invocation_log import record_upstream
+except ImportError:  # imported flat (python/lib on sys.path)
+    from invocation_log import record_upstream
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.2"))
+BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "2.0"))
+
+# Upstream statuses worth retrying on a GET
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Statuses a failed POST can be repeated after: the upstream refused it without applying it
+RETRY_POST_STATUS_CODES = frozenset({429, 500, 502, 503})
+
+# Module-level session, reused across warm invocations
+_session: Optional["requests.Session"] = None
+
+# ============================================================================
+# Session Management
+# ============================================================================
+
+def get_http_session() -> "requests.Session":
+    """
+    Return the shared pooled session, creating it on first use
+
+    Returns:
+        requests.Session with keep-alive connection pools mounted for http/https
+    """
+    global _session
+
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=0  # Retries are handled in http_get with jitter
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session = session
+        logger.info(
+            f"Created pooled HTTP session (pools={POOL_CONNECTIONS}, maxsize={POOL_MAXSIZE})"
+        )
+
+    return _session
+
+
+def reset_http_session() -> None:
+    """Close and discard the shared session (useful for testing)"""
+    global _session
+
+    if _session is not None:
+        _session.close()
+    _session = None
+
+
+def get_timeout(read_timeout: Optional[float] = None) -> Tuple[float, float]:
+    """
+    Build a (connect, read) timeout tuple
+
+    Args:
+        read_timeout: Read timeout override in seconds (default: HTTP_READ_TIMEOUT)
+
+    Returns:
+        Tuple of (connect_timeout, read_timeout)
+    """
+    return (CONNECT_TIMEOUT, read_timeout if read_timeout is not None else READ_TIMEOUT)
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Full-jitter exponential backoff for the given retry attempt (0-based)
+
+    Returns:
+        Delay in seconds between 0 and min(BACKOFF_MAX, BACKOFF_BASE * 2^attempt)
+    """
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+# ============================================================================
+# Request Helpers
+# ============================================================================
+
+def request_errors() -> Tuple[type, ...]:
+    """
+    Exception types raised by failed HTTP calls, for use in except clauses
+
+    Returns () until requests has been imported: no call can have failed
+    before then, and callers avoid importing requests just to name the type.
+    httpx errors are included once the async runtime has loaded httpx.
+    """
+    modules = ((sys.modules.get("requests"), "RequestException"), (sys.modules.get("httpx"), "HTTPError"))
+    return tuple(getattr(module, attr) for module, attr in modules if module is not None)
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status of a failed request's response (None if there was no response)"""
+    return getattr(getattr(error, "response", None), "status_code", None)
+
+
+def write_not_applied(error: Exception) -> bool:
+    """
+    Whether a failed POST certainly did not reach the upstream, so repeating it is safe
+
+    True for connection errors (including connect timeouts) and for
+    RETRY_POST_STATUS_CODES responses. False for read timeouts and 504s, after
+    which the upstream may have stored the write, and for other statuses.
+    """
+    requests = sys.modules.get("requests")
+    if requests is None:
+        return False
+    if isinstance(error, requests.HTTPError):
+        return error_status(error) in RETRY_POST_STATUS_CODES
+    return isinstance(error, requests.ConnectionError)
+
+
+def http_get(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    read_timeout: Optional[float] = None,
+    retries: Optional[int] = None
+) -> "requests.Response":
+    """
+    GET through the pooled session, retrying transient failures
+
+    Connection errors, timeouts and 429/502/503/504 responses are retried with
+    jittered backoff. Pass retries=0 for GET endpoints that are not idempotent
+    (e.g. PF360 cancel-reschedule).
+
+    Args:
+        url: Request URL
+        headers: Request headers
+        params: Query string parameters
+        read_timeout: Read timeout override in seconds
+        retries: Retry count override (default: HTTP_MAX_RETRIES)
+
+    Returns:
+        requests.Response (caller is responsible for raise_for_status)
+    """
+    import requests
+
+    session = get_http_session()
+    max_retries = MAX_RETRIES if retries is None else retries
+    timeout = get_timeout(read_timeout)
+    attempt = 0
+
+    while True:
+        started = time.perf_counter()
+        try:
+            res = session.get(url, headers=headers, params=params, timeout=timeout)
+            record_upstream((time.perf_counter() - started) * 1000)
+            if res.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+                return res
+            logger.warning(f"GET {url} returned {res.status_code}, retrying ({attempt + 1}/{max_retries})")
+        except (requests.ConnectionError, requests.Timeout) as e:
+            record_upstream((time.perf_counter() - started) * 1000)
+            if attempt >= max_retries:
+                raise
+            logger.warning(f"GET {url} failed: {str(e)}, retrying ({attempt + 1}/{max_retries})")
+
+        time.sleep(backoff_delay(attempt))
+        attempt += 1
+
+
+def http_post(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    json: Optional[Dict[str, Any]] = None,
+    read_timeout: Optional[float] = None
+) -> "requests.Response":
+    """
+    POST through the pooled session (never retried)
+
+    Args:
+        url: Request URL
+        headers: Request headers
+        json: JSON payload
+        read_timeout: Read timeout override in seconds
+
+    Returns:
+        requests.Response (caller is responsible for raise_for_status)
+    """
+    session = get_http_session()
+    started = time.perf_counter()
+    try:
+        return session.post(url, headers=headers, json=json, timeout=get_timeout(read_timeout))
+    finally:
+        record_upstream((time.perf_counter() - started) * 1000)
@@ -0,0 +1,246 @@
+"""
+Idempotency store for write actions (confirm, cancel, reschedule)
+
+Bedrock Agent retries action invocations, so the same confirm can reach PF360
+several times. Routers register write actions with idempotent=True; for those,
+the result of the latest write per (Bedrock session, project) is kept with its
+fingerprint (action, date, time, new_date, new_time, request_id). A repeat of
+that same write within the window returns the stored result without calling
+PF360 again. A different write for the project (e.g. a cancel after a confirm)
+always runs and becomes the new latest write, so legitimate follow-up actions
+are never swallowed.
+
+Two backends:
+  1. In-process (retries that land on the same warm container), used when no
+     table is configured
+  2. DynamoDB tier shared across containers, which is then the source of
+     truth since a later write may have run elsewhere. Items are keyed
+     "idem#<session>#<project>" (lib/dynamo_tier.py, sessions table). A conditional "in_progress" claim
+     makes concurrent duplicates wait for the first call's result instead of
+     writing upstream twice.
+
+DynamoDB failures are logged and the write proceeds: the store must never
+block a booking.
+
+Environment variables:
+    IDEMPOTENCY_TABLE             - DynamoDB table for the shared tier (default: disabled)
+    IDEMPOTENCY_TTL_SECONDS       - Replay window for completed writes (default: 300)
+    IDEMPOTENCY_CLAIM_SECONDS     - Lifetime of an in-progress claim (default: 60)
+    IDEMPOTENCY_WAIT_SECONDS      - How long a duplicate waits for the first call (default: 5)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable
+
+try:
+    from .dynamo_tier import DynamoTier, error_code
+    from .invocation_log import count
+except ImportError:  # imported flat (python/lib on sys.path)
+    from dynamo_tier import DynamoTier, error_code
+    from invocation_log import count
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_TABLE = os.getenv("IDEMPOTENCY_TABLE", "")
+DEFAULT_TTL = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "300"))
+DEFAULT_CLAIM_SECONDS = int(os.getenv("IDEMPOTENCY_CLAIM_SECONDS", "60"))
+DEFAULT_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "5"))
+
+# Parameters that distinguish one write from another for the same project
+FINGERPRINT_FIELDS = ("date", "time", "new_date", "new_time", "request_id")
+
+MAX_LOCAL_ENTRIES = 1024
+MAX_DYNAMODB_RESULT_BYTES = 350 * 1024
+POLL_INTERVAL_SECONDS = 0.2
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+
+class IdempotencyConflictError(Exception):
+    """An identical write is still in progress and did not finish in time"""
+
+
+def fingerprint(action: str, params: Dict[str, Any]) -> str:
+    """Identify a write: the action plus the parameters that distinguish it"""
+    return "|".join([action, *(str(params.get(field) or "") for field in FINGERPRINT_FIELDS)])
+
+# ============================================================================
+# Store
+# ============================================================================
+
+class IdempotencyStore:
+    """Latest write result per (session, project), replayed for identical retries"""
+
+    def __init__(
+        self,
+        table_name: Optional[str] = None,
+        ttl_seconds: int = DEFAULT_TTL,
+        claim_seconds: int = DEFAULT_CLAIM_SECONDS,
+        wait_seconds: float = DEFAULT_WAIT_SECONDS
+    ):
+        """
+        Args:
+            table_name: DynamoDB table for the shared tier (None: IDEMPOTENCY_TABLE)
+            ttl_seconds: Replay window for completed writes
+            claim_seconds: Lifetime of an in-progress claim (covers crashed invocations)
+            wait_seconds: How long a concurrent duplicate waits for the first result
+        """
+        self.remote = DynamoTier("idem", DEFAULT_TABLE if table_name is None else table_name, "Idempotency")
+        self.ttl_seconds = ttl_seconds
+        self.claim_seconds = claim_seconds
+        self.wait_seconds = wait_seconds
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------------
+
+    def run(
+        self,
+        session_id: Optional[str],
+        action: str,
+        params: Dict[str, Any],
+        execute: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Execute a write once per session, project and fingerprint
+
+        Args:
+            session_id: Bedrock session ID (writes without one are not deduplicated)
+            action: Normalized action name
+            params: Action parameters (project_id plus FINGERPRINT_FIELDS)
+            execute: Zero-argument callable performing the write
+
+        Returns:
+            The write's result, or the stored result of an identical earlier write
+
+        Raises:
+            IdempotencyConflictError: An identical write is still in progress
+        """
+        project_id = params.get("project_id")
+        if not session_id or not project_id:
+            return execute()
+
+        key = (str(session_id), str(project_id))
+        fp = fingerprint(action, params)
+
+        if self.remote.enabled:
+            result = self._claim_or_replay(key, fp)
+        else:
+            result = self._get_local(key, fp)
+        if result is not None:
+            logger.info("Replaying %s for session %s project %s", action, session_id, project_id)
+            count("idempotent_replay")
+            return result
+
+        try:
+            result = execute()
+        except Exception:
+            self._release_remote(key, fp)
+            raise
+
+        self._complete(key, fp, result)
+        return result
+
+    def clear(self) -> None:
+        """Clear the in-process tier (useful for testing)"""
+        with self._lock:
+            self._entries.clear()
+
+    # ------------------------------------------------------------------------
+    # In-process tier
+    # ------------------------------------------------------------------------
+
+    def _get_local(self, key: tuple, fp: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["fingerprint"] != fp or entry["expires_at"] <= time.time():
+                return None
+            return entry["result"]
+
+    def _complete(self, key: tuple, fp: str, result: Dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = {"fingerprint": fp, "result": result, "expires_at": expires_at}
+            self._entries.move_to_end(key)
+            while len(self._entries) > MAX_LOCAL_ENTRIES:
+                self._entries.popitem(last=False)
+        self._put_remote(key, fp, result, expires_at)
+
+    # ------------------------------------------------------------------------
+    # DynamoDB tier (best effort: failures are logged, never raised)
+    # ------------------------------------------------------------------------
+
+    def _claim_or_replay(self, key: tuple, fp: str) -> Optional[Dict[str, Any]]:
+        """
+        Claim the write, or return the stored result of an identical one
+
+        Returns:
+            None when this invocation should perform the write
+        """
+        table = self.remote.table
+        deadline = time.time() + self.wait_seconds
+        while True:
+            now = int(time.time())
+            try:
+                table.put_item(
+                    Item={**self.remote.key(*key), "status": IN_PROGRESS, "fingerprint": fp,
+                          "ttl": now + self.claim_seconds},
+                    ConditionExpression="attribute_not_exists(session_id) OR #ttl < :now OR fingerprint <> :fp",
+                    ExpressionAttributeNames={"#ttl": "ttl"},
+                    ExpressionAttributeValues={":now": now, ":fp": fp}
+                )
+                return None
+            except Exception as e:
+                if error_code(e) != "ConditionalCheckFailedException":
+                    logger.warning("Idempotency claim failed, proceeding without it: %s", e)
+                    return None
+
+            # An unexpired item with the same fingerprint exists
+            try:
+                item = table.get_item(Key=self.remote.key(*key), ConsistentRead=True).get("Item")
+            except Exception as e:
+                logger.warning("Idempotency read failed, proceeding without it: %s", e)
+                return None
+
+            if item and item.get("status") == COMPLETED and item.get("fingerprint") == fp:
+                return json.loads(item["result"])
+
+            if time.time() >= deadline:
+                raise IdempotencyConflictError("An identical request is already in progress; retry shortly")
+            time.sleep(POLL_INTERVAL_SECONDS)
+
+    def _put_remote(self, key: tuple, fp: str, result: Dict[str, Any], expires_at: float) -> None:
+        if not self.remote.enabled:
+            return
+        payload = json.dumps(result, separators=(",", ":"), default=str)
+        if len(payload) > MAX_DYNAMODB_RESULT_BYTES:
+            # Drop the claim so retries are not held up by a result we cannot store
+            logger.info("Idempotent result too large for DynamoDB (%s bytes)", len(payload))
+            self._release_remote(key, fp)
+            return
+        self.remote.put(key, {"status": COMPLETED, "fingerprint": fp, "result": payload}, expires_at)
+
+    def _release_remote(self, key: tuple, fp: str) -> None:
+        """Drop our in-progress claim after a failed write so a retry can run it"""
+        self.remote.delete(
+            key,
+            ConditionExpression="fingerprint = :fp AND #status = :in_progress",
+            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeValues={":fp": fp, ":in_progress": IN_PROGRESS}
+        )
+
+
+# Module-level store, reused across warm invocations
+idempotency_store = IdempotencyStore()
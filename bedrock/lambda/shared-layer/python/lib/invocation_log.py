@@ -0,0 +1,258 @@
+"""
+Structured, sampled invocation logging for action Lambdas
+
+Each invocation emits exactly one JSON summary line (action, status, total
+and upstream latency, cold start) through the metrics sink, by default as a
+CloudWatch Embedded Metric Format line (see metrics). Handlers and shared code
+add timings and counters to the current invocation:
+
+    with timer("dashboard_load"):        # -> dashboard_load_ms
+        ...
+    count("dashboard_cache_hit")         # -> dashboard_cache_hit
+
+Full payload logging (events, parameters) is sampled, redacted and
+size-capped, and payloads are only serialized when the invocation is sampled.
+
+Environment variables:
+    LOG_SAMPLE_RATE          - Fraction of invocations whose payloads are logged (default: 0.01)
+    LOG_PAYLOAD_MAX_CHARS    - Max characters per logged payload (default: 2048)
+    LOG_REDACT_KEYS          - Comma-separated keys to redact (default: auth/contact fields)
+    LOG_INVOCATION_SUMMARY   - Emit the per-invocation JSON line (default: true)
+    LOG_LEVEL                - DEBUG logs every payload regardless of sampling
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+import functools
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Callable, Iterator
+
+try:
+    from . import metrics as metrics_sink
+except ImportError:  # imported flat (python/lib on sys.path)
+    import metrics as metrics_sink
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "2048"))
+REDACT_KEYS = frozenset(
+    key.strip().lower()
+    for key in os.getenv(
+        "LOG_REDACT_KEYS",
+        "authorization,auth_token,token,password,secret,api_key,x-api-key,email,phone,phone_number"
+    ).split(",")
+    if key.strip()
+)
+SUMMARY_ENABLED = os.getenv("LOG_INVOCATION_SUMMARY", "true").lower() == "true"
+DEBUG_PAYLOADS = os.getenv("LOG_LEVEL", "INFO").upper() == "DEBUG"
+
+REDACTED = "***"
+
+# ============================================================================
+# Payload Helpers
+# ============================================================================
+
+def redact(value: Any) -> Any:
+    """Return a copy of value with REDACT_KEYS masked at any depth"""
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if str(k).lower() in REDACT_KEYS else redact(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        # Bedrock parameter lists: [{"name": "authorization", "value": "..."}]
+        return [
+            {**item, "value": REDACTED}
+            if isinstance(item, dict) and str(item.get("name", "")).lower() in REDACT_KEYS and "value" in item
+            else redact(item)
+            for item in value
+        ]
+    return value
+
+
+def truncate(text: str, max_chars: int = PAYLOAD_MAX_CHARS) -> str:
+    """Cap a logged string, noting how much was dropped"""
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}...[truncated {len(text) - max_chars} chars]"
+
+
+def is_sampled() -> bool:
+    """Sampling decision for payload logging"""
+    return DEBUG_PAYLOADS or random.random() < SAMPLE_RATE
+
+
+def _write_payload(label: str, payload: Any) -> None:
+    try:
+        text = json.dumps(redact(payload), default=str, separators=(",", ":"))
+    except (TypeError, ValueError):
+        text = repr(payload)
+    logger.info("%s: %s", label, truncate(text))
+
+# ============================================================================
+# Invocation Log
+# ============================================================================
+
+class InvocationLog:
+    """Per-invocation state: timings, counters, upstream calls, sampling decision, summary fields"""
+
+    def __init__(self, action_group: str, event: Dict[str, Any], context: Any = None, cold_start: bool = False):
+        self.started = time.perf_counter()
+        self.sampled = is_sampled()
+        self.upstream_ms = 0.0
+        self.upstream_calls = 0
+        self.upstream_call_ms = []
+        self._metrics: Dict[str, list] = {}  # name -> [value, unit]
+        self._lock = threading.Lock()  # upstream calls may run on worker threads
+        self.fields: Dict[str, Any] = {
+            "type": "invocation",
+            "action_group": event.get("actionGroup", action_group),
+            "api_path": event.get("apiPath"),
+            "session_id": event.get("sessionId"),
+            "request_id": getattr(context, "aws_request_id", None),
+            "cold_start": cold_start
+        }
+
+    def set(self, **fields) -> None:
+        """Add fields to the summary line"""
+        self.fields.update(fields)
+
+    def add_metric(self, name: str, value: float, unit: str = "Count") -> None:
+        """Add value to a metric (metrics of the same name are summed)"""
+        with self._lock:
+            entry = self._metrics.setdefault(name, [0, unit])
+            entry[0] += value
+
+    def record_upstream(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.upstream_ms += elapsed_ms
+            self.upstream_calls += 1
+            self.upstream_call_ms.append(round(elapsed_ms, 2))
+
+    def log_payload(self, label: str, payload: Any) -> None:
+        """Log a redacted, size-capped payload if this invocation is sampled"""
+        if self.sampled:
+            _write_payload(label, payload)
+
+    def metrics(self) -> metrics_sink.Metrics:
+        """Metric values and units for this invocation so far"""
+        with self._lock:
+            result = {
+                "total_ms": (round((time.perf_counter() - self.started) * 1000, 2), "Milliseconds"),
+                "upstream_ms": (round(self.upstream_ms, 2), "Milliseconds"),
+                "upstream_calls": (self.upstream_calls, "Count")
+            }
+            if self.upstream_call_ms:
+                result["upstream_call_ms"] = (list(self.upstream_call_ms), "Milliseconds")
+            for name, (value, unit) in self._metrics.items():
+                result[name] = (round(value, 2) if isinstance(value, float) else value, unit)
+        return result
+
+    def properties(self, status_code: int) -> Dict[str, Any]:
+        """Non-metric summary fields"""
+        return {**self.fields, "status": status_code, "sampled": self.sampled}
+
+    def summary(self, status_code: int) -> Dict[str, Any]:
+        """Summary fields and metric values as one flat dict"""
+        return {
+            **self.properties(status_code),
+            **{name: value for name, (value, _) in self.metrics().items()}
+        }
+
+    def finish(self, status_code: int) -> Dict[str, Any]:
+        """Publish the single summary line for this invocation"""
+        properties = self.properties(status_code)
+        values = self.metrics()
+        if SUMMARY_ENABLED:
+            metrics_sink.publish(properties, values)
+        return {**properties, **{name: value for name, (value, _) in values.items()}}
+
+# ============================================================================
+# Current Invocation
+# ============================================================================
+
+# A Lambda container handles one invocation at a time; worker threads of that
+# invocation (batch steps, slot prefetch) share it through this module global
+_current: Optional[InvocationLog] = None
+_cold_start = True
+
+
+def start_invocation(action_group: str, event: Dict[str, Any], context: Any = None) -> InvocationLog:
+    """Begin logging an invocation and make it current"""
+    global _current, _cold_start
+    _current = InvocationLog(action_group, event, context, cold_start=_cold_start)
+    _cold_start = False
+    return _current
+
+
+def current_invocation() -> Optional[InvocationLog]:
+    """Return the invocation being handled, if any"""
+    return _current
+
+
+def end_invocation(status_code: int) -> Optional[Dict[str, Any]]:
+    """Emit the current invocation's summary line and clear it"""
+    global _current
+    invocation, _current = _current, None
+    return invocation.finish(status_code) if invocation is not None else None
+
+
+def record_upstream(elapsed_ms: float) -> None:
+    """Attribute time spent in an outbound call to the current invocation"""
+    invocation = _current
+    if invocation is not None:
+        invocation.record_upstream(elapsed_ms)
+
+
+def add_metric(name: str, value: float, unit: str = "Count") -> None:
+    """Add to a metric of the current invocation (no-op outside an invocation)"""
+    invocation = _current
+    if invocation is not None:
+        invocation.add_metric(name, value, unit)
+
+
+def count(name: str, value: int = 1) -> None:
+    """Increment a counter (e.g. cache hits) on the current invocation"""
+    add_metric(name, value, "Count")
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """Record the time spent in the block as <name>_ms on the current invocation"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_metric(f"{name}_ms", (time.perf_counter() - started) * 1000, "Milliseconds")
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorator form of timer()"""
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def log_payload(label: str, payload: Any) -> None:
+    """
+    Sampled payload logging. Inside an invocation the invocation's sampling
+    decision applies; outside one each call is sampled independently.
+    """
+    invocation = _current
+    if invocation is not None:
+        invocation.log_payload(label, payload)
+    elif is_sampled():
+        _write_payload(label, payload)
@@ -0,0 +1,212 @@
+"""
+Per-invocation metrics for action Lambdas
+
+The invocation summary built by invocation_log is published through a sink:
+
+  - "emf" (default): one CloudWatch Embedded Metric Format line on stdout.
+    CloudWatch extracts the metrics (total_ms, handler_ms, upstream_ms,
+    upstream_call_ms, payload_bytes, cache hit/miss counts, ...) with the
+    dimensions action_group/action/mode; the other fields stay searchable in
+    Logs Insights.
+  - "log": the same line without EMF metadata
+  - "off": nothing is written
+
+LocalAggregator collects summaries in memory for tests and local benchmarks:
+
+    with capture() as aggregator:
+        handler.lambda_handler(event, None)
+    print(aggregator.report())
+
+Environment variables:
+    METRICS_SINK       - emf | log | off (default: emf)
+    METRICS_NAMESPACE  - CloudWatch namespace (default: SchedulingAgent/Actions)
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+NAMESPACE = os.getenv("METRICS_NAMESPACE", "SchedulingAgent/Actions")
+DEFAULT_SINK = os.getenv("METRICS_SINK", "emf").lower()
+
+DIMENSIONS = ["action_group", "action", "mode"]
+
+# EMF accepts at most 100 values per metric
+MAX_METRIC_VALUES = 100
+
+# metric name -> (value or list of values, unit)
+Metrics = Dict[str, Tuple[Any, str]]
+
+# ============================================================================
+# EMF Formatting
+# ============================================================================
+
+def to_emf(summary: Dict[str, Any], metrics: Metrics, timestamp_ms: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Build an EMF document from summary properties and metric values
+
+    Args:
+        summary: Invocation properties (must include the DIMENSIONS keys)
+        metrics: Metric name -> (value or list of values, unit)
+        timestamp_ms: Epoch milliseconds (default: now)
+    """
+    document = {k: ("unknown" if k in DIMENSIONS and v is None else v) for k, v in summary.items()}
+    for name, (value, _) in metrics.items():
+        document[name] = value[:MAX_METRIC_VALUES] if isinstance(value, list) else value
+
+    document["_aws"] = {
+        "Timestamp": timestamp_ms if timestamp_ms is not None else int(time.time() * 1000),
+        "CloudWatchMetrics": [{
+            "Namespace": NAMESPACE,
+            "Dimensions": [DIMENSIONS],
+            "Metrics": [{"Name": name, "Unit": unit} for name, (_, unit) in metrics.items()]
+        }]
+    }
+    return document
+
+# ============================================================================
+# Sinks
+# ============================================================================
+
+class StdoutSink:
+    """Write one JSON line per invocation (EMF or plain)"""
+
+    def __init__(self, emf: bool = True):
+        self.emf = emf
+
+    def publish(self, summary: Dict[str, Any], metrics: Metrics) -> None:
+        if self.emf:
+            document = to_emf(summary, metrics)
+        else:
+            document = {**summary, **{name: value for name, (value, _) in metrics.items()}}
+        print(json.dumps(document, default=str, separators=(",", ":")), flush=True)
+
+
+class NullSink:
+    """Discard metrics"""
+
+    def publish(self, summary: Dict[str, Any], metrics: Metrics) -> None:
+        pass
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class LocalAggregator:
+    """In-memory sink with per-action statistics"""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def publish(self, summary: Dict[str, Any], metrics: Metrics) -> None:
+        record = {**summary, **{name: value for name, (value, _) in metrics.items()}}
+        with self._lock:
+            self.records.append(record)
+
+    def values(self, metric: str, action: Optional[str] = None) -> List[float]:
+        """All recorded values of a scalar metric (optionally for one action)"""
+        return [
+            r[metric] for r in self.records
+            if metric in r and not isinstance(r[metric], list) and (action is None or r.get("action") == action)
+        ]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-action statistics
+
+        Returns:
+            action -> {count, errors, total_ms/upstream_ms p50/p95/max,
+                       upstream_share, payload_bytes_avg, counters}
+        """
+        result = {}
+        for action in sorted({r.get("action") or "unknown" for r in self.records}):
+            records = [r for r in self.records if (r.get("action") or "unknown") == action]
+            total = [r.get("total_ms", 0.0) for r in records]
+            upstream = [r.get("upstream_ms", 0.0) for r in records]
+            payload = [r.get("payload_bytes", 0) for r in records]
+
+            counters: Dict[str, int] = {}
+            for r in records:
+                for name, value in r.items():
+                    if name.endswith(("_hit", "_miss")):
+                        counters[name] = counters.get(name, 0) + value
+
+            result[action] = {
+                "count": len(records),
+                "errors": sum(1 for r in records if r.get("status", 200) >= 400),
+                "total_ms_p50": _percentile(total, 50),
+                "total_ms_p95": _percentile(total, 95),
+                "total_ms_max": max(total),
+                "upstream_ms_p50": _percentile(upstream, 50),
+                "upstream_ms_p95": _percentile(upstream, 95),
+                "upstream_share": round(sum(upstream) / sum(total), 3) if sum(total) else 0.0,
+                "payload_bytes_avg": statistics.mean(payload) if payload else 0,
+                "counters": counters
+            }
+        return result
+
+    def report(self) -> str:
+        """Plain-text table of stats()"""
+        lines = [f"{'action':<24} {'n':>5} {'err':>4} {'total p50':>10} {'total p95':>10} "
+                 f"{'upstream p50':>13} {'upstream %':>11} {'bytes':>8}"]
+        for action, s in self.stats().items():
+            lines.append(
+                f"{action:<24} {s['count']:>5} {s['errors']:>4} {s['total_ms_p50']:>8.1f}ms "
+                f"{s['total_ms_p95']:>8.1f}ms {s['upstream_ms_p50']:>11.1f}ms "
+                f"{s['upstream_share'] * 100:>10.1f}% {s['payload_bytes_avg']:>8.0f}"
+            )
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
+
+
+def _default_sink():
+    if DEFAULT_SINK == "off":
+        return NullSink()
+    return StdoutSink(emf=DEFAULT_SINK != "log")
+
+
+_sink = _default_sink()
+
+
+def get_sink():
+    return _sink
+
+
+def set_sink(sink) -> None:
+    """Replace the active sink (any object with publish(summary, metrics))"""
+    global _sink
+    _sink = sink
+
+
+def publish(summary: Dict[str, Any], metrics: Metrics) -> None:
+    """Publish one invocation's summary and metrics through the active sink"""
+    _sink.publish(summary, metrics)
+
+
+@contextmanager
+def capture() -> Iterator[LocalAggregator]:
+    """Temporarily route metrics to a LocalAggregator"""
+    previous = _sink
+    aggregator = LocalAggregator()
+    set_sink(aggregator)
+    try:
+        yield aggregator
+    finally:
+        set_sink(previous)
@@ -0,0 +1,235 @@
+"""
+Inverted index for full-text search over a project's notes
+
+    index = notes_index_cache.get_or_build(project_id, load_notes)
+    results = index.search("gate code", limit=5)
+
+Each project gets its own index: token -> {note_id: term frequency}
+postings plus per-note lengths. A search reads only the postings of the
+query tokens, so its cost follows the number of matching notes rather than
+the length of the history. Results are ranked with BM25, with ties broken
+newest first.
+
+Tokens are lowercased alphanumeric runs with common stopwords dropped and a
+light plural fold ("appointments" -> "appointment"), applied the same way to
+notes and queries.
+
+Indexes live in an in-process LRU (NOTES_INDEX_MAX_PROJECTS), rebuilt from
+the notes store when missing or older than NOTES_INDEX_TTL. add_note adds
+new notes to a cached index directly, so they are searchable immediately in
+the container that stored them; other containers see them after the TTL.
+
+Environment variables:
+    NOTES_INDEX_TTL           - Seconds before a project's index is rebuilt (default: 300)
+    NOTES_INDEX_MAX_PROJECTS  - Project indexes kept per container (default: 256)
+    NOTES_SEARCH_LIMIT        - Default number of results (default: 5)
+    NOTES_SEARCH_MAX_LIMIT    - Largest limit a caller may request (default: 25)
+"""
+
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Callable, Iterable, Optional, Tuple
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_TTL = int(os.getenv("NOTES_INDEX_TTL", "300"))
+DEFAULT_MAX_PROJECTS = int(os.getenv("NOTES_INDEX_MAX_PROJECTS", "256"))
+SEARCH_LIMIT = int(os.getenv("NOTES_SEARCH_LIMIT", "5"))
+SEARCH_MAX_LIMIT = int(os.getenv("NOTES_SEARCH_MAX_LIMIT", "25"))
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it its me my "
+    "not of on or our that the their this to was we were will with you your "
+    "about note notes".split()
+)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# ============================================================================
+# Tokenizer
+# ============================================================================
+
+def fold_plural(token: str) -> str:
+    """Light plural folding: "appointments" -> "appointment", "boxes" -> "box" """
+    if len(token) <= 3 or token.isdigit() or token.endswith(("ss", "us", "is")):
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith(("ches", "shes", "xes", "sses")):
+        return token[:-2]
+    if token.endswith("s"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Index/query tokens of a text, in order (duplicates kept)"""
+    if not text:
+        return []
+    return [fold_plural(token) for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def search_limit(limit: Any) -> int:
+    """
+    Clamp a requested result count to 1..NOTES_SEARCH_MAX_LIMIT (default NOTES_SEARCH_LIMIT)
+
+    Raises:
+        ValueError: Non-numeric limit
+    """
+    if limit in (None, ""):
+        return SEARCH_LIMIT
+    try:
+        return max(1, min(int(limit), SEARCH_MAX_LIMIT))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid limit: {limit}")
+
+# ============================================================================
+# Index
+# ============================================================================
+
+class NotesIndex:
+    """Inverted index over one project's notes"""
+
+    def __init__(self, notes: Iterable[Dict[str, Any]] = ()):
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.notes: Dict[str, Dict[str, Any]] = {}
+        self.lengths: Dict[str, int] = {}
+        self.total_length = 0
+        self._lock = threading.Lock()
+        for note in notes:
+            self.add(note)
+
+    def __len__(self) -> int:
+        return len(self.notes)
+
+    @staticmethod
+    def note_key(note: Dict[str, Any]) -> str:
+        return str(note.get("note_id") or f"{note.get('project_id')}#{note.get('timestamp') or note.get('created_at')}")
+
+    def add(self, note: Dict[str, Any]) -> bool:
+        """
+        Index one note (notes already indexed are ignored)
+
+        Returns:
+            True if the note was added
+        """
+        key = self.note_key(note)
+        tokens = tokenize(note.get("note_text")) + tokenize(note.get("author"))
+        with self._lock:
+            if key in self.notes:
+                return False
+            self.notes[key] = note
+            self.lengths[key] = len(tokens)
+            self.total_length += len(tokens)
+            for token in tokens:
+                postings = self.postings.setdefault(token, {})
+                postings[key] = postings.get(key, 0) + 1
+        return True
+
+    def search(self, query: str, limit: Any = None) -> List[Tuple[Dict[str, Any], float, List[str]]]:
+        """
+        Rank notes matching any query token
+
+        Args:
+            query: Free text
+            limit: Maximum results (see search_limit)
+
+        Returns:
+            List of (note, score, matched tokens), best first
+        """
+        size = search_limit(limit)
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            count = len(self.notes)
+            if not terms or not count:
+                return []
+            average_length = self.total_length / count or 1.0
+
+            scores: Dict[str, float] = {}
+            matched: Dict[str, List[str]] = {}
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    norm = K1 * (1 - B + B * self.lengths[key] / average_length)
+                    scores[key] = scores.get(key, 0.0) + idf * frequency * (K1 + 1) / (frequency + norm)
+                    matched.setdefault(key, []).append(term)
+
+            best = heapq.nlargest(size, scores, key=lambda key: (scores[key], self._recency(key)))
+            return [(self.notes[key], round(scores[key], 4), matched[key]) for key in best]
+
+    def _recency(self, key: str) -> str:
+        note = self.notes[key]
+        return str(note.get("timestamp") or note.get("created_at") or "")
+
+# ============================================================================
+# Per-Project Cache
+# ============================================================================
+
+class NotesIndexCache:
+    """LRU of project indexes with TTL"""
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL, max_projects: int = DEFAULT_MAX_PROJECTS):
+        self.ttl_seconds = ttl_seconds
+        self.max_projects = max_projects
+        self._entries: "OrderedDict[str, Tuple[float, NotesIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, project_id: str, loader: Callable[[], Iterable[Dict[str, Any]]]) -> Tuple[NotesIndex, bool]:
+        """
+        Return (index, built) for a project, calling loader() for all its notes on a miss
+
+        Args:
+            project_id: Project identifier
+            loader: Zero-argument callable returning the project's notes
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(project_id)
+                return entry[1], False
+
+        index = NotesIndex(loader())
+        with self._lock:
+            self._entries[project_id] = (now + self.ttl_seconds, index)
+            self._entries.move_to_end(project_id)
+            while len(self._entries) > self.max_projects:
+                self._entries.popitem(last=False)
+        return index, True
+
+    def add(self, project_id: str, note: Dict[str, Any]) -> bool:
+        """
+        Add a new note to the project's cached index, if there is one
+
+        Returns:
+            True if a cached index was updated (otherwise the next build includes the note)
+        """
+        with self._lock:
+            entry = self._entries.get(project_id)
+        return entry is not None and entry[1].add(note)
+
+    def invalidate(self, project_id: Optional[str] = None) -> None:
+        """Drop one project's index, or all of them"""
+        with self._lock:
+            if project_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(project_id, None)
+
+
+# Module-level cache, reused across warm invocations
+notes_index_cache = NotesIndexCache()
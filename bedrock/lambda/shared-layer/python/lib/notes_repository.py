@@ -0,0 +1,338 @@
+"""
+DynamoDB notes repository
+
+Notes live in a table keyed by project_id (partition) and timestamp (sort,
+ISO 8601), so one project's history is a single Query, newest first.
+
+  - list() reads one page: Limit plus ExclusiveStartKey from an opaque
+    next_token, and a ProjectionExpression limited to the list-view attributes
+  - put() writes one note; put_many() imports notes with batch_write_item in
+    chunks of 25, retrying UnprocessedItems with backoff
+  - notes written ahead of PF360 carry sync_status "pending"; the notes-sync
+    worker re-reads them with get() and flips them with mark_synced(), or with
+    mark_unsynced() to "failed" (PF360 rejected the note) or "unconfirmed"
+    (the post may have reached PF360; never re-posted automatically)
+  - list_all() reads a project's whole history (search index rebuilds), with
+    each note's sync_status so copies PF360 already lists can be left out
+  - the Table handle is created once per container, on the boto3 resource
+    shared with the cache tiers (lib/dynamo_tier.py)
+
+paginate() applies the same limit/next_token contract to notes from other
+sources (the PF360 API, mock data), using an offset token.
+
+Tokens are tagged with the source that issued them ("api" offsets,
+"dynamodb" keys). list_notes can switch source between pages when the
+pf360-list-notes circuit changes state; a token from the other source
+restarts at the first page instead of failing or skipping notes.
+
+Environment variables:
+    NOTES_PAGE_SIZE      - Default page size for list views (default: 20)
+    NOTES_MAX_PAGE_SIZE  - Largest page a caller may request (default: 100)
+"""
+
+import base64
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    from .dynamo_tier import dynamodb_resource
+    from .circuit_breaker import CircuitOpenError
+    from .http_client import request_errors, error_status, write_not_applied
+except ImportError:  # imported flat (python/lib on sys.path)
+    from dynamo_tier import dynamodb_resource
+    from circuit_breaker import CircuitOpenError
+    from http_client import request_errors, error_status, write_not_applied
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+PAGE_SIZE = int(os.getenv("NOTES_PAGE_SIZE", "20"))
+MAX_PAGE_SIZE = int(os.getenv("NOTES_MAX_PAGE_SIZE", "100"))
+
+# Attributes returned by list views ("timestamp" is a DynamoDB reserved word)
+LIST_ATTRIBUTES = ("note_id", "project_id", "timestamp", "note_text", "author", "created_at")
+
+# list_all() also reads sync_status, to tell notes PF360 already has
+HISTORY_ATTRIBUTES = LIST_ATTRIBUTES + ("sync_status",)
+
+BATCH_WRITE_SIZE = 25
+BATCH_WRITE_ATTEMPTS = 5
+
+# sync_status values for notes replicated to PF360 (write-behind)
+SYNC_PENDING = "pending"
+SYNC_DONE = "synced"
+SYNC_FAILED = "failed"
+SYNC_UNCONFIRMED = "unconfirmed"
+
+# ============================================================================
+# Sync Status
+# ============================================================================
+
+def failed_post_status(error: Exception) -> str:
+    """
+    sync_status for a note whose PF360 post failed
+
+    SYNC_PENDING when PF360 certainly did not get it (no request made,
+    connection error, 429/5xx), SYNC_FAILED when it rejected the note (4xx)
+    and SYNC_UNCONFIRMED when it may have stored it (read timeout, 504).
+    """
+    if isinstance(error, CircuitOpenError) or write_not_applied(error) or not isinstance(error, request_errors()):
+        return SYNC_PENDING
+    status = error_status(error)
+    return SYNC_FAILED if status is not None and status < 500 else SYNC_UNCONFIRMED
+
+# ============================================================================
+# Page Tokens
+# ============================================================================
+
+def encode_token(position: Dict[str, Any]) -> str:
+    """Opaque, URL-safe next_token for a page position"""
+    raw = json.dumps(position, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """
+    Decode a next_token
+
+    Raises:
+        ValueError: Malformed token
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError(f"Invalid next_token: {token}")
+    if not isinstance(position, dict):
+        raise ValueError(f"Invalid next_token: {token}")
+    return position
+
+
+def token_position(next_token: Optional[str], source: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode a next_token issued by `source` (None for no token or another source's token)
+
+    Raises:
+        ValueError: Malformed token
+    """
+    if not next_token:
+        return None
+    position = decode_token(next_token)
+    if position.get("source") != source:
+        logger.warning(f"next_token from {position.get('source')!r}, not {source!r}; restarting at the first page")
+        return None
+    return position
+
+
+def page_size(limit: Any) -> int:
+    """
+    Clamp a requested page size to 1..NOTES_MAX_PAGE_SIZE (default NOTES_PAGE_SIZE)
+
+    Raises:
+        ValueError: Non-numeric limit
+    """
+    if limit in (None, ""):
+        return PAGE_SIZE
+    try:
+        return max(1, min(int(limit), MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid limit: {limit}")
+
+
+def paginate(notes: List[Dict[str, Any]], limit: Any = None, next_token: Optional[str] = None, source: str = "api") -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Page through an in-memory list of notes (API or mock results)
+
+    Returns:
+        (page, next_token or None)
+
+    Raises:
+        ValueError: Invalid limit or next_token
+    """
+    size = page_size(limit)
+    position = token_position(next_token, source) or {}
+    try:
+        offset = max(0, int(position.get("offset", 0)))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid next_token: {next_token}")
+    page = notes[offset:offset + size]
+    more = offset + size < len(notes)
+    return page, encode_token({"source": source, "offset": offset + size}) if more else None
+
+# ============================================================================
+# Repository
+# ============================================================================
+
+class NotesRepository:
+    """Project notes in one DynamoDB table"""
+
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+        self._dynamodb = None
+        self._table = None
+
+    def _get_resource(self):
+        if self._dynamodb is None:
+            self._dynamodb = dynamodb_resource()
+        return self._dynamodb
+
+    def _get_table(self):
+        if self._table is None:
+            self._table = self._get_resource().Table(self.table_name)
+        return self._table
+
+    @staticmethod
+    def new_note(project_id: str, note_text: str, author: str, note_id: Optional[str] = None) -> Dict[str, Any]:
+        """Build a note item (note_id defaults to a new UUID)"""
+        now = datetime.now()
+        return {
+            "project_id": project_id,
+            "timestamp": now.isoformat(),
+            "note_id": note_id or str(uuid.uuid4()),
+            "note_text": note_text,
+            "author": author,
+            "created_at": now.strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    def put(self, project_id: str, note_text: str, author: str, note_id: Optional[str] = None, **attributes: Any) -> Dict[str, Any]:
+        """Store one note (plus any extra attributes, e.g. sync_status) and return it"""
+        note = self.new_note(project_id, note_text, author, note_id)
+        note.update(attributes)
+        self._get_table().put_item(Item=note)
+        return note
+
+    def get(self, project_id: str, timestamp: str) -> Optional[Dict[str, Any]]:
+        """Read one note with a strongly consistent read (None if missing)"""
+        response = self._get_table().get_item(
+            Key={"project_id": project_id, "timestamp": timestamp},
+            ConsistentRead=True
+        )
+        return response.get("Item")
+
+    def mark_synced(self, project_id: str, timestamp: str, synced_at: str) -> bool:
+        """
+        Flip a pending note to synced
+
+        Returns:
+            False if the note was not pending (already synced by another delivery)
+        """
+        return self._finish_sync(project_id, timestamp, SYNC_DONE, {"synced_at": synced_at})
+
+    def mark_unsynced(self, project_id: str, timestamp: str, status: str, reason: str) -> bool:
+        """
+        Flip a pending note to SYNC_FAILED or SYNC_UNCONFIRMED
+
+        Returns:
+            False if the note was not pending
+        """
+        return self._finish_sync(project_id, timestamp, status, {"sync_error": reason})
+
+    def _finish_sync(self, project_id: str, timestamp: str, status: str, attributes: Dict[str, Any]) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self._get_table().update_item(
+                Key={"project_id": project_id, "timestamp": timestamp},
+                UpdateExpression="SET " + ", ".join(f"{name} = :{name}" for name in ["sync_status", *attributes]),
+                ConditionExpression="sync_status = :pending",
+                ExpressionAttributeValues={
+                    ":sync_status": status,
+                    ":pending": SYNC_PENDING,
+                    **{f":{name}": value for name, value in attributes.items()}
+                }
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    def put_many(self, notes: List[Dict[str, Any]]) -> int:
+        """
+        Import notes with batch_write_item (25 per request)
+
+        Args:
+            notes: Note items with at least project_id and timestamp
+
+        Returns:
+            Number of notes written
+
+        Raises:
+            RuntimeError: Items still unprocessed after BATCH_WRITE_ATTEMPTS
+        """
+        resource = self._get_resource()
+        for start in range(0, len(notes), BATCH_WRITE_SIZE):
+            requests = [{"PutRequest": {"Item": note}} for note in notes[start:start + BATCH_WRITE_SIZE]]
+            for attempt in range(BATCH_WRITE_ATTEMPTS):
+                response = resource.batch_write_item(RequestItems={self.table_name: requests})
+                requests = (response.get("UnprocessedItems") or {}).get(self.table_name) or []
+                if not requests:
+                    break
+                time.sleep(min(0.05 * 2 ** attempt, 1.0))
+            else:
+                raise RuntimeError(f"{len(requests)} notes unprocessed after {BATCH_WRITE_ATTEMPTS} attempts")
+        return len(notes)
+
+    @staticmethod
+    def _list_query(project_id: str, attributes: Tuple[str, ...] = LIST_ATTRIBUTES) -> Dict[str, Any]:
+        """Query parameters for a project's notes, newest first, given attributes only"""
+        return {
+            "KeyConditionExpression": "project_id = :pid",
+            "ExpressionAttributeValues": {":pid": project_id},
+            "ProjectionExpression": ", ".join(f"#{name}" for name in attributes),
+            "ExpressionAttributeNames": {f"#{name}": name for name in attributes},
+            "ScanIndexForward": False
+        }
+
+    def list_all(self, project_id: str) -> List[Dict[str, Any]]:
+        """A project's whole history (list attributes plus sync_status), newest first, e.g. to build its search index"""
+        query = self._list_query(project_id, HISTORY_ATTRIBUTES)
+        notes: List[Dict[str, Any]] = []
+        while True:
+            response = self._get_table().query(**query)
+            notes.extend(response.get("Items", []))
+            if not response.get("LastEvaluatedKey"):
+                return notes
+            query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def list(self, project_id: str, limit: Any = None, next_token: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of a project's notes, newest first
+
+        Returns:
+            (notes, next_token or None)
+
+        Raises:
+            ValueError: Invalid limit or next_token (including a token from another project)
+        """
+        query = dict(self._list_query(project_id), Limit=page_size(limit))
+        position = token_position(next_token, "dynamodb")
+        if position:
+            start_key = position.get("key")
+            if not isinstance(start_key, dict) or start_key.get("project_id") != project_id:
+                raise ValueError(f"Invalid next_token: {next_token}")
+            query["ExclusiveStartKey"] = start_key
+
+        response = self._get_table().query(**query)
+        last_key = response.get("LastEvaluatedKey")
+        return response.get("Items", []), encode_token({"source": "dynamodb", "key": last_key}) if last_key else None
+
+
+# Repositories by table name, reused across warm invocations
+_repositories: Dict[str, NotesRepository] = {}
+
+
+def get_notes_repository(table_name: str) -> NotesRepository:
+    """Return the cached repository (and Table handle) for a table"""
+    repository = _repositories.get(table_name)
+    if repository is None:
+        repository = _repositories[table_name] = NotesRepository(table_name)
+    return repository
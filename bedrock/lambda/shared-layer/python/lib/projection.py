@@ -0,0 +1,163 @@
+"""
+Response projection for action results
+
+Actions registered with @router.action(name, projection='project_details')
+accept two optional parameters:
+
+    fields   - Comma-separated (or JSON array) dotted paths to keep, e.g.
+               "status,dates.scheduled,address.city". A path selects that key's
+               whole subtree; paths through lists apply to every element
+               ("forecast.date"). Unknown paths select nothing.
+    compact  - "true" drops null values, and objects left empty by that, from
+               the whole result
+
+fields applies to result[projection] only (projection="" means the top level),
+so the envelope (action, project_id, mock_mode) is always returned. When a
+request has no fields parameter, the router falls back to the default for the
+calling agent (event["agent"]["name"]) and action, or the "*" agent, from the
+Lambda's projection defaults:
+
+    {"scheduling-agent-information": {"get-project-details": "status,dates,address.full_address"}}
+
+Smaller tool results are serialized into the agent's context on every
+following model step, so trimming them makes those steps faster and cheaper.
+"""
+
+import json
+from typing import Dict, Any, List, Optional
+
+try:
+    from .validators import TRUE_VALUES
+except ImportError:  # imported flat (python/lib on sys.path)
+    from validators import TRUE_VALUES
+
+# Keys kept at the top level when the whole result is projected
+ENVELOPE_KEYS = ("action", "project_id", "mock_mode")
+
+# {"agent name" or "*": {"action": fields}}
+Projections = Dict[str, Dict[str, Any]]
+
+# ============================================================================
+# Parsing
+# ============================================================================
+
+def parse_fields(value: Any) -> Optional[List[str]]:
+    """
+    Normalize a fields parameter to a list of dotted paths
+
+    Returns:
+        None when no projection was requested
+
+    Raises:
+        ValueError: Malformed JSON array
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return None
+        if text.startswith("["):
+            try:
+                value = json.loads(text)
+            except json.JSONDecodeError:
+                raise ValueError(f"Invalid fields: {text}")
+        else:
+            value = text.split(",")
+    fields = [str(field).strip() for field in value if str(field).strip()]
+    return fields or None
+
+
+def is_compact(value: Any) -> bool:
+    """Truthiness of a compact parameter (bool or Bedrock string)"""
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in TRUE_VALUES
+
+
+def _field_tree(fields: List[str]) -> Dict[str, Any]:
+    """["a.b", "a.c", "d"] -> {"a": {"b": {}, "c": {}}, "d": {}}; {} selects the whole subtree"""
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        node = tree
+        parts = field.split(".")
+        for index, part in enumerate(parts):
+            if part in node and not node[part]:
+                break  # an ancestor is already selected whole
+            if index == len(parts) - 1:
+                node[part] = {}
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+# ============================================================================
+# Projection
+# ============================================================================
+
+def _select(value: Any, tree: Dict[str, Any]) -> Any:
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_select(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: _select(value[key], subtree) for key, subtree in tree.items() if key in value}
+
+
+def select_fields(value: Any, fields: List[str]) -> Any:
+    """Keep only the given dotted paths of a dict (or list of dicts)"""
+    return _select(value, _field_tree(fields))
+
+
+def drop_nulls(value: Any) -> Any:
+    """Recursively drop None values and objects that end up empty"""
+    if isinstance(value, dict):
+        compacted = {}
+        for key, item in value.items():
+            item = drop_nulls(item)
+            if item is None or item == {}:
+                continue
+            compacted[key] = item
+        return compacted
+    if isinstance(value, list):
+        return [drop_nulls(item) for item in value if item is not None]
+    return value
+
+
+def default_fields(projections: Projections, agent: Optional[str], action: str) -> Optional[List[str]]:
+    """Default fields for an agent and action, falling back to the "*" agent"""
+    for name in (agent, "*"):
+        fields = (projections.get(name) or {}).get(action) if name else None
+        if fields:
+            return parse_fields(fields)
+    return None
+
+
+def apply_projection(
+    result: Dict[str, Any],
+    key: str,
+    fields: Optional[List[str]],
+    compact: bool = False
+) -> Dict[str, Any]:
+    """
+    Shape an action result
+
+    Args:
+        result: Handler result
+        key: Result key the fields apply to ("" for the top level)
+        fields: Dotted paths to keep, or None for everything
+        compact: Drop null values
+
+    Returns:
+        New result dict (the handler's result is not modified)
+    """
+    if fields:
+        if key:
+            if key in result:
+                result = {**result, key: select_fields(result[key], fields)}
+        else:
+            selected = select_fields(result, fields)
+            result = {**{k: result[k] for k in ENVELOPE_KEYS if k in result}, **selected}
+    if compact:
+        result = drop_nulls(result)
+    return result
@@ -0,0 +1,119 @@
+"""
+Session management for Bedrock Agent action Lambdas
+
+Stores per-conversation state (customer, client, auth token, PF360 request_id)
+in the DynamoDB sessions table, keyed by the Bedrock session ID. Items expire
+through the table's TTL attribute.
+
+Environment variables:
+    DYNAMODB_TABLE_NAME  - Sessions table (default: scheduling-agent-sessions-dev)
+    SESSION_TTL_MINUTES  - Session lifetime in minutes (default: 30)
+"""
+
+import logging
+import os
+import time
+from typing import Dict, Any, List, Optional
+
+try:
+    from .dynamo_tier import dynamodb_resource
+except ImportError:  # imported flat (python/lib on sys.path)
+    from dynamo_tier import dynamodb_resource
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_TABLE = os.getenv("DYNAMODB_TABLE_NAME", "scheduling-agent-sessions-dev")
+DEFAULT_TTL_MINUTES = int(os.getenv("SESSION_TTL_MINUTES", "30"))
+
+CUSTOMER_INDEX = "customer_id-index"
+
+# ============================================================================
+# Session Manager
+# ============================================================================
+
+class SessionManager:
+    """DynamoDB-backed session store"""
+
+    def __init__(self, table_name: Optional[str] = None, ttl_minutes: int = DEFAULT_TTL_MINUTES):
+        """
+        Args:
+            table_name: Sessions table (None: DYNAMODB_TABLE_NAME)
+            ttl_minutes: Session lifetime, refreshed on every write
+        """
+        self.table_name = table_name or DEFAULT_TABLE
+        self.ttl_seconds = ttl_minutes * 60
+        self._table = None
+
+    def _get_table(self):
+        # Created on first use, on the container's shared resource (lib/dynamo_tier.py)
+        if self._table is None:
+            self._table = dynamodb_resource().Table(self.table_name)
+        return self._table
+
+    def _expiry(self) -> int:
+        return int(time.time()) + self.ttl_seconds
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return session data, or None if missing or expired
+
+        DynamoDB deletes expired items lazily, so the TTL is checked here too.
+        """
+        try:
+            item = self._get_table().get_item(Key={"session_id": session_id}).get("Item")
+        except Exception as e:
+            logger.error(f"Failed to read session {session_id}: {str(e)}")
+            return None
+
+        if not item or int(item.get("ttl", 0)) <= time.time():
+            return None
+        return item
+
+    def create_session(self, session_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create (or replace) a session and return the stored item"""
+        now = int(time.time())
+        item = {
+            **data,
+            "session_id": session_id,
+            "created_at": now,
+            "updated_at": now,
+            "ttl": self._expiry()
+        }
+        self._get_table().put_item(Item=item)
+        return item
+
+    def update_session(self, session_id: str, updates: Dict[str, Any]) -> None:
+        """Set attributes on a session and extend its TTL"""
+        updates = {**updates, "updated_at": int(time.time()), "ttl": self._expiry()}
+        names = {f"#k{i}": key for i, key in enumerate(updates)}
+        values = {f":v{i}": value for i, value in enumerate(updates.values())}
+
+        self._get_table().update_item(
+            Key={"session_id": session_id},
+            UpdateExpression="SET " + ", ".join(f"#k{i} = :v{i}" for i in range(len(updates))),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
+        )
+
+    def update_request_id(self, session_id: str, request_id: str) -> None:
+        """Store the PF360 request_id returned by get_available_dates"""
+        self.update_session(session_id, {"request_id": request_id})
+
+    def delete_session(self, session_id: str) -> None:
+        """Delete a session"""
+        self._get_table().delete_item(Key={"session_id": session_id})
+
+    def get_sessions_for_customer(self, customer_id: str) -> List[Dict[str, Any]]:
+        """Return unexpired sessions for a customer (customer_id-index GSI)"""
+        from boto3.dynamodb.conditions import Key
+
+        response = self._get_table().query(
+            IndexName=CUSTOMER_INDEX,
+            KeyConditionExpression=Key("customer_id").eq(customer_id)
+        )
+        now = time.time()
+        return [item for item in response.get("Items", []) if int(item.get("ttl", 0)) > now]
@@ -0,0 +1,163 @@
+"""
+Concurrent time-slot prefetch for get_available_dates
+
+When get_available_dates is called with prefetch_slots=true, the time slots for
+the first few dates are fetched in parallel and stored against the PF360
+request_id, which identifies one scheduling session. get_time_slots then serves
+those dates from the store instead of making another upstream round trip.
+
+The store is in-process (warm containers) with an optional DynamoDB tier
+(lib/dynamo_tier.py) so other containers of the same Lambda see the
+prefetched slots, in items keyed "slots#<project_id>#<request_id>".
+
+Environment variables:
+    SLOT_PREFETCH_MAX_DATES  - Dates to prefetch by default (default: 4)
+    SLOT_PREFETCH_WORKERS    - Thread pool size for prefetch calls (default: 4)
+    SLOT_PREFETCH_TTL        - Lifetime of prefetched slots in seconds (default: 300)
+    SLOT_PREFETCH_TABLE      - DynamoDB table for the shared tier (default: disabled)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable
+
+try:
+    from .dynamo_tier import DynamoTier
+    from .invocation_log import count
+except ImportError:  # imported flat (python/lib on sys.path)
+    from dynamo_tier import DynamoTier
+    from invocation_log import count
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_MAX_DATES = int(os.getenv("SLOT_PREFETCH_MAX_DATES", "4"))
+DEFAULT_WORKERS = int(os.getenv("SLOT_PREFETCH_WORKERS", "4"))
+DEFAULT_TTL = int(os.getenv("SLOT_PREFETCH_TTL", "300"))
+DEFAULT_TABLE = os.getenv("SLOT_PREFETCH_TABLE", "")
+
+# Bound the in-process store; one entry per active scheduling session
+MAX_LOCAL_ENTRIES = 512
+
+# ============================================================================
+# Prefetch
+# ============================================================================
+
+def prefetch_slots(
+    dates: List[str],
+    fetch_slots: Callable[[str], List[Any]],
+    max_workers: int = DEFAULT_WORKERS
+) -> Dict[str, List[Any]]:
+    """
+    Fetch time slots for several dates concurrently
+
+    Args:
+        dates: Dates to fetch (YYYY-MM-DD)
+        fetch_slots: Callable returning the slot list for one date
+        max_workers: Thread pool size
+
+    Returns:
+        Dict of date -> slots. Dates whose fetch failed are omitted so callers
+        fall back to a normal upstream call for them.
+    """
+    if not dates:
+        return {}
+
+    def fetch(date: str):
+        try:
+            return date, fetch_slots(date)
+        except Exception as e:
+            logger.warning(f"Slot prefetch failed for {date}: {str(e)}")
+            return date, None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(dates)))) as executor:
+        fetched = list(executor.map(fetch, dates))
+
+    return {date: slots for date, slots in fetched if slots is not None}
+
+# ============================================================================
+# Store
+# ============================================================================
+
+class SlotStore:
+    """Prefetched slots keyed by (project_id, request_id, date)"""
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL, table_name: Optional[str] = None):
+        """
+        Args:
+            ttl_seconds: Lifetime of stored slots
+            table_name: DynamoDB table for the shared tier (None: SLOT_PREFETCH_TABLE)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.remote = DynamoTier("slots", DEFAULT_TABLE if table_name is None else table_name, "Slot store")
+        self._entries: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, project_id: str, request_id: str, slots_by_date: Dict[str, List[Any]]) -> None:
+        """Store prefetched slots for a scheduling session"""
+        if not slots_by_date:
+            return
+
+        key = (str(project_id), str(request_id))
+        expires_at = time.time() + self.ttl_seconds
+
+        with self._lock:
+            if len(self._entries) >= MAX_LOCAL_ENTRIES:
+                self._evict_expired()
+            if len(self._entries) >= MAX_LOCAL_ENTRIES:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = {"slots": dict(slots_by_date), "expires_at": expires_at}
+
+        if self.remote.enabled:
+            self.remote.put(key, {"slots": json.dumps(slots_by_date, separators=(",", ":"))}, expires_at)
+
+    def get(self, project_id: str, request_id: str, date: str) -> Optional[List[Any]]:
+        """
+        Return prefetched slots for a date
+
+        Returns:
+            Slot list, or None if the date was not prefetched or has expired
+        """
+        key = (str(project_id), str(request_id))
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["expires_at"] <= now:
+                del self._entries[key]
+                entry = None
+
+        if entry is None:
+            entry = self.remote.get(
+                key, lambda item: {"slots": json.loads(item["slots"]), "expires_at": float(item["ttl"])}, now
+            )
+            if entry is None:
+                count("slot_cache_miss")
+                return None
+            with self._lock:
+                self._entries[key] = entry
+
+        slots = entry["slots"].get(date)
+        count("slot_cache_hit" if slots is not None else "slot_cache_miss")
+        return slots
+
+    def clear(self) -> None:
+        """Clear the in-process tier (useful for testing)"""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        for key in [k for k, v in self._entries.items() if v["expires_at"] <= now]:
+            del self._entries[key]
+
+
+# Module-level store, reused across warm invocations
+slot_store = SlotStore()
@@ -0,0 +1,299 @@
+"""
+Seeded synthetic PF360 data for mock mode, benchmarks and the local PF360 stub
+
+    if SYNTHETIC_ENABLED:
+        return synthetic_data.projects_response(customer_id)
+
+The get_mock_* functions in each Lambda's mock_data.py return a handful of
+hardcoded records. With MOCK_DATA_MODE=synthetic they delegate here instead,
+so mock mode can serve customers with hundreds of projects and notes.
+
+Everything is derived from (MOCK_DATA_SEED, kind, key): the same customer,
+project or date always yields the same records, across processes and
+without keeping anything in memory, and a record costs only the work to
+build it. Dates are relative to today, like the static mock data.
+
+Responses have the same {"status", "data"} shapes as the static mock data
+(which mirror the PF360 APIs), so handlers and scripts/pf360_stub_server.py
+can use them interchangeably.
+
+Environment variables:
+    MOCK_DATA_MODE               - "static" (hardcoded records) or "synthetic" (default: static)
+    MOCK_DATA_SEED               - Generator seed (default: 42)
+    MOCK_CUSTOMERS               - Customers listed by customer_ids() (default: 10)
+    MOCK_PROJECTS_PER_CUSTOMER   - Projects per customer, max 999 (default: 25)
+    MOCK_NOTES_PER_PROJECT       - Notes of history per project (default: 20)
+    MOCK_SLOTS_PER_DAY           - Time slots per available date, max 24 (default: 9)
+    MOCK_DATE_HORIZON_DAYS       - Days ahead scanned for available weekdays (default: 14)
+"""
+
+import hashlib
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+SYNTHETIC_ENABLED = os.getenv("MOCK_DATA_MODE", "static").lower() == "synthetic"
+DEFAULT_SEED = int(os.getenv("MOCK_DATA_SEED", "42"))
+DEFAULT_CUSTOMERS = int(os.getenv("MOCK_CUSTOMERS", "10"))
+DEFAULT_PROJECTS_PER_CUSTOMER = int(os.getenv("MOCK_PROJECTS_PER_CUSTOMER", "25"))
+DEFAULT_NOTES_PER_PROJECT = int(os.getenv("MOCK_NOTES_PER_PROJECT", "20"))
+DEFAULT_SLOTS_PER_DAY = int(os.getenv("MOCK_SLOTS_PER_DAY", "9"))
+DEFAULT_HORIZON_DAYS = int(os.getenv("MOCK_DATE_HORIZON_DAYS", "14"))
+
+# Project IDs are <customer number> * 1000 + <index>
+PROJECTS_PER_CUSTOMER_MAX = 999
+
+FIRST_NAMES = ("John", "Jane", "Mike", "Sarah", "Carlos", "Priya", "Wei", "Aisha", "Tom", "Linda", "Omar", "Grace")
+LAST_NAMES = ("Smith", "Doe", "Johnson", "Garcia", "Patel", "Chen", "Brown", "Nguyen", "Wilson", "Lopez", "Khan", "Taylor")
+STREETS = ("Main St", "Oak Ave", "Pine Dr", "Maple Ln", "Cedar Ct", "Bay Blvd", "Lake Rd", "Palm Way")
+CITIES = (("Tampa", "FL", "336"), ("Clearwater", "FL", "337"), ("Orlando", "FL", "328"),
+          ("Austin", "TX", "787"), ("Atlanta", "GA", "303"), ("Charlotte", "NC", "282"))
+CATEGORIES = (("Installation", "Flooring"), ("Installation", "Windows"), ("Installation", "Cabinets"),
+              ("Repair", "Deck Repair"), ("Repair", "Roofing"), ("Measurement", "Countertops"))
+STATUSES = ("Scheduled", "Pending", "Pending", "Scheduled", "Completed", "Pending")
+
+NOTE_TEMPLATES = (
+    "Customer requested {period} appointment",
+    "Need to confirm access to {area}",
+    "Customer confirmed appointment for next week",
+    "Gate code is {code}, please call on arrival",
+    "Dog in the {area}; customer will keep it inside",
+    "Materials delivered to {area}",
+    "Customer asked to reschedule due to {reason}",
+    "Measure {area} before the install crew arrives",
+    "Left voicemail about {reason}",
+    "Customer prefers text messages over calls",
+)
+NOTE_WORDS = {
+    "period": ("morning", "afternoon", "early morning", "late afternoon"),
+    "area": ("installation area", "garage", "backyard", "side gate", "basement", "kitchen"),
+    "reason": ("travel", "weather", "a work conflict", "a family event", "permit delays"),
+}
+NOTE_AUTHORS = ("Agent", "Sales Team", "Scheduling Team", "Installer", "Customer Care")
+
+SLOT_GRID = [(hour, minute) for hour in range(7, 19) for minute in (0, 30)]
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def stable_number(value: str, modulo: int) -> int:
+    """Process-independent hash of a string (Python's hash() is salted per process)"""
+    return int(hashlib.sha1(value.encode("utf-8")).hexdigest()[:12], 16) % modulo
+
+
+def format_slot(hour: int, minute: int) -> str:
+    """Slot label in the PF360 format ("08:00 AM")"""
+    return datetime(2000, 1, 1, hour, minute).strftime("%I:%M %p")
+
+# ============================================================================
+# Generator
+# ============================================================================
+
+class SyntheticData:
+    """Deterministic PF360-shaped records for any customer, project or date"""
+
+    def __init__(
+        self,
+        seed: int = DEFAULT_SEED,
+        customers: int = DEFAULT_CUSTOMERS,
+        projects_per_customer: int = DEFAULT_PROJECTS_PER_CUSTOMER,
+        notes_per_project: int = DEFAULT_NOTES_PER_PROJECT,
+        slots_per_day: int = DEFAULT_SLOTS_PER_DAY,
+        horizon_days: int = DEFAULT_HORIZON_DAYS
+    ):
+        self.seed = seed
+        self.customers = customers
+        self.projects_per_customer = max(0, min(projects_per_customer, PROJECTS_PER_CUSTOMER_MAX))
+        self.notes_per_project = max(0, notes_per_project)
+        self.slots_per_day = max(0, min(slots_per_day, len(SLOT_GRID)))
+        self.horizon_days = horizon_days
+
+    def _rng(self, kind: str, key: str) -> random.Random:
+        return random.Random(f"{self.seed}:{kind}:{key}")
+
+    # ------------------------------------------------------------------------
+    # Records
+    # ------------------------------------------------------------------------
+
+    def customer_ids(self) -> List[str]:
+        return [str(1000 + index) for index in range(self.customers)]
+
+    def customer_number(self, customer_id: str) -> int:
+        customer_id = str(customer_id)
+        return int(customer_id) if customer_id.isdigit() and len(customer_id) <= 9 else stable_number(customer_id, 10 ** 6)
+
+    def project_ids(self, customer_id: str) -> List[str]:
+        base = self.customer_number(customer_id) * 1000
+        return [str(base + index) for index in range(1, self.projects_per_customer + 1)]
+
+    def customer(self, customer_id: str) -> Dict[str, Any]:
+        rng = self._rng("customer", str(customer_id))
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        return {
+            "customer_customer_id": str(customer_id),
+            "customer_first_name": first,
+            "customer_last_name": last,
+            "customer_email": f"{first.lower()}.{last.lower()}{rng.randint(1, 99)}@email.com",
+            "customer_phone": f"(555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+        }
+
+    def project(self, project_id: str, customer_id: Optional[str] = None) -> Dict[str, Any]:
+        """Dashboard record for a project (plus customer fields when customer_id is given)"""
+        rng = self._rng("project", str(project_id))
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        project_type, category = rng.choice(CATEGORIES)
+        status = rng.choice(STATUSES)
+        city, state, zip_prefix = rng.choice(CITIES)
+        address1 = f"{rng.randint(100, 9999)} {rng.choice(STREETS)}"
+        zipcode = f"{zip_prefix}{rng.randint(0, 99):02d}"
+        duration = rng.choice((2, 3, 4, 6, 8))
+        sold = today - timedelta(days=rng.randint(5, 60))
+        installer_first, installer_last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+        start = end = None
+        if status == "Scheduled":
+            start = today + timedelta(days=rng.randint(1, 21), hours=rng.choice((8, 9, 10, 13)))
+        elif status == "Completed":
+            start = today - timedelta(days=rng.randint(1, 4)) + timedelta(hours=8)
+        if start is not None:
+            end = start + timedelta(hours=duration)
+
+        record = {
+            "project_project_id": str(project_id),
+            "project_project_number": f"ORD-{sold.year}-{stable_number(str(project_id), 10 ** 6):06d}",
+            "project_type_project_type": project_type,
+            "project_category_category": category,
+            "status_info_status": status,
+            "project_store_store_number": f"ST-{rng.randint(100, 199)}",
+            "installation_address_full_address": f"{address1}, {city}, {state} {zipcode}",
+            "installation_address_address1": address1,
+            "installation_address_address2": rng.choice(("", "", "", f"Apt {rng.randint(1, 20)}{rng.choice('ABCD')}")),
+            "installation_address_city": city,
+            "installation_address_state": state,
+            "installation_address_zipcode": zipcode,
+            "project_date_sold": sold.strftime("%Y-%m-%d"),
+            "project_date_scheduled_date": start.strftime("%Y-%m-%d") if start else None,
+            "convertedProjectStartScheduledDate": start.strftime("%Y-%m-%d %H:%M:%S") if start else None,
+            "convertedProjectEndScheduledDate": end.strftime("%Y-%m-%d %H:%M:%S") if end else None,
+            "project_date_completed_date": end.strftime("%Y-%m-%d") if status == "Completed" else None,
+            "user_idata_user_id": str(rng.randint(1000, 1999)),
+            "user_idata_first_name": installer_first,
+            "user_idata_last_name": installer_last,
+            "service_time_duration_value": str(duration),
+            "service_time_duration_type": "hours"
+        }
+        if customer_id is not None:
+            record.update(self.customer(customer_id))
+        return record
+
+    def projects(self, customer_id: str) -> List[Dict[str, Any]]:
+        return [self.project(project_id, customer_id) for project_id in self.project_ids(customer_id)]
+
+    def appointment_status(self, project_id: str) -> Dict[str, Any]:
+        """Appointment status derived from the project record, like the static mock"""
+        project = self.project(project_id)
+        start, end = project["convertedProjectStartScheduledDate"], project["convertedProjectEndScheduledDate"]
+        scheduled = project["status_info_status"] == "Scheduled"
+
+        def time_of(value: Optional[str]) -> Optional[str]:
+            return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").strftime("%I:%M %p") if value else None
+
+        return {
+            "project_id": str(project_id),
+            "status": project["status_info_status"],
+            "scheduled_date": project["project_date_scheduled_date"],
+            "scheduled_time": time_of(start),
+            "scheduled_end_time": time_of(end),
+            "duration": f"{project['service_time_duration_value']} hours",
+            "technician": f"{project['user_idata_first_name']} {project['user_idata_last_name']}" if start else None,
+            "technician_phone": "(555) 987-6543" if start else None,
+            "can_reschedule": scheduled,
+            "can_cancel": scheduled
+        }
+
+    def notes(self, project_id: str) -> List[Dict[str, Any]]:
+        """A project's note history, oldest first"""
+        rng = self._rng("notes", str(project_id))
+        now = datetime.now().replace(microsecond=0)
+        created = now - timedelta(days=self.notes_per_project + 1)
+        notes = []
+        for index in range(self.notes_per_project):
+            created += timedelta(hours=rng.randint(2, 30))
+            text = rng.choice(NOTE_TEMPLATES).format(
+                code=rng.randint(1000, 9999), **{name: rng.choice(words) for name, words in NOTE_WORDS.items()}
+            )
+            stamp = min(created, now).strftime("%Y-%m-%d %H:%M:%S")
+            notes.append({
+                "note_id": f"note-{project_id}-{index + 1:04d}",
+                "project_id": str(project_id),
+                "note_text": text,
+                "author": rng.choice(NOTE_AUTHORS),
+                "created_at": stamp,
+                "updated_at": stamp
+            })
+        return notes
+
+    def available_dates(self, project_id: str) -> List[str]:
+        """Weekdays within the horizon that have at least one slot"""
+        today = datetime.now()
+        days = (today + timedelta(days=offset) for offset in range(1, self.horizon_days + 1))
+        return [day.strftime("%Y-%m-%d") for day in days if day.weekday() < 5 and self.slots_per_day]
+
+    def time_slots(self, project_id: str, date: str) -> List[str]:
+        """MOCK_SLOTS_PER_DAY slots from a half-hour grid (07:00-18:30), in order"""
+        rng = self._rng("slots", f"{project_id}:{date}")
+        return [format_slot(*slot) for slot in sorted(rng.sample(SLOT_GRID, self.slots_per_day))]
+
+    # ------------------------------------------------------------------------
+    # API-shaped responses
+    # ------------------------------------------------------------------------
+
+    def projects_response(self, customer_id: str) -> Dict[str, Any]:
+        """GET /dashboard/get/{client_id}/{customer_id}"""
+        return {"status": "success", "data": self.projects(customer_id)}
+
+    def project_details_response(self, project_id: str, customer_id: str) -> Dict[str, Any]:
+        return {"status": "success", "data": [self.project(project_id, customer_id)]}
+
+    def appointment_status_response(self, project_id: str) -> Dict[str, Any]:
+        return {"status": "success", "data": self.appointment_status(project_id)}
+
+    def available_dates_response(self, project_id: str) -> Dict[str, Any]:
+        """GET .../get-rescheduler-slots (no request_id)"""
+        return {
+            "status": "success",
+            "data": {
+                "dates": self.available_dates(project_id),
+                "request_id": f"REQ-{project_id}-{int(datetime.now().timestamp())}"
+            }
+        }
+
+    def time_slots_response(self, project_id: str, date: str, request_id: str) -> Dict[str, Any]:
+        """GET .../get-rescheduler-slots?request_id=..."""
+        return {
+            "status": "success",
+            "data": {
+                "slots": self.time_slots(project_id, date),
+                "date": date,
+                "project_id": str(project_id),
+                "request_id": request_id
+            }
+        }
+
+    def notes_response(self, project_id: str, extra_notes: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """GET /project-notes/list/{client_id}?project_id=... (notes added since appended)"""
+        notes = self.notes(project_id) + list(extra_notes or [])
+        return {
+            "status": "success",
+            "data": {"project_id": str(project_id), "notes": notes, "total_count": len(notes)}
+        }
+
+
+# Module-level generator configured from the environment
+synthetic_data = SyntheticData()
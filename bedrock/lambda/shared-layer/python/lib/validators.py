@@ -0,0 +1,274 @@
+"""
+Input validation utilities for Bedrock Agent action Lambdas
+
+Includes:
+  - Field validators (customer/project/session IDs, dates, times)
+  - Bedrock event parsing (parameters, session ID)
+  - Pre-compiled parameter schemas built once from the action group OpenAPI
+    schemas in lambda/schemas/*.json
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Field Validators
+# ============================================================================
+
+ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+TIME_PATTERN = re.compile(r"^\d{2}:\d{2}$")
+
+
+def _validate_id(value: Any, field_name: str) -> str:
+    if value is None or str(value).strip() == "":
+        raise ValueError(f"{field_name} is required")
+
+    value = str(value).strip()
+    if not ID_PATTERN.match(value):
+        raise ValueError(f"Invalid {field_name}: {value}")
+    return value
+
+
+def validate_customer_id(customer_id: Any) -> str:
+    """Validate customer ID (letters, digits, '-' and '_')"""
+    return _validate_id(customer_id, "customer_id")
+
+
+def validate_project_id(project_id: Any) -> str:
+    """Validate project ID (letters, digits, '-' and '_')"""
+    return _validate_id(project_id, "project_id")
+
+
+def validate_date(date: Any) -> str:
+    """Validate date in YYYY-MM-DD format"""
+    if not isinstance(date, str) or not DATE_PATTERN.match(date):
+        raise ValueError(f"Invalid date (expected YYYY-MM-DD): {date}")
+    try:
+        datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid date: {date}")
+    return date
+
+
+def validate_time(time: Any) -> str:
+    """Validate time in HH:MM (24-hour) format"""
+    if not isinstance(time, str) or not TIME_PATTERN.match(time):
+        raise ValueError(f"Invalid time (expected HH:MM): {time}")
+    try:
+        datetime.strptime(time, "%H:%M")
+    except ValueError:
+        raise ValueError(f"Invalid time: {time}")
+    return time
+
+
+def validate_session_id(session_id: Any) -> str:
+    """Validate Bedrock session ID"""
+    if not isinstance(session_id, str) or not session_id.strip():
+        raise ValueError("session_id is required")
+    return session_id.strip()
+
+
+def validate_required_fields(data: Dict[str, Any], required_fields: Iterable[str]) -> None:
+    """
+    Raise ValueError listing any required fields that are missing or empty
+    """
+    missing = [field for field in required_fields if data.get(field) in (None, "")]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+# ============================================================================
+# Bedrock Event Parsing
+# ============================================================================
+
+def validate_bedrock_event(event: Any) -> Dict[str, Any]:
+    """Validate the basic structure of a Bedrock Agent action group event"""
+    if not isinstance(event, dict):
+        raise ValueError("Event must be a JSON object")
+    if not event.get("apiPath") and not event.get("actionGroup"):
+        raise ValueError("Event is missing apiPath/actionGroup")
+    return event
+
+
+def _properties_to_dict(properties: Any) -> Dict[str, Any]:
+    if isinstance(properties, list):
+        return {p["name"]: p.get("value") for p in properties}
+    return dict(properties or {})
+
+
+def extract_bedrock_parameters(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract parameters from a Bedrock Agent event
+
+    Handles the `parameters` list, `requestBody` (properties array/dict, JSON
+    string or plain dict) and a raw `body` fallback. Returns {} if the event
+    cannot be parsed.
+    """
+    try:
+        if event.get("parameters"):
+            return _properties_to_dict(event["parameters"])
+
+        if "requestBody" in event:
+            content = (event["requestBody"] or {}).get("content", {})
+            app_json = content.get("application/json", {})
+
+            if isinstance(app_json, dict) and "properties" in app_json:
+                return _properties_to_dict(app_json["properties"])
+            if isinstance(app_json, str):
+                return json.loads(app_json)
+            return dict(app_json or {})
+
+        body = event.get("body") or {}
+        if isinstance(body, str):
+            return json.loads(body)
+        return dict(body)
+
+    except Exception as e:
+        logger.error(f"Error extracting parameters: {str(e)}")
+        return {}
+
+
+def extract_session_id(event: Dict[str, Any]) -> str:
+    """Return the Bedrock session ID from an event"""
+    return validate_session_id(event.get("sessionId"))
+
+# ============================================================================
+# Pre-compiled Parameter Schemas
+# ============================================================================
+
+TRUE_VALUES = frozenset({"true", "1", "yes", "y"})
+FALSE_VALUES = frozenset({"false", "0", "no", "n", ""})
+
+
+def _coerce_boolean(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"expected boolean, got {value!r}")
+
+
+def _coerce_integer(value: Any) -> int:
+    if isinstance(value, bool):
+        raise ValueError(f"expected integer, got {value!r}")
+    if isinstance(value, int):
+        return value
+    return int(str(value).strip())
+
+
+def _coerce_number(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return float(str(value).strip())
+
+
+# Only scalar types need coercion; Bedrock passes every value as a string
+COERCERS: Dict[str, Callable[[Any], Any]] = {
+    "boolean": _coerce_boolean,
+    "integer": _coerce_integer,
+    "number": _coerce_number
+}
+
+
+class ParameterSchema:
+    """Compiled request schema for one action"""
+
+    __slots__ = ("action", "required", "coercers")
+
+    def __init__(self, action: str, schema: Dict[str, Any]):
+        properties = schema.get("properties", {}) or {}
+        self.action = action
+        self.required = tuple(schema.get("required", []) or [])
+        self.coercers = tuple(
+            (name, COERCERS[spec.get("type")])
+            for name, spec in properties.items()
+            if spec.get("type") in COERCERS
+        )
+
+    def apply(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Check required parameters and coerce typed values
+
+        Returns:
+            New params dict with coerced values
+
+        Raises:
+            ValueError: If required parameters are missing or values are invalid
+        """
+        missing = [name for name in self.required if params.get(name) in (None, "")]
+        if missing:
+            raise ValueError(f"Missing required parameters: {', '.join(missing)}")
+
+        if not self.coercers:
+            return params
+
+        coerced = dict(params)
+        for name, coerce in self.coercers:
+            value = coerced.get(name)
+            if value is None or value == "":
+                continue
+            try:
+                coerced[name] = coerce(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid value for {name}: {value!r}")
+        return coerced
+
+
+def compile_schemas(openapi: Dict[str, Any]) -> Dict[str, ParameterSchema]:
+    """
+    Compile an OpenAPI action group schema into per-action parameter schemas
+
+    Returns:
+        Dict of hyphenated action name (e.g. "get-time-slots") -> ParameterSchema
+    """
+    compiled = {}
+    for path, operations in (openapi.get("paths") or {}).items():
+        action = path.lstrip("/").replace("_", "-")
+        for operation in operations.values():
+            body_schema = (
+                operation.get("requestBody", {})
+                .get("content", {})
+                .get("application/json", {})
+                .get("schema", {})
+            )
+            compiled[action] = ParameterSchema(action, body_schema)
+    return compiled
+
+
+def load_action_schemas(schema_file: str, base_dir: str) -> Dict[str, ParameterSchema]:
+    """
+    Load and compile an action group schema
+
+    Looks for schema_file next to the handler (deployment package) and then in
+    ../schemas (source tree). Returns {} if the file is not found, in which case
+    handlers still run their own parameter checks.
+
+    Args:
+        schema_file: File name, e.g. "scheduling-actions-schema.json"
+        base_dir: Directory of the handler module
+    """
+    candidates: List[str] = [
+        os.path.join(base_dir, schema_file),
+        os.path.join(base_dir, "..", "schemas", schema_file)
+    ]
+    for path in candidates:
+        if os.path.isfile(path):
+            with open(path, "r") as f:
+                return compile_schemas(json.load(f))
+
+    logger.warning(f"Action schema {schema_file} not found; parameter schemas disabled")
+    return {}
+
+
+def get_parameter_schema(schemas: Dict[str, ParameterSchema], action: str) -> Optional[ParameterSchema]:
+    """Look up the compiled schema for an action (hyphenated or underscored)"""
+    return schemas.get(action.replace("_", "-"))
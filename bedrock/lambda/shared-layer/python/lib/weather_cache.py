@@ -0,0 +1,335 @@
+"""
+Location-keyed weather cache for get_weather
+
+Projects cluster in a handful of cities, and wttr.in refreshes its data about
+once an hour, so forecasts are cached per normalized location:
+
+  - "Tampa, FL", "tampa , florida", "Tampa, FL, USA" share the key "tampa, fl";
+    "tampa" and ZIP codes ("33601", "33601-1234") become aliases of the
+    canonical "area, region" key once a response has told us where they are
+    (at most WEATHER_CACHE_MAX_ENTRIES aliases, least recently used dropped)
+  - entries stay fresh until the next forecast period boundary (at least
+    WEATHER_CACHE_MIN_TTL seconds, at most WEATHER_CACHE_MAX_TTL)
+  - for WEATHER_CACHE_SWR_SECONDS after that, the stale entry is returned
+    immediately while one background thread refreshes it (stale-while-revalidate)
+  - when a refresh fails or times out, entries up to
+    WEATHER_CACHE_STALE_IF_ERROR_SECONDS old are served instead of an error
+
+Like the dashboard cache, an optional DynamoDB tier (lib/dynamo_tier.py)
+reuses the sessions table, with items keyed "weather#<location>".
+
+Environment variables:
+    WEATHER_TIMEOUT_SECONDS               - Read timeout for the weather API (default: 3)
+    WEATHER_FORECAST_PERIOD               - Forecast period in seconds (default: 3600)
+    WEATHER_CACHE_MIN_TTL                 - Minimum freshness in seconds (default: 300)
+    WEATHER_CACHE_MAX_TTL                 - Maximum freshness in seconds (default: 3600)
+    WEATHER_CACHE_SWR_SECONDS             - Stale-while-revalidate window (default: 1800)
+    WEATHER_CACHE_STALE_IF_ERROR_SECONDS  - Stale fallback window on errors (default: 21600)
+    WEATHER_CACHE_MAX_ENTRIES             - In-process LRU capacity, entries and aliases (default: 128)
+    WEATHER_CACHE_TABLE                   - DynamoDB table for the shared tier (default: disabled)
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
+
+try:
+    from .dynamo_tier import DynamoTier
+    from .invocation_log import count
+except ImportError:  # imported flat (python/lib on sys.path)
+    from dynamo_tier import DynamoTier
+    from invocation_log import count
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+WEATHER_TIMEOUT = float(os.getenv("WEATHER_TIMEOUT_SECONDS", "3"))
+FORECAST_PERIOD = int(os.getenv("WEATHER_FORECAST_PERIOD", "3600"))
+MIN_TTL = int(os.getenv("WEATHER_CACHE_MIN_TTL", "300"))
+MAX_TTL = int(os.getenv("WEATHER_CACHE_MAX_TTL", "3600"))
+SWR_SECONDS = int(os.getenv("WEATHER_CACHE_SWR_SECONDS", "1800"))
+STALE_IF_ERROR_SECONDS = int(os.getenv("WEATHER_CACHE_STALE_IF_ERROR_SECONDS", "21600"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("WEATHER_CACHE_MAX_ENTRIES", "128"))
+DEFAULT_TABLE = os.getenv("WEATHER_CACHE_TABLE", "")
+
+# ============================================================================
+# Location Normalization
+# ============================================================================
+
+US_STATES = {
+    "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar", "california": "ca",
+    "colorado": "co", "connecticut": "ct", "delaware": "de", "district of columbia": "dc",
+    "florida": "fl", "georgia": "ga", "hawaii": "hi", "idaho": "id", "illinois": "il",
+    "indiana": "in", "iowa": "ia", "kansas": "ks", "kentucky": "ky", "louisiana": "la",
+    "maine": "me", "maryland": "md", "massachusetts": "ma", "michigan": "mi", "minnesota": "mn",
+    "mississippi": "ms", "missouri": "mo", "montana": "mt", "nebraska": "ne", "nevada": "nv",
+    "new hampshire": "nh", "new jersey": "nj", "new mexico": "nm", "new york": "ny",
+    "north carolina": "nc", "north dakota": "nd", "ohio": "oh", "oklahoma": "ok", "oregon": "or",
+    "pennsylvania": "pa", "rhode island": "ri", "south carolina": "sc", "south dakota": "sd",
+    "tennessee": "tn", "texas": "tx", "utah": "ut", "vermont": "vt", "virginia": "va",
+    "washington": "wa", "west virginia": "wv", "wisconsin": "wi", "wyoming": "wy"
+}
+
+COUNTRY_SUFFIXES = frozenset({"us", "usa", "united states", "united states of america"})
+
+_ZIP_RE = re.compile(r"^(\d{5})(?:-\d{4})?$")
+_STATE_ZIP_RE = re.compile(r"^(.*?)\s*\d{5}(?:-\d{4})?$")
+
+
+def normalize_location(location: str) -> str:
+    """
+    Canonical cache key for a free-text location
+
+    "Tampa, FL" / " tampa,  Florida, USA" -> "tampa, fl"; "33601-1234" -> "33601"
+    """
+    text = re.sub(r"[^\w\s,-]", " ", (location or "").lower())
+    parts = [" ".join(part.split()) for part in text.split(",")]
+    parts = [part for part in parts if part]
+
+    if len(parts) == 1 and _ZIP_RE.match(parts[0]):
+        return _ZIP_RE.match(parts[0]).group(1)
+
+    while len(parts) > 1 and parts[-1] in COUNTRY_SUFFIXES:
+        parts.pop()
+    if len(parts) > 1:
+        state = _STATE_ZIP_RE.match(parts[-1])
+        if state and state.group(1):
+            parts[-1] = state.group(1)  # "fl 33601" -> "fl"
+        parts[-1] = US_STATES.get(parts[-1], parts[-1])
+
+    return ", ".join(parts)
+
+
+def canonical_location(payload: Dict[str, Any]) -> Optional[str]:
+    """Canonical key from a formatted weather payload's resolved location (area, region)"""
+    location = payload.get("location") or {}
+    area, region = location.get("area"), location.get("region")
+    if not area:
+        return None
+    return normalize_location(f"{area}, {region}" if region else area)
+
+
+def forecast_expiry(now: float, period: int = FORECAST_PERIOD, min_ttl: int = MIN_TTL, max_ttl: int = MAX_TTL) -> float:
+    """Freshness deadline: the next forecast period boundary at least min_ttl away, capped at max_ttl"""
+    boundary = (now // period + 1) * period
+    while boundary - now < min_ttl:
+        boundary += period
+    return min(boundary, now + max_ttl)
+
+# ============================================================================
+# Cache Entry
+# ============================================================================
+
+class WeatherEntry:
+    """Formatted weather payload with its fetch time and freshness deadline"""
+
+    __slots__ = ("payload", "fetched_at", "expires_at")
+
+    def __init__(self, payload: Dict[str, Any], fetched_at: float, expires_at: float):
+        self.payload = payload
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def is_revalidatable(self, now: float) -> bool:
+        """Stale but within the stale-while-revalidate window"""
+        return now < self.expires_at + SWR_SECONDS
+
+    def is_usable_on_error(self, now: float) -> bool:
+        return now < self.expires_at + STALE_IF_ERROR_SECONDS
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class WeatherCache:
+    """Normalized-location weather cache with stale-while-revalidate"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, table_name: Optional[str] = None):
+        """
+        Args:
+            max_entries: In-process LRU capacity (entries, and separately aliases)
+            table_name: DynamoDB table for the shared tier (None: WEATHER_CACHE_TABLE)
+        """
+        self.max_entries = max_entries
+        self.remote = DynamoTier("weather", DEFAULT_TABLE if table_name is None else table_name, "Weather cache")
+        self._entries: "OrderedDict[str, WeatherEntry]" = OrderedDict()
+        self._aliases: "OrderedDict[str, str]" = OrderedDict()
+        self._refreshing = set()
+        self._refresh_threads = []
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------------
+
+    def get_or_load(
+        self,
+        location: str,
+        loader: Callable[[str], Dict[str, Any]]
+    ) -> Tuple[WeatherEntry, str]:
+        """
+        Return weather for a location, calling loader(location) when needed
+
+        Args:
+            location: Free-text location as given by the user
+            loader: Fetches and formats weather; the payload's "location"
+                    (area, region) is used to learn aliases
+
+        Returns:
+            (WeatherEntry, status) with status "hit", "miss", "stale"
+            (served while refreshing) or "stale_error" (refresh failed)
+        """
+        key = self.resolve(location)
+        now = time.time()
+        entry = self._get(key, now)
+
+        if entry is not None and entry.is_fresh(now):
+            status = "hit"
+        elif entry is not None and entry.is_revalidatable(now):
+            self._refresh_in_background(key, location, loader)
+            status = "stale"
+        else:
+            try:
+                entry = self._load(key, location, loader)
+                status = "miss"
+            except Exception as e:
+                if entry is None or not entry.is_usable_on_error(now):
+                    raise
+                logger.warning("Weather refresh for %s failed, serving stale data: %s", location, e)
+                status = "stale_error"
+
+        count(f"weather_cache_{status}")
+        return entry, status
+
+    def resolve(self, location: str) -> str:
+        """Cache key for a location, following learned aliases"""
+        key = normalize_location(location)
+        with self._lock:
+            canonical = self._aliases.get(key)
+            if canonical is None:
+                return key
+            self._aliases.move_to_end(key)
+            return canonical
+
+    def clear(self) -> None:
+        """Clear the in-process tier and aliases (useful for testing)"""
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+
+    def wait_for_refreshes(self, timeout: Optional[float] = None) -> None:
+        """Join background refreshes (useful for testing)"""
+        with self._lock:
+            threads, self._refresh_threads = self._refresh_threads, []
+        for thread in threads:
+            thread.join(timeout)
+
+    # ------------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------------
+
+    def _get(self, key: str, now: float) -> Optional[WeatherEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self.remote.get((key,), self._decode_remote, now)
+        if entry is not None:
+            self._store_local(key, entry)
+        return entry
+
+    def _load(self, key: str, location: str, loader: Callable[[str], Dict[str, Any]]) -> WeatherEntry:
+        payload = loader(location)
+        now = time.time()
+        entry = WeatherEntry(payload, now, forecast_expiry(now))
+
+        keys = {key}
+        canonical = canonical_location(payload)
+        if canonical and canonical != key:
+            self._store_alias(key, canonical)
+            keys.add(canonical)
+
+        for cache_key in keys:
+            self._store_local(cache_key, entry)
+            self._put_remote(cache_key, entry)
+        return entry
+
+    def _refresh_in_background(self, key: str, location: str, loader: Callable[[str], Dict[str, Any]]) -> None:
+        """
+        Refresh one stale entry on a daemon thread. In Lambda the thread is
+        frozen with the container once the response is returned and resumes
+        on the next invocation, so the refresh finishes there at the latest.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._load(key, location, loader)
+            except Exception as e:
+                logger.warning("Background weather refresh for %s failed: %s", location, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        thread = threading.Thread(target=refresh, name="weather-refresh", daemon=True)
+        with self._lock:
+            # At most one live thread per refreshing key: drop the finished ones
+            self._refresh_threads = [t for t in self._refresh_threads if t.is_alive()]
+            self._refresh_threads.append(thread)
+        thread.start()
+
+    # ------------------------------------------------------------------------
+    # In-process tier
+    # ------------------------------------------------------------------------
+
+    def _store_local(self, key: str, entry: WeatherEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _store_alias(self, alias: str, key: str) -> None:
+        with self._lock:
+            self._aliases[alias] = key
+            self._aliases.move_to_end(alias)
+            while len(self._aliases) > self.max_entries:
+                self._aliases.popitem(last=False)
+
+    # ------------------------------------------------------------------------
+    # DynamoDB tier (best effort: failures are logged, never raised)
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _decode_remote(item: Dict[str, Any]) -> WeatherEntry:
+        return WeatherEntry(json.loads(item["payload"]), float(item["fetched_at"]), float(item["expires_at"]))
+
+    def _put_remote(self, key: str, entry: WeatherEntry) -> None:
+        if not self.remote.enabled:
+            return
+        # Keep the item for the stale fallback window
+        self.remote.put((key,), {
+            "payload": json.dumps(entry.payload, separators=(",", ":")),
+            "fetched_at": str(entry.fetched_at),
+            "expires_at": str(entry.expires_at)
+        }, entry.expires_at + STALE_IF_ERROR_SECONDS)
+
+
+# Module-level cache, reused across warm invocations
+weather_cache = WeatherCache()
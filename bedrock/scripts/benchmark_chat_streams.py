@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Concurrent-stream capacity of the chat backend: Flask (app.py) vs ASGI (asgi_app.py).
+
+Both servers run in-process on local ports with a simulated Bedrock agent
+(first chunk after --first-chunk-ms, then --chunks chunks every --chunk-ms)
+and a simulated Haiku classification (--classify-ms). The Flask app runs
+on a fixed pool of --threads request threads, like gunicorn --threads;
+the ASGI app runs under uvicorn with --threads stream workers and
+--max-waiting queued chats.
+
+For each concurrency level, N clients open /api/chat SSE streams at once
+while a probe polls /api/health. The script reports:
+  - completed streams per second
+  - time to first chunk (p50, p95)
+  - 503 responses and failed streams
+  - health-check p95 under load
+
+Usage:
+    python3 scripts/benchmark_chat_streams.py
+    python3 scripts/benchmark_chat_streams.py --concurrency 16 64 256 --threads 32
+    python3 scripts/benchmark_chat_streams.py --server asgi --first-chunk-ms 800 --chunks 40
+
+Requires the backend requirements (flask, starlette, uvicorn).
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+BEDROCK_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BACKEND_DIR = os.path.join(BEDROCK_DIR, 'frontend', 'backend')
+
+MESSAGE = 'is the crew bringing the tile tomorrow'  # needs the (simulated) Haiku tier
+
+
+class FakeAgentRuntime:
+    """bedrock-agent-runtime stand-in with fixed latency per stream"""
+
+    def __init__(self, first_chunk_ms: float, chunk_ms: float, chunks: int):
+        self.first_chunk = first_chunk_ms / 1000
+        self.chunk_interval = chunk_ms / 1000
+        self.chunks = chunks
+
+    def invoke_agent(self, **kwargs) -> Dict[str, Any]:
+        def completion():
+            time.sleep(self.first_chunk)
+            for index in range(self.chunks):
+                if index:
+                    time.sleep(self.chunk_interval)
+                yield {'chunk': {'bytes': f'token{index} '.encode('utf-8')}}
+        return {'completion': completion()}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+# ============================================================================
+# Servers
+# ============================================================================
+
+def start_flask(flask_app, threads: int):
+    """Flask app on a fixed request thread pool (gunicorn --threads style)"""
+    from werkzeug.serving import BaseWSGIServer
+
+    class PooledWSGIServer(BaseWSGIServer):
+        def __init__(self):
+            super().__init__('127.0.0.1', 0, flask_app)
+            self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='flask-request')
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self._handle, request, client_address)
+
+        def _handle(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    server = PooledWSGIServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1], server.shutdown
+
+
+def start_asgi(asgi_app):
+    import uvicorn
+
+    config = uvicorn.Config(asgi_app, host='127.0.0.1', port=0, log_level='warning', lifespan='off')
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    def stop():
+        server.should_exit = True
+        thread.join(5)
+    return port, stop
+
+# ============================================================================
+# Load
+# ============================================================================
+
+def open_stream(port: int, timeout: float) -> Dict[str, Any]:
+    """One /api/chat SSE stream: status, time to first chunk, chunks, total time"""
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        connection.request('POST', '/api/chat', body=json.dumps({'message': MESSAGE}),
+                           headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        if response.status != 200:
+            response.read()
+            return {'status': response.status}
+        first_chunk = None
+        chunks = 0
+        for line in response:
+            if line.startswith(b'data: {'):
+                chunks += 1
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+            elif line.startswith(b'data: [DONE]'):
+                break
+        return {'status': 200, 'first_chunk': first_chunk, 'chunks': chunks, 'total': time.perf_counter() - start}
+    except (OSError, http.client.HTTPException) as e:
+        return {'status': None, 'error': str(e)}
+    finally:
+        connection.close()
+
+
+def probe_health(port: int, stop: threading.Event, samples: List[float]) -> None:
+    """Poll /api/health every 50ms while streams run (a load balancer's view)"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            connection.request('GET', '/api/health')
+            connection.getresponse().read()
+            connection.close()
+            samples.append(time.perf_counter() - start)
+        except (OSError, http.client.HTTPException):
+            samples.append(10.0)
+        stop.wait(0.05)
+
+
+def run_level(port: int, concurrency: int, chunks: int, timeout: float) -> Dict[str, Any]:
+    health_samples: List[float] = []
+    stop = threading.Event()
+    prober = threading.Thread(target=probe_health, args=(port, stop, health_samples), daemon=True)
+    prober.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        results = list(clients.map(lambda _: open_stream(port, timeout), range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    prober.join()
+
+    completed = [r for r in results if r['status'] == 200 and r['chunks'] == chunks]
+    first_chunks = [r['first_chunk'] for r in completed]
+    return {
+        'concurrency': concurrency,
+        'completed': len(completed),
+        'rejected_503': sum(1 for r in results if r['status'] == 503),
+        'failed': len(results) - len(completed) - sum(1 for r in results if r['status'] == 503),
+        'streams_per_sec': round(len(completed) / elapsed, 1),
+        'first_chunk_p50_ms': round(percentile(first_chunks, 50) * 1000),
+        'first_chunk_p95_ms': round(percentile(first_chunks, 95) * 1000),
+        'health_p95_ms': round(percentile(health_samples, 95) * 1000, 1)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server', choices=['flask', 'asgi', 'both'], default='both')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32, 128])
+    parser.add_argument('--threads', type=int, default=16,
+                        help='Flask request threads / ASGI stream workers (default 16)')
+    parser.add_argument('--max-waiting', type=int, default=64, help='ASGI chats queued before 503')
+    parser.add_argument('--classify-ms', type=float, default=300)
+    parser.add_argument('--first-chunk-ms', type=float, default=500)
+    parser.add_argument('--chunk-ms', type=float, default=20)
+    parser.add_argument('--chunks', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=120, help='Client timeout per stream (s)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    # Stream bridge settings are read at import time
+    os.environ['ASGI_STREAM_WORKERS'] = str(args.threads)
+    os.environ['ASGI_MAX_WAITING'] = str(args.max_waiting)
+    sys.path.insert(0, BACKEND_DIR)
+    import app as routing
+    logging.disable(logging.WARNING)  # per-request routing logs would dominate
+
+    routing.bedrock_agent_runtime = FakeAgentRuntime(args.first_chunk_ms, args.chunk_ms, args.chunks)
+    routing.intent_classifier.fallback = lambda message: time.sleep(args.classify_ms / 1000) or 'information'
+    routing.intent_classifier.cache.enabled = False  # every chat pays for classification
+    routing.speculator.enabled = False
+
+    servers = ['flask', 'asgi'] if args.server == 'both' else [args.server]
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for name in servers:
+        if name == 'flask':
+            port, stop = start_flask(routing.app, args.threads)
+        else:
+            import asgi_app
+            port, stop = start_asgi(asgi_app.app)
+        try:
+            results[name] = [run_level(port, level, args.chunks, args.timeout) for level in args.concurrency]
+        finally:
+            stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    ideal_ms = args.classify_ms + args.first_chunk_ms
+    print(f"Chat stream capacity ({args.threads} threads/workers; ideal first chunk {ideal_ms:.0f}ms, "
+          f"stream {ideal_ms + args.chunk_ms * (args.chunks - 1):.0f}ms)")
+    print(f"{'server':<7} {'clients':>7} {'done':>6} {'503':>5} {'failed':>6} {'streams/s':>10} "
+          f"{'first p50':>10} {'first p95':>10} {'health p95':>11}")
+    for name, levels in results.items():
+        for r in levels:
+            print(f"{name:<7} {r['concurrency']:>7} {r['completed']:>6} {r['rejected_503']:>5} {r['failed']:>6} "
+                  f"{r['streams_per_sec']:>10.1f} {r['first_chunk_p50_ms']:>8}ms {r['first_chunk_p95_ms']:>8}ms "
+                  f"{r['health_p95_ms']:>9.1f}ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
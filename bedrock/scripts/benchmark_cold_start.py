@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the action Lambdas.
+
+Imports each handler module in a fresh Python process (as a new Lambda
+container would) and measures:
+  - import_ms: importing handler.py (config, mock data, shared layer)
+  - first_call_ms: the first lambda_handler invocation after import
+
+Usage:
+    python3 scripts/benchmark_cold_start.py                  # all Lambdas, mock mode
+    python3 scripts/benchmark_cold_start.py --mode real      # USE_MOCK_API=false
+    python3 scripts/benchmark_cold_start.py --budget-ms 150  # exit 1 if median import exceeds budget
+    python3 scripts/benchmark_cold_start.py --top 10         # slowest imported modules (python -X importtime)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BEDROCK_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+LAMBDA_DIR = os.path.join(BEDROCK_DIR, 'lambda')
+LAYER_DIR = os.path.join(LAMBDA_DIR, 'shared-layer', 'python')
+
+# One cheap action per Lambda for the first invocation
+LAMBDAS = {
+    'scheduling-actions': ('/list-projects', {'customer_id': '1645975'}),
+    'information-actions': ('/get-working-hours', {'client_id': '09PF05VD'}),
+    'notes-actions': ('/list-notes', {'project_id': '12345'})
+}
+
+# Runs inside the fresh process; prints one JSON line
+CHILD_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import handler
+imported = time.perf_counter()
+event = {{"apiPath": {api_path!r}, "httpMethod": "POST",
+          "parameters": [{{"name": k, "value": v}} for k, v in {params!r}.items()]}}
+try:
+    handler.lambda_handler(event, None)
+except Exception:
+    pass  # real mode without credentials still measures client construction
+called = time.perf_counter()
+print(json.dumps({{"import_ms": (imported - start) * 1000, "first_call_ms": (called - imported) * 1000,
+                   "modules": len(sys.modules)}}))
+"""
+
+
+def child_env(mode: str) -> dict:
+    env = dict(os.environ)
+    env['USE_MOCK_API'] = 'true' if mode == 'mock' else 'false'
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    env['PYTHONPATH'] = LAYER_DIR
+    env['PYTHONDONTWRITEBYTECODE'] = '0'
+    return env
+
+
+def run_once(lambda_name: str, mode: str, extra_args=()) -> subprocess.CompletedProcess:
+    api_path, params = LAMBDAS[lambda_name]
+    code = CHILD_CODE.format(api_path=api_path, params=params)
+    return subprocess.run(
+        [sys.executable, *extra_args, '-c', code],
+        cwd=os.path.join(LAMBDA_DIR, lambda_name),
+        env=child_env(mode),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+
+def measure(lambda_name: str, mode: str, runs: int) -> dict:
+    # Warm the bytecode cache so runs measure imports, not compilation
+    run_once(lambda_name, mode)
+
+    samples = []
+    for _ in range(runs):
+        output = run_once(lambda_name, mode).stdout.strip().splitlines()[-1]
+        samples.append(json.loads(output))
+
+    imports = sorted(s['import_ms'] for s in samples)
+    calls = sorted(s['first_call_ms'] for s in samples)
+    return {
+        'import_median_ms': statistics.median(imports),
+        'import_max_ms': imports[-1],
+        'first_call_median_ms': statistics.median(calls),
+        'modules': samples[-1]['modules']
+    }
+
+
+def slowest_imports(lambda_name: str, mode: str, top: int) -> list:
+    """
+    Direct imports of handler.py by cumulative time, from python -X importtime
+
+    importtime prints children before their parent, indented two spaces per
+    nesting level, so handler's direct imports are the depth-1 lines right
+    before the depth-0 "handler" line.
+    """
+    stderr = run_once(lambda_name, mode, extra_args=('-X', 'importtime')).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        rows.append((depth, int(cumulative), module.strip()))
+
+    handler_index = max(i for i, row in enumerate(rows) if row[0] == 0 and row[2] == 'handler')
+    children = []
+    for depth, cumulative, module in reversed(rows[:handler_index]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((cumulative, module))
+    return sorted(children, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure action Lambda import and init time')
+    parser.add_argument('--mode', choices=['mock', 'real'], default='mock')
+    parser.add_argument('--runs', type=int, default=10, help='Fresh processes per Lambda')
+    parser.add_argument('--lambda', dest='lambdas', action='append', choices=sorted(LAMBDAS),
+                        help='Lambda to measure (repeatable, default: all)')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help='Fail if any median import time exceeds this budget')
+    parser.add_argument('--top', type=int, default=0, help='Show the N slowest top-level imports')
+    args = parser.parse_args()
+
+    print(f"Cold start benchmark ({args.mode} mode, {args.runs} runs each)")
+    print(f"{'Lambda':<22} {'import p50':>11} {'import max':>11} {'1st call p50':>13} {'modules':>8}")
+
+    over_budget = []
+    for lambda_name in args.lambdas or list(LAMBDAS):
+        result = measure(lambda_name, args.mode, args.runs)
+        print(f"{lambda_name:<22} {result['import_median_ms']:>9.1f}ms {result['import_max_ms']:>9.1f}ms "
+              f"{result['first_call_median_ms']:>11.1f}ms {result['modules']:>8}")
+
+        if args.top:
+            for cumulative_us, module in slowest_imports(lambda_name, args.mode, args.top):
+                print(f"    {cumulative_us / 1000:>8.1f}ms  {module}")
+
+        if args.budget_ms is not None and result['import_median_ms'] > args.budget_ms:
+            over_budget.append(lambda_name)
+
+    if over_budget:
+        print(f"\n❌ Import budget of {args.budget_ms}ms exceeded: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
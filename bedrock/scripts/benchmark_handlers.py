@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+In-process microbenchmark for the action Lambda handlers.
+
+Drives each lambda_handler directly with representative Bedrock events for
+every action, in each parameter format Bedrock sends:
+  - parameters: the top-level "parameters" list
+  - properties: requestBody application/json "properties" list
+  - json:       requestBody application/json as a JSON string
+
+against the mock backend (static records, or seeded synthetic volumes with
+--synthetic), and reports per action and format:
+  - ops/s, mean and p95 latency of the whole lambda_handler call
+  - handler ms: mean time in the action handler (the router's "handler" timer)
+  - overhead ms: mean of the rest of the invocation (parameter parsing, schema
+    coercion, response envelope and JSON body)
+  - alloc KiB: peak traced allocation per call, and bytes retained per call
+    (tracemalloc, in a separate pass so it does not skew timings)
+
+Results can be stored as a baseline and compared on later runs; a drop in
+ops/s or growth in allocations beyond --tolerance exits with status 1.
+
+Usage:
+    python3 scripts/benchmark_handlers.py                              # all Lambdas, actions and formats
+    python3 scripts/benchmark_handlers.py --lambda notes-actions --format json
+    python3 scripts/benchmark_handlers.py --synthetic --projects-per-customer 500 --notes-per-project 300
+    python3 scripts/benchmark_handlers.py --save-baseline              # write .benchmarks/handlers.json
+    python3 scripts/benchmark_handlers.py --compare                    # exit 1 on regression vs the baseline
+"""
+
+import argparse
+import gc
+import importlib
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+BEDROCK_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+LAMBDA_DIR = os.path.join(BEDROCK_DIR, 'lambda')
+LAYER_DIR = os.path.join(LAMBDA_DIR, 'shared-layer', 'python')
+DEFAULT_BASELINE = os.path.join(BEDROCK_DIR, '.benchmarks', 'handlers.json')
+
+LAMBDA_MODULES = ('handler', 'config', 'mock_data')
+FORMATS = ('parameters', 'properties', 'json')
+
+# Every call gets its own Bedrock session so idempotent writes execute instead of replaying
+SESSION_IDS = itertools.count()
+
+NEXT_WEEKDAY = next(
+    day for day in (datetime.now() + timedelta(days=offset) for offset in range(1, 8)) if day.weekday() < 5
+).strftime('%Y-%m-%d')
+
+# Representative parameters per action (the customer/project IDs used across the mock data)
+ACTIONS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    'scheduling-actions': {
+        '/list-projects': {'customer_id': '1645975', 'client_id': '09PF05VD'},
+        '/get-available-dates': {'project_id': '12345', 'client_id': '09PF05VD'},
+        '/get-time-slots': {'project_id': '12345', 'date': NEXT_WEEKDAY, 'request_id': 'REQ-bench'},
+        '/confirm-appointment': {'project_id': '12345', 'date': NEXT_WEEKDAY, 'time': '10:00', 'request_id': 'REQ-bench'},
+        '/reschedule-appointment': {'project_id': '12345', 'new_date': NEXT_WEEKDAY, 'new_time': '13:00',
+                                    'request_id': 'REQ-bench'},
+        '/cancel-appointment': {'project_id': '12345'},
+        '/batch': {'steps': json.dumps([
+            {'id': 'dates', 'action': 'get_available_dates', 'parameters': {'project_id': '12345'}},
+            {'id': 'slots', 'action': 'get_time_slots', 'parameters': {
+                'project_id': '12345', 'date': '$dates.available_dates.0', 'request_id': '$dates.request_id'}}
+        ])},
+    },
+    'information-actions': {
+        '/get-project-details': {'project_id': '12345', 'customer_id': '1645975'},
+        '/get-appointment-status': {'project_id': '12345'},
+        '/get-working-hours': {'client_id': '09PF05VD'},
+        '/is-open': {'client_id': '09PF05VD'},
+        '/get-weather': {'location': 'Tampa, FL'},
+        '/get-project-overview': {'project_id': '12345', 'customer_id': '1645975'},
+    },
+    'notes-actions': {
+        '/add-note': {'project_id': '12345', 'note_text': 'Customer asked for a call 30 minutes before arrival'},
+        '/list-notes': {'project_id': '12345', 'limit': '20'},
+        '/search-notes': {'project_id': '12345', 'query': 'morning appointment'},
+    },
+}
+
+# ============================================================================
+# Setup
+# ============================================================================
+
+def load_handler(lambda_name: str):
+    """Import lambda/<lambda_name>/handler.py without leaking its config/mock_data to other Lambdas"""
+    lambda_dir = os.path.join(LAMBDA_DIR, lambda_name)
+    for name in LAMBDA_MODULES:
+        sys.modules.pop(name, None)
+    sys.path.insert(0, lambda_dir)
+    try:
+        return importlib.import_module('handler')
+    finally:
+        sys.path.remove(lambda_dir)
+        for name in LAMBDA_MODULES:
+            sys.modules.pop(name, None)
+
+
+def make_event(api_path: str, params: Dict[str, Any], fmt: str) -> Dict[str, Any]:
+    """Bedrock Agent event carrying params in the given format"""
+    event = {
+        'messageVersion': '1.0',
+        'actionGroup': 'benchmark',
+        'apiPath': api_path,
+        'httpMethod': 'POST',
+        'sessionId': 'bench'
+    }
+    properties = [{'name': name, 'type': 'string', 'value': str(value)} for name, value in params.items()]
+    if fmt == 'parameters':
+        event['parameters'] = properties
+    elif fmt == 'properties':
+        event['requestBody'] = {'content': {'application/json': {'properties': properties}}}
+    else:
+        event['requestBody'] = {'content': {'application/json': json.dumps(params)}}
+    return event
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_calls(handler, event: Dict[str, Any], iterations: int) -> List[float]:
+    """Per-call wall time of iterations lambda_handler calls (raises on a non-200 response)"""
+    samples = []
+    for _ in range(iterations):
+        event['sessionId'] = f'bench-{next(SESSION_IDS)}'
+        start = time.perf_counter()
+        response = handler.lambda_handler(event, None)
+        samples.append(time.perf_counter() - start)
+        status = response['response']['httpStatusCode']
+        if status != 200:
+            body = response['response']['responseBody']['application/json']['body']
+            raise RuntimeError(f"{event['apiPath']} returned {status}: {body}")
+    return samples
+
+
+def measure_allocations(handler, event: Dict[str, Any], iterations: int) -> Tuple[float, float]:
+    """
+    (mean peak KiB per call, bytes retained per call)
+    """
+    tracemalloc.start()
+    try:
+        peaks = []
+        current_before, _ = tracemalloc.get_traced_memory()
+        for _ in range(iterations):
+            event['sessionId'] = f'bench-{next(SESSION_IDS)}'
+            tracemalloc.reset_peak()
+            start_current, _ = tracemalloc.get_traced_memory()
+            handler.lambda_handler(event, None)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - start_current)
+        current_after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.mean(peaks) / 1024, (current_after - current_before) / iterations
+
+
+def benchmark_case(handler, metrics, api_path: str, params: Dict[str, Any], fmt: str,
+                   iterations: int, warmup: int, alloc_iterations: int) -> Dict[str, Any]:
+    event = make_event(api_path, params, fmt)
+    run_calls(handler, event, warmup)
+
+    gc.collect()
+    with metrics.capture() as aggregator:
+        samples = run_calls(handler, event, iterations)
+
+    handler_ms = aggregator.values('handler_ms')
+    total_ms = aggregator.values('total_ms')
+    overhead_ms = [total - inner for total, inner in zip(total_ms, handler_ms)]
+
+    result = {
+        'ops_per_sec': round(iterations / sum(samples), 1),
+        'mean_us': round(statistics.mean(samples) * 1e6, 1),
+        'p95_us': round(percentile(samples, 95) * 1e6, 1),
+        'handler_ms': round(statistics.mean(handler_ms), 3) if handler_ms else None,
+        'overhead_ms': round(statistics.mean(overhead_ms), 3) if overhead_ms else None,
+        'payload_bytes': int(statistics.mean(aggregator.values('payload_bytes') or [0]))
+    }
+    if alloc_iterations:
+        peak_kib, retained = measure_allocations(handler, event, alloc_iterations)
+        result['alloc_peak_kib'] = round(peak_kib, 1)
+        result['retained_bytes_per_call'] = round(retained, 1)
+    return result
+
+# ============================================================================
+# Baselines
+# ============================================================================
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """Regressions beyond tolerance (slower ops/s, larger peak allocations)"""
+    regressions = []
+    for case, result in results.items():
+        previous = baseline.get(case)
+        if not previous:
+            continue
+        if result['ops_per_sec'] < previous['ops_per_sec'] * (1 - tolerance):
+            regressions.append(f"{case}: {result['ops_per_sec']:.0f} ops/s (baseline {previous['ops_per_sec']:.0f})")
+        if 'alloc_peak_kib' in result and previous.get('alloc_peak_kib') and \
+                result['alloc_peak_kib'] > previous['alloc_peak_kib'] * (1 + tolerance):
+            regressions.append(f"{case}: {result['alloc_peak_kib']:.1f} KiB peak (baseline {previous['alloc_peak_kib']:.1f})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lambda', dest='lambdas', action='append', choices=sorted(ACTIONS),
+                        help='Lambda to benchmark (repeatable, default: all)')
+    parser.add_argument('--action', action='append', help='Only actions whose path contains this (repeatable)')
+    parser.add_argument('--format', dest='formats', action='append', choices=FORMATS,
+                        help='Parameter format (repeatable, default: all)')
+    parser.add_argument('--iterations', type=int, default=300, help='Timed calls per case')
+    parser.add_argument('--warmup', type=int, default=30, help='Untimed calls per case')
+    parser.add_argument('--alloc-iterations', type=int, default=50, help='Calls traced for allocations (0 = skip)')
+    parser.add_argument('--synthetic', action='store_true', help='Use seeded synthetic mock data (MOCK_DATA_MODE=synthetic)')
+    parser.add_argument('--projects-per-customer', type=int, default=None)
+    parser.add_argument('--notes-per-project', type=int, default=None)
+    parser.add_argument('--slots-per-day', type=int, default=None)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--compare', action='store_true', help='Compare with the baseline; exit 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression (default 0.25)')
+    args = parser.parse_args()
+
+    # Configuration is read at import time, so set it before loading any handler
+    os.environ['USE_MOCK_API'] = 'true'
+    os.environ['METRICS_SINK'] = 'off'  # invocation summaries are captured in-process instead
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    if args.synthetic:
+        os.environ['MOCK_DATA_MODE'] = 'synthetic'
+    for option, variable in (('projects_per_customer', 'MOCK_PROJECTS_PER_CUSTOMER'),
+                             ('notes_per_project', 'MOCK_NOTES_PER_PROJECT'),
+                             ('slots_per_day', 'MOCK_SLOTS_PER_DAY')):
+        if getattr(args, option) is not None:
+            os.environ[variable] = str(getattr(args, option))
+    sys.path.insert(0, LAYER_DIR)
+
+    import logging
+    logging.disable(logging.INFO)  # handler log lines would dominate the timings
+    from lib import metrics
+
+    formats = args.formats or list(FORMATS)
+    results: Dict[str, Dict[str, Any]] = {}
+    for lambda_name in args.lambdas or list(ACTIONS):
+        handler = load_handler(lambda_name)
+        for api_path, params in ACTIONS[lambda_name].items():
+            if args.action and not any(pattern in api_path for pattern in args.action):
+                continue
+            for fmt in formats:
+                case = f"{lambda_name}{api_path}[{fmt}]"
+                results[case] = benchmark_case(
+                    handler, metrics, api_path, params, fmt, args.iterations, args.warmup, args.alloc_iterations
+                )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        mode = 'synthetic' if args.synthetic else 'static'
+        print(f"Handler microbenchmark ({mode} mock data, {args.iterations} calls per case)")
+        print(f"{'case':<52} {'ops/s':>9} {'mean':>9} {'p95':>9} {'handler':>9} {'overhead':>9} "
+              f"{'bytes':>7} {'peak KiB':>9} {'kept B':>8}")
+        for case, r in results.items():
+            print(f"{case:<52} {r['ops_per_sec']:>9.0f} {r['mean_us']:>7.0f}us {r['p95_us']:>7.0f}us "
+                  f"{r['handler_ms'] or 0:>7.3f}ms {r['overhead_ms'] or 0:>7.3f}ms {r['payload_bytes']:>7} "
+                  f"{r.get('alloc_peak_kib', 0):>9.1f} {r.get('retained_bytes_per_call', 0):>8.0f}")
+
+    status = 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+            status = 1
+        else:
+            with open(args.baseline) as f:
+                regressions = compare(results, json.load(f)['results'], args.tolerance)
+            if regressions:
+                print(f"\n❌ {len(regressions)} regressions beyond {args.tolerance:.0%}:")
+                for regression in regressions:
+                    print(f"  {regression}")
+                status = 1
+            else:
+                print(f"\n✅ No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'python': sys.version.split()[0],
+                'synthetic': args.synthetic,
+                'results': results
+            }, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
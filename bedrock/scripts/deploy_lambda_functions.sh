@@ -145,6 +145,8 @@ for LAMBDA_NAME in "${LAMBDAS[@]}"; do
     cp handler.py package/
     cp config.py package/
     cp mock_data.py package/
+    cp -r ../shared-layer/python/lib package/
+    cp ../schemas/${LAMBDA_NAME}-schema.json package/
     echo -e "${GREEN}✓ Code copied${NC}"
 
     # Create ZIP file
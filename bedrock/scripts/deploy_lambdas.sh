@@ -39,6 +39,12 @@ for LAMBDA in "${LAMBDAS[@]}"; do
     # Package Lambda function (exclude venv and tests)
     zip -r "../../$ZIP_FILE" . -x "venv/*" "*.pyc" "__pycache__/*" "*.git/*" > /dev/null
 
+    # Bundle shared library (lib/) alongside the handler
+    (cd ../shared-layer/python && zip -r "../../../$ZIP_FILE" lib -x "*.pyc" "*/__pycache__/*" > /dev/null)
+
+    # Bundle the action group schema (parameter schemas are compiled from it)
+    (cd ../schemas && zip "../../$ZIP_FILE" "${LAMBDA}-schema.json" > /dev/null)
+
     cd ../..
 
     echo "✓ Package created: $ZIP_FILE"
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Bulk import of project notes into the notes DynamoDB table.
+
+Reads one JSON note per line ({"project_id", "note_text", "author", optional
+"note_id", "timestamp", "created_at"}) and writes them with batch_write_item,
+25 items per request (see lib/notes_repository.py).
+
+Usage:
+    python3 scripts/import_notes.py notes.jsonl                        # DYNAMODB_TABLE or the dev table
+    python3 scripts/import_notes.py notes.jsonl --table my-notes-table
+    python3 scripts/import_notes.py notes.jsonl --dry-run              # validate only
+"""
+
+import argparse
+import json
+import os
+import sys
+
+BEDROCK_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(BEDROCK_DIR, 'lambda', 'shared-layer', 'python'))
+
+from lib.notes_repository import NotesRepository  # noqa: E402
+
+
+def load_notes(path: str) -> list:
+    """Parse and complete note items from a JSON Lines file"""
+    notes = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not record.get('project_id') or not record.get('note_text'):
+                raise ValueError(f"Line {line_number}: project_id and note_text are required")
+
+            note = NotesRepository.new_note(
+                str(record['project_id']), record['note_text'], record.get('author', 'Import'), record.get('note_id')
+            )
+            note.update({key: record[key] for key in ('timestamp', 'created_at') if record.get(key)})
+            notes.append(note)
+    return notes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help='JSON Lines file with one note per line')
+    parser.add_argument('--table', default=os.getenv('DYNAMODB_TABLE', 'scheduling-agent-notes-dev'))
+    parser.add_argument('--dry-run', action='store_true', help='Validate the file without writing')
+    args = parser.parse_args()
+
+    notes = load_notes(args.path)
+    projects = len({note['project_id'] for note in notes})
+
+    if args.dry_run:
+        print(f"{len(notes)} notes for {projects} projects are valid")
+        return 0
+
+    written = NotesRepository(args.table).put_many(notes)
+    print(f"Imported {written} notes for {projects} projects into {args.table}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
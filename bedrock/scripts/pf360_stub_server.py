@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stand-in for the PF360 endpoints used by the action Lambdas.
+
+Serves seeded synthetic data (lib/synthetic_data.py) on the same paths as
+PF360, so handlers run in real mode (USE_MOCK_API=false) against it with
+CUSTOMER_SCHEDULER_API_URL pointing here. Latency and errors can be injected
+to exercise timeouts, retries and circuit breakers:
+
+  - every response waits --latency-ms plus up to --jitter-ms
+  - --error-rate of requests fail with --error-status (default 503)
+  - --error-route limits errors to paths containing that text (repeatable)
+
+Endpoints:
+    GET  /dashboard/get/{client_id}/{customer_id}
+    GET  /scheduler/client/{client_id}/project/{project_id}/date/{date}/selected/{date}/get-rescheduler-slots[?request_id=]
+    POST /scheduler/client/{client_id}/project/{project_id}/schedule
+    GET  /scheduler/client/{client_id}/project/{project_id}/cancel-reschedule
+    GET  /scheduler/client/{client_id}/business-hours
+    POST /project-notes/add/{client_id}
+    GET  /project-notes/list/{client_id}?project_id=
+    GET  /__stub/stats                     # request and injected-error counts
+
+Usage:
+    python3 scripts/pf360_stub_server.py                                  # http://127.0.0.1:8360
+    python3 scripts/pf360_stub_server.py --projects-per-customer 500 --notes-per-project 200
+    python3 scripts/pf360_stub_server.py --latency-ms 120 --jitter-ms 80 --error-rate 0.05
+    python3 scripts/pf360_stub_server.py --error-rate 1 --error-route project-notes   # notes API down
+
+    USE_MOCK_API=false CUSTOMER_SCHEDULER_API_URL=http://127.0.0.1:8360 python3 lambda/scheduling-actions/handler.py
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+BEDROCK_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(BEDROCK_DIR, 'lambda', 'shared-layer', 'python'))
+
+from lib.synthetic_data import SyntheticData  # noqa: E402
+
+SCHEDULER = r'^/scheduler/client/(?P<client_id>[^/]+)'
+PROJECT = SCHEDULER + r'/project/(?P<project_id>[^/]+)'
+
+ROUTES = [
+    ('GET', re.compile(r'^/dashboard/get/(?P<client_id>[^/]+)/(?P<customer_id>[^/]+)$'), 'dashboard'),
+    ('GET', re.compile(PROJECT + r'/date/(?P<date>[^/]+)/selected/[^/]+/get-rescheduler-slots$'), 'slots'),
+    ('POST', re.compile(PROJECT + r'/schedule$'), 'schedule'),
+    ('GET', re.compile(PROJECT + r'/cancel-reschedule$'), 'cancel'),
+    ('GET', re.compile(SCHEDULER + r'/business-hours$'), 'business_hours'),
+    ('POST', re.compile(r'^/project-notes/add/(?P<client_id>[^/]+)$'), 'add_note'),
+    ('GET', re.compile(r'^/project-notes/list/(?P<client_id>[^/]+)$'), 'list_notes'),
+    ('GET', re.compile(r'^/__stub/stats$'), 'stats'),
+]
+
+WORK_DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+
+class PF360Stub:
+    """Request routing, synthetic responses and fault injection (no HTTP)"""
+
+    def __init__(
+        self,
+        data: SyntheticData,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        error_routes: Optional[List[str]] = None,
+        seed: int = 0
+    ):
+        self.data = data
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.error_routes = error_routes or []
+        self.notes: Dict[str, List[Dict[str, Any]]] = {}
+        self.stats = {'requests': 0, 'errors_injected': 0, 'not_found': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        """Seconds to wait before answering"""
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000
+
+    def inject_error(self, path: str) -> bool:
+        if not self.error_rate or (self.error_routes and not any(route in path for route in self.error_routes)):
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def handle(self, method: str, url: str, body: Optional[Dict[str, Any]] = None) -> Tuple[int, Dict[str, Any]]:
+        """
+        Answer one request
+
+        Returns:
+            (HTTP status, JSON payload)
+        """
+        parts = urlsplit(url)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        with self._lock:
+            self.stats['requests'] += 1
+
+        if self.inject_error(parts.path):
+            with self._lock:
+                self.stats['errors_injected'] += 1
+            return self.error_status, {'status': 'error', 'message': 'Injected error'}
+
+        for route_method, pattern, name in ROUTES:
+            match = pattern.match(parts.path)
+            if match and route_method == method:
+                return 200, getattr(self, f'route_{name}')(match.groupdict(), query, body or {})
+
+        with self._lock:
+            self.stats['not_found'] += 1
+        return 404, {'status': 'error', 'message': f'No route for {method} {parts.path}'}
+
+    # ------------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------------
+
+    def route_dashboard(self, path: Dict, query: Dict, body: Dict) -> Dict[str, Any]:
+        return self.data.projects_response(path['customer_id'])
+
+    def route_slots(self, path: Dict, query: Dict, body: Dict) -> Dict[str, Any]:
+        # Without request_id PF360 opens a session and returns the dates
+        if query.get('request_id'):
+            return self.data.time_slots_response(path['project_id'], path['date'], query['request_id'])
+        return self.data.available_dates_response(path['project_id'])
+
+    def route_schedule(self, path: Dict, query: Dict, body: Dict) -> Dict[str, Any]:
+        return {
+            'status': 'success',
+            'message': f"Appointment scheduled for project {path['project_id']} on {body.get('date')} at {body.get('time')}",
+            'data': {
+                'project_id': path['project_id'],
+                'scheduled_date': body.get('date'),
+                'scheduled_time': body.get('time'),
+                'request_id': body.get('request_id'),
+                'confirmation_number': f"CONF-{uuid.uuid4().hex[:10].upper()}"
+            }
+        }
+
+    def route_cancel(self, path: Dict, query: Dict, body: Dict) -> Dict[str, Any]:
+        return {
+            'status': 'success',
+            'message': f"Appointment cancelled for project {path['project_id']}",
+            'data': {
+                'project_id': path['project_id'],
+                'cancelled_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'cancellation_id': f"CANC-{uuid.uuid4().hex[:10].upper()}"
+            }
+        }
+
+    def route_business_hours(self, path: Dict, query: Dict, body: Dict) -> Dict[str, Any]:
+        return {
+            'status': 'success',
+            'data': {
+                'workHours': [
+                    {'day': day, 'is_working': index < 5,
+                     'start': '08:00' if index < 5 else None, 'end': '17:00' if index < 5 else None}
+                    for index, day in enumerate(WORK_DAYS)
+                ]
+            }
+        }
+
+    def route_add_note(self, path: Dict, query: Dict, body: Dict) -> Dict[str, Any]:
+        project_id = str(body.get('project_id'))
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        note = {
+            'note_id': str(uuid.uuid4()),
+            'project_id': project_id,
+            'note_text': body.get('note'),
+            'author': body.get('author', 'Agent'),
+            'created_at': now,
+            'updated_at': now
+        }
+        with self._lock:
+            self.notes.setdefault(project_id, []).append(note)
+        return {'status': 'success', 'message': f'Note added to project {project_id}', 'data': note}
+
+    def route_list_notes(self, path: Dict, query: Dict, body: Dict) -> Dict[str, Any]:
+        project_id = query.get('project_id', '')
+        with self._lock:
+            added = list(self.notes.get(project_id, []))
+        return self.data.notes_response(project_id, added)
+
+    def route_stats(self, path: Dict, query: Dict, body: Dict) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats)
+
+
+def make_server(stub: PF360Stub, host: str = '127.0.0.1', port: int = 8360) -> ThreadingHTTPServer:
+    """HTTP server for a stub (port 0 picks a free port)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, like PF360 behind its load balancer
+
+        def _serve(self, method: str) -> None:
+            body = None
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                try:
+                    body = json.loads(self.rfile.read(length))
+                except ValueError:
+                    body = None
+
+            time.sleep(stub.delay())
+            status, payload = stub.handle(method, self.path, body)
+            raw = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_GET(self) -> None:
+            self._serve('GET')
+
+        def do_POST(self) -> None:
+            self._serve('POST')
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # per-request logging would dominate benchmark runs
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8360)
+    parser.add_argument('--seed', type=int, default=int(os.getenv('MOCK_DATA_SEED', '42')))
+    parser.add_argument('--customers', type=int, default=int(os.getenv('MOCK_CUSTOMERS', '10')))
+    parser.add_argument('--projects-per-customer', type=int, default=int(os.getenv('MOCK_PROJECTS_PER_CUSTOMER', '25')))
+    parser.add_argument('--notes-per-project', type=int, default=int(os.getenv('MOCK_NOTES_PER_PROJECT', '20')))
+    parser.add_argument('--slots-per-day', type=int, default=int(os.getenv('MOCK_SLOTS_PER_DAY', '9')))
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Fixed delay per response')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Extra random delay, 0..jitter')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests that fail (0-1)')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--error-route', action='append', default=[], help='Only inject errors on paths containing this')
+    args = parser.parse_args()
+
+    data = SyntheticData(
+        seed=args.seed,
+        customers=args.customers,
+        projects_per_customer=args.projects_per_customer,
+        notes_per_project=args.notes_per_project,
+        slots_per_day=args.slots_per_day
+    )
+    stub = PF360Stub(
+        data,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        error_routes=args.error_route,
+        seed=args.seed
+    )
+    server = make_server(stub, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"PF360 stub on http://{host}:{port} "
+          f"({args.customers} customers x {data.projects_per_customer} projects, seed {args.seed})")
+    print(f"Customer IDs: {', '.join(data.customer_ids()[:5])}{' ...' if args.customers > 5 else ''}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
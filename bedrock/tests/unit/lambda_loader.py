@@ -0,0 +1,57 @@
+"""
+Test helper for importing action Lambda handlers
+
+Each Lambda has top-level handler/config/mock_data modules with the same
+names, so they are loaded from their own directory and dropped from
+sys.modules afterwards to keep Lambdas from seeing each other's modules.
+"""
+
+import importlib
+import os
+import sys
+
+os.environ.setdefault("USE_MOCK_API", "true")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+LAMBDA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../lambda"))
+LAYER_PATH = os.path.join(LAMBDA_ROOT, "shared-layer/python")
+
+LAMBDA_MODULES = ("handler", "config", "mock_data")
+
+
+def load_handler(lambda_name: str):
+    """Import lambda/<lambda_name>/handler.py with the shared layer on sys.path"""
+    lambda_dir = os.path.join(LAMBDA_ROOT, lambda_name)
+    if LAYER_PATH not in sys.path:
+        sys.path.insert(0, LAYER_PATH)
+
+    for name in LAMBDA_MODULES:
+        sys.modules.pop(name, None)
+    sys.path.insert(0, lambda_dir)
+    try:
+        return importlib.import_module("handler")
+    finally:
+        sys.path.remove(lambda_dir)
+        for name in LAMBDA_MODULES:
+            sys.modules.pop(name, None)
+
+
+def bedrock_event(api_path: str, **params) -> dict:
+    """Build a Bedrock Agent action group event"""
+    return {
+        "messageVersion": "1.0",
+        "actionGroup": "test",
+        "apiPath": api_path,
+        "httpMethod": "POST",
+        "sessionId": "test-session",
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "properties": [
+                        {"name": name, "type": "string", "value": value}
+                        for name, value in params.items()
+                    ]
+                }
+            }
+        }
+    }
@@ -0,0 +1,175 @@
+"""
+Unit tests for action_router module
+Tests action registration, schema compilation and Lambda dispatch
+"""
+
+import unittest
+import sys
+import os
+import json
+
+import requests
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+from action_router import ActionRouter
+from validators import compile_schemas, load_action_schemas
+from lambda_loader import load_handler, bedrock_event, LAMBDA_ROOT
+
+SCHEMA = {
+    "paths": {
+        "/get-available-dates": {
+            "post": {
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "project_id": {"type": "string"},
+                                    "prefetch_slots": {"type": "boolean"},
+                                    "prefetch_count": {"type": "integer"}
+                                },
+                                "required": ["project_id"]
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+def body(response):
+    return json.loads(response["response"]["responseBody"]["application/json"]["body"])
+
+
+class TestSchemas(unittest.TestCase):
+    """Test pre-compiled parameter schemas"""
+
+    def setUp(self):
+        self.schema = compile_schemas(SCHEMA)["get-available-dates"]
+
+    def test_coercion(self):
+        """Test string parameters are coerced to schema types"""
+        params = self.schema.apply({"project_id": "12345", "prefetch_slots": "true", "prefetch_count": "3"})
+        self.assertEqual(params, {"project_id": "12345", "prefetch_slots": True, "prefetch_count": 3})
+
+    def test_missing_required(self):
+        """Test missing required parameters raise ValueError"""
+        with self.assertRaises(ValueError) as cm:
+            self.schema.apply({"project_id": ""})
+        self.assertIn("project_id", str(cm.exception))
+
+    def test_invalid_value(self):
+        """Test uncoercible values raise ValueError"""
+        with self.assertRaises(ValueError):
+            self.schema.apply({"project_id": "12345", "prefetch_count": "three"})
+
+    def test_repo_schemas_compile(self):
+        """Test every action group schema in lambda/schemas compiles"""
+        schemas = load_action_schemas("scheduling-actions-schema.json", os.path.join(LAMBDA_ROOT, "scheduling-actions"))
+        self.assertEqual(schemas["get-time-slots"].required, ("project_id", "date", "request_id"))
+        self.assertEqual(load_action_schemas("missing-schema.json", LAMBDA_ROOT), {})
+
+    def test_deployed_schemas_cover_actions(self):
+        """Test infrastructure/openapi_schemas (what Terraform deploys) has every action and the shared options"""
+        shared = {"fields", "compact", "limit", "next_token"}
+
+        def properties(spec):
+            body = spec["post"].get("requestBody", {}).get("content", {}).get("application/json", {})
+            return set(body.get("schema", {}).get("properties", {}))
+
+        for group in ("scheduling", "information", "notes"):
+            with open(os.path.join(LAMBDA_ROOT, "schemas", f"{group}-actions-schema.json")) as f:
+                local = json.load(f)["paths"]
+            with open(os.path.join(LAMBDA_ROOT, "../infrastructure/openapi_schemas", f"{group}_actions.json")) as f:
+                deployed = {path.replace("_", "-"): spec for path, spec in json.load(f)["paths"].items()}
+            for path, spec in local.items():
+                with self.subTest(group=group, path=path):
+                    self.assertIn(path, deployed)
+                    self.assertLessEqual(properties(spec) & shared, properties(deployed[path]))
+
+
+class TestActionRouter(unittest.TestCase):
+    """Test registration and dispatch"""
+
+    def setUp(self):
+        self.router = ActionRouter(
+            "scheduling",
+            lambda client_id: {"client_id": client_id},
+            lambda authorization, client_id: {"authorization": authorization},
+            use_mock=False,
+            schemas=compile_schemas(SCHEMA)
+        )
+
+        @self.router.action("get_available_dates")
+        def handle(params, config, auth_headers):
+            return {"params": params, "config": config, "auth": auth_headers}
+
+        @self.router.action("fail")
+        def handle_fail(params, config, auth_headers):
+            raise requests.ConnectionError("upstream down")
+
+    def test_dispatch(self):
+        """Test params, config and auth headers reach the handler"""
+        event = bedrock_event("/get_available_dates", project_id="12345", prefetch_slots="true",
+                              client_id="CLIENT001", authorization="token")
+        response = self.router.dispatch(event)
+
+        self.assertEqual(response["response"]["httpStatusCode"], 200)
+        result = body(response)
+        self.assertIs(result["params"]["prefetch_slots"], True)
+        self.assertEqual(result["config"], {"client_id": "CLIENT001"})
+        self.assertEqual(result["auth"], {"authorization": "token"})
+
+    def test_action_from_parameters(self):
+        """Test the action parameter is used when apiPath is missing"""
+        event = bedrock_event("", action="get_available_dates", project_id="12345")
+        del event["apiPath"]
+
+        self.assertEqual(self.router.dispatch(event)["response"]["httpStatusCode"], 200)
+
+    def test_error_status_codes(self):
+        """Test unknown actions, validation and upstream failures"""
+        cases = [
+            (bedrock_event("/nope"), 400),
+            (bedrock_event("/get-available-dates"), 400),
+            (bedrock_event("/fail"), 502)
+        ]
+        for event, status in cases:
+            response = self.router.dispatch(event)
+            self.assertEqual(response["response"]["httpStatusCode"], status)
+            self.assertIn("error", body(response))
+
+
+class TestActionLambdas(unittest.TestCase):
+    """Smoke test each action Lambda through its router (mock mode)"""
+
+    def test_scheduling(self):
+        handler = load_handler("scheduling-actions")
+        response = handler.lambda_handler(bedrock_event("/list-projects", customer_id="1645975"), None)
+
+        self.assertEqual(response["response"]["httpStatusCode"], 200)
+        self.assertGreater(body(response)["project_count"], 0)
+        self.assertIn("batch", handler.router.handlers)
+
+    def test_information(self):
+        handler = load_handler("information-actions")
+        response = handler.lambda_handler(bedrock_event("/get-weather", location="Tampa, FL"), None)
+
+        self.assertEqual(response["response"]["httpStatusCode"], 200)
+        self.assertEqual(body(response)["action"], "get_weather")
+
+    def test_notes(self):
+        handler = load_handler("notes-actions")
+        response = handler.lambda_handler(bedrock_event("/add-note", project_id="12345"), None)
+
+        self.assertEqual(response["response"]["httpStatusCode"], 400)
+        self.assertIn("note_text", body(response)["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""
+Unit tests for the ASGI chat backend
+Tests the stream bridge (ordering, errors, backpressure, disconnects, admission) and the endpoints
+"""
+
+import unittest
+import sys
+import os
+import asyncio
+import threading
+import time
+from unittest import mock
+
+# Add the chat backend to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../frontend/backend"))
+
+import app as routing
+import asgi_app
+from asgi_app import StreamBridge
+from starlette.testclient import TestClient
+
+
+class FakeAgentRuntime:
+
+    def invoke_agent(self, **kwargs):
+        return {"completion": iter([{"chunk": {"bytes": b"Hello "}}, {"chunk": {"bytes": b"there"}}])}
+
+
+class TestStreamBridge(unittest.TestCase):
+
+    def setUp(self):
+        self.bridge = StreamBridge(workers=2, max_waiting=0, buffer_size=2, send_timeout=1)
+        self.addCleanup(self.bridge.executor.shutdown)
+
+    def collect(self, open_iterator):
+        async def run():
+            return [item async for item in self.bridge.iterate(open_iterator)]
+        return asyncio.run(run())
+
+    def test_relays_in_order(self):
+        self.assertEqual(self.collect(lambda: iter(range(10))), list(range(10)))
+        self.assertEqual(self.bridge.stats()["completed"], 1)
+
+    def test_errors_reach_consumer(self):
+        def failing():
+            yield 1
+            raise RuntimeError("throttled")
+
+        with self.assertRaises(RuntimeError):
+            self.collect(failing)
+        self.assertEqual(self.bridge.stats()["failed"], 1)
+
+    def test_backpressure(self):
+        """Test the worker stays at most buffer_size items ahead of a slow consumer"""
+        produced = []
+
+        def source():
+            for index in range(8):
+                produced.append(index)
+                yield index
+
+        async def run():
+            ahead = []
+            async for item in self.bridge.iterate(source):
+                await asyncio.sleep(0.02)
+                ahead.append(len(produced) - item - 1)
+            return ahead
+
+        self.assertLessEqual(max(asyncio.run(run())), self.bridge.buffer_size + 1)
+
+    def test_disconnect_closes_iterator(self):
+        closed = threading.Event()
+
+        def source():
+            try:
+                for index in range(1000):
+                    time.sleep(0.001)
+                    yield index
+            finally:
+                closed.set()
+
+        async def run():
+            async for _ in self.bridge.iterate(source):
+                break  # client went away
+
+        asyncio.run(run())
+        self.assertTrue(closed.wait(2))
+        self.assertEqual(self.bridge.stats()["disconnected"], 1)
+
+    def test_stalled_client_resumes(self):
+        """Test a client that resumes after the worker gave up gets the buffer, then an error (no hang)"""
+        bridge = StreamBridge(workers=1, max_waiting=0, buffer_size=2, send_timeout=0.1)
+        self.addCleanup(bridge.executor.shutdown)
+        closed = threading.Event()
+
+        def source():
+            try:
+                yield from range(100)
+            finally:
+                closed.set()
+
+        async def run():
+            received = []
+            stream = bridge.iterate(source)
+            received.append(await stream.__anext__())
+            await asyncio.sleep(0.5)  # client stalls past send_timeout
+            with self.assertRaises(TimeoutError):
+                async for item in stream:
+                    received.append(item)
+            return received
+
+        received = asyncio.run(asyncio.wait_for(run(), 5))
+        self.assertEqual(received, list(range(len(received))))
+        self.assertLess(len(received), 100)
+        self.assertTrue(closed.wait(2))
+        stats = bridge.stats()
+        self.assertEqual((stats["stalled"], stats["failed"], stats["open_streams"]), (1, 0, 0))
+
+    def test_admission(self):
+        self.bridge.open_streams = 2
+        self.assertFalse(self.bridge.accepting())
+        self.bridge.open_streams = 1
+        self.assertTrue(self.bridge.accepting())
+        self.assertEqual(self.bridge.stats()["rejected"], 1)
+
+
+class TestASGIEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(routing, "bedrock_agent_runtime", FakeAgentRuntime()),
+            mock.patch.object(routing.intent_classifier, "fallback", return_value="information"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = TestClient(asgi_app.app)
+
+    def test_chat_stream(self):
+        with self.client.stream("POST", "/api/chat", json={"message": "Show me my projects"}) as response:
+            lines = [line for line in response.iter_lines() if line]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        self.assertEqual(lines, ['data: {"chunk": "Hello "}', 'data: {"chunk": "there"}', "data: [DONE]"])
+
+    def test_chat_simple(self):
+        body = self.client.post("/api/chat/simple", json={"message": "hi"}).json()
+        self.assertEqual(body["response"], "Hello there")
+        self.assertEqual(body["customer_id"], routing.SAMPLE_USER["customer_id"])
+
+    def test_message_required(self):
+        self.assertEqual(self.client.post("/api/chat", json={}).status_code, 400)
+        self.assertEqual(self.client.post("/api/chat/simple", content=b"not json").status_code, 400)
+
+    def test_busy(self):
+        with mock.patch.object(asgi_app.bridge, "accepting", return_value=False):
+            response = self.client.post("/api/chat", json={"message": "hi"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["retry-after"], "1")
+
+    def test_same_payloads_as_flask(self):
+        flask_client = routing.app.test_client()
+        for path in ("/api/health", "/api/config", "/api/user"):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).json(), flask_client.get(path).json)
+        self.assertIn("streams", self.client.get("/api/metrics").json())
+
+    def test_chat_recorded_in_metrics(self):
+        self.client.post("/api/chat/simple", json={"message": "hi"})
+        since_start = self.client.get("/api/metrics").json()["metrics"]["since_start"]
+        self.assertGreaterEqual(since_start["invocations"]["time_to_first_chunk"]["count"], 1)
+
+        for response in (self.client.get("/api/metrics/prometheus"),
+                         routing.app.test_client().get("/api/metrics/prometheus")):
+            self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+            self.assertIn('bedrock_routing_invocations_total{intent="chitchat",status="success"}', response.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+"""
+Unit tests for async_runtime module
+Tests the sync shim, overlapping calls, async handler dispatch and the Lambdas' async variants
+"""
+
+import unittest
+import sys
+import os
+import json
+import threading
+import time
+from unittest import mock
+
+import requests
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+import async_runtime
+import http_client
+from async_runtime import run, call, gather, http_get_async
+from action_router import ActionRouter
+from invocation_log import start_invocation, end_invocation
+from lambda_loader import load_handler, bedrock_event
+
+
+def body(response):
+    return json.loads(response["response"]["responseBody"]["application/json"]["body"])
+
+
+class TestRuntime(unittest.TestCase):
+    """Test the event loop shim and helpers"""
+
+    def tearDown(self):
+        async_runtime.reset_async_runtime()
+
+    def test_run_reuses_loop(self):
+        """Test one event loop is kept across invocations"""
+        async def loop_id():
+            return id(async_runtime.get_event_loop())
+
+        self.assertEqual(run(loop_id()), run(loop_id()))
+
+    def test_blocking_calls_overlap(self):
+        """Test gathered blocking calls run concurrently"""
+        async def both():
+            return await gather(call(time.sleep, 0.1), call(time.sleep, 0.1))
+
+        started = time.perf_counter()
+        run(both())
+        self.assertLess(time.perf_counter() - started, 0.18)
+
+    def test_gather_return_exceptions(self):
+        """Test failures can be collected instead of raised"""
+        async def failing():
+            raise ValueError("boom")
+
+        async def both():
+            return await gather(call(len, "abc"), failing(), return_exceptions=True)
+
+        length, error = run(both())
+        self.assertEqual(length, 3)
+        self.assertIsInstance(error, ValueError)
+
+    def test_http_get_async_thread_fallback(self):
+        """Test async GETs use the pooled requests session without httpx"""
+        res = requests.Response()
+        res.status_code = 200
+
+        invocation = start_invocation("scheduling", {})
+        with mock.patch.object(async_runtime, "use_httpx", return_value=False), \
+                mock.patch.object(http_client.get_http_session(), "get", return_value=res) as get:
+            results = run(gather(http_get_async("https://example.com/a"), http_get_async("https://example.com/b")))
+        end_invocation(200)
+
+        self.assertEqual([r.status_code for r in results], [200, 200])
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual(invocation.upstream_calls, 2)
+
+    def test_use_httpx_setting(self):
+        """Test HTTP_ASYNC_CLIENT forces the client choice"""
+        with mock.patch.object(async_runtime, "ASYNC_CLIENT", "threads"):
+            self.assertFalse(async_runtime.use_httpx())
+        with mock.patch.object(async_runtime, "ASYNC_CLIENT", "httpx"):
+            self.assertTrue(async_runtime.use_httpx())
+
+
+class TestAsyncDispatch(unittest.TestCase):
+    """Test routers prefer async variants only when use_async is set"""
+
+    def make_router(self, use_async):
+        router = ActionRouter("scheduling", lambda c: {}, lambda a, c: {}, use_mock=True, use_async=use_async)
+
+        @router.action("lookup")
+        def handle_lookup(params, config, auth_headers):
+            return {"path": "sync"}
+
+        @router.async_action("lookup")
+        async def handle_lookup_async(params, config, auth_headers):
+            return {"path": "async"}
+
+        @router.async_action("async-only")
+        async def handle_async_only(params, config, auth_headers):
+            raise ValueError("Invalid date")
+
+        return router
+
+    def test_use_async(self):
+        router = self.make_router(use_async=True)
+        self.assertEqual(body(router.dispatch(bedrock_event("/lookup")))["path"], "async")
+        self.assertEqual(router.dispatch(bedrock_event("/async-only"))["response"]["httpStatusCode"], 400)
+
+    def test_sync_default(self):
+        router = self.make_router(use_async=False)
+        self.assertEqual(body(router.dispatch(bedrock_event("/lookup")))["path"], "sync")
+        self.assertEqual(router.dispatch(bedrock_event("/async-only"))["response"]["httpStatusCode"], 400)
+
+
+class TestSchedulingAsync(unittest.TestCase):
+    """Test the scheduling Lambda's async variants (mock mode)"""
+
+    def setUp(self):
+        self.handler = load_handler("scheduling-actions")
+        self.handler.router.use_async = True
+
+    def test_reschedule_cancels_before_confirming(self):
+        """Test reschedule runs its dependent writes in order even with use_async"""
+        calls = []
+        cancel, confirm = self.handler.handle_cancel_appointment, self.handler.handle_confirm_appointment
+
+        def record(name, handler):
+            def wrapper(*args):
+                calls.append(name)
+                return handler(*args)
+            return wrapper
+
+        event = bedrock_event("/reschedule-appointment", project_id="12345", new_date="2025-10-20",
+                              new_time="10:00 AM", request_id="REQ-ORDER")
+        with mock.patch.object(self.handler, "handle_cancel_appointment", record("cancel", cancel)), \
+                mock.patch.object(self.handler, "handle_confirm_appointment", record("confirm", confirm)):
+            result = body(self.handler.lambda_handler(event, None))
+
+        self.assertEqual(calls, ["cancel", "confirm"])
+        self.assertEqual(result["confirm_result"]["scheduled_date"], "2025-10-20")
+
+    def test_reschedule_missing_parameters(self):
+        response = self.handler.lambda_handler(bedrock_event("/reschedule-appointment", project_id="12345"), None)
+        self.assertEqual(response["response"]["httpStatusCode"], 400)
+
+    def test_available_dates_prefetch(self):
+        """Test slots are prefetched through the event loop and served to get_time_slots"""
+        result = body(self.handler.lambda_handler(
+            bedrock_event("/get-available-dates", project_id="12345", prefetch_slots="true", prefetch_count="2"), None
+        ))
+
+        self.assertEqual(list(result["slots_by_date"]), result["available_dates"][:2])
+        slots = body(self.handler.lambda_handler(
+            bedrock_event("/get-time-slots", project_id="12345", date=result["available_dates"][0],
+                          request_id=result["request_id"]), None
+        ))
+        self.assertTrue(slots["prefetched"])
+
+
+class TestInformationAsync(unittest.TestCase):
+    """Test the information Lambda's async overview (mock mode)"""
+
+    def setUp(self):
+        self.handler = load_handler("information-actions")
+        self.handler.router.use_async = True
+        self.handler.weather_cache.clear()
+
+    def test_overview_fetches_overlap(self):
+        """Test the notes fetch runs while the dashboard is being fetched"""
+        both_started = threading.Barrier(2, timeout=2)
+        dashboard, notes = self.handler.get_mock_project_details, self.handler.get_mock_project_notes
+
+        def overlapping(fetch):
+            def wrapper(*args):
+                both_started.wait()  # broken (and the action failed) if the fetches ran one after the other
+                return fetch(*args)
+            return wrapper
+
+        event = bedrock_event("/get-project-overview", project_id="12345", customer_id="1645975")
+        with mock.patch.object(self.handler, "get_mock_project_details", overlapping(dashboard)), \
+                mock.patch.object(self.handler, "get_mock_project_notes", overlapping(notes)):
+            response = self.handler.lambda_handler(event, None)
+
+        result = body(response)
+        self.assertEqual(response["response"]["httpStatusCode"], 200)
+        self.assertEqual(result["appointment"]["status"], "Scheduled")
+        self.assertEqual(result["notes"]["total_count"], 3)
+        self.assertEqual(result["weather"]["location"], "Tampa, FL")
+        self.assertEqual(result["unavailable"], [])
+
+    def test_overview_partial_failure(self):
+        with mock.patch.object(self.handler, "get_mock_project_notes", side_effect=TimeoutError("read timed out")):
+            result = body(self.handler.lambda_handler(
+                bedrock_event("/get-project-overview", project_id="12345", customer_id="1645975"), None
+            ))
+
+        self.assertEqual(result["unavailable"], ["notes"])
+        self.assertIsNotNone(result["weather"])
+
+    def test_overview_unknown_project(self):
+        response = self.handler.lambda_handler(
+            bedrock_event("/get-project-overview", project_id="99999", customer_id="1645975"), None
+        )
+        self.assertEqual(response["response"]["httpStatusCode"], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
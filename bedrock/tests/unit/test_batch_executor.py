@@ -0,0 +1,244 @@
+"""
+Unit tests for batch_executor module
+Tests step parsing, reference resolution and concurrent execution
+"""
+
+import unittest
+import sys
+import os
+import threading
+import time
+import json
+from unittest import mock
+
+import requests
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+from batch_executor import (
+    parse_steps,
+    resolve_references,
+    run_batch
+)
+from validators import compile_schemas
+from idempotency import IdempotencyStore
+from lambda_loader import load_handler, bedrock_event
+
+
+def handle_dates(params, config, auth_headers):
+    return {"available_dates": ["2025-10-21", "2025-10-22"], "request_id": f"REQ-{params['project_id']}"}
+
+
+def handle_slots(params, config, auth_headers):
+    return {"date": params["date"], "request_id": params["request_id"], "client_id": params.get("client_id")}
+
+
+def handle_fail(params, config, auth_headers):
+    raise requests.ConnectionError("upstream down")
+
+
+HANDLERS = {
+    "get-available-dates": handle_dates,
+    "get-time-slots": handle_slots,
+    "fail": handle_fail
+}
+
+
+class TestParseSteps(unittest.TestCase):
+    """Test batch validation"""
+
+    def test_json_string_steps(self):
+        """Test steps passed as a JSON string"""
+        steps = parse_steps('[{"action": "get_available_dates", "parameters": {"project_id": "12345"}}]')
+
+        self.assertEqual(steps[0]["id"], "0")
+        self.assertEqual(steps[0]["action"], "get-available-dates")
+        self.assertEqual(steps[0]["depends_on"], set())
+
+    def test_dependencies_detected(self):
+        """Test references are recorded as dependencies"""
+        steps = parse_steps([
+            {"id": "dates", "action": "get_available_dates"},
+            {"id": "slots", "action": "get_time_slots", "parameters": {"request_id": "$dates.request_id"}}
+        ])
+        self.assertEqual(steps[1]["depends_on"], {"dates"})
+
+    def test_forward_reference_rejected(self):
+        """Test references must point at earlier steps"""
+        with self.assertRaises(ValueError):
+            parse_steps([
+                {"id": "slots", "action": "get_time_slots", "parameters": {"request_id": "$dates.request_id"}},
+                {"id": "dates", "action": "get_available_dates"}
+            ])
+
+    def test_invalid_batches(self):
+        """Test malformed batches"""
+        for raw in ("not json", [], [{"parameters": {}}], [{"id": "a", "action": "x"}, {"id": "a", "action": "y"}]):
+            with self.assertRaises(ValueError):
+                parse_steps(raw)
+
+
+class TestResolveReferences(unittest.TestCase):
+    """Test reference substitution"""
+
+    def test_nested_paths(self):
+        """Test dict keys and list indexes"""
+        results = {"dates": {"available_dates": ["2025-10-21"], "request_id": "REQ-1"}}
+        resolved = resolve_references(
+            {"date": "$dates.available_dates.0", "ids": ["$dates.request_id"], "literal": "$5 fee"},
+            results
+        )
+        self.assertEqual(resolved, {"date": "2025-10-21", "ids": ["REQ-1"], "literal": "$5 fee"})
+
+    def test_missing_path(self):
+        """Test a missing path raises ValueError"""
+        with self.assertRaises(ValueError):
+            resolve_references("$dates.nope", {"dates": {}})
+
+
+class TestRunBatch(unittest.TestCase):
+    """Test batch execution"""
+
+    def test_chained_steps(self):
+        """Test later steps receive earlier results and shared params"""
+        steps = parse_steps([
+            {"id": "dates", "action": "get_available_dates", "parameters": {"project_id": "12345"}},
+            {"id": "slots", "action": "get_time_slots",
+             "parameters": {"date": "$dates.available_dates.1", "request_id": "$dates.request_id"}}
+        ])
+
+        results = run_batch(steps, HANDLERS, {"client_id": "CLIENT001"}, {}, {})
+
+        self.assertEqual([r["status"] for r in results], ["success", "success"])
+        self.assertEqual(results[1]["result"], {
+            "date": "2025-10-22", "request_id": "REQ-12345", "client_id": "CLIENT001"
+        })
+
+    def test_failed_dependency_skips(self):
+        """Test dependents of a failed step are skipped"""
+        steps = parse_steps([
+            {"id": "a", "action": "fail"},
+            {"id": "b", "action": "get_time_slots", "parameters": {"date": "$a.date", "request_id": "x"}},
+            {"id": "c", "action": "unknown_action"}
+        ])
+
+        results = run_batch(steps, HANDLERS, {}, {}, {})
+
+        self.assertEqual(results[0]["status_code"], 502)
+        self.assertEqual(results[1]["status"], "skipped")
+        self.assertEqual(results[2]["status_code"], 400)
+
+    def test_independent_steps_concurrent(self):
+        """Test independent steps overlap in time"""
+        barrier = threading.Barrier(3, timeout=2)
+
+        def handle_wait(params, config, auth_headers):
+            barrier.wait()
+            return {"ok": True}
+
+        steps = parse_steps([{"action": "wait"} for _ in range(3)])
+        start = time.time()
+        results = run_batch(steps, {"wait": handle_wait}, {}, {}, {}, max_workers=3, read_only={"wait"})
+
+        self.assertTrue(all(r["status"] == "success" for r in results))
+        self.assertLess(time.time() - start, 2)
+
+    def test_writes_run_in_order(self):
+        """Test independent writes never overlap each other or neighbouring reads"""
+        events = []
+        lock = threading.Lock()
+
+        def handler(name):
+            def handle(params, config, auth_headers):
+                with lock:
+                    events.append(("start", name))
+                time.sleep(0.02)
+                with lock:
+                    events.append(("end", name))
+                return {}
+            return handle
+
+        handlers = {action: handler(action) for action in ("read-a", "cancel", "confirm", "read-b")}
+        steps = parse_steps([{"action": action} for action in ("read_a", "cancel", "confirm", "read_b")])
+        results = run_batch(steps, handlers, {}, {}, {}, max_workers=4, read_only={"read-a", "read-b"})
+
+        self.assertTrue(all(r["status"] == "success" for r in results))
+        self.assertEqual(events, [(edge, name) for name in ("read-a", "cancel", "confirm", "read-b")
+                                  for edge in ("start", "end")])
+
+    def test_failed_write_does_not_skip_later_steps(self):
+        steps = parse_steps([{"action": "fail"}, {"action": "get_available_dates", "parameters": {"project_id": "1"}}])
+        results = run_batch(steps, HANDLERS, {}, {}, {})
+        self.assertEqual([r["status"] for r in results], ["error", "success"])
+
+    def test_step_parameter_schema(self):
+        """Test steps are checked and coerced with the action's compiled schema"""
+        schemas = compile_schemas({"paths": {"/get-time-slots": {"post": {"requestBody": {"content": {
+            "application/json": {"schema": {"required": ["date"], "properties": {"date": {"type": "string"},
+                                                                                 "request_id": {"type": "integer"}}}}
+        }}}}}})
+        steps = parse_steps([
+            {"action": "get_time_slots", "parameters": {"date": "2025-10-21", "request_id": "42"}},
+            {"action": "get_time_slots", "parameters": {"request_id": "42"}}
+        ])
+
+        results = run_batch(steps, HANDLERS, {}, {}, {}, schemas=schemas)
+
+        self.assertEqual(results[0]["result"]["request_id"], 42)
+        self.assertEqual(results[1]["status_code"], 400)
+
+    def test_retried_batch_replays_writes(self):
+        """Test a retried batch replays both writes on a project instead of repeating them"""
+        calls = []
+
+        def handler(name):
+            def handle(params, config, auth_headers):
+                calls.append(name)
+                return {"action": name, "project_id": params["project_id"]}
+            return handle
+
+        handlers = {"cancel-appointment": handler("cancel"), "confirm-appointment": handler("confirm")}
+        steps = parse_steps([
+            {"action": "cancel_appointment", "parameters": {"project_id": "12345"}},
+            {"action": "confirm_appointment", "parameters": {"project_id": "12345", "date": "2025-10-21"}}
+        ])
+        kwargs = {"idempotency": IdempotencyStore(table_name=""), "idempotent_actions": handlers.keys()}
+
+        first = run_batch(steps, handlers, {}, {}, {}, session_id="session-1", **kwargs)
+        retry = run_batch(steps, handlers, {}, {}, {}, session_id="session-1", **kwargs)
+        self.assertEqual(calls, ["cancel", "confirm"])
+        self.assertEqual(first, retry)
+
+        run_batch(steps, handlers, {}, {}, {}, session_id="session-2", **kwargs)
+        self.assertEqual(len(calls), 4)
+
+
+class TestBatchAction(unittest.TestCase):
+    """Test /batch through the scheduling Lambda (mock mode)"""
+
+    def test_retried_batch_does_not_repeat_writes(self):
+        handler = load_handler("scheduling-actions")
+        handler.idempotency_store.clear()
+        self.addCleanup(handler.idempotency_store.clear)
+        steps = json.dumps([
+            {"id": "dates", "action": "get_available_dates", "parameters": {"project_id": "12345"}},
+            {"id": "confirm", "action": "confirm_appointment",
+             "parameters": {"project_id": "12345", "date": "$dates.available_dates.0", "time": "10:00",
+                            "request_id": "$dates.request_id"}}
+        ])
+        event = bedrock_event("/batch", client_id="CLIENT001", customer_id="CUST001", steps=steps)
+
+        with mock.patch.object(handler, "get_mock_confirm_appointment",
+                               wraps=handler.get_mock_confirm_appointment) as confirm:
+            first = handler.lambda_handler(event, None)
+            retry = handler.lambda_handler(event, None)
+
+        body = json.loads(first["response"]["responseBody"]["application/json"]["body"])
+        self.assertEqual([r["status"] for r in body["results"]], ["success", "success"])
+        self.assertEqual(confirm.call_count, 1)
+        self.assertEqual(first, retry)
+
+
+if __name__ == "__main__":
+    unittest.main()
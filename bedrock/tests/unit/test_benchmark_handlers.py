@@ -0,0 +1,61 @@
+"""
+Unit tests for the handler microbenchmark script
+Tests event formats, that every benchmarked action succeeds in mock mode, and baseline comparison
+"""
+
+import unittest
+import sys
+import os
+import importlib.util
+
+from lambda_loader import load_handler, LAYER_PATH
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, LAYER_PATH)
+
+from lib.validators import extract_bedrock_parameters
+
+SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "../../scripts/benchmark_handlers.py")
+spec = importlib.util.spec_from_file_location("benchmark_handlers", SCRIPT_PATH)
+benchmark_handlers = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(benchmark_handlers)
+
+
+class TestMakeEvent(unittest.TestCase):
+
+    def test_formats_carry_same_parameters(self):
+        params = {"project_id": "12345", "date": "2025-10-20"}
+        for fmt in benchmark_handlers.FORMATS:
+            with self.subTest(fmt=fmt):
+                event = benchmark_handlers.make_event("/get-time-slots", params, fmt)
+                self.assertEqual(extract_bedrock_parameters(event), params)
+
+
+class TestBenchmarkActions(unittest.TestCase):
+    """Test every benchmarked action returns 200, so the table stays in step with the handlers"""
+
+    def test_all_actions_succeed(self):
+        for lambda_name, actions in benchmark_handlers.ACTIONS.items():
+            handler = load_handler(lambda_name)
+            for api_path, params in actions.items():
+                with self.subTest(action=api_path):
+                    event = benchmark_handlers.make_event(api_path, params, "json")
+                    self.assertEqual(len(benchmark_handlers.run_calls(handler, event, 2)), 2)
+
+
+class TestCompare(unittest.TestCase):
+
+    def test_regressions(self):
+        baseline = {"a": {"ops_per_sec": 1000, "alloc_peak_kib": 10.0}, "b": {"ops_per_sec": 1000}}
+        results = {
+            "a": {"ops_per_sec": 700, "alloc_peak_kib": 13.0},
+            "b": {"ops_per_sec": 900},
+            "c": {"ops_per_sec": 1}
+        }
+        regressions = benchmark_handlers.compare(results, baseline, tolerance=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(regression.startswith("a:") for regression in regressions))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+"""
+Unit tests for business_hours module
+Tests time parsing, compiled open/closed checks, next open windows and the per-client cache
+"""
+
+import unittest
+import sys
+import os
+import json
+from datetime import datetime, timezone
+from unittest import mock
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+from business_hours import BusinessHoursCache, compile_business_hours, parse_time
+from lambda_loader import load_handler, bedrock_event
+
+# 2025-10-20 is a Monday
+HOURS = {
+    "workHours": [
+        {"day": "Monday", "is_working": True, "start": "08:00", "end": "17:00"},
+        {"day": "Tuesday", "is_working": True, "start": "08:00", "end": "17:00"},
+        {"day": "Wednesday", "is_working": True, "start": "08:00", "end": "12:00"},
+        {"day": "Wednesday", "is_working": True, "start": "13:00", "end": "17:00"},
+        {"day": "Thursday", "is_working": True, "start": "08:00", "end": "17:00"},
+        {"day": "Friday", "is_working": True, "start": "08:00", "end": "17:00"},
+        {"day": "Saturday", "open": "9:00 AM", "close": "4:00 PM"},
+        {"day": "Sunday", "open": "Closed", "close": "Closed"}
+    ],
+    "timezone": "America/New_York",
+    "holidays": ["2025-10-21", {"date": "2025-10-23", "start": "10:00", "end": "14:00"}]
+}
+
+
+class TestParsing(unittest.TestCase):
+    """Test time strings and payload shapes"""
+
+    def test_parse_time(self):
+        self.assertEqual(parse_time("08:00"), 480)
+        self.assertEqual(parse_time("8:30 AM"), 510)
+        self.assertEqual(parse_time("12:00 PM"), 720)
+        self.assertEqual(parse_time("12:15 am"), 15)
+        self.assertEqual(parse_time("5pm"), 1020)
+        self.assertEqual(parse_time("24:00"), 1440)
+        self.assertEqual(parse_time("08:00:00"), 480)
+        self.assertEqual(parse_time("5:30:00 PM"), 1050)
+        self.assertIsNone(parse_time("Closed"))
+        self.assertIsNone(parse_time(None))
+        with self.assertRaises(ValueError):
+            parse_time("25:00")
+
+    def test_compile(self):
+        """Test both API shapes compile to the weekday bitmap and minute intervals"""
+        hours = compile_business_hours(HOURS)
+
+        self.assertEqual(hours.open_days, 0b0111111)
+        self.assertEqual(hours.intervals[2], ((480, 720), (780, 1020)))
+        self.assertEqual(hours.intervals[5], ((540, 960),))
+        self.assertEqual(hours.to_dict()["holidays"]["2025-10-23"], [["10:00", "14:00"]])
+
+
+class TestBusinessHours(unittest.TestCase):
+    """Test open checks and next windows"""
+
+    def setUp(self):
+        self.hours = compile_business_hours(HOURS)
+
+    def test_is_open(self):
+        self.assertTrue(self.hours.is_open(datetime(2025, 10, 20, 8, 0)))
+        self.assertFalse(self.hours.is_open(datetime(2025, 10, 20, 17, 0)))
+        self.assertFalse(self.hours.is_open(datetime(2025, 10, 22, 12, 30)))  # lunch break
+        self.assertFalse(self.hours.is_open(datetime(2025, 10, 26, 10, 0)))  # Sunday
+
+    def test_holiday_overrides(self):
+        self.assertFalse(self.hours.is_open(datetime(2025, 10, 21, 10, 0)))
+        self.assertFalse(self.hours.is_open(datetime(2025, 10, 23, 9, 0)))
+        self.assertTrue(self.hours.is_open(datetime(2025, 10, 23, 13, 0)))
+
+    def test_timezone_conversion(self):
+        """Test aware datetimes are converted to the client's local time"""
+        self.assertTrue(self.hours.is_open(datetime(2025, 10, 20, 12, 30, tzinfo=timezone.utc)))  # 08:30 EDT
+        self.assertFalse(self.hours.is_open(datetime(2025, 10, 20, 11, 30, tzinfo=timezone.utc)))  # 07:30 EDT
+
+    def test_next_open_window(self):
+        start, end = self.hours.next_open_window(datetime(2025, 10, 20, 18, 0))
+        # Tuesday is a holiday, so the next window is Wednesday morning
+        self.assertEqual((start.isoformat(), end.isoformat()),
+                         ("2025-10-22T08:00:00-04:00", "2025-10-22T12:00:00-04:00"))
+
+        start, _ = self.hours.next_open_window(datetime(2025, 10, 22, 12, 15))
+        self.assertEqual(start.isoformat(), "2025-10-22T13:00:00-04:00")
+
+    def test_window_while_open(self):
+        """Test the current window is returned from the checked time"""
+        start, end = self.hours.next_open_window(datetime(2025, 10, 20, 9, 45))
+        self.assertEqual((start.isoformat(), end.isoformat()),
+                         ("2025-10-20T09:45:00-04:00", "2025-10-20T17:00:00-04:00"))
+
+    def test_no_window_in_horizon(self):
+        closed = compile_business_hours({"workHours": [], "timezone": "America/New_York"})
+        self.assertIsNone(closed.next_open_window(datetime(2025, 10, 20, 9, 0), horizon_days=7))
+
+    def test_slot_contained(self):
+        self.assertTrue(self.hours.contains("2025-10-20", "08:00 AM", "10:00 AM"))
+        self.assertFalse(self.hours.contains("2025-10-22", "11:00 AM", "01:00 PM"))
+        self.assertFalse(self.hours.contains("2025-10-21", "08:00 AM", "10:00 AM"))
+
+    def test_unknown_timezone(self):
+        """Test an unknown timezone falls back to UTC"""
+        hours = compile_business_hours({**HOURS, "timezone": "Mars/Olympus"})
+        self.assertTrue(hours.is_open(datetime(2025, 10, 20, 8, 0, tzinfo=timezone.utc)))
+
+
+class TestBusinessHoursCache(unittest.TestCase):
+    """Test per-client caching"""
+
+    def test_compiled_once(self):
+        cache = BusinessHoursCache(ttl_seconds=60)
+        loader = mock.Mock(return_value=HOURS)
+
+        _, first = cache.get_or_load("09PF05VD", loader)
+        data, second = cache.get_or_load("09PF05VD", loader)
+
+        self.assertIs(first, second)
+        self.assertEqual(data, HOURS)
+        self.assertEqual(loader.call_count, 1)
+
+        cache.get_or_load("other", loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_compiled_lazily(self):
+        """Test hours the compiler rejects are still returned raw"""
+        cache = BusinessHoursCache()
+        odd = {"workHours": [{"day": "Monday", "start": "8h", "end": "17h"}]}
+        loader = mock.Mock(return_value=odd)
+
+        self.assertEqual(cache.get_data("09PF05VD", loader), odd)
+        with self.assertRaises(ValueError):
+            cache.get_or_load("09PF05VD", loader)
+        self.assertEqual(cache.get_data("09PF05VD", loader), odd)
+        self.assertEqual(loader.call_count, 1)
+
+    def test_expiry(self):
+        cache = BusinessHoursCache(ttl_seconds=0)
+        loader = mock.Mock(return_value=HOURS)
+        cache.get_or_load("09PF05VD", loader)
+        cache.get_or_load("09PF05VD", loader)
+
+        self.assertEqual(loader.call_count, 2)
+
+
+class TestIsOpenAction(unittest.TestCase):
+    """Test is_open through the information Lambda (mock mode)"""
+
+    def setUp(self):
+        self.handler = load_handler("information-actions")
+        self.handler.business_hours_cache.invalidate()
+
+    def invoke(self, **params):
+        response = self.handler.lambda_handler(bedrock_event("/is-open", **params), None)
+        return response["response"]["httpStatusCode"], json.loads(response["response"]["responseBody"]["application/json"]["body"])
+
+    def test_open(self):
+        status, body = self.invoke(client_id="09PF05VD", datetime="2025-10-20T10:00")
+
+        self.assertEqual(status, 200)
+        self.assertTrue(body["is_open"])
+        self.assertEqual(body["current_window"]["end"], "2025-10-20T17:00-04:00")
+        self.assertEqual(body["next_open_window"]["start"], "2025-10-21T08:00-04:00")
+
+    def test_closed_weekend(self):
+        """Test an aware time is converted and Monday's window is returned"""
+        status, body = self.invoke(client_id="09PF05VD", datetime="2025-10-25T14:00:00+00:00")
+
+        self.assertFalse(body["is_open"])
+        self.assertIsNone(body["current_window"])
+        self.assertEqual(body["checked_at"], "2025-10-25T10:00-04:00")
+        self.assertEqual(body["next_open_window"]["start"], "2025-10-27T08:00-04:00")
+
+    def test_hours_fetched_once(self):
+        with mock.patch.object(self.handler, "get_mock_business_hours", wraps=self.handler.get_mock_business_hours) as fetch:
+            self.invoke(client_id="09PF05VD")
+            self.handler.lambda_handler(bedrock_event("/get-working-hours", client_id="09PF05VD"), None)
+
+        self.assertEqual(fetch.call_count, 1)
+
+    def test_unparseable_hours_still_listed(self):
+        """Test get_working_hours succeeds when only is_open needs the compiled form"""
+        odd = {"status": "success", "data": {"workHours": [{"day": "Monday", "start": "8h", "end": "17h"}]}}
+        with mock.patch.object(self.handler, "get_mock_business_hours", return_value=odd):
+            listing = self.handler.lambda_handler(bedrock_event("/get-working-hours", client_id="ODD"), None)
+            status, _ = self.invoke(client_id="ODD")
+
+        self.assertEqual(listing["response"]["httpStatusCode"], 200)
+        self.assertEqual(status, 400)
+
+    def test_invalid_datetime(self):
+        status, _ = self.invoke(datetime="next tuesday")
+        self.assertEqual(status, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
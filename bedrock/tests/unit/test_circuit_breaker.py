@@ -0,0 +1,166 @@
+"""
+Unit tests for circuit_breaker module
+Tests tripping, the open fast path, half-open probes, shared state and the notes Lambda fallback
+"""
+
+import unittest
+import sys
+import os
+import json
+import subprocess
+import textwrap
+from unittest import mock
+
+import requests
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+import circuit_breaker
+from circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from lambda_loader import load_handler, bedrock_event
+
+
+class FakeTable:
+    """In-memory stand-in for a DynamoDB Table resource"""
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key):
+        item = self.items.get(Key["session_id"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item["session_id"]] = Item
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test breaker states"""
+
+    def setUp(self):
+        self.breaker = CircuitBreaker("pf360-list-notes", failure_threshold=2, reset_seconds=60, table_name="")
+        self.calls = 0
+
+    def failing(self):
+        self.calls += 1
+        raise requests.ConnectionError("connection refused")
+
+    def working(self):
+        self.calls += 1
+        return "api"
+
+    @staticmethod
+    def fallback(error):
+        return type(error).__name__
+
+    def test_trips_after_threshold(self):
+        """Test consecutive failures open the circuit and later calls skip the endpoint"""
+        self.assertEqual(self.breaker.call(self.failing, self.fallback), "ConnectionError")
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.call(self.failing, self.fallback)
+        self.assertEqual(self.breaker.state, OPEN)
+
+        self.assertEqual(self.breaker.call(self.working, self.fallback), "CircuitOpenError")
+        self.assertEqual(self.calls, 2)
+
+    def test_success_resets_failures(self):
+        self.breaker.call(self.failing, self.fallback)
+        self.breaker.call(self.working, self.fallback)
+        self.breaker.call(self.failing, self.fallback)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_probe(self):
+        """Test one probe after the reset timeout; success closes the circuit"""
+        self.breaker.call(self.failing, self.fallback)
+        self.breaker.call(self.failing, self.fallback)
+        self.breaker.opened_until -= 61
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())  # probe in flight
+        self.breaker.record_success()
+
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.call(self.working, self.fallback), "api")
+
+    def test_failed_probe_reopens(self):
+        self.breaker.call(self.failing, self.fallback)
+        self.breaker.call(self.failing, self.fallback)
+        self.breaker.opened_until -= 61
+
+        self.breaker.call(self.failing, self.fallback)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_other_errors_propagate(self):
+        """Test non-request errors are raised and do not count as failures"""
+        def broken():
+            raise KeyError("data")
+
+        with self.assertRaises(KeyError):
+            self.breaker.call(broken, self.fallback)
+        self.assertEqual(self.breaker.failures, 0)
+
+    def test_shared_state(self):
+        """Test another container adopts an open circuit from DynamoDB"""
+        table = FakeTable()
+        first = CircuitBreaker("pf360-add-note", failure_threshold=1, table_name="sessions", sync_seconds=0)
+        second = CircuitBreaker("pf360-add-note", failure_threshold=1, table_name="sessions", sync_seconds=0)
+        first.remote._table = second.remote._table = table
+
+        first.call(self.failing, self.fallback)
+        self.assertEqual(second.call(self.working, self.fallback), "CircuitOpenError")
+        self.assertEqual(self.calls, 1)
+
+        later = circuit_breaker.time.time() + 61
+        with mock.patch.object(circuit_breaker.time, "time", return_value=later):
+            first.call(self.working, self.fallback)  # probe succeeds
+            self.assertEqual(second.call(self.working, self.fallback), "api")
+
+    def test_cold_container_first_failure(self):
+        """Test the first request error is caught when requests was not imported before the call"""
+        script = textwrap.dedent(f"""
+            import sys
+            sys.path.insert(0, {os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../lambda/shared-layer/python/lib")!r})
+            from circuit_breaker import CircuitBreaker
+            assert "requests" not in sys.modules
+
+            def call_api():
+                import requests
+                raise requests.ConnectionError("connection refused")
+
+            breaker = CircuitBreaker("pf360-list-notes", table_name="")
+            print(breaker.call(call_api, lambda error: "fallback"), breaker.failures)
+        """)
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split(), ["fallback", "1"])
+
+    def test_registry(self):
+        self.assertIs(circuit_breaker.get_circuit_breaker("a"), circuit_breaker.get_circuit_breaker("a"))
+
+
+class TestNotesFallback(unittest.TestCase):
+    """Test list_notes goes straight to DynamoDB once the API circuit is open"""
+
+    def test_fast_path(self):
+        handler = load_handler("notes-actions")
+        breaker = handler.get_circuit_breaker("pf360-list-notes")
+        breaker.reset()
+        event = bedrock_event("/list-notes", project_id="12345")
+
+        with mock.patch.object(handler, "USE_MOCK_API", False), \
+                mock.patch.object(handler, "http_get", side_effect=requests.ConnectionError("refused")) as get, \
+                mock.patch.object(handler, "get_notes_from_dynamodb", return_value=([{"note_text": "stored"}], None)):
+            responses = [handler.lambda_handler(event, None) for _ in range(5)]
+
+        body = json.loads(responses[-1]["response"]["responseBody"]["application/json"]["body"])
+        self.assertEqual(get.call_count, breaker.failure_threshold)
+        self.assertEqual(body["source"], "dynamodb")
+        self.assertEqual(body["notes"], [{"note_text": "stored"}])
+        breaker.reset()
+
+
+if __name__ == "__main__":
+    unittest.main()
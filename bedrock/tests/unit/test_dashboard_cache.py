@@ -0,0 +1,184 @@
+"""
+Unit tests for dashboard_cache module
+Tests TTL/LRU behaviour, project index and invalidation
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+import dashboard_cache as dashboard_cache_module
+from dashboard_cache import DashboardCache, DashboardEntry
+
+
+def make_payload(*project_ids):
+    """Build a minimal Dashboard API payload"""
+    return {
+        "status": "success",
+        "data": [{"project_project_id": pid, "status_info_status": "Scheduled"} for pid in project_ids]
+    }
+
+
+class FakeTable:
+    """In-memory stand-in for a DynamoDB Table resource"""
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key):
+        item = self.items.get(Key["session_id"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item["session_id"]] = Item
+
+    def delete_item(self, Key):
+        self.items.pop(Key["session_id"], None)
+
+
+class TestDashboardEntry(unittest.TestCase):
+    """Test project index"""
+
+    def test_project_lookup(self):
+        """Test O(1) project lookup by ID"""
+        entry = DashboardEntry(make_payload("12345", "12347"))
+
+        self.assertEqual(entry.get_project("12347")["project_project_id"], "12347")
+        self.assertIsNone(entry.get_project("99999"))
+
+    def test_numeric_project_ids(self):
+        """Test numeric IDs in payload match string lookups"""
+        entry = DashboardEntry(make_payload(12345))
+        self.assertIsNotNone(entry.get_project("12345"))
+
+    def test_empty_payload(self):
+        """Test payload without data"""
+        entry = DashboardEntry({"status": "success", "data": None})
+        self.assertEqual(entry.records, [])
+
+
+class TestDashboardCache(unittest.TestCase):
+    """Test in-process and DynamoDB tiers"""
+
+    def setUp(self):
+        self.cache = DashboardCache(ttl_seconds=60, max_entries=2, table_name="")
+
+    def test_get_or_load_caches(self):
+        """Test loader is only called on a miss"""
+        loader = mock.Mock(return_value=make_payload("12345"))
+
+        first = self.cache.get_or_load("CLIENT001", "CUST001", loader)
+        second = self.cache.get_or_load("CLIENT001", "CUST001", loader)
+
+        self.assertIs(first, second)
+        self.assertEqual(loader.call_count, 1)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_expired_entry_reloaded(self):
+        """Test entries expire after TTL"""
+        self.cache.put("CLIENT001", "CUST001", make_payload("12345"))
+
+        with mock.patch.object(dashboard_cache_module.time, "time", return_value=10 ** 10):
+            self.assertIsNone(self.cache.get("CLIENT001", "CUST001"))
+
+    def test_lru_eviction(self):
+        """Test least recently used entry is evicted at capacity"""
+        self.cache.put("CLIENT001", "CUST001", make_payload("1"))
+        self.cache.put("CLIENT001", "CUST002", make_payload("2"))
+        self.cache.get("CLIENT001", "CUST001")
+        self.cache.put("CLIENT001", "CUST003", make_payload("3"))
+
+        self.assertIsNotNone(self.cache.get("CLIENT001", "CUST001"))
+        self.assertIsNone(self.cache.get("CLIENT001", "CUST002"))
+
+    def test_invalidate_by_customer(self):
+        """Test invalidation by customer ID"""
+        self.cache.put("CLIENT001", "CUST001", make_payload("12345"))
+
+        removed = self.cache.invalidate("CLIENT001", customer_id="CUST001")
+
+        self.assertEqual(removed, 1)
+        self.assertIsNone(self.cache.get("CLIENT001", "CUST001"))
+
+    def test_invalidate_by_project(self):
+        """Test invalidation finds entries containing the project"""
+        self.cache.put("CLIENT001", "CUST001", make_payload("12345"))
+        self.cache.put("CLIENT001", "CUST002", make_payload("12347"))
+
+        removed = self.cache.invalidate("CLIENT001", project_id="12345")
+
+        self.assertEqual(removed, 1)
+        self.assertIsNone(self.cache.get("CLIENT001", "CUST001"))
+        self.assertIsNotNone(self.cache.get("CLIENT001", "CUST002"))
+
+    def test_dynamodb_tier_shared(self):
+        """Test a second container reads the DynamoDB tier"""
+        table = FakeTable()
+        writer = DashboardCache(ttl_seconds=60, table_name="sessions")
+        reader = DashboardCache(ttl_seconds=60, table_name="sessions")
+        writer.remote._table = table
+        reader.remote._table = table
+
+        writer.put("CLIENT001", "CUST001", make_payload("12345"))
+        entry = reader.get("CLIENT001", "CUST001")
+
+        self.assertIsNotNone(entry)
+        self.assertIsNotNone(entry.get_project("12345"))
+        self.assertIn("dashboard#CLIENT001#CUST001", table.items)
+
+        reader.invalidate("CLIENT001", customer_id="CUST001")
+        self.assertNotIn("dashboard#CLIENT001#CUST001", table.items)
+
+    def test_invalidation_reaches_other_lambdas(self):
+        """Test a write in one Lambda drops another Lambda's in-process copy"""
+        table = FakeTable()
+        scheduling = DashboardCache(ttl_seconds=60, table_name="sessions")
+        information = DashboardCache(ttl_seconds=60, table_name="sessions")
+        scheduling.remote._table = information.remote._table = table
+
+        information.get_or_load("CLIENT001", "CUST001", lambda: make_payload("12345"))
+        self.assertIsNotNone(information.get("CLIENT001", "CUST001"))
+
+        scheduling.invalidate("CLIENT001", customer_id="CUST001", project_id="12345")
+        self.assertIn("dashboard#CLIENT001#CUST001#invalidated", table.items)
+        self.assertIsNone(information.get("CLIENT001", "CUST001"))
+
+        # Reloaded after the write: trusted again, also from the other Lambda
+        loader = mock.Mock(return_value=make_payload("12345", "12346"))
+        information.get_or_load("CLIENT001", "CUST001", loader)
+        self.assertIsNotNone(scheduling.get("CLIENT001", "CUST001").get_project("12346"))
+        loader.assert_called_once()
+
+    def test_load_overlapping_invalidation_dropped(self):
+        """Test a payload requested before an invalidation is not trusted afterwards"""
+        table = FakeTable()
+        cache = DashboardCache(ttl_seconds=60, table_name="sessions")
+        cache.remote._table = table
+
+        def slow_load():
+            cache.invalidate("CLIENT001", customer_id="CUST001")  # a write lands mid-request
+            return make_payload("12345")
+
+        cache.get_or_load("CLIENT001", "CUST001", slow_load)
+        self.assertIsNone(cache.get("CLIENT001", "CUST001"))
+
+    def test_dynamodb_errors_ignored(self):
+        """Test DynamoDB failures fall through to the loader"""
+        table = mock.Mock()
+        table.get_item.side_effect = Exception("throttled")
+        table.put_item.side_effect = Exception("throttled")
+        cache = DashboardCache(table_name="sessions")
+        cache.remote._table = table
+
+        entry = cache.get_or_load("CLIENT001", "CUST001", lambda: make_payload("12345"))
+
+        self.assertIsNotNone(entry.get_project("12345"))
+
+
+if __name__ == "__main__":
+    unittest.main()
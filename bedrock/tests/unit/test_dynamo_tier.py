@@ -0,0 +1,94 @@
+"""
+Unit tests for dynamo_tier module
+Tests key layout, TTL checks on read, best-effort writes and conditional deletes
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+import dynamo_tier
+from dynamo_tier import DynamoTier
+from session_manager import SessionManager
+
+
+class ConditionalCheckFailed(Exception):
+    response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+
+
+class FakeTable:
+    """In-memory stand-in for a DynamoDB Table resource"""
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key, ConsistentRead=False):
+        item = self.items.get(Key["session_id"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item["session_id"]] = Item
+
+    def delete_item(self, Key, **conditions):
+        if conditions and Key["session_id"] not in self.items:
+            raise ConditionalCheckFailed()
+        self.items.pop(Key["session_id"], None)
+
+
+class TestDynamoTier(unittest.TestCase):
+
+    def setUp(self):
+        self.table = FakeTable()
+        self.tier = DynamoTier("slots", "sessions", "Slot store")
+        self.tier._table = self.table
+
+    def test_key(self):
+        self.assertEqual(self.tier.key("12345", "REQ1"), {"session_id": "slots#12345#REQ1"})
+
+    def test_round_trip_and_ttl(self):
+        self.assertTrue(self.tier.put(("12345", "REQ1"), {"slots": "[]"}, 1000.5))
+        self.assertEqual(self.table.items["slots#12345#REQ1"]["ttl"], 1000)
+
+        self.assertEqual(self.tier.get(("12345", "REQ1"), lambda item: item["slots"], now=999), "[]")
+        self.assertIsNone(self.tier.get(("12345", "REQ1"), now=1000))
+        self.assertIsNotNone(self.tier.get(("12345", "REQ1")))
+
+    def test_failures_are_misses(self):
+        self.tier.put(("12345", "REQ1"), {"slots": "not json"}, 2000)
+        self.assertIsNone(self.tier.get(("12345", "REQ1"), lambda item: int(item["slots"])))
+
+        self.tier._table = mock.Mock(**{"put_item.side_effect": Exception("throttled"),
+                                        "get_item.side_effect": Exception("throttled")})
+        self.assertFalse(self.tier.put(("12345",), {}, 2000))
+        self.assertIsNone(self.tier.get(("12345",)))
+
+    def test_conditional_delete(self):
+        with self.assertNoLogs(dynamo_tier.logger):
+            self.assertFalse(self.tier.delete(("missing",), ConditionExpression="attribute_exists(session_id)"))
+        self.tier.put(("12345",), {}, 2000)
+        self.assertTrue(self.tier.delete(("12345",)))
+
+    def test_disabled(self):
+        tier = DynamoTier("slots", "", "Slot store")
+        self.assertIsNone(tier.table)
+        self.assertFalse(tier.put(("12345",), {}, 2000))
+        self.assertIsNone(tier.get(("12345",)))
+        self.assertFalse(tier.delete(("12345",)))
+
+    def test_shared_resource(self):
+        resource = mock.Mock()
+        with mock.patch.object(dynamo_tier, "_resource", resource):
+            first, second = DynamoTier("a", "sessions", "A"), DynamoTier("b", "sessions", "B")
+            first.table, second.table
+            SessionManager("sessions")._get_table()
+            self.assertIs(dynamo_tier.dynamodb_resource(), resource)
+
+        self.assertEqual(resource.Table.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Unit tests for http_client module
+Tests pooled session reuse and GET retry behaviour
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+import requests
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+import http_client
+from http_client import (
+    get_http_session,
+    reset_http_session,
+    get_timeout,
+    backoff_delay,
+    http_get,
+    http_post,
+    request_errors
+)
+
+
+def make_response(status_code):
+    """Build a bare requests.Response with the given status"""
+    res = requests.Response()
+    res.status_code = status_code
+    return res
+
+
+class TestHTTPClient(unittest.TestCase):
+    """Test pooled HTTP client"""
+
+    def setUp(self):
+        reset_http_session()
+        sleep_patcher = mock.patch.object(http_client.time, "sleep")
+        self.sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+        self.addCleanup(reset_http_session)
+
+    def test_session_reused(self):
+        """Test the same session is returned across calls"""
+        self.assertIs(get_http_session(), get_http_session())
+
+    def test_adapter_pool_configured(self):
+        """Test https adapter uses configured pool size"""
+        adapter = get_http_session().get_adapter("https://api.projectsforce.com")
+        self.assertEqual(adapter._pool_maxsize, http_client.POOL_MAXSIZE)
+
+    def test_timeout_split(self):
+        """Test connect and read timeouts are separate"""
+        self.assertEqual(get_timeout(), (http_client.CONNECT_TIMEOUT, http_client.READ_TIMEOUT))
+        self.assertEqual(get_timeout(5), (http_client.CONNECT_TIMEOUT, 5))
+
+    def test_backoff_bounded(self):
+        """Test jittered backoff never exceeds the cap"""
+        for attempt in range(10):
+            self.assertLessEqual(backoff_delay(attempt), http_client.BACKOFF_MAX)
+            self.assertGreaterEqual(backoff_delay(attempt), 0)
+
+    def test_get_retries_on_503(self):
+        """Test GET retries transient upstream status codes"""
+        responses = [make_response(503), make_response(200)]
+        with mock.patch.object(get_http_session(), "get", side_effect=responses) as get:
+            res = http_get("https://example.com/x", retries=2)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual(self.sleep.call_count, 1)
+
+    def test_get_returns_last_response_when_exhausted(self):
+        """Test GET returns the final error response after retries"""
+        with mock.patch.object(get_http_session(), "get", return_value=make_response(502)) as get:
+            res = http_get("https://example.com/x", retries=1)
+
+        self.assertEqual(res.status_code, 502)
+        self.assertEqual(get.call_count, 2)
+
+    def test_get_raises_connection_error_when_exhausted(self):
+        """Test connection errors propagate after retries"""
+        error = requests.ConnectionError("connection reset")
+        with mock.patch.object(get_http_session(), "get", side_effect=error) as get:
+            with self.assertRaises(requests.ConnectionError):
+                http_get("https://example.com/x", retries=2)
+
+        self.assertEqual(get.call_count, 3)
+
+    def test_get_no_retry(self):
+        """Test retries=0 disables retrying"""
+        with mock.patch.object(get_http_session(), "get", return_value=make_response(503)) as get:
+            http_get("https://example.com/x", retries=0)
+
+        self.assertEqual(get.call_count, 1)
+        self.sleep.assert_not_called()
+
+    def test_post_not_retried(self):
+        """Test POST is sent once even on a retryable status"""
+        with mock.patch.object(get_http_session(), "post", return_value=make_response(503)) as post:
+            res = http_post("https://example.com/x", json={"a": 1})
+
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(post.call_args.kwargs["timeout"], get_timeout())
+
+    def test_request_errors(self):
+        """Test request_errors matches requests exceptions once requests is loaded"""
+        self.assertTrue(issubclass(requests.ConnectionError, request_errors()))
+
+        with mock.patch.dict(sys.modules, {"requests": None, "httpx": None}):
+            self.assertEqual(request_errors(), ())
+
+
+if __name__ == "__main__":
+    unittest.main()
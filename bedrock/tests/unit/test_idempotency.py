@@ -0,0 +1,222 @@
+"""
+Unit tests for idempotency module
+Tests replay of identical writes, supersession by other writes and the DynamoDB claim
+"""
+
+import unittest
+import sys
+import os
+import json
+import time
+from unittest import mock
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+from idempotency import IdempotencyStore, IdempotencyConflictError, IN_PROGRESS, fingerprint
+from action_router import ActionRouter
+from lambda_loader import bedrock_event
+
+CONFIRM = {"project_id": "12345", "date": "2025-10-20", "time": "10:00 AM", "request_id": "REQ-1"}
+
+
+class ConditionalCheckFailed(Exception):
+    response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+
+
+class FakeTable:
+    """In-memory DynamoDB Table evaluating the store's condition expressions"""
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key, ConsistentRead=False):
+        item = self.items.get(Key["session_id"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, Item, ConditionExpression=None, ExpressionAttributeNames=None, ExpressionAttributeValues=None):
+        existing = self.items.get(Item["session_id"])
+        if ConditionExpression and existing is not None:
+            values = ExpressionAttributeValues
+            if existing["ttl"] >= values[":now"] and existing["fingerprint"] == values[":fp"]:
+                raise ConditionalCheckFailed()
+        self.items[Item["session_id"]] = Item
+
+    def delete_item(self, Key, ConditionExpression=None, ExpressionAttributeNames=None, ExpressionAttributeValues=None):
+        existing = self.items.get(Key["session_id"])
+        if ConditionExpression and (
+            existing is None
+            or existing["fingerprint"] != ExpressionAttributeValues[":fp"]
+            or existing["status"] != ExpressionAttributeValues[":in_progress"]
+        ):
+            raise ConditionalCheckFailed()
+        self.items.pop(Key["session_id"], None)
+
+
+class TestInProcess(unittest.TestCase):
+    """Test the in-process backend"""
+
+    def setUp(self):
+        self.store = IdempotencyStore(table_name="")
+        self.calls = 0
+
+    def write(self, result="ok"):
+        def execute():
+            self.calls += 1
+            return {"result": result, "call": self.calls}
+        return execute
+
+    def test_identical_retry_replays(self):
+        """Test an identical write runs once and retries get the first result"""
+        first = self.store.run("S1", "confirm-appointment", CONFIRM, self.write())
+        second = self.store.run("S1", "confirm-appointment", dict(CONFIRM), self.write())
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(first, second)
+
+    def test_different_writes_run(self):
+        """Test other slots, sessions and projects are not deduplicated"""
+        self.store.run("S1", "confirm-appointment", CONFIRM, self.write())
+        self.store.run("S1", "confirm-appointment", {**CONFIRM, "time": "02:00 PM"}, self.write())
+        self.store.run("S2", "confirm-appointment", CONFIRM, self.write())
+        self.store.run("S1", "confirm-appointment", {**CONFIRM, "project_id": "12347"}, self.write())
+
+        self.assertEqual(self.calls, 4)
+
+    def test_later_write_supersedes(self):
+        """Test confirm -> cancel -> identical confirm runs all three writes"""
+        self.store.run("S1", "confirm-appointment", CONFIRM, self.write())
+        self.store.run("S1", "cancel-appointment", {"project_id": "12345"}, self.write())
+        self.store.run("S1", "confirm-appointment", CONFIRM, self.write())
+
+        self.assertEqual(self.calls, 3)
+
+    def test_failures_not_stored(self):
+        """Test a failed write is retried for real"""
+        def failing():
+            raise RuntimeError("PF360 unavailable")
+
+        with self.assertRaises(RuntimeError):
+            self.store.run("S1", "confirm-appointment", CONFIRM, failing)
+        self.store.run("S1", "confirm-appointment", CONFIRM, self.write())
+
+        self.assertEqual(self.calls, 1)
+
+    def test_window_expiry(self):
+        """Test results are only replayed within the window"""
+        store = IdempotencyStore(table_name="", ttl_seconds=0)
+        store.run("S1", "confirm-appointment", CONFIRM, self.write())
+        store.run("S1", "confirm-appointment", CONFIRM, self.write())
+
+        self.assertEqual(self.calls, 2)
+
+    def test_without_session(self):
+        """Test writes without a session ID are never deduplicated"""
+        self.store.run(None, "confirm-appointment", CONFIRM, self.write())
+        self.store.run(None, "confirm-appointment", CONFIRM, self.write())
+
+        self.assertEqual(self.calls, 2)
+
+
+class TestDynamoDB(unittest.TestCase):
+    """Test the shared DynamoDB backend"""
+
+    def setUp(self):
+        self.table = FakeTable()
+        self.calls = 0
+
+    def make_store(self, **kwargs):
+        store = IdempotencyStore(table_name="sessions", **kwargs)
+        store.remote._table = self.table
+        return store
+
+    def execute(self):
+        self.calls += 1
+        return {"message": "Appointment confirmed"}
+
+    def test_replay_across_containers(self):
+        """Test a retry on another container replays the stored result"""
+        self.make_store().run("S1", "confirm-appointment", CONFIRM, self.execute)
+        result = self.make_store().run("S1", "confirm-appointment", CONFIRM, self.execute)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(result, {"message": "Appointment confirmed"})
+        item = self.table.items["idem#S1#12345"]
+        self.assertEqual(item["status"], "completed")
+        self.assertEqual(json.loads(item["result"]), result)
+
+    def test_in_progress_duplicate_conflicts(self):
+        """Test a duplicate of an unfinished write waits, then reports a conflict"""
+        fp = fingerprint("confirm-appointment", CONFIRM)
+        self.table.items["idem#S1#12345"] = {
+            "session_id": "idem#S1#12345", "status": IN_PROGRESS, "fingerprint": fp, "ttl": int(time.time()) + 60
+        }
+
+        with self.assertRaises(IdempotencyConflictError):
+            self.make_store(wait_seconds=0).run("S1", "confirm-appointment", CONFIRM, self.execute)
+        self.assertEqual(self.calls, 0)
+
+    def test_failure_releases_claim(self):
+        """Test a failed write drops its claim so a retry can run"""
+        def failing():
+            raise RuntimeError("PF360 unavailable")
+
+        store = self.make_store(wait_seconds=0)
+        with self.assertRaises(RuntimeError):
+            store.run("S1", "confirm-appointment", CONFIRM, failing)
+        self.assertNotIn("idem#S1#12345", self.table.items)
+
+        store.run("S1", "confirm-appointment", CONFIRM, self.execute)
+        self.assertEqual(self.calls, 1)
+
+    def test_table_errors_do_not_block_writes(self):
+        """Test DynamoDB failures fall through to the write"""
+        store = self.make_store()
+        with mock.patch.object(self.table, "put_item", side_effect=RuntimeError("throttled")):
+            store.run("S1", "confirm-appointment", CONFIRM, self.execute)
+
+        self.assertEqual(self.calls, 1)
+
+
+class TestRouterIdempotency(unittest.TestCase):
+    """Test idempotent actions through dispatch"""
+
+    def setUp(self):
+        self.store = IdempotencyStore(table_name="")
+        self.router = ActionRouter("scheduling", lambda c: {}, lambda a, c: {}, use_mock=True, idempotency=self.store)
+        self.calls = 0
+
+        @self.router.action("confirm-appointment", idempotent=True)
+        def handle_confirm(params, config, auth_headers):
+            self.calls += 1
+            return {"confirmed": True}
+
+        @self.router.action("get-time-slots")
+        def handle_read(params, config, auth_headers):
+            self.calls += 1
+            return {"slots": []}
+
+    def test_retry_replayed(self):
+        event = bedrock_event("/confirm-appointment", **CONFIRM)
+        first = self.router.dispatch(event)
+        second = self.router.dispatch(event)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(first, second)
+
+    def test_reads_not_deduplicated(self):
+        event = bedrock_event("/get-time-slots", project_id="12345")
+        self.router.dispatch(event)
+        self.router.dispatch(event)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_conflict_status(self):
+        with mock.patch.object(self.store, "run", side_effect=IdempotencyConflictError("in progress")):
+            response = self.router.dispatch(bedrock_event("/confirm-appointment", **CONFIRM))
+
+        self.assertEqual(response["response"]["httpStatusCode"], 409)
+
+
+if __name__ == "__main__":
+    unittest.main()
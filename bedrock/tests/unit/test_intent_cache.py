@@ -0,0 +1,115 @@
+"""
+Unit tests for the chat backend's intent cache
+Tests message normalization, LRU/TTL behaviour, the Redis tier and the cache tier of the classifier
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add the chat backend to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../frontend/backend"))
+
+from intent_cache import IntentCache, normalize_message
+from intent_classifier import TieredIntentClassifier
+
+
+class FakeRedis:
+    """Minimal stand-in for redis.Redis get/setex"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode("utf-8")
+
+
+class TestNormalizeMessage(unittest.TestCase):
+
+    def test_near_duplicates_share_key(self):
+        self.assertEqual(normalize_message("Show my projects!"), "show my projects")
+        self.assertEqual(normalize_message("  show   MY projects? "), "show my projects")
+        self.assertEqual(normalize_message("What's the  STATUS?"), "whats the status")
+        self.assertEqual(normalize_message(None), "")
+
+
+class TestIntentCache(unittest.TestCase):
+
+    def test_hit_and_miss(self):
+        cache = IntentCache()
+        self.assertIsNone(cache.get("Can we push it to Friday?"))
+        cache.put("Can we push it to Friday?", "scheduling")
+
+        self.assertEqual(cache.get("can we push it to friday"), "scheduling")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["stores"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_lru_and_ttl(self):
+        cache = IntentCache(max_entries=2)
+        cache.put("a", "notes")
+        cache.put("b", "notes")
+        cache.get("a")
+        cache.put("c", "notes")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+        expired = IntentCache(ttl_seconds=0)
+        expired.put("a", "notes")
+        self.assertIsNone(expired.get("a"))
+
+    def test_redis_tier(self):
+        """Test another process's entry is found in Redis and kept locally"""
+        shared = FakeRedis()
+        IntentCache(redis_client=shared).put("Show my projects!", "scheduling")
+
+        cache = IntentCache(redis_client=shared)
+        self.assertEqual(cache.get("show my projects"), "scheduling")
+        self.assertEqual(cache.get("show my projects"), "scheduling")
+        stats = cache.stats()
+        self.assertEqual((stats["redis_hits"], stats["hits"]), (1, 1))
+
+    def test_redis_errors_are_misses(self):
+        broken = mock.Mock()
+        broken.get.side_effect = ConnectionError("down")
+        broken.setex.side_effect = ConnectionError("down")
+        cache = IntentCache(redis_client=broken)
+
+        self.assertIsNone(cache.get("hello"))
+        cache.put("hello", "chitchat")
+        self.assertEqual(cache.get("hello"), "chitchat")
+        self.assertEqual(cache.stats()["redis_errors"], 2)
+
+    def test_disabled(self):
+        cache = IntentCache(enabled=False)
+        cache.put("hello", "chitchat")
+        self.assertIsNone(cache.get("hello"))
+
+
+class TestClassifierCacheTier(unittest.TestCase):
+
+    def test_fallback_answers_cached(self):
+        fallback = mock.Mock(return_value="scheduling")
+        classifier = TieredIntentClassifier(fallback, model=None, cache=IntentCache())
+
+        self.assertEqual(classifier.classify("Can we push it to Friday?")[:2], ("scheduling", "llm"))
+        self.assertEqual(classifier.classify("can we push it to friday")[:2], ("scheduling", "cache"))
+        fallback.assert_called_once()
+
+    def test_failures_not_cached(self):
+        fallback = mock.Mock(return_value=None)
+        cache = IntentCache()
+        classifier = TieredIntentClassifier(fallback, model=None, cache=cache)
+
+        self.assertEqual(classifier.classify("hmm")[:2], ("chitchat", "failed"))
+        self.assertEqual(classifier.classify("hmm")[:2], ("chitchat", "failed"))
+        self.assertEqual(fallback.call_count, 2)
+        self.assertEqual(cache.stats()["stores"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
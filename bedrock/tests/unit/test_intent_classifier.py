@@ -0,0 +1,99 @@
+"""
+Unit tests for the chat backend's tiered intent classifier
+Tests the rules, the exported local model and fallback to the LLM below the threshold
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add the chat backend to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../frontend/backend"))
+
+from intent_classifier import IntentModel, TieredIntentClassifier, prepare, rule_intent, train
+
+
+class TestRules(unittest.TestCase):
+
+    def test_rules(self):
+        cases = {
+            "Hi there!": "chitchat",
+            "Thanks so much": "chitchat",
+            "Add a note that the gate is locked": "notes",
+            "Add to my shopping list: coffee and bananas": "notes",
+            "Please reschedule my appointment": "scheduling",
+            "Show me all my projects": "scheduling",
+            "What are your working hours?": "information",
+        }
+        for message, intent in cases.items():
+            with self.subTest(message=message):
+                self.assertEqual(rule_intent(prepare(message)), intent)
+
+    def test_no_rule(self):
+        """Test small talk only matches whole messages and conflicting rules defer"""
+        self.assertIsNone(rule_intent(prepare("thanks, now book friday")))
+        self.assertIsNone(rule_intent(prepare("add a note to cancel my appointment")))
+        self.assertIsNone(rule_intent(prepare("I'm feeling a bit stressed")))
+
+
+class TestIntentModel(unittest.TestCase):
+
+    def test_exported_model(self):
+        model = IntentModel.load()
+        self.assertEqual(model.predict(prepare("I'd like to book the earliest date"))[0], "scheduling")
+        probabilities = model.predict_proba(prepare("zzz qqq"))
+        self.assertAlmostEqual(sum(probabilities.values()), 1.0)
+        self.assertLess(max(probabilities.values()), 0.8)
+
+    def test_train(self):
+        model = IntentModel(train([
+            ("book a slot", "scheduling"), ("store hours", "information"),
+            ("save a note", "notes"), ("hello friend", "chitchat"),
+        ], epochs=200))
+        self.assertEqual(model.predict("book")[0], "scheduling")
+        self.assertEqual(model.trained_on, 4)
+
+
+class TestTieredIntentClassifier(unittest.TestCase):
+
+    def setUp(self):
+        self.fallback = mock.Mock(return_value="information")
+        self.classifier = TieredIntentClassifier(self.fallback, IntentModel.load(), threshold=0.8)
+
+    def test_tiers(self):
+        self.assertEqual(self.classifier.classify("hello")[:2], ("chitchat", "rules"))
+        self.assertEqual(self.classifier.classify("I'd like to book the earliest date")[:2], ("scheduling", "model"))
+
+        intent, tier, confidence = self.classifier.classify("can we push it to friday afternoon?")
+        self.assertEqual((intent, tier), ("information", "llm"))
+        self.assertLess(confidence, 0.8)
+        self.fallback.assert_called_once_with("can we push it to friday afternoon?")
+
+        stats = self.classifier.stats()
+        self.assertEqual(stats["by_tier"], {"rules": 1, "model": 1, "cache": 0, "llm": 1, "failed": 0})
+        self.assertEqual(stats["local_rate"], 0.667)
+
+    def test_classify_local(self):
+        """Test the local tiers report the model's guess without calling the fallback"""
+        self.assertEqual(self.classifier.classify_local("hello"), ("chitchat", "rules", None))
+        guess, tier, confidence = self.classifier.classify_local("can we push it to friday afternoon?")
+        self.assertIsNone(tier)
+        self.assertIn(guess, ("information", "scheduling"))
+        self.assertLess(confidence, 0.8)
+        self.fallback.assert_not_called()
+
+    def test_failed_fallback(self):
+        """Test a failed fallback gets the default intent under its own tier, not llm"""
+        self.fallback.return_value = None
+        self.assertEqual(self.classifier.classify("can we push it to friday afternoon?")[:2], ("chitchat", "failed"))
+        self.assertEqual(self.classifier.stats()["by_tier"]["llm"], 0)
+        self.assertEqual(self.classifier.stats()["by_tier"]["failed"], 1)
+
+    def test_disabled(self):
+        classifier = TieredIntentClassifier(self.fallback, None, enabled=False)
+        self.assertEqual(classifier.classify("hello")[:2], ("information", "llm"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Unit tests for invocation_log module
+Tests redaction, sampling and the per-invocation summary line
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+from contextlib import redirect_stdout
+from unittest import mock
+
+import requests
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+import invocation_log
+import http_client
+from invocation_log import redact, truncate, start_invocation, end_invocation, log_payload
+from action_router import ActionRouter
+from lambda_loader import bedrock_event
+
+
+class TestPayloadHelpers(unittest.TestCase):
+    """Test redaction and truncation"""
+
+    def test_redact_nested(self):
+        """Test sensitive keys and Bedrock parameter entries are masked"""
+        event = {
+            "authorization": "Bearer abc",
+            "parameters": [
+                {"name": "auth_token", "value": "abc"},
+                {"name": "project_id", "value": "12345"}
+            ],
+            "session": {"Email": "a@b.com", "customer_id": "CUST001"}
+        }
+
+        redacted = redact(event)
+
+        self.assertEqual(redacted["authorization"], "***")
+        self.assertEqual(redacted["parameters"][0]["value"], "***")
+        self.assertEqual(redacted["parameters"][1]["value"], "12345")
+        self.assertEqual(redacted["session"], {"Email": "***", "customer_id": "CUST001"})
+        self.assertEqual(event["authorization"], "Bearer abc")
+
+    def test_truncate(self):
+        """Test payloads are capped"""
+        self.assertEqual(truncate("abc", 5), "abc")
+        self.assertEqual(truncate("abcdefgh", 5), "abcde...[truncated 3 chars]")
+
+    def test_unsampled_payload_not_serialized(self):
+        """Test payloads are not encoded when the invocation is not sampled"""
+        with mock.patch.object(invocation_log, "is_sampled", return_value=False), \
+                mock.patch.object(invocation_log.json, "dumps") as dumps:
+            log_payload("Event", {"big": "x" * 10000})
+        dumps.assert_not_called()
+
+
+class TestInvocationSummary(unittest.TestCase):
+    """Test one structured line per invocation"""
+
+    def setUp(self):
+        self.router = ActionRouter("scheduling", lambda c: {}, lambda a, c: {}, use_mock=True)
+
+        @self.router.action("slow-upstream")
+        def handle(params, config, auth_headers):
+            res = requests.Response()
+            res.status_code = 200
+            with mock.patch.object(http_client.get_http_session(), "get", return_value=res):
+                http_client.http_get("https://example.com/a")
+                http_client.http_get("https://example.com/b")
+            return {"ok": True}
+
+    def dispatch(self, event):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            response = self.router.dispatch(event)
+        lines = [json.loads(line) for line in out.getvalue().splitlines() if line.startswith("{")]
+        return response, lines
+
+    def test_single_summary_line(self):
+        """Test the summary carries action, status, latency and upstream time"""
+        response, lines = self.dispatch(bedrock_event("/slow_upstream"))
+
+        self.assertEqual(response["response"]["httpStatusCode"], 200)
+        self.assertEqual(len(lines), 1)
+        summary = lines[0]
+        self.assertEqual(summary["type"], "invocation")
+        self.assertEqual(summary["action"], "slow-upstream")
+        self.assertEqual(summary["status"], 200)
+        self.assertEqual(summary["mode"], "mock")
+        self.assertEqual(summary["upstream_calls"], 2)
+        self.assertGreaterEqual(summary["total_ms"], summary["upstream_ms"])
+
+    def test_error_status_recorded(self):
+        """Test failed invocations still emit their summary"""
+        _, lines = self.dispatch(bedrock_event("/unknown"))
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["status"], 400)
+
+    def test_cold_start_flag(self):
+        """Test only the first invocation of a container is a cold start"""
+        with mock.patch.object(invocation_log, "_cold_start", True):
+            first = start_invocation("scheduling", {})
+            end_invocation(200)
+            second = start_invocation("scheduling", {})
+            end_invocation(200)
+
+        self.assertTrue(first.fields["cold_start"])
+        self.assertFalse(second.fields["cold_start"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Unit tests for metrics module
+Tests EMF formatting, the local aggregator and per-invocation timings/counters
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+from contextlib import redirect_stdout
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+import metrics
+from metrics import to_emf, capture, LocalAggregator, StdoutSink
+from invocation_log import timer, timed, count, record_upstream
+from action_router import ActionRouter
+from dashboard_cache import DashboardCache
+from lambda_loader import bedrock_event
+
+
+class TestEmf(unittest.TestCase):
+    """Test Embedded Metric Format documents"""
+
+    def test_emf_document(self):
+        """Test metric values are top-level keys declared in the _aws block"""
+        summary = {"action_group": "scheduling", "action": "list-projects", "mode": "mock", "status": 200}
+        document = to_emf(summary, {
+            "total_ms": (12.5, "Milliseconds"),
+            "payload_bytes": (300, "Bytes")
+        }, timestamp_ms=1000)
+
+        self.assertEqual(document["total_ms"], 12.5)
+        self.assertEqual(document["status"], 200)
+        directive = document["_aws"]["CloudWatchMetrics"][0]
+        self.assertEqual(document["_aws"]["Timestamp"], 1000)
+        self.assertEqual(directive["Dimensions"], [["action_group", "action", "mode"]])
+        self.assertEqual(directive["Metrics"], [
+            {"Name": "total_ms", "Unit": "Milliseconds"},
+            {"Name": "payload_bytes", "Unit": "Bytes"}
+        ])
+
+    def test_missing_dimension_and_value_cap(self):
+        """Test absent dimensions get a placeholder and arrays are capped at 100 values"""
+        document = to_emf({"action_group": "notes", "action": None, "mode": "real"},
+                          {"upstream_call_ms": (list(range(150)), "Milliseconds")})
+
+        self.assertEqual(document["action"], "unknown")
+        self.assertEqual(len(document["upstream_call_ms"]), 100)
+
+    def test_stdout_sink_single_line(self):
+        """Test the EMF sink writes one JSON line"""
+        out = io.StringIO()
+        with redirect_stdout(out):
+            StdoutSink().publish({"action_group": "a", "action": "b", "mode": "mock"}, {"total_ms": (1.0, "Milliseconds")})
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn("_aws", json.loads(lines[0]))
+
+
+class TestLocalAggregator(unittest.TestCase):
+    """Test per-action statistics"""
+
+    def test_stats(self):
+        """Test counts, errors, percentiles, upstream share and counters"""
+        aggregator = LocalAggregator()
+        for total, upstream, status in ((10.0, 5.0, 200), (20.0, 15.0, 200), (30.0, 0.0, 502)):
+            aggregator.publish({"action": "confirm-appointment", "status": status}, {
+                "total_ms": (total, "Milliseconds"),
+                "upstream_ms": (upstream, "Milliseconds"),
+                "payload_bytes": (100, "Bytes"),
+                "dashboard_cache_hit": (1, "Count")
+            })
+
+        stats = aggregator.stats()["confirm-appointment"]
+        self.assertEqual(stats["count"], 3)
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["total_ms_p50"], 20.0)
+        self.assertEqual(stats["total_ms_max"], 30.0)
+        self.assertEqual(stats["upstream_share"], round(20 / 60, 3))
+        self.assertEqual(stats["counters"], {"dashboard_cache_hit": 3})
+        self.assertIn("confirm-appointment", aggregator.report())
+
+
+class TestInvocationMetrics(unittest.TestCase):
+    """Test timings and counters recorded through dispatch"""
+
+    def setUp(self):
+        self.router = ActionRouter("scheduling", lambda c: {}, lambda a, c: {}, use_mock=False)
+        self.cache = DashboardCache(ttl_seconds=60, table_name="")
+
+        @self.router.action("cached")
+        def handle_cached(params, config, auth_headers):
+            def load():
+                record_upstream(5.0)
+                return {"data": [{"project_project_id": "1"}]}
+            entry = self.cache.get_or_load("c", "CUST001", load)
+            with timer("render"):
+                return {"projects": len(entry.records)}
+
+        @self.router.action("decorated")
+        @timed("work")
+        def handle_decorated(params, config, auth_headers):
+            count("custom_event", 2)
+            return {"ok": True}
+
+    def test_cache_hit_miss_and_timings(self):
+        """Test cache counters, handler/upstream timings and payload size per invocation"""
+        with capture() as aggregator:
+            self.router.dispatch(bedrock_event("/cached"))
+            self.router.dispatch(bedrock_event("/cached"))
+
+        first, second = aggregator.records
+        self.assertEqual(first["dashboard_cache_miss"], 1)
+        self.assertNotIn("dashboard_cache_hit", first)
+        self.assertEqual(second["dashboard_cache_hit"], 1)
+        self.assertEqual(first["mode"], "real")
+        self.assertEqual(first["upstream_ms"], 5.0)
+        self.assertEqual(first["upstream_call_ms"], [5.0])
+        self.assertEqual(second["upstream_calls"], 0)
+        self.assertEqual(first["payload_bytes"], len('{"projects":1}'))
+        self.assertIn("render_ms", first)
+        self.assertGreaterEqual(first["total_ms"], first["handler_ms"])
+        self.assertEqual(aggregator.stats()["cached"]["counters"],
+                         {"dashboard_cache_hit": 1, "dashboard_cache_miss": 1})
+
+    def test_timed_decorator_and_counter(self):
+        """Test @timed and count() on the current invocation"""
+        with capture() as aggregator:
+            self.router.dispatch(bedrock_event("/decorated"))
+
+        record = aggregator.records[0]
+        self.assertIn("work_ms", record)
+        self.assertEqual(record["custom_event"], 2)
+
+    def test_errors_still_published(self):
+        """Test failed dispatches are captured with their status"""
+        with capture() as aggregator:
+            self.router.dispatch(bedrock_event("/missing"))
+
+        self.assertEqual(aggregator.records[0]["status"], 400)
+        self.assertEqual(aggregator.stats()["missing"]["errors"], 1)
+
+    def test_capture_restores_sink(self):
+        """Test capture() puts the previous sink back"""
+        previous = metrics.get_sink()
+        with capture():
+            self.assertIsNot(metrics.get_sink(), previous)
+        self.assertIs(metrics.get_sink(), previous)
+
+    def test_no_invocation_is_noop(self):
+        """Test timers and counters outside an invocation do nothing"""
+        with timer("outside"):
+            count("outside_event")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+"""
+Unit tests for notes_index module
+Tests tokenizing, BM25 ranking, the per-project index cache and the search_notes action
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest import mock
+
+import requests
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+from notes_index import NotesIndex, NotesIndexCache, tokenize, search_limit
+from lambda_loader import load_handler, bedrock_event
+
+
+NOTES = [
+    {"note_id": "n1", "timestamp": "2025-10-01T09:00:00", "author": "Sales Team",
+     "note_text": "Customer requested a morning appointment"},
+    {"note_id": "n2", "timestamp": "2025-10-02T09:00:00", "author": "Agent",
+     "note_text": "Gate code is 4411, dog in the backyard"},
+    {"note_id": "n3", "timestamp": "2025-10-03T09:00:00", "author": "Agent",
+     "note_text": "Customer prefers morning appointments; call before arrival"},
+    {"note_id": "n4", "timestamp": "2025-10-04T09:00:00", "author": "Agent",
+     "note_text": "Measure the gate width before delivery. Gate is narrow."},
+]
+
+
+class TestTokenize(unittest.TestCase):
+
+    def test_tokens(self):
+        self.assertEqual(tokenize("The Gate-code: 4411!"), ["gate", "code", "4411"])
+        self.assertEqual(tokenize("appointments batteries boxes glass"), ["appointment", "battery", "box", "glass"])
+        self.assertEqual(tokenize("note about the gate"), ["gate"])
+        self.assertEqual(tokenize(None), [])
+
+    def test_search_limit(self):
+        self.assertEqual(search_limit(None), 5)
+        self.assertEqual(search_limit("100"), 25)
+        with self.assertRaises(ValueError):
+            search_limit("many")
+
+
+class TestNotesIndex(unittest.TestCase):
+    """Test postings and ranking"""
+
+    def setUp(self):
+        self.index = NotesIndex(NOTES)
+
+    def ids(self, query, limit=None):
+        return [note["note_id"] for note, _, _ in self.index.search(query, limit)]
+
+    def test_postings(self):
+        self.assertEqual(self.index.postings["gate"], {"n2": 1, "n4": 2})
+        self.assertNotIn("the", self.index.postings)
+
+    def test_ranking(self):
+        """Test more query terms and rarer terms rank higher"""
+        self.assertEqual(self.ids("gate code"), ["n2", "n4"])
+        self.assertEqual(self.ids("morning appointment call")[0], "n3")
+
+    def test_ties_newest_first(self):
+        index = NotesIndex([dict(NOTES[0], note_id="old"), dict(NOTES[0], note_id="new", timestamp="2025-11-01")])
+        self.assertEqual([note["note_id"] for note, _, _ in index.search("morning")], ["new", "old"])
+
+    def test_matched_terms_and_limit(self):
+        (note, score, matched), = self.index.search("dog gate", limit=1)
+        self.assertEqual(note["note_id"], "n2")
+        self.assertEqual(matched, ["dog", "gate"])
+        self.assertGreater(score, 0)
+
+    def test_no_match(self):
+        self.assertEqual(self.ids("invoice"), [])
+        self.assertEqual(self.ids("the and"), [])
+        self.assertEqual(NotesIndex().search("gate"), [])
+
+    def test_add_is_idempotent(self):
+        self.assertFalse(self.index.add(NOTES[1]))
+        self.assertTrue(self.index.add({"note_id": "n5", "note_text": "Invoice sent"}))
+        self.assertEqual(self.ids("invoice"), ["n5"])
+        self.assertEqual(len(self.index), 5)
+
+
+class TestNotesIndexCache(unittest.TestCase):
+    """Test per-project index reuse, incremental adds and expiry"""
+
+    def test_build_once(self):
+        cache = NotesIndexCache(ttl_seconds=60)
+        loader = mock.Mock(return_value=NOTES)
+
+        index, built = cache.get_or_build("12345", loader)
+        again, built_again = cache.get_or_build("12345", loader)
+
+        self.assertIs(index, again)
+        self.assertEqual((built, built_again), (True, False))
+        loader.assert_called_once()
+
+    def test_add_to_cached_index(self):
+        cache = NotesIndexCache()
+        self.assertFalse(cache.add("12345", {"note_id": "n5", "note_text": "Invoice sent"}))
+
+        index, _ = cache.get_or_build("12345", lambda: NOTES)
+        self.assertTrue(cache.add("12345", {"note_id": "n5", "note_text": "Invoice sent"}))
+        self.assertEqual(len(index.search("invoice")), 1)
+
+    def test_expiry_and_lru(self):
+        cache = NotesIndexCache(ttl_seconds=0, max_projects=1)
+        cache.get_or_build("a", lambda: NOTES)
+        _, built = cache.get_or_build("a", lambda: NOTES)
+        self.assertTrue(built)
+
+        cache.ttl_seconds = 60
+        cache.get_or_build("b", lambda: NOTES)
+        self.assertFalse(cache.add("a", NOTES[0]))  # evicted
+
+
+class TestSearchNotesAction(unittest.TestCase):
+    """Test search_notes through the notes Lambda (mock mode)"""
+
+    def setUp(self):
+        self.handler = load_handler("notes-actions")
+        self.handler.notes_index_cache.invalidate()
+        self.addCleanup(self.handler.notes_index_cache.invalidate)
+
+    def body(self, response):
+        return json.loads(response["response"]["responseBody"]["application/json"]["body"])
+
+    def test_search(self):
+        response = self.handler.lambda_handler(bedrock_event("/search-notes", project_id="777", query="installation access"), None)
+        body = self.body(response)
+
+        self.assertEqual(response["response"]["httpStatusCode"], 200)
+        self.assertEqual(body["count"], 1)
+        self.assertEqual(body["results"][0]["note_id"], "note-002")
+        self.assertEqual(body["searched_notes"], 3)
+
+    def test_added_note_is_searchable(self):
+        """Test add_note updates the cached index without a rebuild"""
+        self.handler.lambda_handler(bedrock_event("/search-notes", project_id="778", query="morning"), None)
+        self.handler.lambda_handler(
+            bedrock_event("/add-note", project_id="778", note_text="Side gate code is 2020"), None
+        )
+
+        with mock.patch.object(self.handler, "get_mock_list_notes") as load:
+            body = self.body(self.handler.lambda_handler(bedrock_event("/search-notes", project_id="778", query="gate code"), None))
+
+        load.assert_not_called()
+        self.assertEqual(body["results"][0]["note_text"], "Side gate code is 2020")
+
+    def test_indexes_api_and_dynamodb_notes(self):
+        """Test a rebuild (real mode) merges PF360 and DynamoDB notes, deduped by note_id and sync status"""
+        breaker = self.handler.get_circuit_breaker("pf360-list-notes")
+        breaker.reset()
+        self.addCleanup(breaker.reset)
+        api = mock.Mock(**{"json.return_value": {"data": {"notes": NOTES[:2]}}})
+        # n1 was synced to PF360, which listed it under its own note_id
+        synced = dict(NOTES[0], note_id="local-n1", sync_status="synced")
+        repository = mock.Mock(**{"list_all.return_value": NOTES[1:] + [synced]})
+        event = bedrock_event("/search-notes", project_id="779", query="gate")
+
+        with mock.patch.object(self.handler, "USE_MOCK_API", False), \
+                mock.patch.object(self.handler, "http_get", return_value=api), \
+                mock.patch.object(self.handler, "get_notes_repository", return_value=repository):
+            body = self.body(self.handler.lambda_handler(event, None))
+
+        self.assertEqual(body["searched_notes"], 4)
+        self.assertEqual({r["note_id"] for r in body["results"]}, {"n2", "n4"})
+
+        # API down: DynamoDB notes are still indexed
+        self.handler.notes_index_cache.invalidate()
+        with mock.patch.object(self.handler, "USE_MOCK_API", False), \
+                mock.patch.object(self.handler, "http_get", side_effect=requests.ConnectionError("refused")), \
+                mock.patch.object(self.handler, "get_notes_repository", return_value=repository):
+            body = self.body(self.handler.lambda_handler(event, None))
+
+        self.assertEqual(body["searched_notes"], 4)  # the synced copy stands in for PF360's
+
+    def test_missing_query(self):
+        response = self.handler.lambda_handler(bedrock_event("/search-notes", project_id="777"), None)
+        self.assertEqual(response["response"]["httpStatusCode"], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+"""
+Unit tests for notes_repository module
+Tests cursor pagination, list projections, batch imports and list_notes paging
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest import mock
+
+import requests
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+import notes_repository
+from notes_repository import NotesRepository, get_notes_repository, paginate, decode_token, LIST_ATTRIBUTES
+from lambda_loader import load_handler, bedrock_event
+
+
+class FakeTable:
+    """In-memory notes table (project_id, timestamp) evaluating Query paging"""
+
+    def __init__(self):
+        self.items = []
+        self.queries = []
+
+    def put_item(self, Item):
+        self.items.append(Item)
+
+    # Without a Limit, 3 items stand in for DynamoDB's 1 MB page
+    def query(self, ExpressionAttributeValues, ScanIndexForward, Limit=3, ProjectionExpression=None,
+              ExpressionAttributeNames=None, ExclusiveStartKey=None, **kwargs):
+        self.queries.append(ProjectionExpression)
+        items = sorted((i for i in self.items if i["project_id"] == ExpressionAttributeValues[":pid"]),
+                       key=lambda i: i["timestamp"], reverse=not ScanIndexForward)
+        if ExclusiveStartKey:
+            items = [i for i in items if i["timestamp"] < ExclusiveStartKey["timestamp"]]
+
+        attributes = [ExpressionAttributeNames[name.strip()] for name in ProjectionExpression.split(",")]
+        page = [{k: v for k, v in i.items() if k in attributes} for i in items[:Limit]]
+        response = {"Items": page}
+        if len(items) > Limit:
+            response["LastEvaluatedKey"] = {"project_id": page[-1]["project_id"], "timestamp": page[-1]["timestamp"]}
+        return response
+
+
+class FakeResource:
+    """DynamoDB resource whose first batch_write_item leaves one item unprocessed"""
+
+    def __init__(self, table):
+        self.table = table
+        self.requests = []
+
+    def Table(self, name):
+        return self.table
+
+    def batch_write_item(self, RequestItems):
+        (name, requests), = RequestItems.items()
+        self.requests.append(len(requests))
+        unprocessed = requests[-1:] if len(self.requests) == 1 else []
+        for request in requests[:len(requests) - len(unprocessed)]:
+            self.table.put_item(request["PutRequest"]["Item"])
+        return {"UnprocessedItems": {name: unprocessed} if unprocessed else {}}
+
+
+def make_notes(count, project_id="12345"):
+    return [
+        {"project_id": project_id, "timestamp": f"2025-10-{day:02d}T09:00:00", "note_id": f"n{day}",
+         "note_text": f"Note {day}", "author": "Agent", "created_at": f"2025-10-{day:02d} 09:00:00", "internal": "x"}
+        for day in range(1, count + 1)
+    ]
+
+
+class TestNotesRepository(unittest.TestCase):
+    """Test the DynamoDB repository"""
+
+    def setUp(self):
+        self.table = FakeTable()
+        self.resource = FakeResource(self.table)
+        self.repository = NotesRepository("notes")
+        self.repository._dynamodb = self.resource
+
+    def test_pages_cover_history(self):
+        """Test next_token walks the whole history newest first without repeats"""
+        self.table.items = make_notes(25)
+
+        seen, token = [], None
+        while True:
+            page, token = self.repository.list("12345", limit=10, next_token=token)
+            seen.extend(note["note_id"] for note in page)
+            if not token:
+                break
+
+        self.assertEqual(seen, [f"n{day}" for day in range(25, 0, -1)])
+        self.assertEqual(len(self.table.queries), 3)
+
+    def test_list_all(self):
+        """Test the whole history is read across Query pages"""
+        self.table.items = make_notes(7)
+        notes = self.repository.list_all("12345")
+
+        self.assertEqual([note["note_id"] for note in notes], [f"n{day}" for day in range(7, 0, -1)])
+        self.assertIn("#sync_status", self.table.queries[0])
+        self.assertEqual(len(self.table.queries), 3)
+
+    def test_projection(self):
+        """Test list views only read the list attributes"""
+        self.table.items = make_notes(1)
+        page, token = self.repository.list("12345")
+
+        self.assertIsNone(token)
+        self.assertEqual(set(page[0]), set(LIST_ATTRIBUTES))
+
+    def test_token_for_other_project(self):
+        self.table.items = make_notes(5)
+        _, token = self.repository.list("12345", limit=2)
+        with self.assertRaises(ValueError):
+            self.repository.list("99999", next_token=token)
+        with self.assertRaises(ValueError):
+            self.repository.list("12345", next_token="not-a-token")
+
+    def test_token_from_other_source(self):
+        """Test a token from the other source restarts at the first page"""
+        self.table.items = make_notes(5)
+        _, api_token = paginate(make_notes(5), limit=2)
+        page, _ = self.repository.list("12345", limit=2, next_token=api_token)
+        self.assertEqual([n["note_id"] for n in page], ["n5", "n4"])
+
+        _, dynamodb_token = self.repository.list("12345", limit=2)
+        page, _ = paginate(make_notes(5), limit=2, next_token=dynamodb_token)
+        self.assertEqual([n["note_id"] for n in page], ["n1", "n2"])
+
+    def test_limit_clamped(self):
+        self.table.items = make_notes(3)
+        page, _ = self.repository.list("12345", limit=0)
+        self.assertEqual(len(page), 1)
+        with self.assertRaises(ValueError):
+            self.repository.list("12345", limit="ten")
+
+    def test_put_many_batches_and_retries(self):
+        """Test 25-item chunks and a retry of unprocessed items"""
+        with mock.patch.object(notes_repository.time, "sleep"):
+            written = self.repository.put_many(make_notes(30))
+
+        self.assertEqual(written, 30)
+        self.assertEqual(self.resource.requests, [25, 1, 5])
+        self.assertEqual(len(self.table.items), 30)
+
+    def test_cached_handle(self):
+        self.assertIs(get_notes_repository("notes-a"), get_notes_repository("notes-a"))
+        self.assertIsNot(get_notes_repository("notes-a"), get_notes_repository("notes-b"))
+
+    def test_paginate_in_memory(self):
+        notes = make_notes(5)
+        page, token = paginate(notes, limit=2)
+        self.assertEqual([n["note_id"] for n in page], ["n1", "n2"])
+        self.assertEqual(decode_token(token), {"source": "api", "offset": 2})
+
+        page, token = paginate(notes, limit=2, next_token=token)
+        page, token = paginate(notes, limit=2, next_token=token)
+        self.assertEqual([n["note_id"] for n in page], ["n5"])
+        self.assertIsNone(token)
+
+
+class TestListNotesAction(unittest.TestCase):
+    """Test list_notes paging through the notes Lambda (mock mode)"""
+
+    def test_limit_and_next_token(self):
+        handler = load_handler("notes-actions")
+
+        first = handler.lambda_handler(bedrock_event("/list-notes", project_id="12345", limit="2"), None)
+        body = json.loads(first["response"]["responseBody"]["application/json"]["body"])
+        self.assertEqual(body["count"], 2)
+        self.assertEqual(body["total_count"], 3)
+
+        second = handler.lambda_handler(
+            bedrock_event("/list-notes", project_id="12345", limit="2", next_token=body["next_token"]), None
+        )
+        body = json.loads(second["response"]["responseBody"]["application/json"]["body"])
+        self.assertEqual(body["count"], 1)
+        self.assertIsNone(body["next_token"])
+
+    def test_source_changes_between_pages(self):
+        """Test an API page token still works once the circuit sends list_notes to DynamoDB"""
+        handler = load_handler("notes-actions")
+        breaker = handler.get_circuit_breaker("pf360-list-notes")
+        breaker.reset()
+        self.addCleanup(breaker.reset)
+        table = FakeTable()
+        table.items = make_notes(5)
+        repository = NotesRepository("notes")
+        repository._table = table
+        api = mock.Mock(**{"json.return_value": {"data": {"notes": make_notes(5), "total_count": 5}}})
+
+        def list_notes(**params):
+            response = handler.lambda_handler(bedrock_event("/list-notes", project_id="12345", limit="2", **params), None)
+            self.assertEqual(response["response"]["httpStatusCode"], 200)
+            return json.loads(response["response"]["responseBody"]["application/json"]["body"])
+
+        with mock.patch.object(handler, "USE_MOCK_API", False), \
+                mock.patch.object(handler, "get_notes_repository", return_value=repository):
+            with mock.patch.object(handler, "http_get", return_value=api):
+                first = list_notes()
+            with mock.patch.object(handler, "http_get", side_effect=requests.ConnectionError("refused")):
+                second = list_notes(next_token=first["next_token"])
+                third = list_notes(next_token=second["next_token"])
+
+        self.assertEqual((first["source"], first["total_count"]), ("api", 5))
+        self.assertEqual([n["note_id"] for n in second["notes"]], ["n5", "n4"])
+        self.assertEqual([n["note_id"] for n in third["notes"]], ["n3", "n2"])
+        self.assertEqual((third["source"], third["total_count"]), ("dynamodb", None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,254 @@
+"""
+Unit tests for write-behind notes sync
+Tests add_note writing pending notes and the stream worker's batching, dedupe, retries and partial failures
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest import mock
+
+import requests
+from botocore.exceptions import ClientError
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+from notes_repository import NotesRepository
+from lambda_loader import load_handler, bedrock_event
+
+
+class FakeTable:
+    """In-memory notes table supporting the conditional sync update"""
+
+    def __init__(self):
+        self.items = {}
+
+    def put_item(self, Item):
+        self.items[(Item["project_id"], Item["timestamp"])] = dict(Item)
+
+    def get_item(self, Key, ConsistentRead=False):
+        item = self.items.get((Key["project_id"], Key["timestamp"]))
+        return {"Item": dict(item)} if item else {}
+
+    def update_item(self, Key, ExpressionAttributeValues, **kwargs):
+        item = self.items[(Key["project_id"], Key["timestamp"])]
+        if item.get("sync_status") != ExpressionAttributeValues[":pending"]:
+            raise ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem")
+        item.update({name[1:]: value for name, value in ExpressionAttributeValues.items() if name != ":pending"})
+
+
+def response(status_code):
+    """requests.Response stand-in with the real raise_for_status"""
+    res = requests.Response()
+    res.status_code = status_code
+    return res
+
+
+def stream_record(note, sequence, event_name="INSERT"):
+    return {
+        "eventName": event_name,
+        "dynamodb": {
+            "SequenceNumber": sequence,
+            "NewImage": {name: {"S": value} for name, value in note.items()}
+        }
+    }
+
+
+class TestNotesSync(unittest.TestCase):
+    """Test the stream-triggered sync worker"""
+
+    def setUp(self):
+        self.handler = load_handler("notes-sync")
+        self.table = FakeTable()
+        self.repository = NotesRepository("notes")
+        self.repository._table = self.table
+        self.breaker = self.handler.get_circuit_breaker("pf360-add-note")
+        self.breaker.reset()
+
+        patches = [
+            mock.patch.object(self.handler, "get_notes_repository", return_value=self.repository),
+            mock.patch.object(self.handler.time, "sleep")
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.breaker.reset)
+
+    def add_note(self, note_id):
+        return self.repository.put("12345", f"Note {note_id}", "Agent", note_id,
+                                   sync_status="pending", client_id="09PF05VD")
+
+    def status(self, note):
+        return self.table.items[("12345", note["timestamp"])]["sync_status"]
+
+    def test_syncs_pending_notes(self):
+        """Test each pending note is posted once and marked synced"""
+        notes = [self.add_note("n1"), self.add_note("n2")]
+        records = [stream_record(note, str(100 + i)) for i, note in enumerate(notes)]
+
+        with mock.patch.object(self.handler, "http_post", return_value=response(200)) as post:
+            result = self.handler.lambda_handler({"Records": records}, None)
+
+        self.assertEqual(result, {"batchItemFailures": []})
+        self.assertEqual(post.call_count, 2)
+        url = post.call_args.args[0]
+        self.assertTrue(url.endswith("/project-notes/add/09PF05VD"))
+        self.assertEqual({item["sync_status"] for item in self.table.items.values()}, {"synced"})
+
+    def test_dedupe(self):
+        """Test duplicates in a batch and redelivered synced notes are not posted again"""
+        note = self.add_note("n1")
+        records = [stream_record(note, "100"), stream_record(note, "101")]
+
+        with mock.patch.object(self.handler, "http_post", return_value=response(200)) as post:
+            self.handler.lambda_handler({"Records": records}, None)
+            self.handler.lambda_handler({"Records": records}, None)
+
+        self.assertEqual(post.call_count, 1)
+
+    def test_ignores_other_events(self):
+        note = self.add_note("n1")
+        synced = dict(note, sync_status="synced")
+        records = [stream_record(note, "100", "MODIFY"), stream_record(synced, "101")]
+
+        with mock.patch.object(self.handler, "http_post", return_value=response(200)) as post:
+            result = self.handler.lambda_handler({"Records": records}, None)
+
+        post.assert_not_called()
+        self.assertEqual(result["batchItemFailures"], [])
+
+    def test_partial_failure(self):
+        """Test only the failed note's record is reported for retry, after SYNC_ATTEMPTS tries"""
+        ok, failing = self.add_note("n1"), self.add_note("n2")
+        records = [stream_record(ok, "100"), stream_record(failing, "101")]
+
+        def post(url, headers, json):
+            if json["note"] == "Note n2":
+                raise requests.ConnectionError("refused")
+            return response(200)
+
+        with mock.patch.object(self.handler, "SYNC_MAX_WORKERS", 1), \
+                mock.patch.object(self.handler, "http_post", side_effect=post) as http_post:
+            result = self.handler.lambda_handler({"Records": records}, None)
+
+        self.assertEqual(result, {"batchItemFailures": [{"itemIdentifier": "101"}]})
+        self.assertEqual(http_post.call_count, 1 + self.handler.SYNC_ATTEMPTS)
+        self.assertEqual(self.status(failing), "pending")
+
+    def test_retries_only_unapplied_posts(self):
+        """Test 5xx is retried, a 4xx marks the note failed and a read timeout marks it unconfirmed"""
+        recovered, rejected, timed_out = self.add_note("n1"), self.add_note("n2"), self.add_note("n3")
+        records = [stream_record(note, str(100 + i)) for i, note in enumerate((recovered, rejected, timed_out))]
+        outcomes = {"Note n1": [response(503), response(200)], "Note n2": [response(400)],
+                    "Note n3": [requests.ReadTimeout("read timed out")]}
+
+        def post(url, headers, json):
+            outcome = outcomes[json["note"]].pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        with mock.patch.object(self.handler, "SYNC_MAX_WORKERS", 1), \
+                mock.patch.object(self.handler, "http_post", side_effect=post) as http_post:
+            result = self.handler.lambda_handler({"Records": records}, None)
+
+        self.assertEqual(result, {"batchItemFailures": []})
+        self.assertEqual(http_post.call_count, 4)
+        self.assertEqual([self.status(note) for note in (recovered, rejected, timed_out)],
+                         ["synced", "failed", "unconfirmed"])
+        self.assertEqual(self.breaker.failures, 1)  # the read timeout; the 4xx did not count
+
+    def test_posted_note_never_retried(self):
+        """Test a failed mark_synced after the post does not fail the batch or re-post"""
+        ok, unmarked = self.add_note("n1"), self.add_note("n2")
+        records = [stream_record(ok, "100"), stream_record(unmarked, "101")]
+        mark_synced = self.repository.mark_synced
+
+        def flaky_mark(project_id, timestamp, synced_at):
+            if timestamp == unmarked["timestamp"]:
+                raise ClientError({"Error": {"Code": "ProvisionedThroughputExceededException"}}, "UpdateItem")
+            return mark_synced(project_id, timestamp, synced_at)
+
+        with mock.patch.object(self.repository, "mark_synced", side_effect=flaky_mark), \
+                mock.patch.object(self.handler, "count") as count, \
+                mock.patch.object(self.handler, "http_post", return_value=response(200)) as post:
+            result = self.handler.lambda_handler({"Records": records}, None)
+
+        self.assertEqual(result, {"batchItemFailures": []})
+        self.assertEqual(post.call_count, 2)
+        count.assert_any_call("notes_sync_unmarked")
+        self.assertEqual(self.table.items[("12345", unmarked["timestamp"])]["sync_status"], "pending")
+
+    def test_payload_keeps_creation_time(self):
+        payload = self.handler.build_payload({
+            "project_id": "12345", "note_text": "Hi", "author": "Agent", "created_at": "2025-10-01 09:30:00"
+        })
+        self.assertEqual(payload, {"project_id": "12345", "note": "Hi", "author": "Agent",
+                                   "created_at": "10-01-2025 09:30:00"})
+
+
+class TestWriteBehindAddNote(unittest.TestCase):
+    """Test add_note acknowledges after the DynamoDB write (real mode)"""
+
+    def test_pending_note(self):
+        handler = load_handler("notes-actions")
+        table = FakeTable()
+        repository = NotesRepository("notes")
+        repository._table = table
+        event = bedrock_event("/add-note", project_id="12345", note_text="Call before arrival", client_id="09PF05VD")
+
+        with mock.patch.object(handler, "USE_MOCK_API", False), \
+                mock.patch.object(handler, "NOTES_WRITE_BEHIND", True), \
+                mock.patch.object(handler, "get_notes_repository", return_value=repository), \
+                mock.patch.object(handler, "http_post") as post:
+            response = handler.lambda_handler(event, None)
+
+        body = json.loads(response["response"]["responseBody"]["application/json"]["body"])
+        post.assert_not_called()
+        (item,) = table.items.values()
+        self.assertEqual(item["sync_status"], "pending")
+        self.assertEqual(item["client_id"], "09PF05VD")
+        self.assertEqual(body["note_data"]["note_id"], item["note_id"])
+
+
+class TestAddNoteFallback(unittest.TestCase):
+    """Test add_note's DynamoDB fallback only leaves notes pending when PF360 certainly lacks them"""
+
+    def setUp(self):
+        self.handler = load_handler("notes-actions")
+        self.breaker = self.handler.get_circuit_breaker("pf360-add-note")
+        self.breaker.reset()
+        self.addCleanup(self.breaker.reset)
+        self.table = FakeTable()
+        self.repository = NotesRepository("notes")
+        self.repository._table = self.table
+
+    def add_note(self, error):
+        event = bedrock_event("/add-note", project_id="12345", note_text="Gate code 4411", client_id="09PF05VD")
+        with mock.patch.object(self.handler, "USE_MOCK_API", False), \
+                mock.patch.object(self.handler, "NOTES_WRITE_BEHIND", False), \
+                mock.patch.object(self.handler, "get_notes_repository", return_value=self.repository), \
+                mock.patch.object(self.handler, "http_post", side_effect=error):
+            self.handler.lambda_handler(event, None)
+        return list(self.table.items.values())[-1]
+
+    def test_connection_error_pending(self):
+        self.assertEqual(self.add_note(requests.ConnectionError("refused"))["sync_status"], "pending")
+
+    def test_read_timeout_unconfirmed(self):
+        """Test a note PF360 may have accepted is never posted again by notes-sync"""
+        note = self.add_note(requests.ReadTimeout("read timed out"))
+        self.assertEqual(note["sync_status"], "unconfirmed")
+        self.assertIn("read timed out", note["sync_error"])
+
+        sync = load_handler("notes-sync")
+        with mock.patch.object(sync, "get_notes_repository", return_value=self.repository), \
+                mock.patch.object(sync, "http_post") as post:
+            sync.lambda_handler({"Records": [stream_record(note, "100")]}, None)
+        post.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Unit tests for the information Lambda's get_project_overview action
+Tests the combined payload, single dashboard fetch, partial failures and the notes table fallback
+"""
+
+import unittest
+import json
+from unittest import mock
+
+import requests
+
+from lambda_loader import load_handler, bedrock_event
+
+EVENT = bedrock_event("/get-project-overview", project_id="12345", customer_id="1645975", client_id="09PF05VD")
+
+
+def body(response):
+    return json.loads(response["response"]["responseBody"]["application/json"]["body"])
+
+
+class TestProjectOverview(unittest.TestCase):
+    """Test get_project_overview (mock mode)"""
+
+    def setUp(self):
+        self.handler = load_handler("information-actions")
+        self.handler.weather_cache.clear()
+
+    def test_combined_payload(self):
+        """Test details and status come from the same dashboard record"""
+        with mock.patch.object(self.handler, "get_mock_project_details",
+                               wraps=self.handler.get_mock_project_details) as dashboard:
+            response = self.handler.lambda_handler(EVENT, None)
+
+        result = body(response)
+        self.assertEqual(response["response"]["httpStatusCode"], 200)
+        self.assertEqual(dashboard.call_count, 1)
+        self.assertEqual(result["project"]["order_number"], "ORD-2025-001")
+        self.assertEqual(result["appointment"]["status"], "Scheduled")
+        self.assertTrue(result["appointment"]["can_reschedule"])
+        self.assertEqual(result["notes"]["total_count"], 3)
+        self.assertEqual(result["notes"]["recent"][0]["note_text"], "Customer confirmed appointment for next week")
+        self.assertEqual(result["weather"]["location"], "Tampa, FL")
+        self.assertEqual(result["unavailable"], [])
+
+    def test_partial_failure(self):
+        """Test a failed weather fetch is reported instead of failing the overview"""
+        with mock.patch.object(self.handler, "fetch_weather", side_effect=TimeoutError("read timed out")):
+            response = self.handler.lambda_handler(EVENT, None)
+
+        result = body(response)
+        self.assertEqual(response["response"]["httpStatusCode"], 200)
+        self.assertIsNone(result["weather"])
+        self.assertEqual(result["unavailable"], ["weather"])
+        self.assertEqual(result["notes"]["total_count"], 3)
+
+    def test_unknown_project(self):
+        response = self.handler.lambda_handler(
+            bedrock_event("/get-project-overview", project_id="99999", customer_id="1645975"), None
+        )
+        self.assertEqual(response["response"]["httpStatusCode"], 400)
+
+    def test_notes_from_table(self):
+        """Test notes come from the notes table when the List Notes API fails"""
+        breaker = self.handler.get_circuit_breaker("pf360-list-notes")
+        breaker.reset()
+        self.addCleanup(breaker.reset)
+        repository = mock.Mock(**{"list.return_value": ([
+            {"created_at": "2025-10-02 09:00:00", "author": "Agent", "note_text": "Gate code is 4411"},
+            {"created_at": "2025-10-01 09:00:00", "author": "Agent", "note_text": "Call before arrival"}
+        ], "token")})
+        config = self.handler.get_api_config("09PF05VD")
+
+        with mock.patch.object(self.handler, "USE_MOCK_API", False), \
+                mock.patch.object(self.handler, "http_get", side_effect=requests.ConnectionError("refused")), \
+                mock.patch.object(self.handler, "get_notes_repository", return_value=repository) as repositories:
+            notes = self.handler.fetch_recent_notes("12345", config, {})
+
+        repositories.assert_called_once_with(config["notes_table"])
+        repository.list.assert_called_once_with("12345", limit=self.handler.OVERVIEW_NOTES)
+        self.assertIsNone(notes["total_count"])
+        self.assertEqual([note["note_text"] for note in notes["recent"]], ["Gate code is 4411", "Call before arrival"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Unit tests for projection module
+Tests field parsing, subtree selection, null dropping and per-agent defaults through the router
+"""
+
+import unittest
+import sys
+import os
+import json
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+from projection import parse_fields, select_fields, drop_nulls, apply_projection
+from action_router import ActionRouter
+from lambda_loader import load_handler, bedrock_event
+
+DETAILS = {
+    "status": "Scheduled",
+    "address": {"city": "Tampa", "state": "FL", "address2": None},
+    "dates": {"scheduled": "2025-10-15", "completed": None},
+    "technician": {"first_name": None, "last_name": None},
+    "forecast": [{"date": "2025-10-15", "max_temp_f": "85"}, {"date": "2025-10-16", "max_temp_f": "84"}]
+}
+
+
+def body(response):
+    return json.loads(response["response"]["responseBody"]["application/json"]["body"])
+
+
+class TestProjection(unittest.TestCase):
+    """Test the projection helpers"""
+
+    def test_parse_fields(self):
+        self.assertEqual(parse_fields(" status, address.city ,"), ["status", "address.city"])
+        self.assertEqual(parse_fields('["status", "dates"]'), ["status", "dates"])
+        self.assertEqual(parse_fields(["status"]), ["status"])
+        self.assertIsNone(parse_fields(""))
+        with self.assertRaises(ValueError):
+            parse_fields("[status")
+
+    def test_select_subtrees(self):
+        result = select_fields(DETAILS, ["status", "address.city", "dates", "unknown.path"])
+        self.assertEqual(result, {"status": "Scheduled", "address": {"city": "Tampa"}, "dates": DETAILS["dates"]})
+
+    def test_whole_subtree_wins(self):
+        """Test a path and one of its children select the whole subtree in either order"""
+        self.assertEqual(select_fields(DETAILS, ["address.city", "address"]), {"address": DETAILS["address"]})
+        self.assertEqual(select_fields(DETAILS, ["address", "address.city"]), {"address": DETAILS["address"]})
+
+    def test_select_through_lists(self):
+        self.assertEqual(select_fields(DETAILS, ["forecast.date"]),
+                         {"forecast": [{"date": "2025-10-15"}, {"date": "2025-10-16"}]})
+
+    def test_drop_nulls(self):
+        self.assertEqual(drop_nulls(DETAILS)["address"], {"city": "Tampa", "state": "FL"})
+        self.assertNotIn("technician", drop_nulls(DETAILS))
+        self.assertEqual(drop_nulls({"notes": [None, {"text": "a", "author": None}]}), {"notes": [{"text": "a"}]})
+
+    def test_envelope_kept(self):
+        """Test fields select within the projected key and the envelope is kept"""
+        result = {"action": "get_project_details", "project_id": "12345", "project_details": DETAILS}
+
+        projected = apply_projection(result, "project_details", ["status"])
+        self.assertEqual(projected, {"action": "get_project_details", "project_id": "12345",
+                                     "project_details": {"status": "Scheduled"}})
+        self.assertEqual(apply_projection(result, "", ["project_id"]), {"action": "get_project_details", "project_id": "12345"})
+        self.assertIs(result["project_details"], DETAILS)
+
+
+class TestRouterProjection(unittest.TestCase):
+    """Test fields/compact parameters and agent defaults through dispatch"""
+
+    def setUp(self):
+        self.router = ActionRouter(
+            "information", lambda c: {}, lambda a, c: {}, use_mock=True,
+            projections={"scheduling-agent-information": {"get-project-details": "status"}, "*": {"get-weather": "current"}}
+        )
+
+        @self.router.action("get-project-details", projection="project_details")
+        def handle_details(params, config, auth_headers):
+            return {"action": "get_project_details", "project_details": DETAILS, "mock_mode": True}
+
+        @self.router.action("get-working-hours")
+        def handle_hours(params, config, auth_headers):
+            return {"action": "get_working_hours", "timezone": None}
+
+    def test_fields_parameter(self):
+        result = body(self.router.dispatch(bedrock_event("/get-project-details", fields="dates", compact="true")))
+        self.assertEqual(result["project_details"], {"dates": {"scheduled": "2025-10-15"}})
+        self.assertTrue(result["mock_mode"])
+
+    def test_agent_default(self):
+        event = bedrock_event("/get-project-details")
+        event["agent"] = {"name": "scheduling-agent-information"}
+        self.assertEqual(body(self.router.dispatch(event))["project_details"], {"status": "Scheduled"})
+
+        event["agent"] = {"name": "other-agent"}
+        self.assertEqual(body(self.router.dispatch(event))["project_details"], DETAILS)
+
+    def test_not_projectable(self):
+        """Test actions registered without projection ignore the parameters"""
+        result = body(self.router.dispatch(bedrock_event("/get-working-hours", fields="action", compact="true")))
+        self.assertEqual(result, {"action": "get_working_hours", "timezone": None})
+
+
+class TestInformationProjection(unittest.TestCase):
+    """Test projection on the information Lambda (mock mode)"""
+
+    def test_project_details_fields(self):
+        handler = load_handler("information-actions")
+        full = handler.lambda_handler(bedrock_event("/get-project-details", project_id="12345", customer_id="1645975"), None)
+        projected = handler.lambda_handler(bedrock_event(
+            "/get-project-details", project_id="12345", customer_id="1645975",
+            fields="status,dates.scheduled,address.city", compact="true"
+        ), None)
+
+        self.assertEqual(body(projected)["project_details"],
+                         {"status": "Scheduled", "dates": {"scheduled": "2025-10-15"}, "address": {"city": "Tampa"}})
+        self.assertLess(len(projected["response"]["responseBody"]["application/json"]["body"]),
+                        len(full["response"]["responseBody"]["application/json"]["body"]) / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Unit tests for the chat backend's routing metrics
+Tests histogram accuracy, rolling windows, the /api/metrics snapshot, Prometheus export and Haiku failures
+"""
+
+import unittest
+import sys
+import os
+import random
+from unittest import mock
+
+# Add the chat backend to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../frontend/backend"))
+
+from routing_metrics import LatencyHistogram, RoutingMetrics, bucket_bounds, bucket_index
+import app as routing
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_buckets_are_contiguous(self):
+        for micros in (0, 1, 31, 32, 33, 63, 64, 1000, 123456, 10 ** 9):
+            with self.subTest(micros=micros):
+                low, width = bucket_bounds(bucket_index(micros))
+                self.assertLessEqual(low, micros)
+                self.assertLess(micros, low + width)
+
+    def test_percentiles_within_bucket_error(self):
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(-1, 1) for _ in range(5000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for pct in (50, 95, 99):
+            exact = values[int(len(values) * pct / 100) - 1]
+            self.assertAlmostEqual(histogram.percentile(pct), exact, delta=exact * 0.07)
+        self.assertEqual(histogram.percentile(100), values[-1])
+
+    def test_empty(self):
+        self.assertEqual(LatencyHistogram().summary()["p99_ms"], 0.0)
+
+
+class TestRoutingMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.metrics = RoutingMetrics(clock=self.clock)
+
+    def test_windows_roll(self):
+        self.metrics.record_classification("scheduling", "rules", 0.001)
+        self.clock.now += 120
+        self.metrics.record_classification("notes", "haiku", 0.4)
+
+        windows = self.metrics.snapshot()["windows"]
+        self.assertEqual(windows["1m"]["classifications"]["by_intent"], {"notes": 1})
+        self.assertEqual(windows["5m"]["classifications"]["by_intent"], {"scheduling": 1, "notes": 1})
+
+        self.clock.now += 3600
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["windows"]["1h"]["classifications"]["count"], 0)
+        self.assertEqual(snapshot["since_start"]["classifications"]["count"], 2)
+
+    def test_snapshot(self):
+        self.metrics.record_classification("information", "model", 0.002)
+        self.metrics.record_classification("chitchat", "haiku", 0.3)
+        self.metrics.record_classification_error(0.3)
+        self.metrics.record_invocation("information", 1.0, True, chunks=4, first_chunk_seconds=0.4)
+        self.metrics.record_invocation("chitchat", 0.5, False)
+
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["total_requests"], 2)
+        self.assertEqual(snapshot["intents"], {"information": 1, "chitchat": 1})
+        self.assertEqual(snapshot["error_rate"], 0.5)
+
+        hour = snapshot["windows"]["1h"]
+        self.assertEqual(hour["classifications"]["by_source"], {"model": 1, "haiku": 1})
+        self.assertEqual(hour["classifications"]["count"], 2)
+        self.assertEqual(hour["classifications"]["error_rate"], 0.3333)
+        self.assertEqual(hour["invocations"]["chunks"], 4)
+        self.assertEqual(hour["invocations"]["time_to_first_chunk"]["count"], 1)
+        self.assertEqual(hour["invocations"]["latency"]["max_ms"], 1000.0)
+
+    def test_prometheus(self):
+        self.metrics.record_classification("notes", "rules", 0.0001)
+        self.metrics.record_invocation("notes", 0.8, True, chunks=3, first_chunk_seconds=0.2)
+
+        text = self.metrics.prometheus()
+        self.assertIn('bedrock_routing_classifications_total{intent="notes",source="rules"} 1', text)
+        self.assertIn('bedrock_routing_invocations_total{intent="notes",status="success"} 1', text)
+        self.assertIn('bedrock_routing_chunks_total{intent="notes"} 3', text)
+        self.assertIn("bedrock_routing_classification_errors_total 0", text)
+        self.assertIn("# TYPE bedrock_routing_first_chunk_seconds summary", text)
+        self.assertIn("bedrock_routing_invocation_seconds_count 1", text)
+        self.assertTrue(text.endswith("\n"))
+
+
+class TestHaikuFailure(unittest.TestCase):
+    """Test a failed Haiku classification is an error, not a chitchat classification"""
+
+    def test_failure_recorded_once(self):
+        metrics = RoutingMetrics()
+        runtime = mock.Mock(**{"invoke_model.side_effect": RuntimeError("ThrottlingException")})
+        with mock.patch.object(routing, "routing_metrics", metrics), \
+                mock.patch.object(routing, "bedrock_runtime", runtime), \
+                mock.patch.object(routing.intent_classifier, "classify_local", return_value=(None, None, None)):
+            self.assertEqual(routing.classify_intent("can we push it to friday afternoon?"), "chitchat")
+
+        classifications = metrics.snapshot()["since_start"]["classifications"]
+        self.assertEqual((classifications["count"], classifications["errors"]), (0, 1))
+        self.assertEqual(classifications["by_intent"], {})
+        self.assertEqual(classifications["error_rate"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Unit tests for slot_prefetch module
+Tests concurrent slot prefetch and the prefetched slot store
+"""
+
+import unittest
+import sys
+import os
+import threading
+from unittest import mock
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+import slot_prefetch as slot_prefetch_module
+from slot_prefetch import prefetch_slots, SlotStore
+
+
+class FakeTable:
+    """In-memory stand-in for a DynamoDB Table resource"""
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key):
+        item = self.items.get(Key["session_id"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item["session_id"]] = Item
+
+
+class TestPrefetchSlots(unittest.TestCase):
+    """Test concurrent fan-out"""
+
+    def test_fetches_all_dates_concurrently(self):
+        """Test every date is fetched and calls overlap"""
+        barrier = threading.Barrier(3, timeout=2)
+
+        def fetch(date):
+            barrier.wait()
+            return [f"{date} 09:00 AM"]
+
+        result = prefetch_slots(["2025-10-21", "2025-10-22", "2025-10-23"], fetch, max_workers=3)
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result["2025-10-22"], ["2025-10-22 09:00 AM"])
+
+    def test_failed_dates_omitted(self):
+        """Test a failing date is left out of the map"""
+        def fetch(date):
+            if date == "2025-10-22":
+                raise RuntimeError("upstream timeout")
+            return ["09:00 AM"]
+
+        result = prefetch_slots(["2025-10-21", "2025-10-22"], fetch)
+
+        self.assertEqual(list(result), ["2025-10-21"])
+
+    def test_no_dates(self):
+        """Test empty input"""
+        self.assertEqual(prefetch_slots([], lambda d: []), {})
+
+
+class TestSlotStore(unittest.TestCase):
+    """Test prefetched slot store"""
+
+    def setUp(self):
+        self.store = SlotStore(ttl_seconds=300, table_name="")
+
+    def test_put_and_get(self):
+        """Test slots are returned per date and session"""
+        self.store.put("12345", "REQ-1", {"2025-10-21": ["09:00 AM"], "2025-10-22": []})
+
+        self.assertEqual(self.store.get("12345", "REQ-1", "2025-10-21"), ["09:00 AM"])
+        self.assertEqual(self.store.get("12345", "REQ-1", "2025-10-22"), [])
+        self.assertIsNone(self.store.get("12345", "REQ-1", "2025-10-23"))
+        self.assertIsNone(self.store.get("12345", "REQ-2", "2025-10-21"))
+
+    def test_expiry(self):
+        """Test slots expire after TTL"""
+        self.store.put("12345", "REQ-1", {"2025-10-21": ["09:00 AM"]})
+
+        with mock.patch.object(slot_prefetch_module.time, "time", return_value=10 ** 10):
+            self.assertIsNone(self.store.get("12345", "REQ-1", "2025-10-21"))
+
+    def test_dynamodb_tier_shared(self):
+        """Test another container reads slots from DynamoDB"""
+        table = FakeTable()
+        writer = SlotStore(table_name="sessions")
+        reader = SlotStore(table_name="sessions")
+        writer.remote._table = table
+        reader.remote._table = table
+
+        writer.put("12345", "REQ-1", {"2025-10-21": ["09:00 AM"]})
+
+        self.assertIn("slots#12345#REQ-1", table.items)
+        self.assertEqual(reader.get("12345", "REQ-1", "2025-10-21"), ["09:00 AM"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+"""
+Unit tests for speculative agent invocation in the chat backend
+Tests guessing, hit/miss settlement, stream cancellation, the allowed-intent guard and client disconnects
+"""
+
+import unittest
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+# Add the chat backend to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../frontend/backend"))
+
+import app as routing
+from speculation import Speculator, SpeculativeStream
+
+
+class TestSpeculativeStream(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_buffers_chunks(self):
+        stream = SpeculativeStream("information", lambda: iter(["a", "b"]), self.executor)
+        self.assertEqual(list(stream), ["a", "b"])
+        self.assertEqual(stream.chunks, 2)
+
+    def test_errors_reach_consumer(self):
+        def failing():
+            yield "a"
+            raise RuntimeError("throttled")
+
+        with self.assertRaises(RuntimeError):
+            list(SpeculativeStream("information", failing, self.executor))
+
+    def test_cancel_closes_agent_stream(self):
+        release, closed = threading.Event(), threading.Event()
+
+        def agent():
+            try:
+                yield "a"
+                release.wait(1)
+                yield "b"
+                yield "c"
+            finally:
+                closed.set()
+
+        stream = SpeculativeStream("information", agent, self.executor)
+        stream.cancel()
+        release.set()
+        self.assertTrue(closed.wait(1))
+        self.assertLessEqual(stream.chunks, 1)
+
+
+class TestSpeculator(unittest.TestCase):
+
+    def setUp(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        self.speculator = Speculator(executor, enabled=True, intents=["information", "chitchat"])
+        self.opened = []
+
+    def open_stream(self, intent):
+        self.opened.append(intent)
+        return iter([f"{intent} answer"])
+
+    def test_guess(self):
+        self.speculator.recent.set("C1", "chitchat")
+        self.assertEqual(self.speculator.guess("C1", "information", 0.7), "information")
+        self.assertEqual(self.speculator.guess("C1", "information", 0.3), "chitchat")
+        self.assertEqual(self.speculator.guess("C2", "information", 0.3), "information")
+        self.assertIsNone(self.speculator.guess("C2", None, None))
+
+    def test_hit(self):
+        speculative = self.speculator.start("C1", "information", 0.7, self.open_stream)
+        stream = self.speculator.resolve(speculative, "information")
+
+        self.assertEqual(list(stream), ["information answer"])
+        stats = self.speculator.stats()
+        self.assertEqual((stats["hits"], stats["wasted_invocations"], stats["hit_rate"]), (1, 0, 1.0))
+
+    def test_miss(self):
+        speculative = self.speculator.start("C1", "information", 0.7, self.open_stream)
+        self.assertIsNone(self.speculator.resolve(speculative, "scheduling"))
+        self.assertEqual(self.speculator.stats()["wasted_invocations"], 1)
+
+    def test_side_effect_agents_not_speculated(self):
+        self.assertIsNone(self.speculator.start("C1", "scheduling", 0.9, self.open_stream))
+        self.assertIsNone(self.speculator.start("C9", None, None, self.open_stream))
+        self.assertEqual(self.opened, [])
+        stats = self.speculator.stats()
+        self.assertEqual((stats["skipped_not_allowed"], stats["skipped_no_guess"]), (1, 1))
+
+    def test_disabled(self):
+        self.speculator.enabled = False
+        self.assertIsNone(self.speculator.start("C1", "information", 0.9, self.open_stream))
+        self.assertIsNone(self.speculator.resolve(None, "information"))
+
+
+class TestClientDisconnect(unittest.TestCase):
+    """Test closing the chat stream stops the agent's response (speculative hit or not)"""
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown)
+        self.closed = threading.Event()
+
+    def agent(self):
+        try:
+            for index in range(1000):
+                yield f"chunk {index} "
+        finally:
+            self.closed.set()
+
+    def test_speculative_hit(self):
+        release = threading.Event()
+
+        def agent():
+            try:
+                yield "a"
+                release.wait(1)
+                yield from ("b", "c", "d")
+            finally:
+                self.closed.set()
+
+        stream = SpeculativeStream("information", agent, self.executor)
+        with mock.patch.object(routing.speculator, "enabled", True), \
+                mock.patch.object(routing, "classify_intent_speculatively", return_value=("information", stream)):
+            response = routing.invoke_agent_with_context("When is my appointment?", "C1")
+            self.assertEqual(next(response), "a")
+            response.close()  # client went away
+
+        release.set()
+        self.assertTrue(self.closed.wait(1))
+        self.assertLessEqual(stream.chunks, 2)
+
+    def test_direct_stream(self):
+        completion = mock.MagicMock()
+        completion.__iter__.return_value = ({"chunk": {"bytes": chunk.encode()}} for chunk in self.agent())
+        runtime = mock.Mock(**{"invoke_agent.return_value": {"completion": completion}})
+        with mock.patch.object(routing, "bedrock_agent_runtime", runtime), \
+                mock.patch.object(routing, "classify_intent", return_value="information"), \
+                mock.patch.object(routing.speculator, "enabled", False):
+            response = routing.invoke_agent_with_context("When is my appointment?", "C1")
+            self.assertEqual(next(response), "chunk 0 ")
+            response.close()
+
+        completion.close.assert_called_once()
+
+
+class TestSpeculativeSession(unittest.TestCase):
+    """Test a discarded speculative stream runs outside the user's session"""
+
+    def test_miss_uses_throwaway_session(self):
+        speculation_started = threading.Event()
+        sessions = {}
+
+        def invoke_agent(agentId, sessionId, **kwargs):
+            sessions.setdefault(agentId, []).append(sessionId)
+            speculation_started.set()
+            return {"completion": iter([{"chunk": {"bytes": agentId.encode()}}])}
+
+        def classify_fallback(message, confidence):
+            speculation_started.wait(2)  # the guessed agent is already running
+            return "notes", "haiku", 0.9
+
+        agents = {intent: {"agent_id": f"{intent}-agent", "alias_id": "alias"}
+                  for intent in ("information", "notes", "chitchat")}
+        runtime = mock.Mock(**{"invoke_agent.side_effect": invoke_agent})
+        with mock.patch.object(routing, "AGENTS", agents), \
+                mock.patch.object(routing, "bedrock_agent_runtime", runtime), \
+                mock.patch.object(routing, "record_classification"), \
+                mock.patch.object(routing.speculator, "enabled", True), \
+                mock.patch.object(routing.intent_classifier, "classify_local", return_value=("information", None, 0.8)), \
+                mock.patch.object(routing.intent_classifier, "classify_fallback", side_effect=classify_fallback):
+            response = "".join(routing.invoke_agent_with_context("Add a note: gate code 4411", "C1"))
+
+        self.assertEqual(response, "notes-agent")
+        (user_session,), (discarded_session,) = sessions["notes-agent"], sessions["information-agent"]
+        self.assertTrue(user_session.startswith("session-C1-"))
+        self.assertNotEqual(discarded_session, user_session)
+        self.assertTrue(discarded_session.startswith(f"{user_session}-speculative-"))
+
+
+if __name__ == "__main__":
+    unittest.main()
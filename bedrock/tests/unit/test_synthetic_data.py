@@ -0,0 +1,141 @@
+"""
+Unit tests for synthetic_data module and the local PF360 stub
+Tests seeded volumes, mock_data delegation, fault injection and a real-mode handler against the stub
+"""
+
+import unittest
+import sys
+import os
+import json
+import threading
+import importlib.util
+from unittest import mock
+
+import requests
+
+from lambda_loader import load_handler, bedrock_event, LAYER_PATH
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, LAYER_PATH)
+
+import lib.synthetic_data
+from lib.synthetic_data import SyntheticData
+
+STUB_PATH = os.path.join(os.path.dirname(__file__), "../../scripts/pf360_stub_server.py")
+spec = importlib.util.spec_from_file_location("pf360_stub_server", STUB_PATH)
+pf360_stub_server = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(pf360_stub_server)
+
+
+class TestSyntheticData(unittest.TestCase):
+    """Test generated volumes and determinism"""
+
+    def setUp(self):
+        self.data = SyntheticData(seed=7, customers=3, projects_per_customer=300, notes_per_project=150, slots_per_day=16)
+
+    def test_volumes(self):
+        projects = self.data.projects("1001")
+        self.assertEqual(len(projects), 300)
+        self.assertEqual(len({p["project_project_id"] for p in projects}), 300)
+        self.assertEqual(projects[0]["customer_customer_id"], "1001")
+        self.assertEqual(len(self.data.notes(projects[0]["project_project_id"])), 150)
+        self.assertEqual(self.data.customer_ids(), ["1000", "1001", "1002"])
+
+    def test_deterministic(self):
+        """Test the same seed gives the same records and another seed does not"""
+        same = SyntheticData(seed=7, projects_per_customer=300, slots_per_day=16)
+        other = SyntheticData(seed=8, projects_per_customer=300)
+        self.assertEqual(self.data.project("1001005", "1001"), same.project("1001005", "1001"))
+        self.assertEqual(self.data.time_slots("1001005", "2025-10-15"), same.time_slots("1001005", "2025-10-15"))
+        self.assertNotEqual(self.data.projects("1001"), other.projects("1001"))
+
+    def test_slot_density(self):
+        slots = self.data.time_slots("1001005", "2025-10-15")
+        self.assertEqual(len(slots), 16)
+        self.assertEqual(len(set(slots)), 16)
+        self.assertEqual(SyntheticData(slots_per_day=100).slots_per_day, 24)
+
+    def test_status_matches_project(self):
+        for project in self.data.projects("1002")[:30]:
+            status = self.data.appointment_status(project["project_project_id"])
+            self.assertEqual(status["status"], project["status_info_status"])
+            self.assertEqual(status["scheduled_date"], project["project_date_scheduled_date"])
+
+    def test_notes_with_added(self):
+        response = self.data.notes_response("1001001", [{"note_id": "added"}])
+        self.assertEqual(response["data"]["total_count"], 151)
+        self.assertEqual(response["data"]["notes"][-1]["note_id"], "added")
+
+
+class TestMockDataDelegation(unittest.TestCase):
+    """Test get_mock_* functions serve synthetic data with MOCK_DATA_MODE=synthetic"""
+
+    def test_list_projects(self):
+        with mock.patch.object(lib.synthetic_data, "SYNTHETIC_ENABLED", True), \
+                mock.patch.object(lib.synthetic_data.synthetic_data, "projects_per_customer", 120):
+            handler = load_handler("scheduling-actions")
+            response = handler.lambda_handler(bedrock_event("/list-projects", customer_id="2001"), None)
+
+        body = json.loads(response["response"]["responseBody"]["application/json"]["body"])
+        self.assertEqual(len(body["projects"]), 120)
+
+    def test_static_by_default(self):
+        handler = load_handler("scheduling-actions")
+        response = handler.lambda_handler(bedrock_event("/list-projects", customer_id="2002"), None)
+        body = json.loads(response["response"]["responseBody"]["application/json"]["body"])
+        self.assertEqual(len(body["projects"]), 3)
+
+
+class TestPF360Stub(unittest.TestCase):
+    """Test routing and fault injection, in-process and over HTTP"""
+
+    def setUp(self):
+        self.stub = pf360_stub_server.PF360Stub(SyntheticData(seed=1, projects_per_customer=40))
+
+    def test_routes(self):
+        status, payload = self.stub.handle("GET", "/dashboard/get/09PF05VD/1001")
+        self.assertEqual((status, len(payload["data"])), (200, 40))
+
+        base = "/scheduler/client/09PF05VD/project/1001001/date/2025-10-15/selected/2025-10-15/get-rescheduler-slots"
+        _, dates = self.stub.handle("GET", base)
+        _, slots = self.stub.handle("GET", f"{base}?request_id={dates['data']['request_id']}")
+        self.assertIn("dates", dates["data"])
+        self.assertEqual(len(slots["data"]["slots"]), 9)
+
+        self.stub.handle("POST", "/project-notes/add/09PF05VD", {"project_id": "1001001", "note": "Hi"})
+        _, notes = self.stub.handle("GET", "/project-notes/list/09PF05VD?project_id=1001001")
+        self.assertEqual(notes["data"]["notes"][-1]["note_text"], "Hi")
+
+        self.assertEqual(self.stub.handle("POST", "/dashboard/get/09PF05VD/1001")[0], 404)
+
+    def test_error_injection(self):
+        self.stub.error_rate = 1.0
+        self.stub.error_routes = ["project-notes"]
+        self.assertEqual(self.stub.handle("GET", "/project-notes/list/x?project_id=1")[0], 503)
+        self.assertEqual(self.stub.handle("GET", "/dashboard/get/x/1001")[0], 200)
+        self.assertEqual(self.stub.stats["errors_injected"], 1)
+
+    def test_latency(self):
+        self.stub.latency_ms, self.stub.jitter_ms = 50, 10
+        self.assertTrue(0.05 <= self.stub.delay() <= 0.06)
+
+    def test_real_mode_handler(self):
+        """Test a handler in real mode against the stub over HTTP"""
+        server = pf360_stub_server.make_server(self.stub, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        with mock.patch.dict(os.environ, {"USE_MOCK_API": "false", "CUSTOMER_SCHEDULER_API_URL": url}):
+            handler = load_handler("scheduling-actions")
+        response = handler.lambda_handler(bedrock_event("/list-projects", customer_id="3003", authorization="t"), None)
+
+        body = json.loads(response["response"]["responseBody"]["application/json"]["body"])
+        self.assertFalse(body["mock_mode"])
+        self.assertEqual(len(body["projects"]), 40)
+        self.assertEqual(requests.get(f"{url}/__stub/stats").json()["requests"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Unit tests for weather_cache module
+Tests location normalization, forecast-aware expiry, stale-while-revalidate and stale fallback
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest import mock
+
+# Add Lambda layer to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda/shared-layer/python/lib"))
+
+import weather_cache as weather_cache_module
+from weather_cache import WeatherCache, normalize_location, forecast_expiry
+from lambda_loader import load_handler, bedrock_event
+
+
+def make_payload(area="Tampa", region="Florida", temp="72"):
+    """Build a formatted weather payload"""
+    return {"location": {"area": area, "region": region, "country": "United States"}, "current": {"temp_f": temp}}
+
+
+class FakeTable:
+    """In-memory stand-in for a DynamoDB Table resource"""
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key):
+        item = self.items.get(Key["session_id"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item["session_id"]] = Item
+
+
+class TestNormalization(unittest.TestCase):
+    """Test location keys"""
+
+    def test_equivalent_forms(self):
+        """Test case, whitespace, state names and country suffixes collapse to one key"""
+        for location in ("Tampa, FL", "tampa,fl", "  TAMPA ,  Florida ", "Tampa, FL, USA", "Tampa, FL 33601"):
+            self.assertEqual(normalize_location(location), "tampa, fl", location)
+
+    def test_zip_codes(self):
+        self.assertEqual(normalize_location("33601"), "33601")
+        self.assertEqual(normalize_location(" 33601-1234 "), "33601")
+
+    def test_forecast_expiry(self):
+        """Test freshness ends at the next period boundary, at least min_ttl away"""
+        self.assertEqual(forecast_expiry(3600 * 10 + 60, period=3600, min_ttl=300, max_ttl=7200), 3600 * 11)
+        self.assertEqual(forecast_expiry(3600 * 11 - 60, period=3600, min_ttl=300, max_ttl=7200), 3600 * 12)
+        self.assertEqual(forecast_expiry(3600 * 10, period=3600, min_ttl=300, max_ttl=600), 3600 * 10 + 600)
+
+
+class TestWeatherCache(unittest.TestCase):
+    """Test cache statuses"""
+
+    def setUp(self):
+        self.cache = WeatherCache(table_name="")
+        self.loader = mock.Mock(side_effect=lambda location: make_payload())
+
+    def expire(self, seconds_past):
+        for entry in self.cache._entries.values():
+            entry.expires_at = weather_cache_module.time.time() - seconds_past
+
+    def test_hit_after_miss(self):
+        entry, status = self.cache.get_or_load("Tampa, FL", self.loader)
+        self.assertEqual(status, "miss")
+
+        _, status = self.cache.get_or_load("tampa, florida", self.loader)
+        self.assertEqual(status, "hit")
+        self.assertEqual(self.loader.call_count, 1)
+        self.assertEqual(entry.payload["current"]["temp_f"], "72")
+
+    def test_aliases_learned_from_response(self):
+        """Test a bare city or ZIP resolves to the canonical area/region key"""
+        self.cache.get_or_load("tampa", self.loader)
+        self.assertEqual(self.cache.resolve("tampa"), "tampa, fl")
+
+        _, status = self.cache.get_or_load("Tampa, FL", self.loader)
+        self.assertEqual(status, "hit")
+        self.assertEqual(self.loader.call_count, 1)
+
+    def test_aliases_bounded(self):
+        """Test aliases are capped at max_entries, least recently used dropped first"""
+        cache = WeatherCache(max_entries=2, table_name="")
+        for zip_code in ("33601", "33602", "33603"):
+            cache.get_or_load(zip_code, self.loader)
+            cache.resolve("33601")  # keep the first alias in use
+
+        self.assertEqual(list(cache._aliases), ["33603", "33601"])
+        self.assertEqual(cache.resolve("33602"), "33602")
+
+    def test_stale_while_revalidate(self):
+        """Test stale entries are served while one background refresh runs"""
+        self.cache.get_or_load("Tampa, FL", self.loader)
+        self.expire(60)
+        self.loader.side_effect = lambda location: make_payload(temp="80")
+
+        entry, status = self.cache.get_or_load("Tampa, FL", self.loader)
+        self.assertEqual(status, "stale")
+        self.assertEqual(entry.payload["current"]["temp_f"], "72")
+
+        self.cache.wait_for_refreshes(timeout=5)
+        entry, status = self.cache.get_or_load("Tampa, FL", self.loader)
+        self.assertEqual(status, "hit")
+        self.assertEqual(entry.payload["current"]["temp_f"], "80")
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_finished_refresh_threads_dropped(self):
+        """Test refreshes do not accumulate threads in a long-lived container"""
+        self.cache.get_or_load("Tampa, FL", self.loader)
+        for _ in range(5):
+            self.expire(60)
+            self.cache.get_or_load("Tampa, FL", self.loader)
+            for thread in list(self.cache._refresh_threads):
+                thread.join(5)
+
+        self.assertEqual(self.loader.call_count, 6)
+        self.assertLessEqual(len(self.cache._refresh_threads), 1)
+
+    def test_stale_fallback_on_error(self):
+        """Test an old entry is served when the upstream fails"""
+        self.cache.get_or_load("Tampa, FL", self.loader)
+        self.expire(weather_cache_module.SWR_SECONDS + 60)
+        self.loader.side_effect = TimeoutError("read timed out")
+
+        entry, status = self.cache.get_or_load("Tampa, FL", self.loader)
+        self.assertEqual(status, "stale_error")
+        self.assertEqual(entry.payload["current"]["temp_f"], "72")
+
+    def test_error_without_cached_entry(self):
+        self.loader.side_effect = TimeoutError("read timed out")
+        with self.assertRaises(TimeoutError):
+            self.cache.get_or_load("Tampa, FL", self.loader)
+
+    def test_error_after_stale_window(self):
+        self.cache.get_or_load("Tampa, FL", self.loader)
+        self.expire(weather_cache_module.STALE_IF_ERROR_SECONDS + 60)
+        self.loader.side_effect = TimeoutError("read timed out")
+
+        with self.assertRaises(TimeoutError):
+            self.cache.get_or_load("Tampa, FL", self.loader)
+
+    def test_shared_dynamodb_tier(self):
+        """Test another container reads the entry from DynamoDB"""
+        table = FakeTable()
+        first, second = WeatherCache(table_name="sessions"), WeatherCache(table_name="sessions")
+        first.remote._table = second.remote._table = table
+
+        first.get_or_load("Tampa, FL", self.loader)
+        entry, status = second.get_or_load("Tampa, FL", self.loader)
+
+        self.assertEqual(status, "hit")
+        self.assertEqual(self.loader.call_count, 1)
+        self.assertEqual(json.loads(table.items["weather#tampa, fl"]["payload"]), entry.payload)
+
+
+class TestGetWeatherAction(unittest.TestCase):
+    """Test get_weather through the information Lambda (mock mode)"""
+
+    def test_cached_response(self):
+        handler = load_handler("information-actions")
+        handler.weather_cache.clear()
+
+        with mock.patch.object(handler, "get_mock_weather", wraps=handler.get_mock_weather) as fetch:
+            first = handler.lambda_handler(bedrock_event("/get-weather", location="Tampa, FL"), None)
+            second = handler.lambda_handler(bedrock_event("/get-weather", location="tampa,  florida"), None)
+
+        body = json.loads(second["response"]["responseBody"]["application/json"]["body"])
+        self.assertEqual(first["response"]["httpStatusCode"], 200)
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(body["location"], "tampa,  florida")
+        self.assertFalse(body["stale"])
+        self.assertIn("as_of", body)
+
+
+if __name__ == "__main__":
+    unittest.main()